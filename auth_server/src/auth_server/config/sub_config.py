@@ -7,7 +7,10 @@ from auxillary.mixins.db_config import (
     BasicPostgresDatabaseConfigMixin,
     BasicSQLAlchemyConfigMixin,
 )
-from auxillary.mixins.redis_config import BasicRedisConfigMixin
+from auxillary.mixins.redis_config import (
+    BasicRedisConfigMixin,
+    RedisConnectionPoolConfigMixin,
+)
 from pydantic import (
     BaseModel,
     BeforeValidator,
@@ -169,7 +172,9 @@ class DatabaseConfigModel(BasicPostgresDatabaseConfigMixin, BaseModel):
     SQLALCHEMY: Annotated[SAConfigModel, Field(alias="sqlalchemy")]
 
 
-class RedisStoreModel(BasicRedisConfigMixin, BaseModel): ...
+class RedisStoreModel(
+    BasicRedisConfigMixin, RedisConnectionPoolConfigMixin, BaseModel
+): ...
 
 
 class RedisConfigModel(BaseModel):
@@ -3,7 +3,7 @@ from functools import lru_cache
 from typing import AsyncGenerator, Final
 
 from auth_server.repositories.keydata import KeydataRepository
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -26,9 +26,12 @@ def get_synced_store_client() -> Redis:
     config: Final[AppConfig] = get_app_config()
 
     return Redis(
-        # username=os.environ["AUTH_WORKER_REDIS_USERNAME"],
-        # password=os.environ["AUTH_WORKER_REDIS_PASSWORD"],
-        **config.REDIS.SYNCED_STORE.to_constructor_kwargs(),
+        connection_pool=BlockingConnectionPool(
+            # username=os.environ["AUTH_WORKER_REDIS_USERNAME"],
+            # password=os.environ["AUTH_WORKER_REDIS_PASSWORD"],
+            **config.REDIS.SYNCED_STORE.to_constructor_kwargs(),
+            **config.REDIS.SYNCED_STORE.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
@@ -37,9 +40,12 @@ def get_token_store_client() -> Redis:
     config: Final[AppConfig] = get_app_config()
 
     return Redis(
-        # username=os.environ["AUTH_WORKER_REDIS_USERNAME"],
-        # password=os.environ["AUTH_WORKER_REDIS_PASSWORD"],
-        **config.REDIS.TOKEN_STORE.to_constructor_kwargs(),
+        connection_pool=BlockingConnectionPool(
+            # username=os.environ["AUTH_WORKER_REDIS_USERNAME"],
+            # password=os.environ["AUTH_WORKER_REDIS_PASSWORD"],
+            **config.REDIS.TOKEN_STORE.to_constructor_kwargs(),
+            **config.REDIS.TOKEN_STORE.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
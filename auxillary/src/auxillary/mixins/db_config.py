@@ -71,8 +71,13 @@ class BasicConnectionPoolConfigMixin:
 
 
 class BasicPostgresDatabaseConfigMixin:
+    # psycopg (3) serves both sync and async engines, psycopg2 is not installed
     DATABASE_URI_TEMPLATE: ClassVar[str] = (
-        "postgresql+psycopg2://{username}:{password}@{host}:{port}/{database}"
+        "postgresql+psycopg://{username}:{password}@{host}:{port}/{database}"
+    )
+    # libpq only accepts the bare scheme, without a SQLAlchemy driver suffix
+    CONNINFO_TEMPLATE: ClassVar[str] = (
+        "postgresql://{username}:{password}@{host}:{port}/{database}"
     )
 
     POSTGRES_HOST: str
@@ -99,3 +104,12 @@ class BasicPostgresDatabaseConfigMixin:
             port=self.POSTGRES_PORT,
             database=self.POSTGRES_DATABASE,
         )
+
+    def derive_conninfo(self, username: str, password: str) -> str:
+        return self.CONNINFO_TEMPLATE.format(
+            username=username,
+            password=password,
+            host=str(self.POSTGRES_HOST),
+            port=self.POSTGRES_PORT,
+            database=self.POSTGRES_DATABASE,
+        )
@@ -16,3 +16,23 @@ class BasicRedisConfigMixin:
             "db": self.DB,
             "decode_responses": self.DECODE_RESPONSES,
         }
+
+
+class RedisConnectionPoolConfigMixin:
+    # Sized per client role, to be used with redis.asyncio.BlockingConnectionPool.
+    # Once MAX_CONNECTIONS are checked out, callers wait up to POOL_TIMEOUT
+    # for a free connection instead of opening unbounded new ones
+    MAX_CONNECTIONS: Annotated[int, Field(ge=1, default=64)]
+    POOL_TIMEOUT: Annotated[float, Field(gt=0, default=5)]
+    SOCKET_KEEPALIVE: Annotated[bool, Field(default=True)]
+    SOCKET_CONNECT_TIMEOUT: Annotated[float, Field(gt=0, default=5)]
+    HEALTH_CHECK_INTERVAL: Annotated[int, Field(ge=0, default=30)]
+
+    def emit_connection_pool_constructor_kwargs(self) -> dict[str, Any]:
+        return {
+            "max_connections": self.MAX_CONNECTIONS,
+            "timeout": self.POOL_TIMEOUT,
+            "socket_keepalive": self.SOCKET_KEEPALIVE,
+            "socket_connect_timeout": self.SOCKET_CONNECT_TIMEOUT,
+            "health_check_interval": self.HEALTH_CHECK_INTERVAL,
+        }
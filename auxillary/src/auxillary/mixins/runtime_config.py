@@ -0,0 +1,24 @@
+import asyncio
+from typing import Annotated, Any, Callable, Coroutine, TypeVar
+
+from pydantic import Field
+
+T = TypeVar("T")
+
+
+class RuntimeProfileMixin:
+    # uvloop is optional, and silently falls back to the default loop if not installed
+    USE_UVLOOP: Annotated[bool, Field(default=True)]
+
+    def resolve_loop_factory(self) -> Callable[[], asyncio.AbstractEventLoop] | None:
+        if not self.USE_UVLOOP:
+            return None
+        try:
+            import uvloop
+        except ImportError:
+            return None
+        return uvloop.new_event_loop
+
+    def run(self, main: Coroutine[Any, Any, T]) -> T:
+        with asyncio.Runner(loop_factory=self.resolve_loop_factory()) as runner:
+            return runner.run(main)
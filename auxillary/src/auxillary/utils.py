@@ -7,6 +7,7 @@ import traceback
 from typing import Final, Literal, Mapping, Callable, Any
 from types import NoneType
 import base64
+import struct
 
 import bcrypt
 
@@ -49,6 +50,23 @@ def from_base64url(b64url: str) -> int:
     return int.from_bytes(byte_data, byteorder="big")
 
 
+def to_keyset_base64url(*keys: int) -> str:
+    """
+    Pack signed 64-bit keys into an opaque, URL-safe cursor
+    """
+    return (
+        base64.urlsafe_b64encode(struct.pack(f">{len(keys)}q", *keys))
+        .rstrip(b"=")
+        .decode("utf-8")
+    )
+
+
+def from_keyset_base64url(b64url: str, key_count: int) -> tuple[int, ...]:
+    padding = "=" * ((4 - len(b64url) % 4) % 4)
+    byte_data = base64.urlsafe_b64decode(b64url + padding)
+    return struct.unpack(f">{key_count}q", byte_data)
+
+
 def hash_password(password: str, salt: bytes | None = None) -> tuple[bytes, bytes]:
     """
     Produce a password salt and hash from a given string
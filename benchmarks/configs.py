@@ -0,0 +1,130 @@
+"""
+Service configs rewritten to point at benchmark instances.
+
+Each config is loaded from its checked-in TOML file, has its hosts overridden and
+is written to a scratch directory, to be picked up through the service's config
+filepath environment variable.
+"""
+
+import json
+from pathlib import Path
+import tomllib
+from typing import Any, Final, Mapping, Sequence
+
+from services import PostgresEndpoint, RedisEndpoint
+
+REPOSITORY_ROOT: Final[Path] = Path(__file__).parent.parent
+WORKER_CONFIG_FILEPATH: Final[Path] = (
+    REPOSITORY_ROOT
+    / "resource_database_workers/src/resource_database_workers/config/config.toml"
+)
+SERVER_CONFIG_FILEPATH: Final[Path] = (
+    REPOSITORY_ROOT / "resource_server/src/resource_server/config/app_config.toml"
+)
+
+
+def _format_toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, list):
+        return f"[{', '.join(_format_toml_value(item) for item in value)}]"
+    raise TypeError(f"Unsupported TOML value: {value!r}")
+
+
+def _is_table_array(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(item, Mapping) for item in value)
+    )
+
+
+def dump_toml(mapping: Mapping[str, Any], prefix: str = "") -> str:
+    """
+    Minimal TOML writer for service configs: scalars, arrays, nested tables and
+    arrays of tables
+    """
+    lines: list[str] = [
+        f"{key}={_format_toml_value(value)}"
+        for key, value in mapping.items()
+        if not (isinstance(value, Mapping) or _is_table_array(value))
+    ]
+    for key, value in mapping.items():
+        table: str = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, Mapping):
+            lines.append(f"\n[{table}]")
+            lines.append(dump_toml(value, table))
+        elif _is_table_array(value):
+            for item in value:
+                lines.append(f"\n[[{table}]]")
+                lines.append(dump_toml(item, table))
+    return "\n".join(lines)
+
+
+def _load_with_endpoints(
+    filepath: Path, redis: RedisEndpoint, postgres: PostgresEndpoint
+) -> dict[str, Any]:
+    with open(filepath, "rb") as config_file:
+        config: dict[str, Any] = tomllib.load(config_file)
+
+    config["database"] |= {
+        "POSTGRES_HOST": postgres.host,
+        "POSTGRES_PORT": postgres.port,
+        "POSTGRES_DATABASE": postgres.database,
+    }
+    # Every logical Redis (app, internal, auth) shares the benchmark instance. The
+    # resource server streams events into its app database, which workers read
+    # from their internal connection, so all of them must use the same database
+    for redis_config in config["redis"].values():
+        redis_config |= {"HOST": redis.host, "PORT": redis.port, "DB": redis.db}
+    return config
+
+
+def write_worker_config(
+    directory: Path,
+    redis: RedisEndpoint,
+    postgres: PostgresEndpoint,
+    metrics_port: int,
+) -> Path:
+    config: dict[str, Any] = _load_with_endpoints(
+        WORKER_CONFIG_FILEPATH, redis, postgres
+    )
+    config["worker"] |= {"METRICS_HOST": "127.0.0.1", "METRICS_PORT": metrics_port}
+
+    filepath: Path = directory / "worker_config.toml"
+    filepath.write_text(dump_toml(config), encoding="utf-8")
+    return filepath
+
+
+def write_server_config(
+    directory: Path,
+    redis: RedisEndpoint,
+    postgres: PostgresEndpoint,
+    port: int,
+    page_size: int | None = None,
+    replicas: Sequence[PostgresEndpoint] = (),
+) -> Path:
+    config: dict[str, Any] = _load_with_endpoints(
+        SERVER_CONFIG_FILEPATH, redis, postgres
+    )
+    config["core"]["PORT"] = port
+    if page_size is not None:
+        config["business"]["PAGINATION_SIZE"] = page_size
+    # Replicas must stream from the benchmark primary, whose schema is recreated
+    config["database"]["REPLICAS"] = [
+        {"POSTGRES_HOST": replica.host, "POSTGRES_PORT": replica.port}
+        for replica in replicas
+    ]
+
+    filepath: Path = directory / "server_config.toml"
+    filepath.write_text(dump_toml(config), encoding="utf-8")
+    return filepath
+
+
+def load_server_config() -> dict[str, Any]:
+    with open(SERVER_CONFIG_FILEPATH, "rb") as config_file:
+        return tomllib.load(config_file)
@@ -0,0 +1,213 @@
+"""
+Stream reader and insertion consumer throughput under the default asyncio loop
+and uvloop.
+
+Runs against the Redis and Postgres instances configured for
+resource_database_workers. Both must be disposable: the benchmark recreates the
+POSTS stream and writes event IDs into stream_events.
+
+The insertion consumer runs unmodified, apart from its batch function, which records
+every event as inserted instead of writing votes. This isolates the loop-bound work:
+dequeuing, deduplication, acks and side-effects.
+
+Usage:
+    python benchmarks/event_loops.py --events 50000 --output event_loops.json
+"""
+
+from argparse import ArgumentParser, Namespace
+import asyncio
+from itertools import batched
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Final, Sequence
+
+from auxillary.utils import cache_repr
+from psycopg import AsyncConnection
+from redis.asyncio import Redis
+
+from resource_auxillary.datastructures.database import CopyFormat
+from resource_auxillary.events import Event, EventSideEffects, StreamedEvent
+from resource_auxillary.strings import EventName, StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.dependencies import (
+    get_app_redis,
+    get_config,
+    get_connection_pool,
+)
+from resource_database_workers.tasks.consumer import queue_insertion_consumer
+from resource_database_workers.tasks.stream_readers import stream_reader
+
+LOOPS: Final[tuple[str, ...]] = ("asyncio", "uvloop")
+STREAM: Final[StreamName] = StreamName.POSTS
+GROUP_NAME: Final[str] = "benchmark"
+SEED_CHUNK_SIZE: Final[int] = 1000
+
+
+def _resolve_loop_factory(
+    loop_name: str,
+) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    if loop_name == "asyncio":
+        return None
+    import uvloop
+
+    return uvloop.new_event_loop
+
+
+def _synthetic_vote(i: int) -> Event:
+    return Event(
+        name=EventName.POST_VOTE,
+        payload={"user_id": i, "post_id": 1, "vote": 1},
+        side_effects=EventSideEffects(),
+    )
+
+
+async def _seed_stream(redis: Redis, event_count: int) -> None:
+    await redis.delete(STREAM)
+    await redis.xgroup_create(STREAM, GROUP_NAME, id="0", mkstream=True)
+    for chunk in batched(range(event_count), SEED_CHUNK_SIZE):
+        async with redis.pipeline(transaction=False) as pipeline:
+            for i in chunk:
+                pipeline.xadd(STREAM, cache_repr(_synthetic_vote(i)))
+            await pipeline.execute()
+
+
+async def _benchmark_reader(
+    config: AppConfig, redis: Redis, event_count: int
+) -> tuple[float, list[tuple[StreamedEvent, ...]]]:
+    dead_letter_queue: asyncio.Queue[StreamedEvent] = asyncio.Queue()
+    batches: list[tuple[StreamedEvent, ...]] = []
+    read: int = 0
+
+    start: float = time.perf_counter()
+    while read < event_count:
+        events: list[StreamedEvent] = await stream_reader(
+            config, redis, STREAM, dead_letter_queue, GROUP_NAME, "reader", ">"
+        )
+        read += len(events)
+        batches.append(tuple(events))
+    return read / (time.perf_counter() - start), batches
+
+
+async def _benchmark_insertion_consumer(
+    config: AppConfig,
+    redis: Redis,
+    batches: Sequence[tuple[StreamedEvent, ...]],
+    event_count: int,
+) -> float:
+    queue: asyncio.Queue[tuple[StreamedEvent]] = asyncio.Queue()
+    done: asyncio.Event = asyncio.Event()
+    processed: int = 0
+
+    async def _record_batch(
+        conn: AsyncConnection,
+        batch: Sequence[StreamedEvent],
+        inserted_ids: list[int],
+        action: Any,
+        copy_format: CopyFormat,
+    ) -> None:
+        nonlocal processed
+        inserted_ids.extend(event.event_id for event in batch)
+        processed += len(batch)
+        if processed >= event_count:
+            done.set()
+
+    consumer: asyncio.Task[None] = asyncio.create_task(
+        queue_insertion_consumer(
+            config,
+            get_connection_pool(),
+            redis,
+            queue,  # type: ignore[reportArgumentType]
+            _record_batch,
+            STREAM,
+            GROUP_NAME,
+            StreamName.DEAD_LETTER_QUEUE,
+            "vote",
+        )
+    )
+    start: float = time.perf_counter()
+    for batch in batches:
+        queue.put_nowait(batch)  # type: ignore[reportArgumentType]
+    await done.wait()
+    elapsed: float = time.perf_counter() - start
+
+    consumer.cancel()
+    await asyncio.gather(consumer, return_exceptions=True)
+    return processed / elapsed
+
+
+async def _run_benchmark(event_count: int) -> dict[str, float]:
+    config: AppConfig = get_config()
+    redis: Redis = get_app_redis()
+    await get_connection_pool().open()
+
+    await _seed_stream(redis, event_count)
+    reader_throughput, batches = await _benchmark_reader(config, redis, event_count)
+    consumer_throughput: float = await _benchmark_insertion_consumer(
+        config, redis, batches, event_count
+    )
+    await redis.delete(STREAM)
+    await get_connection_pool().close()
+    return {
+        "reader_events_per_second": reader_throughput,
+        "insertion_consumer_events_per_second": consumer_throughput,
+    }
+
+
+def _run_single_loop(loop_name: str, event_count: int) -> dict[str, Any]:
+    try:
+        loop_factory = _resolve_loop_factory(loop_name)
+    except ImportError:
+        return {"loop": loop_name, "skipped": "not installed"}
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        results: dict[str, float] = runner.run(_run_benchmark(event_count))
+    return {"loop": loop_name, "events": event_count, **results}
+
+
+def get_argument_parser() -> ArgumentParser:
+    arg_parser: ArgumentParser = ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--events", help="Events per run", type=int, default=50_000)
+    arg_parser.add_argument("--output", help="JSON filepath for results")
+    # Internal: run a single loop in this process
+    arg_parser.add_argument("--loop", choices=LOOPS, help="Benchmark a single loop")
+    return arg_parser
+
+
+def main(args: Sequence[str]) -> None:
+    parsed_args: Namespace = get_argument_parser().parse_args(args)
+    if parsed_args.loop:
+        print(json.dumps(_run_single_loop(parsed_args.loop, parsed_args.events)))
+        return
+
+    # Each loop runs in a fresh interpreter, since the cached
+    # Redis client and connection pool bind to the first loop that uses them
+    results: list[dict[str, Any]] = [
+        json.loads(
+            subprocess.run(
+                (
+                    sys.executable,
+                    __file__,
+                    "--loop",
+                    loop_name,
+                    "--events",
+                    str(parsed_args.events),
+                ),
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.splitlines()[-1]
+        )
+        for loop_name in LOOPS
+    ]
+
+    output: str = json.dumps(results, indent=2)
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,467 @@
+"""
+HTTP load test of the resource server's read and write paths.
+
+resource_server.main:app is served by uvicorn against throwaway Redis and Postgres
+instances (or external ones, given by URL, which must be disposable). Requests are
+signed with a local key published through the JWKS mapping that KeyManager reads at
+startup, so no auth server is needed.
+
+Every scenario runs twice: a cache-cold phase right after flushing Redis, then a
+cache-warm phase. Target IDs follow a Zipfian distribution, so that hot keys
+dominate as they do in production.
+
+Reported per scenario and phase:
+    requests/s and latency percentiles
+    response status counts
+    Redis commands per request (INFO commandstats deltas)
+    SQL statements per request (pg_stat_statements deltas, when available)
+
+Usage:
+    python benchmarks/http_load.py --requests 5000 --concurrency 64 --output http.json
+    python benchmarks/http_load.py --scenarios post,vote --zipf-exponent 1.3
+"""
+
+from argparse import ArgumentParser, Namespace
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Final, Sequence
+from uuid import uuid4
+
+import ecdsa
+import httpx
+import jwt
+from psycopg import AsyncConnection
+from psycopg.errors import Error as PsycopgError
+from redis.asyncio import Redis
+
+from resource_server.config.constants import RedisConstants
+
+# Imported as a sibling script, like the other benchmarks
+sys.path.insert(0, str(Path(__file__).parent))
+from configs import load_server_config, write_server_config  # noqa: E402
+from services import (  # noqa: E402
+    PostgresEndpoint,
+    RedisEndpoint,
+    find_free_port,
+    services,
+)
+from workloads import Fixtures, ZipfSampler, create_schema  # noqa: E402
+
+KEY_ID: Final[str] = "benchmark"
+TOKEN_LIFETIME: Final[int] = 60 * 60  # seconds
+SERVER_STARTUP_TIMEOUT: Final[float] = 60  # seconds
+PERCENTILES: Final[tuple[int, ...]] = (50, 90, 99)
+PHASES: Final[tuple[str, ...]] = ("cold", "warm")
+# Commands issued by the benchmark itself while measuring
+HARNESS_COMMANDS: Final[frozenset[str]] = frozenset(("info",))
+
+
+@dataclass(slots=True, frozen=True)
+class PreparedRequest:
+    method: str
+    path: str
+    user_id: int | None = None
+    body: dict[str, Any] | None = None
+
+
+type t_request_builder = Callable[["RequestFactory"], PreparedRequest]
+
+
+@dataclass(slots=True)
+class RequestFactory:
+    fixtures: Fixtures
+    posts: ZipfSampler
+    forums: ZipfSampler
+    users: ZipfSampler
+    rng: random.Random
+
+    def any_user(self) -> int:
+        return self.rng.randint(1, self.fixtures.users)
+
+
+SCENARIOS: Final[dict[str, t_request_builder]] = {
+    "post": lambda factory: PreparedRequest("GET", f"/posts/{factory.posts.sample()}"),
+    "forum_posts": lambda factory: PreparedRequest(
+        "GET", f"/forums/{factory.forums.sample()}/posts"
+    ),
+    "user": lambda factory: PreparedRequest(
+        "GET", f"/users/bench_user_{factory.users.sample()}"
+    ),
+    "vote": lambda factory: PreparedRequest(
+        "POST",
+        f"/posts/{factory.posts.sample()}/votes",
+        factory.any_user(),
+        {"vote": factory.rng.choice((1, -1))},
+    ),
+    "comment": lambda factory: PreparedRequest(
+        "POST",
+        f"/posts/comments/?post_id={factory.posts.sample()}",
+        factory.any_user(),
+        {"body": "Synthetic comment"},
+    ),
+}
+
+
+@dataclass(slots=True)
+class TokenIssuer:
+    """
+    Sign access tokens the way the auth server does: ES256 headers over a SECP256k1
+    key, which is the curve KeyManager rebuilds JWKS entries on
+    """
+
+    signing_key: ecdsa.SigningKey
+    _tokens: dict[int, str]
+
+    @classmethod
+    def generate(cls) -> "TokenIssuer":
+        return cls(ecdsa.SigningKey.generate(curve=ecdsa.SECP256k1), {})
+
+    @property
+    def public_pem(self) -> str:
+        return self.signing_key.get_verifying_key().to_pem().decode()  # type: ignore
+
+    def token(self, user_id: int) -> str:
+        if not (token := self._tokens.get(user_id)):
+            now: float = time.time()
+            token = self._tokens[user_id] = jwt.encode(
+                payload={
+                    "iat": now,
+                    "exp": now + TOKEN_LIFETIME,
+                    "fid": uuid4().hex,
+                    "sub": f"bench_user_{user_id}",
+                    "sid": user_id,
+                    "jti": uuid4().hex,
+                },
+                key=self.signing_key.to_pem(),
+                algorithm="ES256",
+                headers={"typ": "JWT", "kid": KEY_ID},
+            )
+        return token
+
+
+async def _reset_cache(redis: Redis, issuer: TokenIssuer) -> None:
+    await redis.flushdb()
+    await redis.hset(
+        RedisConstants.JWKS_MAPPING, KEY_ID, issuer.public_pem
+    )  # type: ignore[reportGeneralTypeIssues]
+
+
+async def _redis_command_counts(redis: Redis) -> dict[str, int]:
+    command_stats: dict[str, dict[str, int]] = await redis.info("commandstats")
+    return {
+        name.removeprefix("cmdstat_"): stats["calls"]
+        for name, stats in command_stats.items()
+    }
+
+
+async def _enable_statement_statistics(conn: AsyncConnection) -> bool:
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_stat_statements")
+        await conn.execute("SELECT pg_stat_statements_reset()")
+    except PsycopgError:
+        return False
+    return True
+
+
+async def _statement_count(conn: AsyncConnection) -> int:
+    cursor = await conn.execute("""
+        SELECT coalesce(sum(calls), 0)::bigint FROM pg_stat_statements
+        WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+        AND query NOT ILIKE '%pg_stat_statements%'
+        """)
+    (calls,) = await cursor.fetchone()  # type: ignore
+    return calls
+
+
+def _start_server(
+    directory: Path,
+    redis: RedisEndpoint,
+    postgres: PostgresEndpoint,
+    port: int,
+    worker_count: int,
+    page_size: int | None,
+    replicas: Sequence[PostgresEndpoint],
+) -> subprocess.Popen:
+    config_filepath: Path = write_server_config(
+        directory, redis, postgres, port, page_size, replicas
+    )
+    return subprocess.Popen(
+        (
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "resource_server.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(worker_count),
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ),
+        env=os.environ
+        | {
+            "RESOURCE_SERVER_CONFIG_FILEPATH": str(config_filepath),
+            "RESOURCE_SERVER_POSTGRES_USERNAME": postgres.username,
+            "RESOURCE_SERVER_POSTGRES_PASSWORD": postgres.password,
+        },
+    )
+
+
+async def _wait_until_ready(
+    client: httpx.AsyncClient, server: subprocess.Popen
+) -> None:
+    # Routers are only registered once the lifespan has run
+    deadline: float = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Resource server exited with code {server.returncode}")
+        try:
+            if (await client.get("/posts/1")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise TimeoutError(f"Resource server not ready after {SERVER_STARTUP_TIMEOUT}s")
+
+
+async def _run_phase(
+    client: httpx.AsyncClient,
+    builder: t_request_builder,
+    factory: RequestFactory,
+    issuer: TokenIssuer,
+    request_count: int,
+    concurrency: int,
+) -> tuple[float, list[float], dict[int, int]]:
+    remaining: int = request_count
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def _client_loop() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            request: PreparedRequest = builder(factory)
+            headers: dict[str, str] = (
+                {"Authorization": f"Bearer {issuer.token(request.user_id)}"}
+                if request.user_id
+                else {}
+            )
+            start: float = time.perf_counter()
+            response: httpx.Response = await client.request(
+                request.method, request.path, json=request.body, headers=headers
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start: float = time.perf_counter()
+    await asyncio.gather(*(_client_loop() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, statuses
+
+
+def _summarize_latencies(latencies: Sequence[float]) -> dict[str, float]:
+    if len(latencies) < 2:
+        return {}
+    cut_points: list[float] = statistics.quantiles(latencies, n=100)
+    return {
+        **{f"p{p}_ms": cut_points[p - 1] for p in PERCENTILES},
+        "max_ms": max(latencies),
+    }
+
+
+async def run_benchmark(
+    redis_endpoint: RedisEndpoint,
+    postgres: PostgresEndpoint,
+    parsed_args: Namespace,
+) -> dict[str, Any]:
+    fixtures: Fixtures = Fixtures(
+        users=parsed_args.users, posts=parsed_args.posts, forums=parsed_args.forums
+    )
+    await asyncio.to_thread(create_schema, postgres.sqlalchemy_uri, fixtures)
+
+    rng: random.Random = random.Random(parsed_args.seed)
+    factory: RequestFactory = RequestFactory(
+        fixtures,
+        posts=ZipfSampler(fixtures.posts, parsed_args.zipf_exponent, rng),
+        forums=ZipfSampler(fixtures.forums, parsed_args.zipf_exponent, rng),
+        users=ZipfSampler(fixtures.users, parsed_args.zipf_exponent, rng),
+        rng=rng,
+    )
+    issuer: TokenIssuer = TokenIssuer.generate()
+
+    redis: Redis = Redis(
+        host=redis_endpoint.host, port=redis_endpoint.port, db=redis_endpoint.db
+    )
+    await _reset_cache(redis, issuer)
+    conn: AsyncConnection = await AsyncConnection.connect(
+        postgres.conninfo, autocommit=True
+    )
+    counts_statements: bool = await _enable_statement_statistics(conn)
+
+    port: int = find_free_port()
+    application_root: str = load_server_config()["core"]["APPLICATION_ROOT"]
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="tenjin-http-") as directory:
+        server: subprocess.Popen = _start_server(
+            Path(directory),
+            redis_endpoint,
+            postgres,
+            port,
+            parsed_args.server_workers,
+            parsed_args.page_size,
+            [
+                PostgresEndpoint.from_url(replica_url)
+                for replica_url in parsed_args.replica_url
+            ],
+        )
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}{application_root}",
+                limits=httpx.Limits(max_connections=parsed_args.concurrency),
+                timeout=parsed_args.timeout,
+            ) as client:
+                await _wait_until_ready(client, server)
+                for scenario in parsed_args.scenarios.split(","):
+                    builder: t_request_builder = SCENARIOS[scenario.strip()]
+                    for phase in PHASES:
+                        if phase == "cold":
+                            await _reset_cache(redis, issuer)
+                        redis_before: dict[str, int] = await _redis_command_counts(
+                            redis
+                        )
+                        statements_before: int = (
+                            await _statement_count(conn) if counts_statements else 0
+                        )
+
+                        elapsed, latencies, statuses = await _run_phase(
+                            client,
+                            builder,
+                            factory,
+                            issuer,
+                            parsed_args.requests,
+                            parsed_args.concurrency,
+                        )
+
+                        redis_after: dict[str, int] = await _redis_command_counts(redis)
+                        redis_calls: dict[str, int] = {
+                            command: calls - redis_before.get(command, 0)
+                            for command, calls in redis_after.items()
+                            if command not in HARNESS_COMMANDS
+                            and calls > redis_before.get(command, 0)
+                        }
+                        statements: int | None = (
+                            await _statement_count(conn) - statements_before
+                            if counts_statements
+                            else None
+                        )
+                        request_count: int = len(latencies)
+                        results.append(
+                            {
+                                "scenario": scenario,
+                                "phase": phase,
+                                "requests": request_count,
+                                "requests_per_second": request_count / elapsed,
+                                "latency": _summarize_latencies(latencies),
+                                "statuses": {
+                                    str(status): count
+                                    for status, count in sorted(statuses.items())
+                                },
+                                "redis_commands_per_request": (
+                                    sum(redis_calls.values()) / request_count
+                                ),
+                                "redis_commands": dict(sorted(redis_calls.items())),
+                                "sql_statements_per_request": (
+                                    statements / request_count
+                                    if statements is not None
+                                    else None
+                                ),
+                            }
+                        )
+        finally:
+            server.terminate()
+            server.wait()
+            await conn.close()
+            await redis.aclose()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "server_workers": parsed_args.server_workers,
+        "concurrency": parsed_args.concurrency,
+        "zipf_exponent": parsed_args.zipf_exponent,
+        "results": results,
+    }
+
+
+def get_argument_parser() -> ArgumentParser:
+    arg_parser: ArgumentParser = ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument(
+        "--scenarios",
+        help=f"Comma separated subset of: {', '.join(SCENARIOS)}",
+        default=",".join(SCENARIOS),
+    )
+    arg_parser.add_argument(
+        "--requests", help="Requests per scenario phase", type=int, default=5000
+    )
+    arg_parser.add_argument(
+        "--concurrency", help="Concurrent clients", type=int, default=64
+    )
+    arg_parser.add_argument(
+        "--server-workers", help="uvicorn worker processes", type=int, default=1
+    )
+    arg_parser.add_argument(
+        "--page-size", help="Rows per list endpoint page", type=int, default=None
+    )
+    arg_parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    arg_parser.add_argument("--users", type=int, default=Fixtures.users)
+    arg_parser.add_argument("--posts", type=int, default=Fixtures.posts)
+    arg_parser.add_argument("--forums", type=int, default=Fixtures.forums)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument(
+        "--timeout", help="Per request timeout in seconds", type=float, default=30
+    )
+    arg_parser.add_argument("--redis-url", help="Use an external Redis instance")
+    arg_parser.add_argument("--postgres-url", help="Use an external Postgres instance")
+    arg_parser.add_argument(
+        "--replica-url",
+        help="Streaming replica of the Postgres instance, repeatable",
+        action="append",
+        default=[],
+    )
+    arg_parser.add_argument("--output", help="JSON filepath for results")
+    return arg_parser
+
+
+def main(args: Sequence[str]) -> None:
+    parsed_args: Namespace = get_argument_parser().parse_args(args)
+    if unknown := set(parsed_args.scenarios.split(",")) - set(SCENARIOS):
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    with services(parsed_args.redis_url, parsed_args.postgres_url) as (
+        redis,
+        postgres,
+    ):
+        results: dict[str, Any] = asyncio.run(
+            run_benchmark(redis, postgres, parsed_args)
+        )
+
+    output: str = json.dumps(results, indent=2)
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,387 @@
+"""
+End-to-end throughput and latency of the event pipeline, from EventStreamer to
+Postgres.
+
+Synthetic events are emitted through the resource server's EventStreamer and
+consumed by the real resource_database_workers, run under the multi-process
+supervisor. Redis and Postgres are local throwaway instances unless their URLs are
+given, in which case both must be disposable: the benchmark drops and recreates
+the schema and flushes the Redis database.
+
+Reported per run:
+    events/s, from the first emit until every event is committed or dead-lettered
+    end-to-end latency percentiles, from stream entry ID to acknowledgement time
+    Redis commands and Postgres transactions/tuple writes per event
+
+Usage:
+    python benchmarks/pipeline.py --events 20000 --processes 2 --output pipeline.json
+"""
+
+from argparse import ArgumentParser, Namespace
+import asyncio
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Final, Sequence
+
+from psycopg import AsyncConnection
+from redis.asyncio import Redis
+
+from resource_auxillary.datastructures.database import EventLiteral
+from resource_auxillary.strings import EventName, StreamName
+
+from resource_server.config.sub_config import CacheConfig
+from resource_server.event_streamer import EventStreamer
+
+# Imported as a sibling script, like the other benchmarks
+sys.path.insert(0, str(Path(__file__).parent))
+from configs import load_server_config, write_worker_config  # noqa: E402
+from services import (  # noqa: E402
+    PostgresEndpoint,
+    RedisEndpoint,
+    find_free_port,
+    services,
+)
+from workloads import (  # noqa: E402
+    DEFAULT_MIX,
+    EVENT_STREAMS,
+    EventFactory,
+    Fixtures,
+    create_schema,
+    parse_mix,
+)
+
+DRAIN_POLL_INTERVAL: Final[float] = 0.25  # seconds
+STATS_FLUSH_DELAY: Final[float] = 1.5  # seconds, backends report statistics lazily
+PERCENTILES: Final[tuple[int, ...]] = (50, 90, 99)
+# Commands issued by the benchmark itself while measuring
+HARNESS_COMMANDS: Final[frozenset[str]] = frozenset(("info", "xlen"))
+
+
+def load_cache_config() -> CacheConfig:
+    return CacheConfig.model_validate(load_server_config()["cache"])
+
+
+def _serve_workers(streams: Sequence[StreamName], processes: int) -> None:
+    """
+    Run the worker supervisor over the given streams, until SIGTERM.
+
+    Worker modules resolve their config at import time, so they are only imported
+    here, in the child process whose environment points them at the benchmark
+    config.
+    """
+    from resource_auxillary.datastructures.status_indicator import StatusController
+
+    from resource_database_workers.config.worker_config import (
+        CounterWorkersConfig,
+        StreamWorkersConfig,
+    )
+    from resource_database_workers.datastructures.processors import (
+        EVENT_WORKER_MAPPING,
+    )
+    from resource_database_workers.datastructures.shards import plan_worker_shards
+    from resource_database_workers.datastructures.streams import STREAM_EVENT_MAPPING
+    from resource_database_workers.dependencies import get_config
+    from resource_database_workers.supervisor import supervise_shards
+
+    # Stream configs normally require every event of their stream, but events
+    # without a processor (reports) cannot be spawned, so validation is skipped
+    worker_configs = (
+        CounterWorkersConfig(WORKER_COUNT=1, RETRY_WORKER_COUNT=1),
+        *(
+            StreamWorkersConfig.model_construct(
+                STREAM=stream,
+                READER_COUNT=1,
+                EVENT_WORKER_COUNT_MAPPING={
+                    event_name: 1
+                    for event_name in STREAM_EVENT_MAPPING[stream]
+                    if event_name in EVENT_WORKER_MAPPING
+                },
+            )
+            for stream in streams
+        ),
+    )
+    app_config = get_config()
+    app_config.WORKER.run(
+        supervise_shards(
+            app_config,
+            plan_worker_shards(worker_configs, processes),
+            StatusController(),
+        )
+    )
+
+
+async def _redis_command_counts(redis: Redis) -> dict[str, int]:
+    command_stats: dict[str, dict[str, int]] = await redis.info("commandstats")
+    return {
+        name.removeprefix("cmdstat_"): stats["calls"]
+        for name, stats in command_stats.items()
+    }
+
+
+async def _postgres_activity(conn: AsyncConnection, database: str) -> dict[str, int]:
+    cursor = await conn.execute(
+        """
+        SELECT xact_commit + xact_rollback, tup_inserted, tup_updated, tup_deleted
+        FROM pg_stat_database WHERE datname = %s
+        """,
+        (database,),
+    )
+    transactions, inserted, updated, deleted = await cursor.fetchone()  # type: ignore
+    return {
+        "transactions": transactions,
+        "tuples_inserted": inserted,
+        "tuples_updated": updated,
+        "tuples_deleted": deleted,
+    }
+
+
+async def _emit_events(
+    streamer: EventStreamer,
+    factory: EventFactory,
+    event_count: int,
+    concurrency: int,
+    rate: float | None,
+) -> None:
+    remaining: int = event_count
+    interval: float = 1 / rate if rate else 0
+    next_emit: float = time.monotonic()
+
+    async def _emitter() -> None:
+        nonlocal remaining, next_emit
+        while remaining > 0:
+            remaining -= 1
+            if interval:
+                next_emit += interval
+                if (delay := next_emit - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+            await streamer.emit_user_event(*factory.build())
+
+    await asyncio.gather(*(_emitter() for _ in range(concurrency)))
+
+
+async def _count_processed(conn: AsyncConnection, redis: Redis) -> int:
+    cursor = await conn.execute(
+        f"SELECT count(*) FROM {EventLiteral.EVENTS_TABLE_NAME}"  # nosec
+    )
+    (committed,) = await cursor.fetchone()  # type: ignore
+    return committed + await redis.xlen(StreamName.DEAD_LETTER_QUEUE)
+
+
+async def _latency_percentiles(conn: AsyncConnection) -> dict[str, float]:
+    # Stream IDs start with the entry's creation time in milliseconds, and
+    # acknowledgement times are written by workers in local time
+    cursor = await conn.execute(f"""
+        SELECT
+            {EventLiteral.EVENT_ID_COLUMN_NAME},
+            {EventLiteral.EVENT_TIMESTAMP_COLUMN_NAME}
+        FROM {EventLiteral.EVENTS_TABLE_NAME}
+        """)  # nosec
+    latencies: list[float] = sorted(
+        acknowledgement_time.timestamp() * 1000 - int(event_id.partition("-")[0])
+        for event_id, acknowledgement_time in await cursor.fetchall()
+    )
+    if len(latencies) < 2:
+        return {}
+    cut_points: list[float] = statistics.quantiles(latencies, n=100)
+    return {
+        **{f"p{p}_ms": cut_points[p - 1] for p in PERCENTILES},
+        "max_ms": latencies[-1],
+    }
+
+
+async def run_benchmark(
+    redis_endpoint: RedisEndpoint,
+    postgres: PostgresEndpoint,
+    parsed_args: Namespace,
+) -> dict[str, Any]:
+    fixtures: Fixtures = Fixtures(
+        users=parsed_args.users, posts=parsed_args.posts, forums=parsed_args.forums
+    )
+    mix: dict[EventName, float] = (
+        parse_mix(parsed_args.mix) if parsed_args.mix else dict(DEFAULT_MIX)
+    )
+    factory: EventFactory = EventFactory(fixtures, mix, parsed_args.seed)
+    await asyncio.to_thread(create_schema, postgres.sqlalchemy_uri, fixtures)
+
+    redis: Redis = Redis(
+        host=redis_endpoint.host, port=redis_endpoint.port, db=redis_endpoint.db
+    )
+    await redis.flushdb()
+    streamer: EventStreamer = EventStreamer(redis, load_cache_config())
+    conn: AsyncConnection = await AsyncConnection.connect(
+        postgres.conninfo, autocommit=True
+    )
+
+    streams: tuple[StreamName, ...] = (
+        *sorted({EVENT_STREAMS[event_name] for event_name in mix}),
+        StreamName.DEAD_LETTER_QUEUE,
+    )
+    with tempfile.TemporaryDirectory(prefix="tenjin-bench-") as directory:
+        worker_config_filepath: Path = write_worker_config(
+            Path(directory), redis_endpoint, postgres, find_free_port()
+        )
+        workers: subprocess.Popen = subprocess.Popen(
+            (
+                sys.executable,
+                __file__,
+                "--serve-workers",
+                ",".join(streams),
+                "--processes",
+                str(parsed_args.processes),
+            ),
+            env=os.environ
+            | {
+                "WORKER_CONFIG_FILEPATH": str(worker_config_filepath),
+                "POSTGRES_USERNAME": postgres.username,
+                "POSTGRES_PASSWORD": postgres.password,
+            },
+        )
+        try:
+            # Let consumer groups and connection pools come up before measuring
+            await asyncio.sleep(parsed_args.warmup)
+            redis_before: dict[str, int] = await _redis_command_counts(redis)
+            postgres_before: dict[str, int] = await _postgres_activity(
+                conn, postgres.database
+            )
+
+            start: float = time.perf_counter()
+            await _emit_events(
+                streamer,
+                factory,
+                parsed_args.events,
+                parsed_args.concurrency,
+                parsed_args.rate,
+            )
+            emit_elapsed: float = time.perf_counter() - start
+
+            polls: int = 0
+            processed: int = 0
+            deadline: float = time.monotonic() + parsed_args.timeout
+            while time.monotonic() < deadline:
+                polls += 1
+                if (
+                    processed := await _count_processed(conn, redis)
+                ) >= parsed_args.events:
+                    break
+                await asyncio.sleep(DRAIN_POLL_INTERVAL)
+            elapsed: float = time.perf_counter() - start
+
+            await asyncio.sleep(STATS_FLUSH_DELAY)
+            redis_after: dict[str, int] = await _redis_command_counts(redis)
+            postgres_after: dict[str, int] = await _postgres_activity(
+                conn, postgres.database
+            )
+            dead_lettered: int = await redis.xlen(StreamName.DEAD_LETTER_QUEUE)
+            latencies: dict[str, float] = await _latency_percentiles(conn)
+        finally:
+            workers.send_signal(signal.SIGTERM)
+            try:
+                workers.wait(parsed_args.timeout)
+            except subprocess.TimeoutExpired:
+                workers.kill()
+            await conn.close()
+            await redis.aclose()
+
+    redis_calls: dict[str, int] = {
+        command: calls - redis_before.get(command, 0)
+        for command, calls in redis_after.items()
+        if command not in HARNESS_COMMANDS and calls > redis_before.get(command, 0)
+    }
+    postgres_writes: dict[str, int] = {
+        key: value - postgres_before[key] for key, value in postgres_after.items()
+    }
+    # Discount the harness's own autocommit transactions: drain polls and the
+    # first activity snapshot
+    postgres_writes["transactions"] -= polls + 1
+    events: int = parsed_args.events
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "events": events,
+        "processed": processed,
+        "dead_lettered": dead_lettered,
+        "drained": processed >= events,
+        "processes": parsed_args.processes,
+        "concurrency": parsed_args.concurrency,
+        "mix": mix,
+        "emit_events_per_second": events / emit_elapsed,
+        "events_per_second": processed / elapsed,
+        "latency": latencies,
+        "redis_commands_per_event": sum(redis_calls.values()) / events,
+        "redis_commands": dict(sorted(redis_calls.items())),
+        "postgres_per_event": {
+            key: value / events for key, value in postgres_writes.items()
+        },
+    }
+
+
+def get_argument_parser() -> ArgumentParser:
+    arg_parser: ArgumentParser = ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--events", type=int, default=20_000)
+    arg_parser.add_argument(
+        "--mix", help="Event weights, e.g. POST_VOTE=5,COMMENT_CREATE=2"
+    )
+    arg_parser.add_argument(
+        "--processes", help="Supervised worker processes", type=int, default=2
+    )
+    arg_parser.add_argument(
+        "--concurrency", help="Concurrent emitters", type=int, default=32
+    )
+    arg_parser.add_argument(
+        "--rate", help="Target emits per second, unbounded if omitted", type=float
+    )
+    arg_parser.add_argument("--users", type=int, default=Fixtures.users)
+    arg_parser.add_argument("--posts", type=int, default=Fixtures.posts)
+    arg_parser.add_argument("--forums", type=int, default=Fixtures.forums)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument(
+        "--warmup", help="Seconds to wait for workers", type=float, default=5
+    )
+    arg_parser.add_argument(
+        "--timeout",
+        help="Seconds to wait for the pipeline to drain",
+        type=float,
+        default=120,
+    )
+    arg_parser.add_argument("--redis-url", help="Use an external Redis instance")
+    arg_parser.add_argument("--postgres-url", help="Use an external Postgres instance")
+    arg_parser.add_argument("--output", help="JSON filepath for results")
+    # Internal: run the worker supervisor in this process
+    arg_parser.add_argument("--serve-workers", help="Comma separated stream names")
+    return arg_parser
+
+
+def main(args: Sequence[str]) -> None:
+    parsed_args: Namespace = get_argument_parser().parse_args(args)
+    if parsed_args.serve_workers:
+        _serve_workers(
+            tuple(StreamName(name) for name in parsed_args.serve_workers.split(",")),
+            parsed_args.processes,
+        )
+        return
+
+    with services(parsed_args.redis_url, parsed_args.postgres_url) as (
+        redis,
+        postgres,
+    ):
+        results: dict[str, Any] = asyncio.run(
+            run_benchmark(redis, postgres, parsed_args)
+        )
+
+    output: str = json.dumps(results, indent=2)
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,225 @@
+"""
+Database connection pool saturation under concurrent cache misses.
+
+Every cache miss on a post falls back to PostRepository.get_post, so lookups are
+issued through it directly, from more concurrent tasks than the pool holds
+connections. Engines are built by the resource server's engine factory, against a
+throwaway Postgres instance (or an external one, given by URL, which must be
+disposable).
+
+Reported per pool size and concurrency:
+    lookups/s and latency percentiles
+    mean pool checkout wait, and its share of lookup latency
+    pool checkout timeouts
+
+Usage:
+    python benchmarks/pool_saturation.py --pool-sizes 4,16 --concurrency 16,64,256
+    python benchmarks/pool_saturation.py --max-overflow 0 --pool-timeout 1
+"""
+
+from argparse import ArgumentParser, Namespace
+import asyncio
+from contextlib import ExitStack
+import json
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+from typing import Any, Final, Sequence
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from resource_server.config.sub_config import SQLAlchemyConfig
+from resource_server.database_engine import (
+    POOL_CHECKOUT_TIMEOUTS,
+    POOL_CHECKOUT_WAIT,
+    EngineRole,
+    create_database_engine,
+)
+from resource_server.repositories.posts import PostRepository
+
+# Imported as a sibling script, like the other benchmarks
+sys.path.insert(0, str(Path(__file__).parent))
+from configs import load_server_config  # noqa: E402
+from services import PostgresEndpoint, local_postgres  # noqa: E402
+from workloads import Fixtures, ZipfSampler, create_schema  # noqa: E402
+
+PERCENTILES: Final[tuple[int, ...]] = (50, 90, 99)
+
+
+def _summarize_latencies(latencies: Sequence[float]) -> dict[str, float]:
+    if len(latencies) < 2:
+        return {}
+    cut_points: list[float] = statistics.quantiles(latencies, n=100)
+    return {
+        **{f"p{p}_ms": cut_points[p - 1] for p in PERCENTILES},
+        "max_ms": max(latencies),
+    }
+
+
+async def _run_lookups(
+    post_repo: PostRepository,
+    posts: ZipfSampler,
+    lookup_count: int,
+    concurrency: int,
+) -> tuple[float, list[float]]:
+    remaining: int = lookup_count
+    latencies: list[float] = []
+
+    async def _client_loop() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start: float = time.perf_counter()
+            try:
+                await post_repo.get_post(posts.sample())
+            except PoolTimeoutError:
+                # Counted by the pool's own metrics
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start: float = time.perf_counter()
+    await asyncio.gather(*(_client_loop() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def run_benchmark(
+    postgres: PostgresEndpoint, parsed_args: Namespace
+) -> dict[str, Any]:
+    fixtures: Fixtures = Fixtures(
+        users=parsed_args.users, posts=parsed_args.posts, forums=parsed_args.forums
+    )
+    await asyncio.to_thread(create_schema, postgres.sqlalchemy_uri, fixtures)
+
+    base_config: SQLAlchemyConfig = SQLAlchemyConfig.model_validate(
+        load_server_config()["database"]["SQLALCHEMY"]
+    )
+    overrides: dict[str, int] = {
+        name: value
+        for name, value in (
+            ("SQLALCHEMY_MAX_OVERFLOW", parsed_args.max_overflow),
+            ("SQLALCHEMY_POOL_TIMEOUT", parsed_args.pool_timeout),
+        )
+        if value is not None
+    }
+    posts: ZipfSampler = ZipfSampler(
+        fixtures.posts, parsed_args.zipf_exponent, random.Random(parsed_args.seed)
+    )
+
+    results: list[dict[str, Any]] = []
+    post_repo: PostRepository | None = None
+    for pool_size in parsed_args.pool_sizes:
+        config: SQLAlchemyConfig = base_config.model_copy(
+            update=overrides | {"SQLALCHEMY_POOL_SIZE": pool_size}
+        )
+        for concurrency in parsed_args.concurrency:
+            # Every run gets fresh pool metrics, and starts with no open connections
+            # as a freshly started worker would
+            engine_name: str = f"pool_{pool_size}_concurrency_{concurrency}"
+            engine: AsyncEngine = create_database_engine(
+                config, postgres.sqlalchemy_uri, EngineRole.PRIMARY, engine_name
+            )
+            session_maker: async_sessionmaker[AsyncSession] = async_sessionmaker(
+                bind=engine, autoflush=False
+            )
+            # Repositories are singletons, so later runs swap their session maker
+            post_repo = post_repo or PostRepository(session_maker)
+            post_repo.session_maker = session_maker
+            try:
+                elapsed, latencies = await _run_lookups(
+                    post_repo, posts, parsed_args.lookups, concurrency
+                )
+            finally:
+                await engine.dispose()
+
+            checkouts, checkout_wait = POOL_CHECKOUT_WAIT.totals(engine_name)
+            lookup_count: int = len(latencies)
+            results.append(
+                {
+                    "pool_size": pool_size,
+                    "max_overflow": config.SQLALCHEMY_MAX_OVERFLOW,
+                    "concurrency": concurrency,
+                    "lookups": lookup_count,
+                    "lookups_per_second": lookup_count / elapsed,
+                    "latency": _summarize_latencies(latencies),
+                    "mean_checkout_wait_ms": (
+                        checkout_wait / checkouts * 1000 if checkouts else None
+                    ),
+                    "checkout_wait_share": (
+                        checkout_wait * 1000 / sum(latencies) if latencies else None
+                    ),
+                    "checkout_timeouts": int(POOL_CHECKOUT_TIMEOUTS.value(engine_name)),
+                }
+            )
+
+    return {
+        "pool_timeout": overrides.get(
+            "SQLALCHEMY_POOL_TIMEOUT", base_config.SQLALCHEMY_POOL_TIMEOUT
+        ),
+        "zipf_exponent": parsed_args.zipf_exponent,
+        "results": results,
+    }
+
+
+def _parse_sizes(spec: str) -> list[int]:
+    return [int(size) for size in spec.split(",")]
+
+
+def get_argument_parser() -> ArgumentParser:
+    arg_parser: ArgumentParser = ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument(
+        "--pool-sizes",
+        help="Comma separated pool sizes",
+        type=_parse_sizes,
+        default=[4, 16],
+    )
+    arg_parser.add_argument(
+        "--concurrency",
+        help="Comma separated numbers of concurrent cache misses",
+        type=_parse_sizes,
+        default=[16, 64, 256],
+    )
+    arg_parser.add_argument(
+        "--lookups",
+        help="Lookups per pool size and concurrency",
+        type=int,
+        default=5000,
+    )
+    arg_parser.add_argument(
+        "--max-overflow", help="Override the configured overflow", type=int
+    )
+    arg_parser.add_argument(
+        "--pool-timeout", help="Override the configured timeout (seconds)", type=int
+    )
+    arg_parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    arg_parser.add_argument("--users", type=int, default=Fixtures.users)
+    arg_parser.add_argument("--posts", type=int, default=Fixtures.posts)
+    arg_parser.add_argument("--forums", type=int, default=Fixtures.forums)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--postgres-url", help="Use an external Postgres instance")
+    arg_parser.add_argument("--output", help="JSON filepath for results")
+    return arg_parser
+
+
+def main(args: Sequence[str]) -> None:
+    parsed_args: Namespace = get_argument_parser().parse_args(args)
+
+    with ExitStack() as stack:
+        postgres: PostgresEndpoint = (
+            PostgresEndpoint.from_url(parsed_args.postgres_url)
+            if parsed_args.postgres_url
+            else stack.enter_context(local_postgres())
+        )
+        results: dict[str, Any] = asyncio.run(run_benchmark(postgres, parsed_args))
+
+    output: str = json.dumps(results, indent=2)
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,231 @@
+"""
+Disposable Redis and Postgres instances for benchmarks.
+
+Both are started as local subprocesses from binaries on PATH (redis-server, initdb,
+pg_ctl), with durability turned off since benchmark data is thrown away. Externally
+managed instances, such as testcontainers fixtures, are used instead when their
+URLs are given.
+"""
+
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from typing import Final, Generator, Self
+from urllib.parse import urlsplit
+
+BENCHMARK_DATABASE: Final[str] = "tenjin_benchmark"
+BENCHMARK_USER: Final[str] = "tenjin"
+STARTUP_TIMEOUT: Final[float] = 30  # seconds
+
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _require_binary(name: str) -> str:
+    if not (path := shutil.which(name)):
+        raise FileNotFoundError(
+            f"{name} not found on PATH, pass an external URL for this service instead"
+        )
+    return path
+
+
+def _wait_for_port(host: str, port: int) -> None:
+    deadline: float = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Nothing listening on {host}:{port} after {STARTUP_TIMEOUT}s")
+
+
+@dataclass(slots=True, frozen=True)
+class RedisEndpoint:
+    host: str
+    port: int
+    db: int = 0
+
+    @classmethod
+    def from_url(cls, url: str) -> Self:
+        parts = urlsplit(url)
+        return cls(
+            host=parts.hostname or "127.0.0.1",
+            port=parts.port or 6379,
+            db=int(parts.path.lstrip("/") or 0),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PostgresEndpoint:
+    host: str
+    port: int
+    username: str
+    password: str
+    database: str
+
+    @classmethod
+    def from_url(cls, url: str) -> Self:
+        parts = urlsplit(url)
+        return cls(
+            host=parts.hostname or "127.0.0.1",
+            port=parts.port or 5432,
+            username=parts.username or BENCHMARK_USER,
+            password=parts.password or "",
+            database=parts.path.lstrip("/") or BENCHMARK_DATABASE,
+        )
+
+    @property
+    def conninfo(self) -> str:
+        return "postgresql://{}:{}@{}:{}/{}".format(
+            self.username, self.password, self.host, self.port, self.database
+        )
+
+    @property
+    def sqlalchemy_uri(self) -> str:
+        return "postgresql+psycopg://{}:{}@{}:{}/{}".format(
+            self.username, self.password, self.host, self.port, self.database
+        )
+
+
+@contextmanager
+def local_redis() -> Generator[RedisEndpoint, None, None]:
+    port: int = find_free_port()
+    process: subprocess.Popen = subprocess.Popen(
+        (
+            _require_binary("redis-server"),
+            "--port",
+            str(port),
+            "--bind",
+            "127.0.0.1",
+            "--save",
+            "",
+            "--appendonly",
+            "no",
+        ),
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port("127.0.0.1", port)
+        yield RedisEndpoint("127.0.0.1", port)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _statement_statistics_options() -> tuple[str, ...]:
+    """
+    Preload pg_stat_statements when the contrib module is installed, so that SQL
+    statements can be counted per request
+    """
+    if not (pg_config := shutil.which("pg_config")):
+        return ()
+    library_directory: str = subprocess.run(
+        (pg_config, "--pkglibdir"), capture_output=True, check=True, text=True
+    ).stdout.strip()
+    if not any(Path(library_directory).glob("pg_stat_statements.*")):
+        return ()
+    return (
+        "-c shared_preload_libraries=pg_stat_statements",
+        "-c pg_stat_statements.track=all",
+    )
+
+
+@contextmanager
+def local_postgres() -> Generator[PostgresEndpoint, None, None]:
+    port: int = find_free_port()
+    with tempfile.TemporaryDirectory(prefix="tenjin-pg-") as data_directory:
+        subprocess.run(
+            (
+                _require_binary("initdb"),
+                "--pgdata",
+                data_directory,
+                "--username",
+                BENCHMARK_USER,
+                "--auth",
+                "trust",
+            ),
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        pg_ctl: str = _require_binary("pg_ctl")
+        subprocess.run(
+            (
+                pg_ctl,
+                "start",
+                "--pgdata",
+                data_directory,
+                "--wait",
+                "--log",
+                str(Path(data_directory) / "postgres.log"),
+                "-o",
+                " ".join(
+                    (
+                        f"-p {port}",
+                        "-c listen_addresses=127.0.0.1",
+                        f"-c unix_socket_directories={data_directory}",
+                        # Durability is irrelevant for throwaway benchmark data
+                        "-c fsync=off",
+                        "-c synchronous_commit=off",
+                        "-c full_page_writes=off",
+                        "-c max_connections=500",
+                        *_statement_statistics_options(),
+                    )
+                ),
+            ),
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            subprocess.run(
+                (
+                    _require_binary("createdb"),
+                    "--host",
+                    "127.0.0.1",
+                    "--port",
+                    str(port),
+                    "--username",
+                    BENCHMARK_USER,
+                    BENCHMARK_DATABASE,
+                ),
+                check=True,
+            )
+            yield PostgresEndpoint(
+                "127.0.0.1", port, BENCHMARK_USER, "", BENCHMARK_DATABASE
+            )
+        finally:
+            subprocess.run(
+                (pg_ctl, "stop", "--pgdata", data_directory, "--mode", "fast"),
+                check=False,
+                stdout=subprocess.DEVNULL,
+            )
+
+
+@contextmanager
+def services(
+    redis_url: str | None = None, postgres_url: str | None = None
+) -> Generator[tuple[RedisEndpoint, PostgresEndpoint], None, None]:
+    """
+    Yield Redis and Postgres endpoints, starting local instances for any service
+    without an external URL
+    """
+    with ExitStack() as stack:
+        redis: RedisEndpoint = (
+            RedisEndpoint.from_url(redis_url)
+            if redis_url
+            else stack.enter_context(local_redis())
+        )
+        postgres: PostgresEndpoint = (
+            PostgresEndpoint.from_url(postgres_url)
+            if postgres_url
+            else stack.enter_context(local_postgres())
+        )
+        yield redis, postgres
@@ -0,0 +1,328 @@
+"""
+Schema, fixtures and synthetic event mixes for the pipeline benchmark.
+
+Events mirror what the resource server's routes emit, side-effects included, so
+that Redis sees the same counter and intent traffic per event as in production.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import accumulate
+import random
+from typing import Callable, Final, Mapping
+from uuid import uuid4
+
+from sqlalchemy import Engine, create_engine, text
+
+from resource_auxillary.cache import (
+    create_intent_flag,
+    derive_cache_key,
+    derive_hashmap_name,
+)
+from resource_auxillary.datastructures.database import EventLiteral, StrongEntity
+from resource_auxillary.events import (
+    CounterUpdate,
+    Event,
+    EventSideEffects,
+    IntentUpdate,
+)
+from resource_auxillary.strings import Action, EventName, IntentFlag, StreamName
+
+from resource_server.models.database import Base
+
+DEFAULT_MIX: Final[Mapping[EventName, float]] = {
+    EventName.POST_VOTE: 0.5,
+    EventName.COMMENT_CREATE: 0.2,
+    EventName.POST_CREATE: 0.1,
+    EventName.FORUM_SUB: 0.1,
+    EventName.ANIME_SUB: 0.1,
+}
+
+# Streams each supported event is emitted to by the resource server
+EVENT_STREAMS: Final[Mapping[EventName, StreamName]] = {
+    EventName.POST_VOTE: StreamName.POSTS,
+    EventName.POST_CREATE: StreamName.POSTS,
+    EventName.COMMENT_CREATE: StreamName.COMMENTS,
+    EventName.FORUM_SUB: StreamName.FORUMS,
+    EventName.ANIME_SUB: StreamName.ANIMES,
+}
+
+_SEED_STATEMENTS: Final[tuple[str, ...]] = (
+    """
+    INSERT INTO users (username, email, pw_hash)
+    SELECT 'bench_user_' || g, 'bench_user_' || g || '@example.com', '\\x00'
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO animes (title, synopsis)
+    SELECT 'bench_anime_' || g, 'Synthetic anime ' || g
+    FROM generate_series(1, :animes) AS g
+    """,
+    """
+    INSERT INTO forums (name_, parent_anime, created_at)
+    SELECT 'bench_forum_' || g, 1 + (g - 1) % :animes, CURRENT_TIMESTAMP
+    FROM generate_series(1, :forums) AS g
+    """,
+    """
+    INSERT INTO posts (author_id, parent_forum, title, body_text)
+    SELECT 1 + (g - 1) % :users, 1 + (g - 1) % :forums, 'post_' || g, 'Synthetic post'
+    FROM generate_series(1, :posts) AS g
+    """,
+)
+
+_EVENT_PARTITION_STATEMENT: Final[str] = f"""
+    CREATE TABLE {EventLiteral.EVENTS_TABLE_NAME}_benchmark
+    PARTITION OF {EventLiteral.EVENTS_TABLE_NAME}
+    FOR VALUES FROM (MINVALUE) TO (MAXVALUE)
+    """
+
+
+# Not slotted, so that defaults stay readable as class attributes for CLI defaults
+@dataclass(frozen=True)
+class Fixtures:
+    """
+    Row counts seeded per entity. IDs are dense, starting at 1
+    """
+
+    users: int = 1000
+    animes: int = 50
+    forums: int = 100
+    posts: int = 1000
+
+
+def create_schema(sqlalchemy_uri: str, fixtures: Fixtures) -> None:
+    engine: Engine = create_engine(sqlalchemy_uri)
+    try:
+        Base.metadata.drop_all(engine)
+        with engine.begin() as conn:
+            # Enabled by migrations in deployments, trigram indexes depend on it
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            # The partitioned event dedup table takes no rows until it has a
+            # partition, and benchmark runs are shorter than any partition span
+            conn.execute(text(_EVENT_PARTITION_STATEMENT))
+            for statement in _SEED_STATEMENTS:
+                conn.execute(
+                    text(statement),
+                    {
+                        "users": fixtures.users,
+                        "animes": fixtures.animes,
+                        "forums": fixtures.forums,
+                        "posts": fixtures.posts,
+                    },
+                )
+    finally:
+        engine.dispose()
+
+
+@dataclass(slots=True)
+class ZipfSampler:
+    """
+    Draw IDs in [1, size] with P(k) proportional to 1 / k**exponent, so that low IDs
+    are hot keys
+    """
+
+    size: int
+    exponent: float = 1.1
+    rng: random.Random = field(default_factory=random.Random)
+    _cumulative_weights: list[float] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.size < 1:
+            raise ValueError("Zipf sampler needs at least one key")
+        self._cumulative_weights = list(
+            accumulate(1 / k**self.exponent for k in range(1, self.size + 1))
+        )
+
+    def sample(self) -> int:
+        return 1 + bisect_left(
+            self._cumulative_weights, self.rng.random() * self._cumulative_weights[-1]
+        )
+
+
+def _counter_update(
+    entity: StrongEntity, group: str, field_name: str, identifier: int, delta: int = 1
+) -> CounterUpdate:
+    return CounterUpdate(
+        counter_group=derive_hashmap_name(entity, group),
+        cache_key=derive_cache_key(entity, identifier),
+        field_name=field_name,
+        delta=delta,
+    )
+
+
+def _pending_intent(
+    entity: StrongEntity, action: Action, user_id: int, target: int
+) -> IntentUpdate:
+    return IntentUpdate(
+        intent_name=create_intent_flag(entity, action, str(user_id), str(target)),
+        intent_flag=IntentFlag.RESOURCE_CREATION_PENDING_FLAG,
+        intent_id=uuid4().hex,
+    )
+
+
+@dataclass(slots=True)
+class EventFactory:
+    """
+    Build events in the shape each route emits them.
+
+    Association events (votes, subscriptions) walk (user, target) pairs in order,
+    so no pair repeats until every pair has been used once.
+    """
+
+    fixtures: Fixtures
+    mix: Mapping[EventName, float] = field(default_factory=lambda: DEFAULT_MIX)
+    seed: int = 0
+    _rng: random.Random = field(init=False)
+    _sequences: dict[EventName, int] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if unsupported := set(self.mix) - set(EVENT_STREAMS):
+            raise ValueError(f"Unsupported events in mix: {', '.join(unsupported)}")
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _builders(
+        self,
+    ) -> Mapping[EventName, Callable[[int], tuple[StreamName, Event]]]:
+        return {
+            EventName.POST_VOTE: self._post_vote,
+            EventName.POST_CREATE: self._post_create,
+            EventName.COMMENT_CREATE: self._comment_create,
+            EventName.FORUM_SUB: self._forum_sub,
+            EventName.ANIME_SUB: self._anime_sub,
+        }
+
+    def _pair(self, sequence: int, targets: int) -> tuple[int, int]:
+        sequence %= self.fixtures.users * targets
+        return 1 + sequence % self.fixtures.users, 1 + sequence // self.fixtures.users
+
+    def _post_vote(self, sequence: int) -> tuple[StreamName, Event]:
+        user_id, post_id = self._pair(sequence, self.fixtures.posts)
+        vote: int = self._rng.choice((1, -1))
+        # Seeded posts are authored round-robin across users
+        author_id: int = 1 + (post_id - 1) % self.fixtures.users
+        return StreamName.POSTS, Event(
+            name=EventName.POST_VOTE,
+            payload={"user_id": user_id, "post_id": post_id, "vote": vote},
+            side_effects=EventSideEffects(
+                counter_updates=(
+                    _counter_update(StrongEntity.POST, "score", "score", post_id, vote),
+                    _counter_update(StrongEntity.USER, "aura", "aura", author_id, vote),
+                ),
+                intent_updates=(
+                    _pending_intent(StrongEntity.POST, Action.VOTE, user_id, post_id),
+                ),
+            ),  # type: ignore[reportCallIssue]
+        )
+
+    def _post_create(self, sequence: int) -> tuple[StreamName, Event]:
+        author_id: int = self._rng.randint(1, self.fixtures.users)
+        forum_id: int = self._rng.randint(1, self.fixtures.forums)
+        return StreamName.POSTS, Event(
+            name=EventName.POST_CREATE,
+            payload={
+                "author_id": author_id,
+                "forum_id": forum_id,
+                "title": f"bench_{sequence}"[:16],
+                "body_text": "Synthetic post",
+                "time_posted": datetime.now().isoformat(),
+            },
+            side_effects=EventSideEffects(
+                counter_updates=(
+                    _counter_update(StrongEntity.FORUM, "posts", "posts", forum_id),
+                    _counter_update(
+                        StrongEntity.USER, "total_posts", "total_posts", author_id
+                    ),
+                )
+            ),  # type: ignore[reportCallIssue]
+        )
+
+    def _comment_create(self, sequence: int) -> tuple[StreamName, Event]:
+        author_id: int = self._rng.randint(1, self.fixtures.users)
+        post_id: int = self._rng.randint(1, self.fixtures.posts)
+        return StreamName.COMMENTS, Event(
+            name=EventName.COMMENT_CREATE,
+            payload={
+                "author_id": author_id,
+                "parent_forum": 1 + (post_id - 1) % self.fixtures.forums,
+                "parent_post": post_id,
+                "body": f"Synthetic comment {sequence}",
+                "time_created": datetime.now(),
+            },
+            side_effects=EventSideEffects(
+                counter_updates=(
+                    _counter_update(
+                        StrongEntity.POST, "total_comments", "total_comments", post_id
+                    ),
+                    _counter_update(
+                        StrongEntity.USER, "total_comments", "total_comments", author_id
+                    ),
+                )
+            ),  # type: ignore[reportCallIssue]
+        )
+
+    def _forum_sub(self, sequence: int) -> tuple[StreamName, Event]:
+        user_id, forum_id = self._pair(sequence, self.fixtures.forums)
+        return StreamName.FORUMS, Event(
+            name=EventName.FORUM_SUB,
+            payload={
+                "user_id": user_id,
+                "forum_id": forum_id,
+                "time_subscribed": datetime.now(),
+            },
+            side_effects=EventSideEffects(
+                counter_updates=(
+                    _counter_update(
+                        StrongEntity.FORUM, "subscriptions", "subscribers", forum_id
+                    ),
+                ),
+                intent_updates=(
+                    _pending_intent(StrongEntity.FORUM, Action.SUB, user_id, forum_id),
+                ),
+            ),  # type: ignore[reportCallIssue]
+        )
+
+    def _anime_sub(self, sequence: int) -> tuple[StreamName, Event]:
+        user_id, anime_id = self._pair(sequence, self.fixtures.animes)
+        return StreamName.ANIMES, Event(
+            name=EventName.ANIME_SUB,
+            payload={
+                "user_id": user_id,
+                "anime_id": anime_id,
+                "time_subscribed": datetime.now(),
+            },
+            side_effects=EventSideEffects(
+                counter_updates=(
+                    _counter_update(
+                        StrongEntity.ANIME, "subscriptions", "subscribers", anime_id
+                    ),
+                ),
+                intent_updates=(
+                    _pending_intent(StrongEntity.ANIME, Action.SUB, user_id, anime_id),
+                ),
+            ),  # type: ignore[reportCallIssue]
+        )
+
+    def build(self) -> tuple[StreamName, Event]:
+        event_name: EventName = self._rng.choices(
+            tuple(self.mix), weights=tuple(self.mix.values())
+        )[0]
+        sequence: int = self._sequences.get(event_name, 0)
+        self._sequences[event_name] = sequence + 1
+        return self._builders[event_name](sequence)
+
+
+def parse_mix(spec: str) -> dict[EventName, float]:
+    """
+    Parse a mix such as `POST_VOTE=5,COMMENT_CREATE=2` into event weights
+    """
+    mix: dict[EventName, float] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        event_name, _, weight = entry.partition("=")
+        mix[EventName(event_name.strip().upper())] = float(weight)
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise ValueError(f"Invalid event mix: {spec}")
+    return mix
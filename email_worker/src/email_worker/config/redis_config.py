@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Annotated, ClassVar
 
+from auxillary.mixins.redis_config import RedisConnectionPoolConfigMixin
 from pydantic import Field
 from pydantic_settings import (
     BaseSettings,
@@ -10,7 +11,7 @@ from pydantic_settings import (
 )
 
 
-class RedisConfig(BaseSettings):
+class RedisConfig(RedisConnectionPoolConfigMixin, BaseSettings):
     config_filepath: ClassVar[Path] = Path(__file__).parent / "redis_config.toml"
     model_config = SettingsConfigDict(toml_file=str(config_filepath))
 
@@ -6,7 +6,7 @@ from aiosmtplib import SMTP
 from ssl import create_default_context, Purpose
 
 from psycopg_pool import AsyncConnectionPool
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from email_worker.config.email_config import EmailConfig
 from email_worker.config.redis_config import RedisConfig
@@ -35,10 +35,13 @@ def get_database_config() -> DatabaseConfig:
 def get_redis_client() -> Redis:
     redis_config: RedisConfig = get_redis_config()
     return Redis(
-        host=redis_config.HOSTNAME,
-        port=redis_config.PORT,
-        db=redis_config.DB,
-        decode_responses=redis_config.DECODE_RESPONSES,
+        connection_pool=BlockingConnectionPool(
+            host=redis_config.HOSTNAME,
+            port=redis_config.PORT,
+            db=redis_config.DB,
+            decode_responses=redis_config.DECODE_RESPONSES,
+            **redis_config.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
@@ -49,7 +49,9 @@ async def email_dispatcher(
         async with connection_pool.connection() as connection:
             # Event Deduplication
             fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
-                connection, (e.event_id for e in batch)
+                connection,
+                (e.event_id for e in batch),
+                email_config.WORKER.DEDUP_WINDOW,
             )
             await trim_duplicate_events(
                 redis, batch, fresh_event_ids, stream_name, group_name
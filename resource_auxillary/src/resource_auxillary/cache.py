@@ -6,6 +6,17 @@ from resource_auxillary.strings import NAME_SEPERATOR, Action
 
 type t_cache_casting_map = MappingProxyType[type, Callable[[Any], Any]]
 
+USER_STATE_PREFIX: Final[LiteralString] = "user_state"
+USER_STATE_ACTIONS: Final[MappingProxyType[str, Action]] = MappingProxyType(
+    {
+        Action.VOTE: Action.VOTE,
+        Action.UNVOTE: Action.VOTE,
+        Action.SAVE: Action.SAVE,
+        Action.SUB: Action.SUB,
+        Action.UNSUB: Action.SUB,
+    }
+)
+
 NF_SENTINEL_KEY: Final[LiteralString] = "__NF__"
 NF_SENTINEL_VALUE: Final[LiteralString] = "NF"
 NF_MAPPING: Final[dict[LiteralString, LiteralString]] = {
@@ -32,6 +43,26 @@ def create_intent_flag(
     return NAME_SEPERATOR.join((entity, action, user_identifier, resource_identifier))
 
 
+def parse_intent_flag(intent_name: str) -> tuple[str, str, str, str]:
+    """
+    Split an intent flag into (entity, action, user identifier, resource identifier)
+    """
+    entity, action, user_identifier, resource_identifier = intent_name.rsplit(
+        NAME_SEPERATOR, 3
+    )
+    return entity, action, user_identifier, resource_identifier
+
+
+def derive_user_state_key(entity: str, action: str, user_identifier: str) -> str:
+    """
+    Hash of a user's latest intent flag per resource, for actions whose state is shown
+    to users. Undoing actions share the state of the action they undo
+    """
+    return NAME_SEPERATOR.join(
+        (USER_STATE_PREFIX, entity, USER_STATE_ACTIONS[action], user_identifier)
+    )
+
+
 def derive_cache_key(resource_name: str, identifier: str | int) -> str:
     return NAME_SEPERATOR.join((resource_name, str(identifier)))
 
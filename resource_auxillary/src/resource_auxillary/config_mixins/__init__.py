@@ -2,11 +2,15 @@
 
 from .worker_queues import WorkerInternalQueueMixin
 from .worker_consumer import WorkerStreamReaderMixin
+from .worker_copy import WorkerCopyMixin
+from .worker_metrics import WorkerMetricsMixin
 from .worker_qos import WorkerDLQMixin, WorkerReclaimMixin, WorkerRetryMixin
 
 __all__ = (
     "WorkerInternalQueueMixin",
     "WorkerStreamReaderMixin",
+    "WorkerCopyMixin",
+    "WorkerMetricsMixin",
     "WorkerDLQMixin",
     "WorkerReclaimMixin",
     "WorkerRetryMixin",
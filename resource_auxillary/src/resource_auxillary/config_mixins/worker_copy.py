@@ -0,0 +1,16 @@
+from typing import Annotated
+
+from pydantic import Field
+
+from resource_auxillary.datastructures.database import CopyFormat
+from resource_auxillary.strings import StreamName
+
+
+class WorkerCopyMixin:
+    DEFAULT_COPY_FORMAT: Annotated[CopyFormat, Field(default=CopyFormat.BINARY)]
+    STREAM_COPY_FORMATS: Annotated[
+        dict[StreamName, CopyFormat], Field(default_factory=dict)
+    ]
+
+    def resolve_copy_format(self, stream_name: StreamName) -> CopyFormat:
+        return self.STREAM_COPY_FORMATS.get(stream_name, self.DEFAULT_COPY_FORMAT)
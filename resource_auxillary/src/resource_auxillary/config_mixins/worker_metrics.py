@@ -0,0 +1,10 @@
+from typing import Annotated
+
+from pydantic import Field
+
+
+class WorkerMetricsMixin:
+    METRICS_HOST: Annotated[str, Field(default="0.0.0.0")]  # nosec
+    # 0 disables the exposition endpoint. Supervised shards
+    # serve on METRICS_PORT + their shard index
+    METRICS_PORT: Annotated[int, Field(default=0, ge=0, le=65_535)]
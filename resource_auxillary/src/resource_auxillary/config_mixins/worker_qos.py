@@ -7,8 +7,8 @@ from resource_auxillary.strings import StreamName
 
 
 class WorkerRetryMixin:
-    MAXIMUM_BACKOFF_INTERVAL: Annotated[int, Field(ge=0)]
-    BASE_BACKOFF_INTERVAL: Annotated[int, Field(ge=0)]
+    MAXIMUM_BACKOFF_INTERVAL: Annotated[float, Field(ge=0)]
+    BASE_BACKOFF_INTERVAL: Annotated[float, Field(ge=0)]
     BACKOFF_EXPONENTIAL: Annotated[int, Field(ge=1)]
 
     @model_validator(mode="after")
@@ -30,6 +30,8 @@ class WorkerReclaimMixin:
     RECLAIM_THRESHOLD: Annotated[int, Field(ge=1)]
     RECLAIMATION_CHECK_INTERVAL: Annotated[int, Field(ge=1)]
     MAX_DELIVERIES: Annotated[int, Field(ge=1)]
+    # Seconds for which processed events are remembered, and redeliveries dropped
+    DEDUP_WINDOW: Annotated[int, Field(ge=1)]
 
     @model_validator(mode="after")
     def validate_reclamation_interval(self) -> Self:
@@ -45,6 +47,22 @@ class WorkerReclaimMixin:
             )
         return self
 
+    @model_validator(mode="after")
+    def validate_dedup_window(self) -> Self:
+        # Every delivery of a pending entry may be reclaimed after the threshold
+        redelivery_window: int = self.RECLAIM_THRESHOLD * self.MAX_DELIVERIES
+        if self.DEDUP_WINDOW * 1000 < redelivery_window:
+            raise ValueError(
+                " ".join(
+                    (
+                        f"Dedup window {self.DEDUP_WINDOW}s",
+                        "cannot be shorter than the redelivery window",
+                        f"{redelivery_window}ms",
+                    )
+                )
+            )
+        return self
+
 
 class WorkerDLQMixin:
     MAX_RETRIES: Annotated[int, Field(ge=0)]
@@ -11,6 +11,13 @@ class SideEffectType(StrEnum):
     COUNTER_UPDATE = "COUNTER_UPDATE"
 
 
+class CopyFormat(StrEnum):
+    """Wire formats supported for COPY FROM STDIN"""
+
+    TEXT = "text"
+    BINARY = "binary"
+
+
 class EventLiteral(StrEnum):
     """Table and column names for event table"""
 
@@ -45,8 +45,8 @@ ASSOCIATION_DB_METADATA: Final[t_event_db_metadata_mapping] = MappingProxyType(
         EventName.COMMENT_VOTE: ("comment_votes", user_comment_pk),
         EventName.COMMENT_UNVOTE: ("comment_votes", user_comment_pk),
         EventName.COMMENT_REPORT: ("comment_reportss", user_comment_pk),
-        EventName.FORUM_SUB: ("forum_subscriptions", user_comment_pk),
-        EventName.FORUM_UNSUB: ("forum_subscriptions", user_comment_pk),
+        EventName.FORUM_SUB: ("forum_subscriptions", user_forum_pk),
+        EventName.FORUM_UNSUB: ("forum_subscriptions", user_forum_pk),
         EventName.ANIME_SUB: ("anime_subscriptions", user_anime_pk),
         EventName.ANIME_UNSUB: ("anime_subscriptions", user_anime_pk),
     }
@@ -0,0 +1,125 @@
+"""COPY protocol helpers for staging event payloads in bulk"""
+
+from typing import Any, Final, Sequence
+
+from psycopg import AsyncConnection, AsyncCursor, pq
+from psycopg.errors import DataError, ProgrammingError
+
+from resource_auxillary.datastructures.database import CopyFormat
+from resource_auxillary.templates.sql import (
+    prepare_column_types_sql,
+    prepare_weak_insertion_copy_sql,
+)
+
+type t_relation_signature = tuple[str, tuple[str, ...]]
+
+# Column type OIDs only change with a schema migration, which restarts workers
+_COLUMN_TYPES_CACHE: Final[dict[t_relation_signature, tuple[int, ...]]] = {}
+
+# Dumpers are registered per type OID for the life of the process, so a relation
+# with a column that has no binary dumper is remembered instead of checked per batch
+_BINARY_INCOMPATIBLE_RELATIONS: Final[set[t_relation_signature]] = set()
+
+# Binary dumpers are picked by column type rather than by value, so a value of
+# another type fails in the dumper or is rejected by the server
+_BINARY_COPY_ERRORS: Final = (DataError, TypeError, ValueError, OverflowError)
+
+
+async def resolve_column_types(
+    conn: AsyncConnection, table: str, columns: Sequence[str]
+) -> tuple[int, ...]:
+    """
+    Fetch (and memoize) the type OIDs of the given columns of a relation,
+    in the same order as the given columns
+    """
+    signature: t_relation_signature = (table, tuple(columns))
+    if (column_types := _COLUMN_TYPES_CACHE.get(signature)) is not None:
+        return column_types
+
+    async with conn.cursor() as cursor:
+        await cursor.execute(prepare_column_types_sql(table, columns))
+        type_mapping: dict[str, int] = {
+            column: type_oid for column, type_oid in await cursor.fetchall()
+        }
+
+    if missing_columns := set(columns) - type_mapping.keys():
+        raise ValueError(
+            f"Columns {', '.join(missing_columns)} not found in relation {table}"
+        )
+
+    column_types = tuple(type_mapping[column] for column in columns)
+    _COLUMN_TYPES_CACHE[signature] = column_types
+    return column_types
+
+
+def _has_binary_dumpers(cursor: AsyncCursor, column_types: Sequence[int]) -> bool:
+    try:
+        for type_oid in column_types:
+            cursor.adapters.get_dumper_by_oid(type_oid, pq.Format.BINARY)
+    except ProgrammingError:
+        return False
+    return True
+
+
+async def _copy_rows_in_format(
+    cursor: AsyncCursor,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    copy_format: CopyFormat,
+    column_types: Sequence[int] | None = None,
+) -> None:
+    async with cursor.copy(
+        prepare_weak_insertion_copy_sql(table, *columns, copy_format=copy_format)
+    ) as copy:
+        if column_types:
+            copy.set_types(column_types)
+        for row in rows:
+            await copy.write_row(row)
+
+
+async def copy_rows(
+    cursor: AsyncCursor,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    copy_format: CopyFormat = CopyFormat.BINARY,
+    *,
+    type_reference: str | None = None,
+) -> CopyFormat:
+    """
+    COPY rows into a relation, in the binary wire format unless a column's type has
+    no binary dumper, in which case the relation is copied as text from then on.
+    A batch holding values that cannot be written in binary for their column is
+    copied again as text, within a savepoint, and fails only if the text format
+    rejects them too.
+
+    Args:
+        type_reference: Relation to derive column types from, for staging tables
+        created with `LIKE <reference>`. Defaults to the target table itself.
+
+    Returns:
+        The COPY format that was eventually used
+    """
+    signature: t_relation_signature = (type_reference or table, tuple(columns))
+    if (
+        copy_format == CopyFormat.BINARY
+        and signature not in _BINARY_INCOMPATIBLE_RELATIONS
+    ):
+        column_types: tuple[int, ...] = await resolve_column_types(
+            cursor.connection, *signature
+        )
+        if not _has_binary_dumpers(cursor, column_types):
+            _BINARY_INCOMPATIBLE_RELATIONS.add(signature)
+        else:
+            try:
+                async with cursor.connection.transaction():
+                    await _copy_rows_in_format(
+                        cursor, table, columns, rows, CopyFormat.BINARY, column_types
+                    )
+                return CopyFormat.BINARY
+            except _BINARY_COPY_ERRORS:
+                pass
+
+    await _copy_rows_in_format(cursor, table, columns, rows, CopyFormat.TEXT)
+    return CopyFormat.TEXT
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Callable, Coroutine, Iterable
 from uuid import uuid4
 
@@ -7,12 +7,15 @@ from psycopg.errors import IntegrityError
 
 from resource_auxillary.constants import POTENTIAL_TRANSIENT_ERRORS
 from resource_auxillary.coordination import exponential_jittered_backoff
-from resource_auxillary.datastructures.database import EventLiteral
+from resource_auxillary.datastructures.database import CopyFormat, EventLiteral
+from resource_auxillary.event_processing.bulk_copy import copy_rows
+from resource_auxillary.event_processing.metrics import DB_RETRIES
 from resource_auxillary.templates.sql import (
+    prepare_batch_dedup_lock_sql,
     prepare_batch_dedup_sql,
+    prepare_single_dedup_lock_sql,
     prepare_single_dedup_sql,
     prepare_temp_table_sql,
-    prepare_weak_insertion_copy_sql,
 )
 from resource_auxillary.typing import SupportsExponentialJitteredRetryPolicy
 
@@ -31,6 +34,7 @@ async def db_execute_with_retries(
         except POTENTIAL_TRANSIENT_ERRORS as pt_err:
             await connection.rollback()
             exception = pt_err
+            DB_RETRIES.inc(type(pt_err).__name__)
             await exponential_jittered_backoff(
                 retry_policy.MAXIMUM_BACKOFF_INTERVAL,
                 retry_policy.BASE_BACKOFF_INTERVAL,
@@ -47,15 +51,29 @@ async def db_execute_with_retries(
 
 
 async def dedup_insert_event(
-    conn: AsyncConnection, event_id: int, acknowledgement_time: datetime | None = None
+    conn: AsyncConnection,
+    event_id: int | str,
+    dedup_window: float,
+    acknowledgement_time: datetime | None = None,
 ) -> bool:
+    """
+    Record an event as processed, unless it already was within the last
+    `dedup_window` seconds
+
+    Returns:
+        Whether the event is fresh
+    """
+    acknowledgement_time = acknowledgement_time or datetime.now()
     dedup_insertion_statement: sql.Composed = prepare_single_dedup_sql(
-        event_id, acknowledgement_time
+        event_id,
+        acknowledgement_time,
+        acknowledgement_time - timedelta(seconds=dedup_window),
     )
     try:
         async with conn.transaction():
-            await conn.execute(dedup_insertion_statement)
-        return True
+            await conn.execute(prepare_single_dedup_lock_sql(event_id))
+            cursor = await conn.execute(dedup_insertion_statement)
+        return cursor.rowcount == 1
     except IntegrityError:
         await conn.rollback()
         return False
@@ -64,8 +82,18 @@ async def dedup_insert_event(
 async def batch_dedup_insert_events(
     conn: AsyncConnection,
     event_ids: Iterable[int],
+    dedup_window: float,
     acknowledgement_time: datetime | None = None,
+    copy_format: CopyFormat = CopyFormat.BINARY,
 ) -> tuple[int, ...]:
+    """
+    Record a batch of events as processed, skipping events already processed
+    within the last `dedup_window` seconds. Dedup locks are held until the
+    connection's transaction ends
+
+    Returns:
+        IDs of fresh events
+    """
     acknowledgement_time = acknowledgement_time or datetime.now()
     temp_table_name: str = f"_temp_{uuid4().hex}_{acknowledgement_time.isoformat()}"
 
@@ -73,14 +101,23 @@ async def batch_dedup_insert_events(
         prepare_temp_table_sql(temp_table_name, EventLiteral.EVENTS_TABLE_NAME)
     )
     async with conn.cursor() as cursor:
-        async with cursor.copy(
-            prepare_weak_insertion_copy_sql(
-                temp_table_name,
+        await copy_rows(
+            cursor,
+            temp_table_name,
+            (
                 EventLiteral.EVENT_ID_COLUMN_NAME,
                 EventLiteral.EVENT_TIMESTAMP_COLUMN_NAME,
+            ),
+            # Event IDs are stored as text, and binary copies are not cast
+            [(str(event_id), acknowledgement_time) for event_id in event_ids],
+            copy_format,
+            type_reference=EventLiteral.EVENTS_TABLE_NAME,
+        )
+        await cursor.execute(prepare_batch_dedup_lock_sql(temp_table_name))
+        await cursor.execute(
+            prepare_batch_dedup_sql(
+                temp_table_name,
+                acknowledgement_time - timedelta(seconds=dedup_window),
             )
-        ) as copy:
-            for event_id in event_ids:
-                await copy.write_row((event_id, acknowledgement_time))
-        await cursor.execute(prepare_batch_dedup_sql(temp_table_name))
-        return tuple(i[0] for i in await cursor.fetchall())
+        )
+        return tuple(int(i[0]) for i in await cursor.fetchall())
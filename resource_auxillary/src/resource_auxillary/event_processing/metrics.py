@@ -0,0 +1,348 @@
+"""Lightweight in-process metrics, exposed in the Prometheus text format"""
+
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import partial
+import math
+import time
+from typing import ClassVar, Final, Generator, Sequence
+
+from resource_auxillary.datastructures.status_indicator import StatusProxy
+
+type t_labels = tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+DEFAULT_SIZE_BUCKETS: Final[tuple[float, ...]] = (
+    1,
+    10,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+EXPOSITION_CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+HEALTH_PATH: Final[bytes] = b"/health"
+HEALTH_CONTENT_TYPE: Final[str] = "text/plain; charset=utf-8"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(value)
+
+
+class MetricsRegistry:
+    __slots__ = ("_metrics",)
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: "Metric") -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        return "".join(
+            f"{line}\n" for metric in self._metrics.values() for line in metric.render()
+        )
+
+
+REGISTRY: Final[MetricsRegistry] = MetricsRegistry()
+
+
+class Metric:
+    __slots__ = ("name", "documentation", "label_names")
+    kind: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        registry.register(self)
+
+    def _resolve_labels(self, labels: Sequence[object]) -> t_labels:
+        if len(labels) != len(self.label_names):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.label_names}, got {labels}"
+            )
+        return tuple(str(label) for label in labels)
+
+    def _format_sample(
+        self,
+        suffix: str,
+        labels: t_labels,
+        value: float,
+        extra_labels: Sequence[tuple[str, str]] = (),
+    ) -> str:
+        label_pairs: tuple[tuple[str, str], ...] = (
+            *zip(self.label_names, labels),
+            *extra_labels,
+        )
+        formatted_labels: str = ",".join(
+            f'{name}="{_escape_label_value(value)}"' for name, value in label_pairs
+        )
+        if formatted_labels:
+            formatted_labels = f"{{{formatted_labels}}}"
+        return f"{self.name}{suffix}{formatted_labels} {_format_value(value)}"
+
+    def _render_samples(self) -> Generator[str, None, None]:
+        raise NotImplementedError
+
+    def render(self) -> Generator[str, None, None]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._render_samples()
+
+
+class Counter(Metric):
+    __slots__ = ("_values",)
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[t_labels, float] = {}
+
+    def inc(self, *labels: object, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        resolved_labels: t_labels = self._resolve_labels(labels)
+        self._values[resolved_labels] = self._values.get(resolved_labels, 0) + amount
+
+    def value(self, *labels: object) -> float:
+        return self._values.get(self._resolve_labels(labels), 0)
+
+    def _render_samples(self) -> Generator[str, None, None]:
+        for labels, value in self._values.items():
+            yield self._format_sample("_total", labels, value)
+
+
+class Gauge(Metric):
+    __slots__ = ("_values",)
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[t_labels, float] = {}
+
+    def set(self, *labels: object, value: float) -> None:
+        self._values[self._resolve_labels(labels)] = value
+
+    def _render_samples(self) -> Generator[str, None, None]:
+        for labels, value in self._values.items():
+            yield self._format_sample("", labels, value)
+
+
+class Histogram(Metric):
+    __slots__ = ("buckets", "_bucket_counts", "_sums")
+    kind = "histogram"
+
+    def __init__(
+        self,
+        *args,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets: tuple[float, ...] = (*sorted(buckets), math.inf)
+        self._bucket_counts: dict[t_labels, list[int]] = {}
+        self._sums: dict[t_labels, float] = {}
+
+    def observe(self, *labels: object, value: float) -> None:
+        resolved_labels: t_labels = self._resolve_labels(labels)
+        if (bucket_counts := self._bucket_counts.get(resolved_labels)) is None:
+            bucket_counts = self._bucket_counts[resolved_labels] = [0] * len(
+                self.buckets
+            )
+            self._sums[resolved_labels] = 0
+        # Only the first matching bucket is incremented, cumulative counts are
+        # computed while rendering
+        bucket_counts[bisect_left(self.buckets, value)] += 1
+        self._sums[resolved_labels] += value
+
+    def totals(self, *labels: object) -> tuple[int, float]:
+        """
+        Number and sum of observations with the given labels
+        """
+        resolved_labels: t_labels = self._resolve_labels(labels)
+        return (
+            sum(self._bucket_counts.get(resolved_labels, ())),
+            self._sums.get(resolved_labels, 0),
+        )
+
+    @contextmanager
+    def time(self, *labels: object) -> Generator[None, None, None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*labels, value=time.perf_counter() - start)
+
+    def _render_samples(self) -> Generator[str, None, None]:
+        for labels, bucket_counts in self._bucket_counts.items():
+            cumulative_count: int = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative_count += bucket_count
+                yield self._format_sample(
+                    "_bucket",
+                    labels,
+                    cumulative_count,
+                    (("le", _format_value(upper_bound)),),
+                )
+            yield self._format_sample("_sum", labels, self._sums[labels])
+            yield self._format_sample("_count", labels, cumulative_count)
+
+
+# Worker pipeline metrics
+EVENTS_COMMITTED: Final[Counter] = Counter(
+    "tenjin_events_committed",
+    "Events acknowledged after successful processing",
+    ("stream",),
+)
+EVENTS_DEAD_LETTERED: Final[Counter] = Counter(
+    "tenjin_events_dead_lettered",
+    "Events moved to the dead letter queue",
+    ("stream",),
+)
+BATCH_SIZE: Final[Histogram] = Histogram(
+    "tenjin_batch_size",
+    "Events per processed batch",
+    ("stream", "stage"),
+    buckets=DEFAULT_SIZE_BUCKETS,
+)
+STAGE_LATENCY: Final[Histogram] = Histogram(
+    "tenjin_stage_latency_seconds",
+    "Latency of each pipeline stage (read, decode, dedup, apply, ack, dead_letter)",
+    ("stream", "stage"),
+)
+QUEUE_DEPTH: Final[Gauge] = Gauge(
+    "tenjin_queue_depth",
+    "Batches waiting in an internal queue",
+    ("queue",),
+)
+DB_RETRIES: Final[Counter] = Counter(
+    "tenjin_db_retries",
+    "Database operations retried after a potentially transient error",
+    ("error",),
+)
+REDIS_RETRIES: Final[Counter] = Counter(
+    "tenjin_redis_retries",
+    "Redis operations retried after a network error",
+    ("error",),
+)
+
+# Adaptive batching decisions
+BATCH_SIZE_LIMIT: Final[Gauge] = Gauge(
+    "tenjin_batch_size_limit",
+    "Current batch size limit chosen by the adaptive batch controller",
+    ("queue",),
+)
+BATCH_WAIT_LIMIT: Final[Gauge] = Gauge(
+    "tenjin_batch_wait_seconds",
+    "Current batch waiting time chosen by the adaptive batch controller",
+    ("queue",),
+)
+APPLY_LATENCY_QUANTILE: Final[Gauge] = Gauge(
+    "tenjin_apply_latency_p99_seconds",
+    "p99 apply latency over the adaptive batch controller's sample window",
+    ("queue",),
+)
+BATCH_LIMIT_ADJUSTMENTS: Final[Counter] = Counter(
+    "tenjin_batch_limit_adjustments",
+    "Batch size limit changes made by the adaptive batch controller",
+    ("queue", "direction"),
+)
+
+# Counter reconciliation
+RECONCILED_ENTITIES: Final[Counter] = Counter(
+    "tenjin_reconciled_entities",
+    "Entities whose counters were recounted by the reconciliation worker",
+    ("table",),
+)
+RECONCILIATION_CORRECTIONS: Final[Counter] = Counter(
+    "tenjin_reconciliation_corrections",
+    "Counters found to have drifted, and corrected, per counter group",
+    ("counter_group",),
+)
+
+
+async def _handle_scrape(
+    status_proxy: StatusProxy | None,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    try:
+        request_line: list[bytes] = (await reader.readline()).split()
+        # Any other path is answered with the exposition, so only the headers are
+        # drained
+        while (await reader.readline()).strip():
+            pass
+        status: bytes = b"200 OK"
+        content_type: str = EXPOSITION_CONTENT_TYPE
+        if status_proxy and request_line[1:2] == [HEALTH_PATH]:
+            status = b"200 OK" if status_proxy.status_ok else b"503 Service Unavailable"
+            content_type = HEALTH_CONTENT_TYPE
+            body: bytes = status
+        else:
+            body = REGISTRY.render().encode()
+        writer.write(
+            b"".join(
+                (
+                    b"HTTP/1.1 %s\r\n" % status,
+                    f"Content-Type: {content_type}\r\n".encode(),
+                    f"Content-Length: {len(body)}\r\n".encode(),
+                    b"Connection: close\r\n\r\n",
+                    body,
+                )
+            )
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def serve_metrics(
+    host: str, port: int, status_proxy: StatusProxy | None = None
+) -> None:
+    """
+    Serve the registry's Prometheus text exposition over HTTP, until cancelled.
+    Given a status proxy, its status is also served on `HEALTH_PATH`, as 200 while
+    it is OK and 503 otherwise
+    """
+    server: asyncio.Server = await asyncio.start_server(
+        partial(_handle_scrape, status_proxy), host, port
+    )
+    async with server:
+        await server.serve_forever()
@@ -16,6 +16,7 @@ from resource_auxillary.events import (
     IntentUpdate,
     StreamedEvent,
     Event,
+    EventSideEffects,
 )
 from resource_auxillary.templates.lua import CONDITIIONAL_DELETE_TARGET_INTENT_TEMPLATE
 
@@ -120,3 +121,19 @@ async def atomic_ack_and_emit_side_effects(
             pipeline, (i.side_effects.cache_invalidations for i in events)
         )
         await pipeline.execute()
+
+
+async def emit_side_effects(
+    redis: Redis, side_effects: Sequence[EventSideEffects]
+) -> None:
+    """
+    Emit side-effects without acknowledging their events, e.g. when replaying
+    side-effects that failed after their events were acknowledged
+    """
+    async with redis.pipeline(transaction=True) as pipeline:
+        _emit_intent_invalidations(pipeline, (i.intent_updates for i in side_effects))
+        _emit_counter_side_effects(pipeline, (i.counter_updates for i in side_effects))
+        _emit_cache_invalidation_side_effects(
+            pipeline, (i.cache_invalidations for i in side_effects)
+        )
+        await pipeline.execute()
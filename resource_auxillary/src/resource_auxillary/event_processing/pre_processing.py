@@ -53,3 +53,21 @@ async def populate_events_batch_from_queue(
             await asyncio.sleep(batching_policy.IQ_CONSUMER_SLEEP_INTERVAL)
             reference_time = time.monotonic()
             continue
+        return
+
+
+async def populate_events_batch_from_event_queue(
+    queue: asyncio.Queue[StreamedEvent],
+    batch: list[StreamedEvent],
+    max_batch_size: int,
+) -> None:
+    """
+    Wait for at least one event, then take whatever else is already queued
+    (up to max_batch_size) without waiting any further
+    """
+    batch.append(await queue.get())
+    while len(batch) < max_batch_size:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
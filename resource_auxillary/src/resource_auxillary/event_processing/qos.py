@@ -8,6 +8,11 @@ from redis.exceptions import RedisError, ExceptionType
 
 from resource_auxillary.coordination import exponential_jittered_backoff
 from resource_auxillary.events import StreamedEvent
+from resource_auxillary.event_processing.metrics import (
+    EVENTS_COMMITTED,
+    EVENTS_DEAD_LETTERED,
+    REDIS_RETRIES,
+)
 from resource_auxillary.event_processing.post_processing import (
     amortize_event,
 )
@@ -28,6 +33,7 @@ async def execute_with_redis_retries(
         except RedisError as redis_error:
             exception = redis_error
             if redis_error.error_type == ExceptionType.NETWORK:
+                REDIS_RETRIES.inc(type(redis_error).__name__)
                 await exponential_jittered_backoff(
                     retry_policy.MAXIMUM_BACKOFF_INTERVAL,
                     retry_policy.BASE_BACKOFF_INTERVAL,
@@ -60,6 +66,7 @@ async def dlq_aware_process_events(
     """
     try:
         await execute_with_redis_retries(retry_policy, redis_coroutine, attempts)
+        EVENTS_COMMITTED.inc(event_stream_name, amount=len(events))
     except Exception as e:
         dlq_attempts: int = (
             1 if getattr(e, "error_type", None) == ExceptionType.NETWORK else attempts
@@ -68,6 +75,7 @@ async def dlq_aware_process_events(
             redis, events, event_stream_name, group_name, dlq_stream_name
         )
         await execute_with_redis_retries(retry_policy, coro, dlq_attempts)
+        EVENTS_DEAD_LETTERED.inc(event_stream_name, amount=len(events))
 
 
 @asynccontextmanager
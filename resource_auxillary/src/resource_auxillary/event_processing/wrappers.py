@@ -7,6 +7,10 @@ from redis.asyncio import Redis
 from resource_auxillary.events import StreamedEvent
 from resource_auxillary.strings import StreamName
 from resource_auxillary.typing import SupportsExponentialJitteredRetryPolicy
+from resource_auxillary.event_processing.metrics import (
+    EVENTS_DEAD_LETTERED,
+    STAGE_LATENCY,
+)
 from resource_auxillary.event_processing.post_processing import (
     acknowledge_event,
     amortize_event,
@@ -33,7 +37,9 @@ async def declare_dead_with_retries(
     coro = lambda: amortize_event(
         redis, batch, stream_name, group_name, dead_letter_stream_name
     )
-    await execute_with_redis_retries(retry_policy, coro, attempts)
+    with STAGE_LATENCY.time(stream_name, "dead_letter"):
+        await execute_with_redis_retries(retry_policy, coro, attempts)
+    EVENTS_DEAD_LETTERED.inc(stream_name, amount=len(batch))
 
 
 async def ack_with_retries(
@@ -49,16 +55,17 @@ async def ack_with_retries(
     Thin wrapper over sibling utility functions to acknowledge an event
     """
     coro = lambda: acknowledge_event(redis, batch, stream_name, group_name)
-    await dlq_aware_process_events(
-        redis,
-        retry_policy,
-        batch,
-        coro,
-        attempts,
-        stream_name,
-        group_name,
-        dead_letter_stream_name,
-    )
+    with STAGE_LATENCY.time(stream_name, "ack"):
+        await dlq_aware_process_events(
+            redis,
+            retry_policy,
+            batch,
+            coro,
+            attempts,
+            stream_name,
+            group_name,
+            dead_letter_stream_name,
+        )
 
 
 async def commit_processed_events(
@@ -76,13 +83,14 @@ async def commit_processed_events(
     coro = lambda: atomic_ack_and_emit_side_effects(
         redis, events, stream_name, group_name
     )
-    await dlq_aware_process_events(
-        redis,
-        retry_policy,
-        events,
-        coro,
-        retry_policy.MAX_RETRIES,
-        stream_name,
-        group_name,
-        dlq_stream_name,
-    )
+    with STAGE_LATENCY.time(stream_name, "ack"):
+        await dlq_aware_process_events(
+            redis,
+            retry_policy,
+            events,
+            coro,
+            retry_policy.MAX_RETRIES,
+            stream_name,
+            group_name,
+            dlq_stream_name,
+        )
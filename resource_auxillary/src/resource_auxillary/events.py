@@ -92,16 +92,17 @@ class EventSideEffects(BaseModel):
     ]
 
     def __cache_repr__(self) -> dict[FieldT, EncodableT]:
+        # Nested inside the event's own JSON encoding, so kept as text
         return {
             "counter_updates": orjson.dumps(
                 [cache_repr(i) for i in self.counter_updates]
-            ),
+            ).decode(),
             "intent_updates": orjson.dumps(
                 [cache_repr(i) for i in self.intent_updates]
-            ),
+            ).decode(),
             "cache_invalidations": orjson.dumps(
                 [cache_repr(i) for i in self.cache_invalidations]
-            ),
+            ).decode(),
         }
 
     def __json_repr__(self) -> dict[str, Any]:
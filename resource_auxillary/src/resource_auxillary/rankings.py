@@ -0,0 +1,43 @@
+"""Per-forum post rankings, maintained by workers and served by the resource server"""
+
+from datetime import datetime
+from enum import StrEnum
+import math
+from typing import Final, LiteralString
+
+from resource_auxillary.strings import NAME_SEPERATOR
+
+RANKING_PREFIX: Final[LiteralString] = "rankings"
+
+# Post timestamps are naive (TIMESTAMP WITHOUT TIME ZONE)
+HOT_RANK_EPOCH: Final[datetime] = datetime(2025, 1, 1)
+# Seconds of recency worth a tenfold difference in score
+HOT_RANK_TIME_SCALE: Final[float] = 45000
+
+
+class RankingName(StrEnum):
+    HOT = "hot"
+    TOP = "top"
+
+
+def derive_ranking_key(ranking: RankingName, forum_id: int | str) -> str:
+    return NAME_SEPERATOR.join((RANKING_PREFIX, ranking, str(forum_id)))
+
+
+def compute_hot_rank(score: int, time_posted: datetime) -> float:
+    """
+    Logarithmic score plus linear recency. The recency term grows for newer posts
+    instead of decaying for older ones, so ranks never have to be recomputed as
+    time passes
+    """
+    order: float = math.log10(max(abs(score), 1))
+    sign: int = (score > 0) - (score < 0)
+    seconds: float = (time_posted - HOT_RANK_EPOCH).total_seconds()
+    return round(sign * order + seconds / HOT_RANK_TIME_SCALE, 7)
+
+
+def compute_rankings(score: int, time_posted: datetime) -> dict[RankingName, float]:
+    return {
+        RankingName.HOT: compute_hot_rank(score, time_posted),
+        RankingName.TOP: score,
+    }
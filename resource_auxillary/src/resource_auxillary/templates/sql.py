@@ -6,43 +6,83 @@ from typing import Final, Literal, Sequence
 from psycopg.sql import SQL, Composed, Identifier, Literal as SQL_Literal
 
 from resource_auxillary.datastructures.database import (
+    CopyFormat,
     EventLiteral,
     EventMetadataLiteral,
 )
 
+# The dedup table is range-partitioned by acknowledgement time, so event IDs are
+# only unique within a partition. Events are looked up within the dedup window,
+# pruning lookups to its partitions, and concurrent deliveries of the same event
+# are serialized on a transaction-scoped advisory lock over its ID
+DEDUP_LOCK_STATEMENT: Final[SQL] = SQL(
+    "SELECT pg_advisory_xact_lock(hashtextextended({event_id}::text, 0));"
+)
+
 SINGLE_DEDUP_STATEMENT: Final[SQL] = SQL("""INSERT INTO {event_dedup_table}
     ({event_id_col}, {ack_time_col})
-    VALUES ({event_id}, {acknowledgement_time})""")
+    SELECT {event_id}::text, {acknowledgement_time}
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {event_dedup_table}
+        WHERE {event_id_col} = {event_id}::text
+        AND {ack_time_col} >= {window_start}
+    )
+    ON CONFLICT DO NOTHING;""")
+
+
+def prepare_single_dedup_lock_sql(event_id: int | str) -> Composed:
+    return DEDUP_LOCK_STATEMENT.format(event_id=SQL_Literal(event_id))
 
 
 def prepare_single_dedup_sql(
-    event_id: int, acknowledgement_time: datetime | None = None
+    event_id: int | str, acknowledgement_time: datetime, window_start: datetime
 ) -> Composed:
     return SINGLE_DEDUP_STATEMENT.format(
         event_dedup_table=Identifier(EventLiteral.EVENTS_TABLE_NAME),
         event_id_col=Identifier(EventLiteral.EVENT_ID_COLUMN_NAME),
         ack_time_col=Identifier(EventLiteral.EVENT_TIMESTAMP_COLUMN_NAME),
         event_id=SQL_Literal(event_id),
-        acknowledgement_time=SQL_Literal(acknowledgement_time or datetime.now()),
+        acknowledgement_time=SQL_Literal(acknowledgement_time),
+        window_start=SQL_Literal(window_start),
     )
 
 
-BATCH_DEDUP_STATEMENT: Final[SQL] = SQL("""WITH attempted AS (
-        INSERT INTO {event_dedup_table} ({event_id_col}, {ack_time_col})
-        SELECT {event_id_col}, {ack_time_col}
-        FROM {temp_table}
-        ON CONFLICT ({event_id_col}) DO NOTHING
-        RETURNING {event_id_col}
+# Locks are taken in ID order, so that overlapping batches cannot deadlock
+BATCH_DEDUP_LOCK_STATEMENT: Final[SQL] = SQL(
+    """SELECT pg_advisory_xact_lock(hashtextextended(locked.{event_id_col}, 0))
+    FROM (
+        SELECT DISTINCT {event_id_col} FROM {temp_table}
+        ORDER BY {event_id_col}
+    ) AS locked;"""
+)
+
+BATCH_DEDUP_STATEMENT: Final[SQL] = SQL("""INSERT INTO {event_dedup_table}
+    ({event_id_col}, {ack_time_col})
+    SELECT DISTINCT ON (t.{event_id_col}) t.{event_id_col}, t.{ack_time_col}
+    FROM {temp_table} AS t
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {event_dedup_table} AS e
+        WHERE e.{event_id_col} = t.{event_id_col}
+        AND e.{ack_time_col} >= {window_start}
     )
-    SELECT {event_id_col} FROM attempted;""")
+    ON CONFLICT DO NOTHING
+    RETURNING {event_id_col};""")
 
 
-def prepare_batch_dedup_sql(temp_table: str) -> Composed:
-    return SINGLE_DEDUP_STATEMENT.format(
+def prepare_batch_dedup_lock_sql(temp_table: str) -> Composed:
+    return BATCH_DEDUP_LOCK_STATEMENT.format(
+        event_id_col=Identifier(EventLiteral.EVENT_ID_COLUMN_NAME),
+        temp_table=Identifier(temp_table),
+    )
+
+
+def prepare_batch_dedup_sql(temp_table: str, window_start: datetime) -> Composed:
+    return BATCH_DEDUP_STATEMENT.format(
         event_dedup_table=Identifier(EventLiteral.EVENTS_TABLE_NAME),
         event_id_col=Identifier(EventLiteral.EVENT_ID_COLUMN_NAME),
         ack_time_col=Identifier(EventLiteral.EVENT_TIMESTAMP_COLUMN_NAME),
         temp_table=Identifier(temp_table),
+        window_start=SQL_Literal(window_start),
     )
 
 
@@ -61,13 +101,38 @@ WEAK_INSERTION_COPY_SQL: Final[SQL] = SQL("""COPY {table}
                                           ({columns})
                                           FROM STDIN;""")
 
+BINARY_INSERTION_COPY_SQL: Final[SQL] = SQL("""COPY {table}
+                                            ({columns})
+                                            FROM STDIN (FORMAT BINARY);""")
 
-def prepare_weak_insertion_copy_sql(table: str, *columns: str) -> Composed:
-    return WEAK_INSERTION_COPY_SQL.format(
+
+def prepare_weak_insertion_copy_sql(
+    table: str, *columns: str, copy_format: CopyFormat = CopyFormat.TEXT
+) -> Composed:
+    template: SQL = (
+        BINARY_INSERTION_COPY_SQL
+        if copy_format == CopyFormat.BINARY
+        else WEAK_INSERTION_COPY_SQL
+    )
+    return template.format(
         table=Identifier(table), columns=SQL(", ").join(Identifier(c) for c in columns)
     )
 
 
+COLUMN_TYPES_SQL: Final[SQL] = SQL("""SELECT attname, atttypid::integer
+    FROM pg_catalog.pg_attribute
+    WHERE attrelid = {table}::regclass
+    AND attname = ANY({columns})
+    AND attnum > 0
+    AND NOT attisdropped;""")
+
+
+def prepare_column_types_sql(table: str, columns: Sequence[str]) -> Composed:
+    return COLUMN_TYPES_SQL.format(
+        table=SQL_Literal(table), columns=SQL_Literal(list(columns))
+    )
+
+
 WEAK_INSERTION_SQL: Final[SQL] = SQL(
     """INSERT INTO {table} AS insertion_table ({columns})
     SELECT {columns}
@@ -76,8 +141,8 @@ WEAK_INSERTION_SQL: Final[SQL] = SQL(
     DO UPDATE SET
     {state_column} = EXCLUDED.{state_column},
     {event_seq_column} = EXCLUDED.{event_seq_column}
-    WHERE {event_seq_column} < EXCLUDED.{event_seq_column}
-    RETURNING insertion_table.{event_id_column};"""
+    WHERE insertion_table.{event_seq_column} < EXCLUDED.{event_seq_column}
+    RETURNING insertion_table.{event_seq_column};"""
 )
 
 
@@ -3,6 +3,12 @@ import asyncio
 import sys
 from typing import Final, Sequence
 
+from resource_auxillary.datastructures.status_indicator import (
+    StatusController,
+    StatusProxy,
+)
+from resource_auxillary.event_processing.metrics import serve_metrics
+
 from resource_database_workers.bootup import spawn_tasks
 from resource_database_workers.cli import get_argument_parser, parse_args
 from resource_database_workers.config.worker_config import (
@@ -10,7 +16,20 @@ from resource_database_workers.config.worker_config import (
     CounterWorkersConfig,
 )
 from resource_database_workers.config.config import AppConfig
-from resource_database_workers.dependencies import get_config
+from resource_database_workers.datastructures.replay import ReplayFilter
+from resource_database_workers.datastructures.shards import plan_worker_shards
+from resource_database_workers.dependencies import (
+    get_app_redis,
+    get_config,
+    get_internal_redis,
+    open_connection_pool,
+)
+from resource_database_workers.supervisor import supervise_shards
+from resource_database_workers.tasks.partitions import maintain_event_partitions
+from resource_database_workers.tasks.rankings import maintain_rankings
+from resource_database_workers.tasks.reconciliation import maintain_reconciliation
+from resource_database_workers.tasks.replay import replay_dead_letters
+from resource_database_workers.utils.strings import generate_consumer_name
 
 
 async def main(args: Sequence[str]) -> None:
@@ -19,10 +38,96 @@ async def main(args: Sequence[str]) -> None:
 
     app_config: Final[AppConfig] = get_config()
 
+    if parsed_args.worker_type == "replay":
+        replay_filter: ReplayFilter = ReplayFilter(
+            source=parsed_args.source,
+            since=parsed_args.since,
+            until=parsed_args.until,
+            event_names=tuple(parsed_args.event_names),
+            side_effect_types=tuple(parsed_args.side_effect_types),
+            counter_tables=tuple(parsed_args.counter_tables),
+        )
+        replayed: int = await replay_dead_letters(
+            app_config,
+            await open_connection_pool(),
+            get_internal_redis(),
+            get_app_redis(),
+            replay_filter,
+            rate=parsed_args.rate or app_config.WORKER.DLQ_REPLAY_RATE,
+            batch_size=(
+                parsed_args.batch_size or app_config.WORKER.DLQ_REPLAY_BATCH_SIZE
+            ),
+            restart=parsed_args.restart,
+        )
+        print(f"Replayed {replayed} entries from {replay_filter.source}")
+        return
+
+    if parsed_args.worker_type == "rankings":
+        await maintain_rankings(
+            app_config,
+            await open_connection_pool(),
+            get_internal_redis(),
+            get_app_redis(),
+            generate_consumer_name("rankings"),
+        )
+        return
+
+    if parsed_args.worker_type == "reconciliation":
+        await maintain_reconciliation(
+            app_config,
+            await open_connection_pool(),
+            get_internal_redis(),
+            get_app_redis(),
+            generate_consumer_name("reconciliation"),
+        )
+        return
+
+    if parsed_args.worker_type == "partitions":
+        await maintain_event_partitions(
+            app_config,
+            await open_connection_pool(),
+            get_internal_redis(),
+            generate_consumer_name("partitions"),
+        )
+        return
+
+    if parsed_args.worker_type == "supervisor":
+        status_controller: StatusController = StatusController()
+        # Shards serve their own metrics on the ports following the supervisor's
+        metrics_task: asyncio.Task[None] | None = None
+        if app_config.WORKER.METRICS_PORT:
+            metrics_task = asyncio.create_task(
+                serve_metrics(
+                    app_config.WORKER.METRICS_HOST,
+                    app_config.WORKER.METRICS_PORT,
+                    StatusProxy(status_controller),
+                )
+            )
+        try:
+            await supervise_shards(
+                app_config,
+                plan_worker_shards(
+                    (
+                        CounterWorkersConfig.construct_from_toml(
+                            parsed_args.worker_config_filepath
+                        ),
+                        *StreamWorkersConfig.construct_all_from_toml(
+                            parsed_args.worker_config_filepath
+                        ),
+                    ),
+                    parsed_args.processes,
+                ),
+                status_controller,
+            )
+        finally:
+            if metrics_task:
+                metrics_task.cancel()
+        return
+
     workers_config: StreamWorkersConfig | CounterWorkersConfig | None = None
     if parsed_args.worker_type == "stream":
         workers_config = StreamWorkersConfig.construct_from_toml(
-            parsed_args.worker_config_filepath, parsed_args.strean
+            parsed_args.worker_config_filepath, parsed_args.stream
         )
     else:
         workers_config = CounterWorkersConfig.construct_from_toml(
@@ -32,4 +137,4 @@ async def main(args: Sequence[str]) -> None:
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main(sys.argv[1:])))
+    sys.exit(get_config().WORKER.run(main(sys.argv[1:])))
@@ -1,5 +1,6 @@
 import asyncio
 from functools import partial
+import inspect
 from typing import Any, Callable, Coroutine, Final, Mapping
 
 from resource_database_workers.datastructures.worker_inputs import (
@@ -18,29 +19,51 @@ from resource_database_workers.config.worker_config import (
     CounterWorkersConfig,
     StreamWorkersConfig,
 )
+from resource_auxillary.event_processing.metrics import serve_metrics
 from resource_auxillary.datastructures.status_indicator import (
     StatusController,
     StatusProxy,
 )
 from resource_database_workers.dependencies import (
+    get_internal_redis,
     get_queue_registry,
+    open_connection_pool,
 )
 from resource_database_workers.config.config import AppConfig
+from resource_database_workers.utils.coordination import establish_consumer_groups
 from resource_database_workers.utils.strings import (
+    generate_consumer_name,
     generate_worker_name,
 )
 from resource_database_workers.utils.typing import (
     GenericDataclass,
 )
-from resource_database_workers.tasks.counters import (
-    batch_update_counters,
-)
 from resource_database_workers.tasks.counters import (
     batch_update_counters,
     batch_update_retry_counters,
 )
 
 
+def _bind_worker_inputs(
+    worker_callable: Callable[..., Coroutine[None, None, None]],
+    worker_inputs: GenericDataclass,
+    **overrides: Any,
+) -> Callable[[], Coroutine[None, None, None]]:
+    """
+    Bind a worker to the values of its inputs. Inputs are shared by every worker of
+    a stream, so only the parameters the worker actually takes are passed
+    """
+    parameters = inspect.signature(worker_callable).parameters
+    arguments: dict[str, Any] = {
+        name: getattr(worker_inputs, name)
+        for name in worker_inputs.__dataclass_fields__
+    } | overrides
+    return partial(
+        worker_callable,
+        **{name: value for name, value in arguments.items() if name in parameters},
+    )
+
+
 async def tasks_wrapper(
     worker_callables: Mapping[str, Callable[[], Coroutine[None, None, None]]],
     graceful_shutdown_timeout: float,
@@ -50,11 +73,12 @@ async def tasks_wrapper(
         asyncio.create_task(worker_callable(), name=name)
         for name, worker_callable in worker_callables.items()
     )
-    failed, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
-    assert len(failed) == 1  # nosec
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
 
-    # Save initial exception
-    exception: Exception = next(iter(failed)).exception()  # type: ignore[reportAssignmentType]
+    # Save initial exception, several tasks may fail in the same loop iteration
+    exception: Exception = next(
+        task.exception() for task in done if task.exception()
+    )  # type: ignore[reportAssignmentType]
 
     status_controller.status_ok = False
     done, pending = await asyncio.wait(pending, timeout=graceful_shutdown_timeout)
@@ -82,16 +106,22 @@ def _counter_worker_wrapper(
 ) -> dict[str, Callable[[], Coroutine[None, None, None]]]:
     callable_mapping: dict[str, Callable[[], Coroutine[None, None, None]]] = {}
 
-    prepared_inputs: Final[dict[str, Any]] = (
-        COUNTER_WORKER_INPUT.__dataclass_fields__ | {STATUS_PROXY_NAME: status_proxy}
-    )
     for i in range(1, counter_config.WORKER_COUNT + 1):
-        callable_mapping[generate_worker_name("counter", i)] = partial(
-            batch_update_counters, **prepared_inputs
+        worker_name: str = generate_worker_name("counter", i)
+        # Worker names must be unique across processes for counter group ownership
+        callable_mapping[worker_name] = _bind_worker_inputs(
+            batch_update_counters,
+            COUNTER_WORKER_INPUT,
+            **{STATUS_PROXY_NAME: status_proxy},
+            worker_name=generate_consumer_name(worker_name),
         )
     for i in range(1, counter_config.RETRY_WORKER_COUNT + 1):
-        callable_mapping[generate_worker_name("retry_counter", i)] = partial(
-            batch_update_retry_counters, **prepared_inputs
+        callable_mapping[generate_worker_name("retry_counter", i)] = (
+            _bind_worker_inputs(
+                batch_update_retry_counters,
+                COUNTER_WORKER_INPUT,
+                **{STATUS_PROXY_NAME: status_proxy},
+            )
         )
     return callable_mapping
 
@@ -106,12 +136,10 @@ def _stream_worker_wrapper(
         worker_callable: Callable = EVENT_WORKER_MAPPING[event]
         worker_arguments: GenericDataclass = WORKER_INPUT_DATA_MAPPING[event]
         for i in range(1, worker_count + 1):
-            worker_mapping[generate_worker_name(event, i)] = partial(
+            worker_mapping[generate_worker_name(event, i)] = _bind_worker_inputs(
                 worker_callable,
-                **(
-                    worker_arguments.__dataclass_fields__
-                    | {STATUS_PROXY_NAME: status_proxy}
-                ),
+                worker_arguments,
+                **{STATUS_PROXY_NAME: status_proxy},
             )
     queue_mapping = get_queue_registry().resolve_stream_reader_queue_mapping(
         stream_config.STREAM
@@ -122,31 +150,49 @@ def _stream_worker_wrapper(
     for i in range(1, stream_config.READER_COUNT + 1):
         worker_mapping[
             generate_worker_name(stream_config.STREAM, i, base_name="reader")
-        ] = partial(
+        ] = _bind_worker_inputs(
             reader_callable,
-            **(
-                reader_task_input.__dataclass_fields__
-                | {STATUS_PROXY_NAME: status_proxy}
-            ),
+            reader_task_input,
+            **{STATUS_PROXY_NAME: status_proxy},
         )
     return worker_mapping
 
 
 async def spawn_tasks(
     app_config: AppConfig,
-    worker_config: CounterWorkersConfig | StreamWorkersConfig,
+    *worker_configs: CounterWorkersConfig | StreamWorkersConfig,
+    metrics_port_offset: int = 0,
 ) -> None:
+    await open_connection_pool()
+    # Readers join their consumer group under their own names on first read
+    await establish_consumer_groups(
+        get_internal_redis(),
+        {
+            worker_config.STREAM: ()
+            for worker_config in worker_configs
+            if isinstance(worker_config, StreamWorkersConfig)
+        },
+        app_config.WORKER.CONSUMER_GROUP_NAME,
+    )
     status_controller: Final[StatusController] = StatusController()
     status_proxy: StatusProxy = StatusProxy(status_controller)
-    if isinstance(worker_config, CounterWorkersConfig):
-        await tasks_wrapper(
-            _counter_worker_wrapper(worker_config, status_proxy),
-            app_config.WORKER.GRACEFUL_SHUTDOWN_PERIOD,
-            status_controller,
-        )
-    else:
-        await tasks_wrapper(
-            _stream_worker_wrapper(worker_config, status_proxy),
-            app_config.WORKER.GRACEFUL_SHUTDOWN_PERIOD,
-            status_controller,
+
+    worker_callables: dict[str, Callable[[], Coroutine[None, None, None]]] = {}
+    for worker_config in worker_configs:
+        if isinstance(worker_config, CounterWorkersConfig):
+            worker_callables |= _counter_worker_wrapper(worker_config, status_proxy)
+        else:
+            worker_callables |= _stream_worker_wrapper(worker_config, status_proxy)
+    if app_config.WORKER.METRICS_PORT:
+        worker_callables["metrics"] = partial(
+            serve_metrics,
+            app_config.WORKER.METRICS_HOST,
+            app_config.WORKER.METRICS_PORT + metrics_port_offset,
+            status_proxy,
         )
+
+    await tasks_wrapper(
+        worker_callables,
+        app_config.WORKER.GRACEFUL_SHUTDOWN_PERIOD,
+        status_controller,
+    )
@@ -1,8 +1,12 @@
 from argparse import ArgumentParser, Namespace
+from datetime import datetime
 import os
 from typing import Iterable
 
-from resource_auxillary.strings import StreamName
+from resource_auxillary.datastructures.database import SideEffectType
+from resource_auxillary.strings import EventName, StreamName
+
+from resource_database_workers.datastructures.replay import ReplaySource
 
 
 def _check_file_existence(arg: str) -> str:
@@ -21,28 +25,109 @@ def get_argument_parser() -> ArgumentParser:
     )
 
     arg_parser.add_argument(
-        "worker_type", help="type of worker", choices=("counter", "stream")
+        "worker_type",
+        help="type of worker",
+        choices=(
+            "counter",
+            "stream",
+            "replay",
+            "rankings",
+            "reconciliation",
+            "partitions",
+            "supervisor",
+        ),
     )
 
     arg_parser.add_argument(
         "worker_config_filepath",
-        help="TOML filepath for worker count config",
+        help=(
+            "TOML filepath for worker count config, "
+            "unused by replay, rankings, reconciliation and partitions"
+        ),
         type=_check_file_existence,
+        nargs="?",
     )
 
     arg_parser.add_argument(
         "--stream", help="Name of stream, if worker is a stream worker", type=StreamName
     )
 
+    supervisor_group = arg_parser.add_argument_group(
+        "supervisor", "Options for supervising sharded worker processes"
+    )
+    supervisor_group.add_argument(
+        "--processes",
+        help="Number of worker processes to supervise, defaults to the CPU count",
+        type=int,
+        default=os.cpu_count() or 1,
+    )
+
+    replay_group = arg_parser.add_argument_group(
+        "replay", "Options for replaying dead-lettered entries"
+    )
+    replay_group.add_argument(
+        "--source",
+        help="DLQ table to replay from",
+        type=ReplaySource,
+        choices=tuple(ReplaySource),
+        default=ReplaySource.EVENTS,
+    )
+    replay_group.add_argument(
+        "--since", help="Earliest failure time (ISO 8601)", type=datetime.fromisoformat
+    )
+    replay_group.add_argument(
+        "--until", help="Latest failure time (ISO 8601)", type=datetime.fromisoformat
+    )
+    replay_group.add_argument(
+        "--event-name",
+        help="Replay only failed events of this name",
+        type=EventName,
+        action="append",
+        default=[],
+        dest="event_names",
+    )
+    replay_group.add_argument(
+        "--side-effect-type",
+        help="Replay only failed side-effects of this type",
+        type=SideEffectType,
+        action="append",
+        default=[],
+        dest="side_effect_types",
+    )
+    replay_group.add_argument(
+        "--counter-table",
+        help="Replay only failed counter batches of this table",
+        action="append",
+        default=[],
+        dest="counter_tables",
+    )
+    replay_group.add_argument(
+        "--rate", help="Maximum rows replayed per second", type=float
+    )
+    replay_group.add_argument("--batch-size", help="Rows replayed per page", type=int)
+    replay_group.add_argument(
+        "--restart",
+        help="Discard any checkpoint left by a previous replay with the same filters",
+        action="store_true",
+    )
+
     return arg_parser
 
 
 def parse_args(argparser: ArgumentParser, args: Iterable[str]) -> Namespace:
     parsed_args: Namespace = argparser.parse_args(args)
 
+    if (
+        parsed_args.worker_type
+        not in ("replay", "rankings", "reconciliation", "partitions")
+        and not parsed_args.worker_config_filepath
+    ):
+        raise ValueError("Missing worker config filepath")
     if parsed_args.worker_type == "stream" and not parsed_args.stream:
         raise ValueError("Missing stream name")
     elif parsed_args.worker_type != "stream" and parsed_args.stream:
         print("Ignoring irrelevant argument: ", parsed_args.stream)
+    if parsed_args.processes < 1:
+        raise ValueError("Process count must be at least 1")
 
     return parsed_args
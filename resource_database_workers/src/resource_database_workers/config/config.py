@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import Annotated, ClassVar
 
@@ -13,10 +14,14 @@ from resource_database_workers.config import sub_config
 
 
 class AppConfig(BaseSettings):
-    config_filepath: ClassVar[Path] = Path(__file__).parent / "app_config.toml"
-    model_config = SettingsConfigDict(toml_file=str(config_filepath))
+    # Overridable for deployments and benchmarks that point workers at other services
+    config_filepath: ClassVar[Path] = Path(
+        os.environ.get("WORKER_CONFIG_FILEPATH", Path(__file__).parent / "config.toml")
+    )
+    # The shared [cache] table is read by the resource server only
+    model_config = SettingsConfigDict(toml_file=str(config_filepath), extra="ignore")
 
-    WORKER: Annotated[sub_config.WorkerConfig, Field(alias="business")]
+    WORKER: Annotated[sub_config.WorkerConfig, Field(alias="worker")]
     REDIS: Annotated[sub_config.RedisContainer, Field(alias="redis")]
     DATABASE: Annotated[sub_config.DatabaseConfig, Field(alias="database")]
 
@@ -29,4 +34,4 @@ class AppConfig(BaseSettings):
         dotenv_settings: PydanticBaseSettingsSource,
         file_secret_settings: PydanticBaseSettingsSource,
     ) -> tuple[PydanticBaseSettingsSource, ...]:
-        return (TomlConfigSettingsSource(settings_cls),)
+        return (TomlConfigSettingsSource(settings_cls, toml_file=cls.config_filepath),)
@@ -5,7 +5,11 @@ from auxillary.mixins.db_config import (
     BasicConnectionPoolConfigMixin,
     BasicPostgresDatabaseConfigMixin,
 )
-from auxillary.mixins.redis_config import BasicRedisConfigMixin
+from auxillary.mixins.redis_config import (
+    BasicRedisConfigMixin,
+    RedisConnectionPoolConfigMixin,
+)
+from auxillary.mixins.runtime_config import RuntimeProfileMixin
 from pydantic import (
     BaseModel,
     BeforeValidator,
@@ -28,7 +32,7 @@ def _verify_hostname(s: str) -> str | IPvAnyAddress:
     return s
 
 
-class RedisConfig(BasicRedisConfigMixin, BaseModel): ...
+class RedisConfig(BasicRedisConfigMixin, RedisConnectionPoolConfigMixin, BaseModel): ...
 
 
 class RedisContainer(BaseModel):
@@ -42,6 +46,9 @@ class WorkerConfig(
     config_mixins.WorkerRetryMixin,
     config_mixins.WorkerReclaimMixin,
     config_mixins.WorkerDLQMixin,
+    config_mixins.WorkerCopyMixin,
+    config_mixins.WorkerMetricsMixin,
+    RuntimeProfileMixin,
     BaseModel,
 ):
     # Counters
@@ -50,10 +57,74 @@ class WorkerConfig(
     COUNTER_REGISTRY_REFRESH_INTERVAL: Annotated[int, Field(ge=0)]
     COUNTER_FLUSH_LOCK_TTL: Annotated[int, Field(ge=0)]
     COUNTER_FLUSH_INTERVAL: Annotated[int, Field(ge=0)]
+    COUNTER_FLUSH_CHUNK_SIZE: Annotated[int, Field(ge=1)]
+    COUNTER_MIN_FLUSH_INTERVAL: Annotated[float, Field(gt=0)]
+    COUNTER_MAX_FLUSH_INTERVAL: Annotated[float, Field(gt=0)]
+    COUNTER_FLUSH_TARGET_SIZE: Annotated[int, Field(ge=1)]
+    COUNTER_DRAIN_THRESHOLD: Annotated[int, Field(ge=1)]
+    COUNTER_DRAIN_CHUNK_SIZE: Annotated[int, Field(ge=1)]
+
+    # Counter group ownership
+    COUNTER_WORKER_REGISTRY_NAME: Annotated[str, BeforeValidator(lambda x: x.strip())]
+    COUNTER_WORKER_LEASE_TTL: Annotated[float, Field(gt=0)]
+    COUNTER_WORKER_HEARTBEAT_INTERVAL: Annotated[float, Field(gt=0)]
+    COUNTER_RING_VIRTUAL_NODES: Annotated[int, Field(ge=1)]
 
     # Downstream counter consumers
     DOWNSTREAM_COUNTER_BATCH_SIZE: Annotated[int, Field(ge=1)]
 
+    # Downstream deletion consumers
+    DOWNSTREAM_DELETION_BATCH_SIZE: Annotated[int, Field(ge=1)]
+
+    # Dead letter queue consumers
+    DLQ_BATCH_SIZE: Annotated[int, Field(ge=1)]
+
+    # Dead letter replays
+    DLQ_REPLAY_CHECKPOINT_PREFIX: Annotated[str, BeforeValidator(lambda x: x.strip())]
+    DLQ_REPLAY_RATE: Annotated[float, Field(gt=0)]
+    DLQ_REPLAY_BATCH_SIZE: Annotated[int, Field(ge=1)]
+
+    # Adaptive batching
+    ADAPTIVE_BATCHING: Annotated[bool, Field(default=True)]
+    BATCH_TARGET_APPLY_LATENCY: Annotated[float, Field(gt=0)]
+    BATCH_MIN_SIZE: Annotated[int, Field(ge=1)]
+    BATCH_MAX_SIZE: Annotated[int, Field(ge=1)]
+    BATCH_ADDITIVE_INCREASE: Annotated[int, Field(ge=1)]
+    BATCH_MULTIPLICATIVE_DECREASE: Annotated[float, Field(gt=0, lt=1)]
+    BATCH_MIN_WAITING_TIME: Annotated[float, Field(ge=0)]
+    BATCH_LATENCY_WINDOW: Annotated[int, Field(ge=1)]
+
+    # Post rankings
+    RANKING_CHECKPOINT_NAME: Annotated[str, BeforeValidator(lambda x: x.strip())]
+    RANKING_TOP_K: Annotated[int, Field(ge=1)]
+    RANKING_INTERVAL: Annotated[float, Field(gt=0)]
+    RANKING_LAG: Annotated[int, Field(ge=0)]
+    RANKING_READ_SIZE: Annotated[int, Field(ge=1)]
+    RANKING_LEASE_TTL: Annotated[int, Field(ge=1)]
+
+    # Counter reconciliation
+    RECONCILIATION_WATERMARK_NAME: Annotated[str, BeforeValidator(lambda x: x.strip())]
+    RECONCILIATION_INTERVAL: Annotated[float, Field(gt=0)]
+    RECONCILIATION_LAG: Annotated[int, Field(ge=0)]
+    RECONCILIATION_READ_SIZE: Annotated[int, Field(ge=1)]
+    RECONCILIATION_BATCH_SIZE: Annotated[int, Field(ge=1)]
+    RECONCILIATION_RATE: Annotated[float, Field(gt=0)]
+    RECONCILIATION_SETTLE_TIME: Annotated[float, Field(ge=0)]
+    RECONCILIATION_LEASE_TTL: Annotated[int, Field(ge=1)]
+
+    # Event dedup partitions
+    EVENT_PARTITION_SPAN: Annotated[int, Field(ge=1)]
+    EVENT_PARTITIONS_AHEAD: Annotated[int, Field(ge=1)]
+    EVENT_PARTITION_CHECK_INTERVAL: Annotated[float, Field(gt=0)]
+    EVENT_PARTITION_LOCK_TIMEOUT: Annotated[int, Field(ge=1)]
+    EVENT_PARTITION_LEASE_TTL: Annotated[int, Field(ge=1)]
+
+    # Supervisor
+    SUPERVISOR_POLL_INTERVAL: Annotated[float, Field(gt=0)]
+    SUPERVISOR_BASE_RESTART_BACKOFF: Annotated[float, Field(gt=0)]
+    SUPERVISOR_MAXIMUM_RESTART_BACKOFF: Annotated[float, Field(gt=0)]
+    SUPERVISOR_STABLE_RUNTIME: Annotated[float, Field(ge=0)]
+
     # Others
     GRACEFUL_SHUTDOWN_PERIOD: Annotated[float, Field(ge=0)]
 
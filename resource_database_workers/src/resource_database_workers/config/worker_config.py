@@ -84,7 +84,9 @@ class StreamWorkersConfig(BaseModel):
             reader_count: int | None = config_mapping[READERS_KEY][STREAM_KEY].get(
                 stream_name
             )
-            stream_mapping: dict[str, int] | None = config_mapping.get(stream_name)
+            stream_mapping: dict[str, int] | None = config_mapping[WORKERS_KEY][
+                STREAM_KEY
+            ].get(stream_name)
         if not reader_count:
             raise KeyError("No reader count found for stream:", stream_name)
         if not stream_mapping:
@@ -95,3 +97,17 @@ class StreamWorkersConfig(BaseModel):
             READER_COUNT=reader_count,
             EVENT_WORKER_COUNT_MAPPING=cls.normalize_config_mapping(stream_mapping),
         )
+
+    @classmethod
+    def construct_all_from_toml(cls, toml_filepath: str) -> tuple[Self, ...]:
+        """
+        Construct configs for every stream that has a reader count in the TOML file
+        """
+        with open(toml_filepath, "r", encoding="utf-8") as toml_file:
+            stream_names: dict[str, int] = tomllib.loads(toml_file.read())[READERS_KEY][
+                STREAM_KEY
+            ]
+        return tuple(
+            cls.construct_from_toml(toml_filepath, StreamName(stream_name))
+            for stream_name in stream_names
+        )
@@ -0,0 +1,129 @@
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import math
+import time
+from typing import Generator
+
+from resource_auxillary.event_processing.metrics import (
+    APPLY_LATENCY_QUANTILE,
+    BATCH_LIMIT_ADJUSTMENTS,
+    BATCH_SIZE_LIMIT,
+    BATCH_WAIT_LIMIT,
+)
+
+
+@dataclass(slots=True)
+class AdaptiveBatchController:
+    """
+    Per-queue batch size limit driven by additive-increase/multiplicative-decrease
+    against a p99 apply latency target.
+
+    The limit grows additively while batches fill up to it and the p99 of recent
+    apply latencies stays under the target, and is cut multiplicatively as soon as
+    the target is exceeded. Batches that fill less than half the limit shrink it
+    too, so that off-peak traffic is not held back waiting for batches that will
+    never fill. The waiting time shrinks along with the limit, from the maximum
+    waiting time at the initial limit.
+
+    Satisfies SupportsInternalQueueConsumerPolicy, and can be passed in place of
+    the worker config when populating batches from an internal queue
+    """
+
+    queue_name: str
+    target_latency: float
+    minimum_batch_size: int
+    maximum_batch_size: int
+    initial_batch_size: int
+    additive_increase: int
+    multiplicative_decrease: float
+    minimum_waiting_time: float
+    maximum_waiting_time: float
+    get_timeout: float
+    sleep_interval: float
+    window_size: int
+    adaptive: bool = True
+    batch_size: int = field(init=False)
+    waiting_time: float = field(init=False)
+    latencies: deque[float] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.maximum_batch_size = max(self.maximum_batch_size, self.initial_batch_size)
+        self.batch_size = self.initial_batch_size
+        self.latencies = deque(maxlen=self.window_size)
+        self.waiting_time = self.resolve_waiting_time()
+        self._publish()
+
+    @property
+    def IQ_CONSUMER_BATCH_SIZE_QUOTA(self) -> int:
+        return self.batch_size
+
+    @property
+    def IQ_CONSUMER_BASE_WAITING_TIME(self) -> float:
+        return self.waiting_time
+
+    @property
+    def IQ_CONSUMER_GET_TIMEOUT(self) -> float:
+        return self.get_timeout
+
+    @property
+    def IQ_CONSUMER_SLEEP_INTERVAL(self) -> float:
+        return self.sleep_interval
+
+    def resolve_latency_quantile(self, quantile: float = 0.99) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered_latencies: list[float] = sorted(self.latencies)
+        rank: int = math.ceil(quantile * len(ordered_latencies)) - 1
+        return ordered_latencies[max(0, rank)]
+
+    def resolve_waiting_time(self) -> float:
+        return min(
+            self.maximum_waiting_time,
+            max(
+                self.minimum_waiting_time,
+                self.maximum_waiting_time * self.batch_size / self.initial_batch_size,
+            ),
+        )
+
+    def record(self, latency: float, batch_size: int) -> None:
+        self.latencies.append(latency)
+        latency_quantile: float = self.resolve_latency_quantile()
+        APPLY_LATENCY_QUANTILE.set(self.queue_name, value=latency_quantile)
+        if not self.adaptive:
+            return
+
+        previous_batch_size: int = self.batch_size
+        if latency_quantile > self.target_latency:
+            self.batch_size = int(self.batch_size * self.multiplicative_decrease)
+            # Samples taken at the old limit would keep triggering decreases
+            self.latencies.clear()
+        elif batch_size >= self.batch_size:
+            self.batch_size += self.additive_increase
+        elif batch_size < self.batch_size // 2:
+            self.batch_size = max(
+                2 * batch_size, int(self.batch_size * self.multiplicative_decrease)
+            )
+
+        self.batch_size = min(
+            self.maximum_batch_size, max(self.minimum_batch_size, self.batch_size)
+        )
+        if self.batch_size != previous_batch_size:
+            BATCH_LIMIT_ADJUSTMENTS.inc(
+                self.queue_name,
+                "increase" if self.batch_size > previous_batch_size else "decrease",
+            )
+            self.waiting_time = self.resolve_waiting_time()
+            self._publish()
+
+    @contextmanager
+    def measure(self, batch_size: int) -> Generator[None, None, None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - start, batch_size)
+
+    def _publish(self) -> None:
+        BATCH_SIZE_LIMIT.set(self.queue_name, value=self.batch_size)
+        BATCH_WAIT_LIMIT.set(self.queue_name, value=self.waiting_time)
@@ -20,11 +20,14 @@ class DeadCounterBatch:
         instance.column = payload["column"]
         instance.failure_time = datetime.fromisoformat(payload["failure_time"])
 
-        counters = orjson.loads(payload["counters"])
+        counters: Mapping[str, Any] | str | bytes = payload["counters"]
+        if isinstance(counters, (str, bytes)):
+            counters = orjson.loads(counters)
+        # Identifiers are keys, and come back as strings from JSON
         for k, v in counters.items():
-            if not (isinstance(k, int) and isinstance(v, int)):
+            if not (str(k).isdigit() and isinstance(v, int)):
                 raise ValueError("Invalid counter data (non-int)")
-        instance.counters = counters
+        instance.counters = {int(k): v for k, v in counters.items()}
 
         return instance
 
@@ -47,7 +50,7 @@ class DeadCounterBatch:
         return {
             "table": self.table,
             "column": self.column,
-            "counters": orjson.dumps(self.counters),
+            "counters": orjson.dumps(self.counters, option=orjson.OPT_NON_STR_KEYS),
             "failure_time": self.failure_time.isoformat(),
         }
 
@@ -55,6 +58,6 @@ class DeadCounterBatch:
         return {
             "table": self.table,
             "column": self.column,
-            "counters": self.counters,
+            "counters": {str(k): v for k, v in self.counters.items()},
             "failure_time": self.failure_time.isoformat(),
         }
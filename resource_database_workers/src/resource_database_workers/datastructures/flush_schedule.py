@@ -0,0 +1,45 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class AdaptiveFlushSchedule:
+    """
+    Per-group flush interval that backs off exponentially while a group stays
+    empty, and tightens as the number of pending deltas approaches the target
+    """
+
+    minimum_interval: float
+    maximum_interval: float
+    target_size: int
+    intervals: dict[str, float] = field(default_factory=dict)
+    due_times: dict[str, float] = field(default_factory=dict)
+
+    def resolve_due_groups(self, groups: set[str]) -> list[str]:
+        now: float = time.monotonic()
+        return [group for group in groups if self.due_times.get(group, 0) <= now]
+
+    def record_flush(self, group: str, pending_deltas: int) -> float:
+        interval: float = self.intervals.get(group, self.minimum_interval)
+        if not pending_deltas:
+            interval *= 2
+        else:
+            # Scale towards the interval at which target_size deltas accumulate
+            interval *= min(2.0, max(0.5, self.target_size / pending_deltas))
+
+        interval = min(self.maximum_interval, max(self.minimum_interval, interval))
+        self.intervals[group] = interval
+        self.due_times[group] = time.monotonic() + interval
+        return interval
+
+    def resolve_sleep_time(self, groups: set[str], ceiling: float) -> float:
+        if not groups:
+            return ceiling
+        now: float = time.monotonic()
+        earliest_due: float = min(self.due_times.get(group, now) for group in groups)
+        return min(ceiling, max(0.0, earliest_due - now))
+
+    def discard(self, groups: set[str]) -> None:
+        for group in groups:
+            self.intervals.pop(group, None)
+            self.due_times.pop(group, None)
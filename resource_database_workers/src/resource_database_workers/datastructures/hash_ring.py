@@ -0,0 +1,46 @@
+import bisect
+import hashlib
+from dataclasses import dataclass, field
+from typing import Iterable, Self
+
+
+def _stable_hash(key: str) -> int:
+    # Built-in hash() is salted per process, so ring positions would
+    # disagree across counter workers running in different processes
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+@dataclass(slots=True)
+class ConsistentHashRing:
+    """
+    Consistent hashing ring mapping keys (counter groups) to members (workers),
+    such that a change in membership only moves the keys of the affected member
+    """
+
+    virtual_nodes: int
+    members: frozenset[str] = field(default_factory=frozenset)
+    _positions: list[int] = field(default_factory=list, repr=False)
+    _owners: list[str] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def construct_from_members(cls, members: Iterable[str], virtual_nodes: int) -> Self:
+        instance = cls(virtual_nodes=virtual_nodes, members=frozenset(members))
+        ring: list[tuple[int, str]] = sorted(
+            (_stable_hash(f"{member}#{replica}"), member)
+            for member in instance.members
+            for replica in range(virtual_nodes)
+        )
+        instance._positions = [position for position, _ in ring]
+        instance._owners = [member for _, member in ring]
+        return instance
+
+    def resolve_owner(self, key: str) -> str | None:
+        if not self._positions:
+            return None
+        index: int = bisect.bisect(self._positions, _stable_hash(key))
+        return self._owners[index % len(self._owners)]
+
+    def resolve_owned_keys(self, member: str, keys: Iterable[str]) -> set[str]:
+        return {key for key in keys if self.resolve_owner(key) == member}
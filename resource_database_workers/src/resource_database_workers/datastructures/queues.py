@@ -1,6 +1,6 @@
 from asyncio import Queue
 import asyncio
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from functools import cached_property
 from types import MappingProxyType
 
@@ -13,7 +13,9 @@ from resource_auxillary.strings import StreamName
 from resource_database_workers.datastructures.dead_counter_batch import DeadCounterBatch
 
 
-@dataclass(slots=True, frozen=True)
+# Not slotted, cached properties need an instance dict and the singleton
+# metaclass a weak reference
+@dataclass(frozen=True)
 class QueueRegistry(metaclass=SingletonMetaclass):
     # Strong entity insertions
     post_insertions: Queue[tuple[StreamedEvent]] = field(default_factory=Queue)
@@ -136,3 +138,9 @@ class QueueRegistry(metaclass=SingletonMetaclass):
             return self.downstream_deletion_event_queue_apping
         else:
             return self.event_queue_mapping
+
+    def resolve_queue_name(self, queue: Queue) -> str:
+        for queue_field in fields(self):
+            if getattr(self, queue_field.name) is queue:
+                return queue_field.name
+        raise ValueError("Queue is not part of the registry")
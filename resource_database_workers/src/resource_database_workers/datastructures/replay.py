@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from hashlib import blake2b
+from types import MappingProxyType
+from typing import Callable, Final, NamedTuple
+
+from resource_auxillary.datastructures.database import (
+    DeadLetterQueueLiteral,
+    EventLiteral,
+    GenericLiterals,
+    SideEffectType,
+)
+from resource_auxillary.strings import EventName
+
+from resource_database_workers.utils.strings import INTERNAL_NAME_SEPERATOR
+
+
+class ReplaySource(StrEnum):
+    """DLQ tables that dead events can be replayed from"""
+
+    EVENTS = "events"
+    COUNTERS = "counters"
+    SIDE_EFFECTS = "side-effects"
+
+
+class ReplaySourceMetadata(NamedTuple):
+    table: DeadLetterQueueLiteral
+    # Unique, ordered column used to paginate and checkpoint replays
+    keyset_column: str
+    keyset_type: Callable[[str], str | int]
+    columns: tuple[str, ...]
+    time_column: str | None
+
+
+REPLAY_SOURCE_METADATA: Final[MappingProxyType[ReplaySource, ReplaySourceMetadata]] = (
+    MappingProxyType(
+        {
+            ReplaySource.EVENTS: ReplaySourceMetadata(
+                table=DeadLetterQueueLiteral.TABLE_NAME,
+                keyset_column=EventLiteral.EVENT_ID_COLUMN_NAME,
+                keyset_type=str,
+                columns=(
+                    EventLiteral.EVENT_ID_COLUMN_NAME,
+                    DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME,
+                ),
+                time_column=DeadLetterQueueLiteral.COUNTERS_FAILURE_TIME_COLUMN_NAME,
+            ),
+            ReplaySource.COUNTERS: ReplaySourceMetadata(
+                table=DeadLetterQueueLiteral.COUNTERS_TABLE_NAME,
+                keyset_column=GenericLiterals.ID,
+                keyset_type=int,
+                columns=(
+                    GenericLiterals.ID,
+                    DeadLetterQueueLiteral.COUNTERS_AFFECTED_RELATION_COLUMN_NAME,
+                    DeadLetterQueueLiteral.COUNTERS_AFFECTED_COLUMN_COLUMN_NAME,
+                    DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME,
+                ),
+                time_column=DeadLetterQueueLiteral.COUNTERS_FAILURE_TIME_COLUMN_NAME,
+            ),
+            ReplaySource.SIDE_EFFECTS: ReplaySourceMetadata(
+                table=DeadLetterQueueLiteral.FAILED_SIDE_EFFECTS_TABLE_NAME,
+                keyset_column=GenericLiterals.ID,
+                keyset_type=int,
+                columns=(
+                    GenericLiterals.ID,
+                    EventLiteral.EVENT_ID_COLUMN_NAME,
+                    DeadLetterQueueLiteral.SIDE_EFFECT_TYPE_COLUMN_NAME,
+                    DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME,
+                ),
+                time_column=None,
+            ),
+        }
+    )
+)
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ReplayFilter:
+    source: ReplaySource
+    since: datetime | None = None
+    until: datetime | None = None
+    event_names: tuple[EventName, ...] = field(default_factory=tuple)
+    side_effect_types: tuple[SideEffectType, ...] = field(default_factory=tuple)
+    counter_tables: tuple[str, ...] = field(default_factory=tuple)
+
+    def __post_init__(self) -> None:
+        metadata: ReplaySourceMetadata = REPLAY_SOURCE_METADATA[self.source]
+        if (self.since or self.until) and not metadata.time_column:
+            raise ValueError(f"Replay source {self.source} has no failure time")
+        if self.event_names and self.source != ReplaySource.EVENTS:
+            raise ValueError("Event names can only be filtered for failed events")
+        if self.side_effect_types and self.source != ReplaySource.SIDE_EFFECTS:
+            raise ValueError(
+                "Side effect types can only be filtered for failed side effects"
+            )
+        if self.counter_tables and self.source != ReplaySource.COUNTERS:
+            raise ValueError("Counter tables can only be filtered for failed counters")
+
+    def derive_checkpoint_name(self, prefix: str) -> str:
+        """Checkpoint key unique to this combination of filters"""
+        digest: str = blake2b(repr(self).encode("utf-8"), digest_size=8).hexdigest()
+        return INTERNAL_NAME_SEPERATOR.join((prefix, self.source, digest))
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from itertools import cycle, islice
+from typing import Sequence
+
+from resource_database_workers.config.worker_config import (
+    CounterWorkersConfig,
+    StreamWorkersConfig,
+)
+from resource_database_workers.utils.strings import generate_worker_name
+
+type t_worker_config = CounterWorkersConfig | StreamWorkersConfig
+
+
+@dataclass(slots=True, frozen=True)
+class WorkerShard:
+    """
+    Set of worker configs run together by a single supervised process
+    """
+
+    index: int
+    worker_configs: tuple[t_worker_config, ...]
+
+    @property
+    def name(self) -> str:
+        return generate_worker_name("shard", self.index)
+
+
+def plan_worker_shards(
+    worker_configs: Sequence[t_worker_config], process_count: int
+) -> tuple[WorkerShard, ...]:
+    """
+    Deal worker configs round-robin across processes.
+
+    When there are more processes than configs, configs are dealt again so that no
+    process idles. Replicas of a stream config join the same consumer group, and
+    replicas of the counter config join the same counter ownership ring, so Redis
+    splits their work instead of duplicating it.
+    """
+    if process_count < 1:
+        raise ValueError("Process count must be at least 1")
+    if not worker_configs:
+        raise ValueError("No worker configs to shard")
+
+    assignments: list[list[t_worker_config]] = [[] for _ in range(process_count)]
+    for i, worker_config in enumerate(
+        islice(cycle(worker_configs), max(process_count, len(worker_configs)))
+    ):
+        assignments[i % process_count].append(worker_config)
+
+    return tuple(
+        WorkerShard(index, tuple(assignment))
+        for index, assignment in enumerate(assignments, start=1)
+    )
@@ -69,3 +69,12 @@ STREAM_EVENT_MAPPING: Final[MappingProxyType[StreamName, tuple[EventName, ...]]]
         }
     )
 )
+
+# Originating stream of every event, for re-injecting dead events
+EVENT_STREAM_MAPPING: Final[MappingProxyType[EventName, StreamName]] = MappingProxyType(
+    {
+        event_name: stream_name
+        for stream_name, event_names in STREAM_EVENT_MAPPING.items()
+        for event_name in event_names
+    }
+)
@@ -0,0 +1,39 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """
+    Token bucket rate limiter, refilled continuously at `rate` tokens per second
+    up to `capacity` tokens
+    """
+
+    rate: float
+    capacity: float
+    tokens: float = field(init=False)
+    updated_at: float = field(init=False, default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+        self.tokens = self.capacity
+
+    def _refill(self) -> None:
+        now: float = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Cannot acquire {tokens} tokens, bucket capacity is {self.capacity}"
+            )
+        self._refill()
+        while self.tokens < tokens:
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= tokens
@@ -5,7 +5,6 @@ from typing import Any, Final, LiteralString, Mapping
 from uuid import uuid4
 
 from psycopg_pool import AsyncConnectionPool
-from psycopg.sql import Composed
 
 from redis.asyncio import Redis
 
@@ -23,18 +22,15 @@ from resource_database_workers.dependencies import (
     get_queue_registry,
 )
 from resource_database_workers.datastructures.queues import QueueRegistry
-from resource_database_workers.utils.sql_templates import (
-    format_dlq_insertion_sql,
-    format_counters_dlq_insertion_sql,
-    format_failed_side_effects_sql,
-)
 from resource_database_workers.tasks.deletions import (
     downstream_soft_delete_strong_entity,
+    soft_delete_strong_entity,
 )
 from resource_database_workers.tasks.insertions import (
     batch_insert_with_isolation,
 )
 from resource_database_workers.utils.typing import (
+    BatchDeletionFunction,
     BatchDownstreamDeletionFunction,
     BatchInsertionFunction,
     t_action_literal,
@@ -59,6 +55,7 @@ class UpstreamDeletionInput(BaseInput):
     identifier_column: str = field(default=GenericLiterals.ID.value)
     config: AppConfig = field(default_factory=get_config)
     redis: Redis = field(default_factory=get_app_redis)
+    batch_function: BatchDeletionFunction = field(default=soft_delete_strong_entity)
 
 
 @dataclass(slots=True, kw_only=True)
@@ -95,6 +92,9 @@ class UpstreamDispatcherInput(BaseInput):
         EventName,
         asyncio.Queue[tuple[StreamedEvent, ...]] | asyncio.Queue[StreamedEvent],
     ]
+    dead_letter_queue: asyncio.Queue[StreamedEvent] = field(
+        default=QUEUE_REGISTRY.dead_letter
+    )
     read_history: bool = field(default=True)
     consumer_name: str = field(default_factory=lambda: uuid4().hex)
 
@@ -104,6 +104,9 @@ class DownstreamDispatcherInput(BaseInput):
     config: AppConfig = field(default_factory=get_config)
     redis: Redis = field(default_factory=get_internal_redis)
     queue_mapping: Mapping[EventName, asyncio.Queue[StreamedEvent]]
+    dead_letter_queue: asyncio.Queue[StreamedEvent] = field(
+        default=QUEUE_REGISTRY.dead_letter
+    )
     read_history: bool = field(default=True)
     consumer_name: str = field(default_factory=lambda: uuid4().hex)
 
@@ -228,33 +231,19 @@ class DeadLetterQueueWorkerInput:
     group_name: str = field(default=get_config().WORKER.CONSUMER_GROUP_NAME)
     stream_name: StreamName = field(default=StreamName.DEAD_LETTER_QUEUE)
     queue: asyncio.Queue[StreamedEvent]
-    composed_statement: Composed
 
 
-STANDARD_DLQ_WORKER_INPUT: Final[DeadLetterQueueWorkerInput] = (
-    DeadLetterQueueWorkerInput(
-        queue=QUEUE_REGISTRY.dead_letter, composed_statement=format_dlq_insertion_sql()
-    )
-)
-
-COUNTERS_DLQ_WORKER_INPUT: Final[DeadLetterQueueWorkerInput] = (
-    DeadLetterQueueWorkerInput(
-        queue=QUEUE_REGISTRY.dead_letter,
-        composed_statement=format_counters_dlq_insertion_sql(),
-    )
-)
-
-SIDE_EFFECTS_DLQ_WORKER_INPUT: Final[DeadLetterQueueWorkerInput] = (
-    DeadLetterQueueWorkerInput(
-        queue=QUEUE_REGISTRY.dead_letter,
-        composed_statement=format_failed_side_effects_sql(),
-    )
+# DLQ workers route every event to its table themselves
+DLQ_WORKER_INPUT: Final[DeadLetterQueueWorkerInput] = DeadLetterQueueWorkerInput(
+    queue=QUEUE_REGISTRY.dead_letter
 )
 
 
 @dataclass(slots=True, kw_only=True)
 class CounterWorkerInput:
     config: AppConfig = field(default_factory=get_config)
+    pool: AsyncConnectionPool = field(default_factory=get_connection_pool)
+    dlq_stream_name: StreamName = field(default=StreamName.DEAD_LETTER_QUEUE)
     worker_redis: Redis = field(default_factory=get_internal_redis)
     server_redis: Redis = field(default_factory=get_app_redis)
 
@@ -266,7 +255,7 @@ WORKER_INPUT_DATA_MAPPING: Final[MappingProxyType[EventName, Any]] = MappingProx
         EventName.POST_CREATE: POST_CREATION_INPUT,
         EventName.COMMENT_CREATE: COMMENT_CREATION_INPUT,
         # Strong entity deletions
-        EventName.POST_DELETE: UPSTREAM_COMMENT_DELETION_INPUT,
+        EventName.POST_DELETE: UPSTREAM_POST_DELETION_INPUT,
         EventName.COMMENT_DELETE: UPSTREAM_COMMENT_DELETION_INPUT,
         EventName.FORUM_DELETE: UPSTREAM_FORUM_DELETION_INPUT,
         EventName.USER_CLEANUP: USER_CLEANUP_INPUT,
@@ -290,7 +279,7 @@ WORKER_INPUT_DATA_MAPPING: Final[MappingProxyType[EventName, Any]] = MappingProx
         EventName.DOWNSTREAM_FORUM_POST_DECREMENT: DOWNSTREAM_FORUMS_POSTS_COUNTER_DECREMENT,
         EventName.DOWNSTREAM_POST_COMMENT_DECREMENT: DOWNSTREAM_POSTS_COMMENTS_COUNTER_DECREMENT,
         # Dead Letter Queues
-        EventName.DLQ_COUNTER: COUNTERS_DLQ_WORKER_INPUT,
-        EventName.DLQ_SIDE_EFFECTS: SIDE_EFFECTS_DLQ_WORKER_INPUT,
+        EventName.DLQ_COUNTER: DLQ_WORKER_INPUT,
+        EventName.DLQ_SIDE_EFFECTS: DLQ_WORKER_INPUT,
     }
 )
@@ -1,10 +1,14 @@
+import asyncio
 from functools import lru_cache
 import os
 
 from psycopg_pool import AsyncConnectionPool
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.batch_controller import (
+    AdaptiveBatchController,
+)
 from resource_database_workers.datastructures.queues import QueueRegistry
 
 
@@ -17,7 +21,10 @@ def get_config() -> AppConfig:
 def get_app_redis() -> Redis:
     app: AppConfig = get_config()
     return Redis(
-        host=str(app.REDIS.APP.HOST), port=app.REDIS.APP.PORT, db=app.REDIS.APP.DB
+        connection_pool=BlockingConnectionPool(
+            **app.REDIS.APP.to_constructor_kwargs(),
+            **app.REDIS.APP.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
@@ -25,9 +32,10 @@ def get_app_redis() -> Redis:
 def get_internal_redis() -> Redis:
     app: AppConfig = get_config()
     return Redis(
-        host=str(app.REDIS.INTERNAL.HOST),
-        port=app.REDIS.INTERNAL.PORT,
-        db=app.REDIS.INTERNAL.DB,
+        connection_pool=BlockingConnectionPool(
+            **app.REDIS.INTERNAL.to_constructor_kwargs(),
+            **app.REDIS.INTERNAL.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
@@ -39,12 +47,46 @@ def get_queue_registry() -> QueueRegistry:
 @lru_cache(maxsize=1)
 def get_connection_pool() -> AsyncConnectionPool:
     config = get_config()
-    uri: str = config.DATABASE.derive_sqlalchemy_uri(
+    conninfo: str = config.DATABASE.derive_conninfo(
         os.environ["POSTGRES_USERNAME"],
         os.environ["POSTGRES_PASSWORD"],
     )
 
+    # Worker inputs are built at import time, outside of any event loop, so the pool
+    # is only opened once the loop that uses it is running
     return AsyncConnectionPool(
-        conninfo=uri,
+        conninfo=conninfo,
+        open=False,
         **config.DATABASE.emit_connection_pool_constructor_kwargs(),  # type: ignore
     )
+
+
+async def open_connection_pool() -> AsyncConnectionPool:
+    pool: AsyncConnectionPool = get_connection_pool()
+    await pool.open()
+    return pool
+
+
+@lru_cache(maxsize=None)
+def get_batch_controller(
+    queue: asyncio.Queue, initial_batch_size: int
+) -> AdaptiveBatchController:
+    """
+    Batch controller for an internal queue, shared by all of its consumers
+    """
+    config: AppConfig = get_config()
+    return AdaptiveBatchController(
+        queue_name=get_queue_registry().resolve_queue_name(queue),
+        target_latency=config.WORKER.BATCH_TARGET_APPLY_LATENCY,
+        minimum_batch_size=config.WORKER.BATCH_MIN_SIZE,
+        maximum_batch_size=config.WORKER.BATCH_MAX_SIZE,
+        initial_batch_size=initial_batch_size,
+        additive_increase=config.WORKER.BATCH_ADDITIVE_INCREASE,
+        multiplicative_decrease=config.WORKER.BATCH_MULTIPLICATIVE_DECREASE,
+        minimum_waiting_time=config.WORKER.BATCH_MIN_WAITING_TIME,
+        maximum_waiting_time=config.WORKER.IQ_CONSUMER_BASE_WAITING_TIME,
+        get_timeout=config.WORKER.IQ_CONSUMER_GET_TIMEOUT,
+        sleep_interval=config.WORKER.IQ_CONSUMER_SLEEP_INTERVAL,
+        window_size=config.WORKER.BATCH_LATENCY_WINDOW,
+        adaptive=config.WORKER.ADAPTIVE_BATCHING,
+    )
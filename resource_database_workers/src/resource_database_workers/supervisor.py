@@ -0,0 +1,146 @@
+"""Multi-process supervision of worker shards"""
+
+import asyncio
+from dataclasses import dataclass
+import multiprocessing
+from multiprocessing.context import SpawnProcess
+import os
+import signal
+import sys
+import time
+from typing import Final, Sequence
+
+from resource_auxillary.coordination import calculate_exponential_backoff_time
+from resource_auxillary.datastructures.status_indicator import StatusController
+
+from resource_database_workers.bootup import spawn_tasks
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.shards import WorkerShard
+from resource_database_workers.dependencies import get_config
+
+# Spawn rather than fork, so that every child builds its own
+# Redis clients and connection pool instead of inheriting the supervisor's
+_PROCESS_CONTEXT: Final = multiprocessing.get_context("spawn")
+
+
+def _run_shard(shard: WorkerShard) -> None:
+    app_config: AppConfig = get_config()
+    try:
+        app_config.WORKER.run(
+            spawn_tasks(
+                app_config, *shard.worker_configs, metrics_port_offset=shard.index
+            )
+        )
+    except KeyboardInterrupt:
+        # Sent by the supervisor on shutdown
+        pass
+
+
+@dataclass(slots=True)
+class _SupervisedShard:
+    shard: WorkerShard
+    process: SpawnProcess | None = None
+    started_at: float = 0
+    failures: int = 0
+    restart_at: float = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self) -> None:
+        self.process = _PROCESS_CONTEXT.Process(
+            target=_run_shard, args=(self.shard,), name=self.shard.name
+        )
+        self.process.start()
+        self.started_at = time.monotonic()
+
+    def reap(self, config: AppConfig, now: float) -> None:
+        """
+        Release an exited child and schedule its replacement
+        """
+        assert self.process is not None  # nosec
+        exitcode: int | None = self.process.exitcode
+        self.process.close()
+        self.process = None
+
+        if now - self.started_at >= config.WORKER.SUPERVISOR_STABLE_RUNTIME:
+            self.failures = 0
+        backoff: float = calculate_exponential_backoff_time(
+            config.WORKER.SUPERVISOR_MAXIMUM_RESTART_BACKOFF,
+            config.WORKER.SUPERVISOR_BASE_RESTART_BACKOFF,
+            self.failures,
+            exponential=config.WORKER.BACKOFF_EXPONENTIAL,
+        )
+        self.failures += 1
+        self.restart_at = now + backoff
+        print(
+            f"{self.shard.name} exited with code {exitcode}, restarting in {backoff}s",
+            file=sys.stderr,
+        )
+
+
+def _stop_shards(
+    supervised_shards: Sequence[_SupervisedShard], graceful_shutdown_period: float
+) -> None:
+    running: tuple[SpawnProcess, ...] = tuple(
+        supervised.process
+        for supervised in supervised_shards
+        if supervised.process is not None and supervised.alive
+    )
+    for process in running:
+        if process.pid is not None:
+            os.kill(process.pid, signal.SIGINT)
+
+    deadline: float = time.monotonic() + graceful_shutdown_period
+    for process in running:
+        process.join(max(0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+async def supervise_shards(
+    app_config: AppConfig,
+    shards: Sequence[WorkerShard],
+    status_controller: StatusController,
+) -> None:
+    """
+    Run every shard in its own process until SIGINT/SIGTERM.
+
+    A failed child is restarted with exponential backoff without disturbing its
+    siblings, and `status_controller` reports OK only while every shard is running.
+    """
+    supervised_shards: Final[tuple[_SupervisedShard, ...]] = tuple(
+        _SupervisedShard(shard) for shard in shards
+    )
+    shutdown: Final[asyncio.Event] = asyncio.Event()
+    loop: Final[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, shutdown.set)
+
+    try:
+        while not shutdown.is_set():
+            now: float = time.monotonic()
+            for supervised in supervised_shards:
+                if supervised.process is not None and not supervised.alive:
+                    supervised.reap(app_config, now)
+                if supervised.process is None and now >= supervised.restart_at:
+                    supervised.start()
+
+            status_controller.status_ok = all(
+                supervised.alive for supervised in supervised_shards
+            )
+            try:
+                await asyncio.wait_for(
+                    shutdown.wait(), app_config.WORKER.SUPERVISOR_POLL_INTERVAL
+                )
+            except TimeoutError:
+                pass
+    finally:
+        status_controller.status_ok = False
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+        await asyncio.to_thread(
+            _stop_shards, supervised_shards, app_config.WORKER.GRACEFUL_SHUTDOWN_PERIOD
+        )
@@ -1,5 +1,6 @@
 import asyncio
 from datetime import datetime
+import itertools
 import time
 from typing import Generator
 
@@ -9,12 +10,14 @@ from redis.asyncio import Redis
 from redis.exceptions import RedisError, ExceptionType
 
 from resource_auxillary.coordination import exponential_jittered_backoff
-from resource_auxillary.datastructures.database import StrongEntity
+from resource_auxillary.datastructures.database import CopyFormat, StrongEntity
 from resource_auxillary.events import StreamedEvent
 from resource_auxillary.event_processing.pre_processing import (
     trim_duplicate_events,
     populate_events_batch_from_queue,
+    populate_events_batch_from_event_queue,
 )
+from resource_auxillary.event_processing.metrics import BATCH_SIZE, STAGE_LATENCY
 from resource_auxillary.event_processing.qos import execute_with_redis_retries
 from resource_auxillary.event_processing.wrappers import (
     ack_with_retries,
@@ -25,6 +28,10 @@ from resource_auxillary.strings import StreamName
 from resource_auxillary.constants import POTENTIAL_TRANSIENT_ERRORS
 
 from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.batch_controller import (
+    AdaptiveBatchController,
+)
+from resource_database_workers.dependencies import get_batch_controller
 from resource_auxillary.event_processing.db_qos import (
     batch_dedup_insert_events,
     dedup_insert_event,
@@ -61,6 +68,7 @@ async def user_orphan_consumer(
 ) -> None:
     batch: list[StreamedEvent] = []
     reference_time: float = time.monotonic()
+    copy_format: CopyFormat = config.WORKER.resolve_copy_format(stream_name)
 
     while True:
         await populate_events_batch_from_queue(
@@ -70,7 +78,10 @@ async def user_orphan_consumer(
         # Database connection only needed for deduplication
         async with pool.connection() as conn:
             fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
-                conn, (e.event_id for e in batch)
+                conn,
+                (e.event_id for e in batch),
+                config.WORKER.DEDUP_WINDOW,
+                copy_format=copy_format,
             )
 
         await trim_duplicate_events(
@@ -146,28 +157,43 @@ async def queue_insertion_consumer(
 ) -> None:
     batch: list[StreamedEvent] = []
     reference_time: float = time.monotonic()
+    copy_format: CopyFormat = config.WORKER.resolve_copy_format(stream_name)
+    batch_controller: AdaptiveBatchController = get_batch_controller(
+        queue, config.WORKER.IQ_CONSUMER_BATCH_SIZE_QUOTA
+    )
 
     while True:
         await populate_events_batch_from_queue(
-            config.WORKER, queue, reference_time, batch
+            batch_controller, queue, reference_time, batch
         )
         async with pool.connection() as conn:
             # Perform deduplication
-            fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
-                conn, (e.event_id for e in batch)
-            )
-            await trim_duplicate_events(
-                redis, batch, fresh_event_ids, stream_name, group_name
-            )
+            with STAGE_LATENCY.time(stream_name, "dedup"):
+                fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
+                    conn,
+                    (e.event_id for e in batch),
+                    config.WORKER.DEDUP_WINDOW,
+                    copy_format=copy_format,
+                )
+                await trim_duplicate_events(
+                    redis, batch, fresh_event_ids, stream_name, group_name
+                )
             if not batch:
                 continue
 
+            BATCH_SIZE.observe(stream_name, "apply", value=len(batch))
             inserted_ids: list[int] = []  # Populated in-place by batch_function
             insertion_callable = lambda: batch_function(
-                conn, batch, inserted_ids, action
+                conn, batch, inserted_ids, action, copy_format
             )
             try:
-                await db_execute_with_retries(config.WORKER, conn, insertion_callable)
+                with (
+                    STAGE_LATENCY.time(stream_name, "apply"),
+                    batch_controller.measure(len(batch)),
+                ):
+                    await db_execute_with_retries(
+                        config.WORKER, conn, insertion_callable
+                    )
             except Exception:  # Entire batch failed
                 await declare_dead_with_retries(
                     redis,
@@ -220,14 +246,21 @@ async def queue_deletion_consumer(
 ) -> None:
     batch: list[StreamedEvent] = []
     reference_time: float = time.monotonic()
+    copy_format: CopyFormat = config.WORKER.resolve_copy_format(stream_name)
+    batch_controller: AdaptiveBatchController = get_batch_controller(
+        queue, config.WORKER.IQ_CONSUMER_BATCH_SIZE_QUOTA
+    )
 
     while True:
         await populate_events_batch_from_queue(
-            config.WORKER, queue, reference_time, batch
+            batch_controller, queue, reference_time, batch
         )
         async with pool.connection() as conn:
             fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
-                conn, (e.event_id for e in batch)
+                conn,
+                (e.event_id for e in batch),
+                config.WORKER.DEDUP_WINDOW,
+                copy_format=copy_format,
             )
             await trim_duplicate_events(
                 redis, batch, fresh_event_ids, stream_name, group_name
@@ -246,7 +279,10 @@ async def queue_deletion_consumer(
                 conn, table.value, identifier_column, deletion_data
             )
             try:
-                await db_execute_with_retries(config.WORKER, conn, deletion_callable)
+                with batch_controller.measure(len(batch)):
+                    await db_execute_with_retries(
+                        config.WORKER, conn, deletion_callable
+                    )
             except Exception:
                 await declare_dead_with_retries(
                     redis,
@@ -292,71 +328,136 @@ async def queue_downstream_deletion_consumer(
     group_name: str,
     dead_letter_stream_name: StreamName,
 ) -> None:
+    batch: list[StreamedEvent] = []
+    copy_format: CopyFormat = config.WORKER.resolve_copy_format(stream_name)
+    batch_controller: AdaptiveBatchController = get_batch_controller(
+        queue, config.WORKER.DOWNSTREAM_DELETION_BATCH_SIZE
+    )
     while True:
-        event: StreamedEvent = await queue.get()
-        try:
-            event_payload: DownstreamDeletionData = (
-                reconstruct_downstream_data_from_stream(event.payload)
-            )
-        except (KeyError, ValueError):
+        batch.clear()
+        await populate_events_batch_from_event_queue(
+            queue, batch, batch_controller.batch_size
+        )
+
+        # Orphans sharing a table and foreign key column are deleted together
+        deletion_groups: dict[
+            tuple[StrongEntity, str], list[tuple[StreamedEvent, DownstreamDeletionData]]
+        ] = {}
+        malformed_events: list[StreamedEvent] = []
+        for event in batch:
+            try:
+                event_payload: DownstreamDeletionData = (
+                    reconstruct_downstream_data_from_stream(event.payload)
+                )
+            except (KeyError, ValueError):
+                malformed_events.append(event)
+                continue
+            deletion_groups.setdefault(
+                (event_payload["orphan_table"], event_payload["foreign_key_column"]),
+                [],
+            ).append((event, event_payload))
+
+        if malformed_events:
             await declare_dead_with_retries(
                 redis,
                 config.WORKER,
-                (event,),
+                malformed_events,
                 stream_name,
                 group_name,
                 dead_letter_stream_name,
                 config.WORKER.MAX_RETRIES,
             )
+
+        if not deletion_groups:
             continue
 
+        processed_events: list[StreamedEvent] = []
+        failed_events: list[StreamedEvent] = []
+        processed_deletions: dict[StrongEntity, list[int]] = {}
         async with pool.connection() as conn:
-            # Deduplication
-            if not await dedup_insert_event(conn, event.event_id):
-                await redis.xack(stream_name, group_name, event.event_id)
-                continue
-
-            downstream_deletion_callable = lambda: batch_function(
+            fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
                 conn,
-                event_payload["foreign_key"],
-                event_payload["orphan_table"],
-                event_payload["foreign_key_column"],
-                event_payload["deleted_at"],
+                (
+                    event.event_id
+                    for event, _ in itertools.chain(*deletion_groups.values())
+                ),
+                config.WORKER.DEDUP_WINDOW,
+                copy_format=copy_format,
             )
+            await conn.commit()
+
+            duplicate_events: list[StreamedEvent] = []
+            apply_start: float = time.perf_counter()
+            for (orphan_table, foreign_key_column), group in deletion_groups.items():
+                fresh_group: list[tuple[StreamedEvent, DownstreamDeletionData]] = []
+                for event, event_payload in group:
+                    if event.event_id in fresh_event_ids:
+                        fresh_group.append((event, event_payload))
+                    else:
+                        duplicate_events.append(event)
+                if not fresh_group:
+                    continue
 
-            try:
-                await db_execute_with_retries(
-                    config.WORKER, conn, downstream_deletion_callable
-                )
-            except Exception:
-                # Single event tuple used in place of event
-                # for methods that process batches of events
-                await declare_dead_with_retries(
-                    redis,
-                    config.WORKER,
-                    (event,),
-                    stream_name,
-                    group_name,
-                    dead_letter_stream_name,
-                    config.WORKER.MAX_RETRIES,
+                deletion_data: list[tuple[int, int, datetime]] = [
+                    (
+                        event_payload["foreign_key"],
+                        event.event_id,
+                        event_payload["deleted_at"],
+                    )
+                    for event, event_payload in fresh_group
+                ]
+
+                async def _delete_group_orphans() -> None:
+                    # Each group commits on its own, so that one failing
+                    # group does not take the rest of the batch down with it
+                    async with conn.transaction():
+                        await batch_function(
+                            conn, orphan_table, foreign_key_column, deletion_data
+                        )
+
+                try:
+                    await db_execute_with_retries(
+                        config.WORKER, conn, _delete_group_orphans
+                    )
+                except Exception:
+                    failed_events.extend(event for event, _ in fresh_group)
+                    continue
+
+                processed_events.extend(event for event, _ in fresh_group)
+                processed_deletions.setdefault(orphan_table, []).extend(
+                    event.event_id for event, _ in fresh_group
                 )
-                continue
+            batch_controller.record(time.perf_counter() - apply_start, len(batch))
 
+        # Duplicates were processed before, and only need acknowledgement
+        processed_events.extend(duplicate_events)
+        if failed_events:
+            await declare_dead_with_retries(
+                redis,
+                config.WORKER,
+                failed_events,
+                stream_name,
+                group_name,
+                dead_letter_stream_name,
+                config.WORKER.MAX_RETRIES,
+            )
+        if processed_events:
             await ack_with_retries(
                 redis,
                 config.WORKER,
-                (event,),
+                processed_events,
                 stream_name,
                 group_name,
                 dead_letter_stream_name,
                 config.WORKER.MAX_RETRIES,
             )
 
+        for orphan_table, deletion_author_event_ids in processed_deletions.items():
             await dispatch_downstream_counter_decrements(
                 redis,
                 config.WORKER,
-                event_payload["orphan_table"],
-                event.event_id,
+                orphan_table,
+                deletion_author_event_ids,
                 dead_letter_stream_name,
             )
 
@@ -370,6 +471,9 @@ async def queue_downstream_decrement_consumer(
     group_name: str,
     dead_letter_stream_name: StreamName,
 ) -> None:
+    batch_controller: AdaptiveBatchController = get_batch_controller(
+        queue, config.WORKER.DOWNSTREAM_COUNTER_BATCH_SIZE
+    )
     while True:
         event: StreamedEvent = await queue.get()
         try:
@@ -388,29 +492,39 @@ async def queue_downstream_decrement_consumer(
             )
             continue
 
-        # Downstream counters may be too big to materialize all at once
-        limit, offset = config.WORKER.DOWNSTREAM_COUNTER_BATCH_SIZE, 0
+        # Downstream counters may be too big to materialize all at once.
+        # The keyset survives retries, so chunks already emitted are not re-emitted
+        last_foreign_key: int = 0
         exception: Exception | None = None
         async with pool.connection() as conn:
-            if not await dedup_insert_event(conn, event.event_id):
+            if not await dedup_insert_event(
+                conn, event.event_id, config.WORKER.DEDUP_WINDOW
+            ):
                 await redis.xack(stream_name, group_name, event.event_id)
                 continue
 
             for _attempt in range(1, config.WORKER.MAX_RETRIES + 1):
+                exception = None
                 try:
-                    # temp truthy tuple to enter loop
-                    # (hehe it kinda looks like a wink)
-                    results: list[tuple[str, int]] = [("", 0)]
-                    while results:
-                        results: list[tuple[str, int]] = await select_decrement_deltas(
+                    while True:
+                        # Chunks are sized by the controller, and only full
+                        # chunks say anything about whether the limit can grow
+                        limit: int = batch_controller.batch_size
+                        selection_start: float = time.perf_counter()
+                        results: list[tuple[int, int]] = await select_decrement_deltas(
                             conn,
                             event_payload["affected_column_name"],
                             limit,
-                            offset,
+                            last_foreign_key,
                             event_payload["affected_table_name"],
                             event_payload["deletion_author_event_id"],
                         )
-                        offset += limit
+                        if len(results) == limit:
+                            batch_controller.record(
+                                time.perf_counter() - selection_start, limit
+                            )
+                        if not results:
+                            break
 
                         emission_coroutine = (
                             lambda: emit_downstream_counter_decrement_updates(
@@ -423,6 +537,10 @@ async def queue_downstream_decrement_consumer(
                         await execute_with_redis_retries(
                             config.WORKER, emission_coroutine
                         )
+                        last_foreign_key = results[-1][0]
+                        if len(results) < limit:
+                            break
+                    break
                 except POTENTIAL_TRANSIENT_ERRORS as e:
                     exception = e
                     await conn.rollback()
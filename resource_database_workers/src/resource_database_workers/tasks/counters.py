@@ -1,12 +1,14 @@
 import asyncio
-import itertools
 import time
-from typing import Literal, MutableMapping
+from typing import AsyncIterator, Literal, MutableMapping
 
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 
 from psycopg_pool import AsyncConnectionPool
 
+from resource_auxillary.constants import POTENTIAL_TRANSIENT_ERRORS
+from resource_auxillary.event_processing.db_qos import dedup_insert_event
 from resource_auxillary.event_processing.qos import locked_operation
 from resource_auxillary.strings import NAME_SEPERATOR, StreamName
 
@@ -14,24 +16,37 @@ from resource_database_workers.config.config import AppConfig
 from resource_database_workers.datastructures.exceptions import (
     RecoverableDatabaseException,
 )
+from resource_database_workers.datastructures.flush_schedule import (
+    AdaptiveFlushSchedule,
+)
+from resource_database_workers.datastructures.hash_ring import ConsistentHashRing
 from resource_database_workers.workers.redis.declarations import (
     declare_counters_event_dead,
 )
 
 from resource_database_workers.workers.redis.cache import (
+    load_counter_reflection_script,
     reflect_processed_counters,
 )
 from resource_database_workers.workers.redis.counters import (
     retrieve_counter_group_names,
+    retrieve_pending_counter_sizes,
     dispatch_to_retrier,
+    release_worker_lease,
+    renew_worker_lease,
 )
 from resource_database_workers.workers.database.counters import (
     flush_counter_updates,
 )
 
 from resource_database_workers.utils.strings import (
+    decode_reply,
+    derive_chunk_key,
+    derive_chunk_token_key,
     derive_lock_key,
+    derive_snapshot_key,
     extract_batch_metadata,
+    generate_chunk_token,
 )
 
 
@@ -42,19 +57,14 @@ async def batch_update_retry_counters(
     worker_redis: Redis,
     server_redis: Redis,
 ) -> None:
+    await load_counter_reflection_script(server_redis)
     while True:
         batch_name: str = await worker_redis.blpop(config.WORKER.COUNTER_RETRY_REGISTRY_NAME)  # type: ignore
         if not batch_name:
             await asyncio.sleep(config.WORKER.COUNTER_FLUSH_INTERVAL)
             continue
-        counter_data: dict[str, int] | None = await batch_update_counter_group(
-            config, pool, batch_name, dlq_stream_name, worker_redis
-        )
-        if not counter_data:
-            continue
-
-        await reflect_processed_counters(
-            server_redis, extract_batch_metadata(batch_name)[0], counter_data
+        await batch_update_counter_group(
+            config, pool, batch_name, dlq_stream_name, worker_redis, server_redis
         )
 
 
@@ -64,36 +74,105 @@ async def batch_update_counters(
     dlq_stream_name: StreamName,
     worker_redis: Redis,
     server_redis: Redis,
+    worker_name: str,
 ) -> None:
+    """
+    Flush the counter groups assigned to this worker by consistent hashing over
+    all live counter workers. Workers hold heartbeat-renewed leases in the worker
+    registry, and groups are rebalanced whenever the set of live workers changes
+    """
+    await load_counter_reflection_script(server_redis)
+    schedule: AdaptiveFlushSchedule = AdaptiveFlushSchedule(
+        minimum_interval=config.WORKER.COUNTER_MIN_FLUSH_INTERVAL,
+        maximum_interval=config.WORKER.COUNTER_MAX_FLUSH_INTERVAL,
+        target_size=config.WORKER.COUNTER_FLUSH_TARGET_SIZE,
+    )
+    ring: ConsistentHashRing = ConsistentHashRing(
+        virtual_nodes=config.WORKER.COUNTER_RING_VIRTUAL_NODES
+    )
     counter_groups: set[str] = await retrieve_counter_group_names(
         worker_redis, config.WORKER.COUNTER_REGISTRY_NAME
     )
+    owned_groups: set[str] = set()
     refresh_time: int = int(time.monotonic())
-    for counter_group in itertools.cycle(counter_groups):
-        # Periodically refresh counter group names
-        # in the extremely rare case of a schema change
-        if (
-            int(time.monotonic()) - refresh_time
-            >= config.WORKER.COUNTER_REGISTRY_REFRESH_INTERVAL
-        ):
-            counter_groups: set[str] = await retrieve_counter_group_names(
-                worker_redis, config.WORKER.COUNTER_REGISTRY_NAME
-            )
-            refresh_time = int(time.monotonic())
+    heartbeat_time: float = float("-inf")
 
-        counter_data: dict[str, int] | None = await batch_update_counter_group(
-            config, pool, counter_group, dlq_stream_name, worker_redis
-        )
-        if not counter_data:
-            continue
+    try:
+        while True:
+            # Periodically refresh counter group names
+            # in the extremely rare case of a schema change
+            if (
+                int(time.monotonic()) - refresh_time
+                >= config.WORKER.COUNTER_REGISTRY_REFRESH_INTERVAL
+            ):
+                counter_groups = await retrieve_counter_group_names(
+                    worker_redis, config.WORKER.COUNTER_REGISTRY_NAME
+                )
+                refreshed_groups: set[str] = ring.resolve_owned_keys(
+                    worker_name, counter_groups
+                )
+                schedule.discard(owned_groups - refreshed_groups)
+                owned_groups = refreshed_groups
+                refresh_time = int(time.monotonic())
 
-        await reflect_processed_counters(server_redis, counter_group, counter_data)
+            if (
+                time.monotonic() - heartbeat_time
+                >= config.WORKER.COUNTER_WORKER_HEARTBEAT_INTERVAL
+            ):
+                live_workers: set[str] = await renew_worker_lease(
+                    worker_redis,
+                    config.WORKER.COUNTER_WORKER_REGISTRY_NAME,
+                    worker_name,
+                    config.WORKER.COUNTER_WORKER_LEASE_TTL,
+                )
+                heartbeat_time = time.monotonic()
+                if live_workers != ring.members:
+                    ring = ConsistentHashRing.construct_from_members(
+                        live_workers, config.WORKER.COUNTER_RING_VIRTUAL_NODES
+                    )
+                    rebalanced_groups: set[str] = ring.resolve_owned_keys(
+                        worker_name, counter_groups
+                    )
+                    schedule.discard(owned_groups - rebalanced_groups)
+                    owned_groups = rebalanced_groups
+
+            if due_groups := schedule.resolve_due_groups(owned_groups):
+                # HLEN is O(1), so empty groups are skipped without taking a lock
+                pending_sizes: dict[str, int] = await retrieve_pending_counter_sizes(
+                    worker_redis, due_groups
+                )
+                for counter_group, pending_deltas in pending_sizes.items():
+                    schedule.record_flush(counter_group, pending_deltas)
+                    if not pending_deltas:
+                        continue
+
+                    await batch_update_counter_group(
+                        config,
+                        pool,
+                        counter_group,
+                        dlq_stream_name,
+                        worker_redis,
+                        server_redis,
+                    )
+
+            next_heartbeat: float = config.WORKER.COUNTER_WORKER_HEARTBEAT_INTERVAL - (
+                time.monotonic() - heartbeat_time
+            )
+            await asyncio.sleep(
+                schedule.resolve_sleep_time(owned_groups, max(0.0, next_heartbeat))
+            )
+    finally:
+        # Let the remaining workers pick up this worker's groups without
+        # waiting for its lease to expire
+        await release_worker_lease(
+            worker_redis, config.WORKER.COUNTER_WORKER_REGISTRY_NAME, worker_name
+        )
 
 
 def _cache_normalize_raw_counter_data(
     raw_counters: MutableMapping[str, str],
 ) -> dict[str, int]:
-    return {k: int(v) for k, v in raw_counters}
+    return {k: int(v) for k, v in raw_counters.items()}
 
 
 def _database_normalize_cache_normalized_counter_data(
@@ -108,44 +187,75 @@ async def batch_update_counter_group(
     batch_name: str,
     dlq_stream_name: StreamName,
     worker_redis: Redis,
-) -> dict[str, int] | None:
+    server_redis: Redis,
+) -> int:
+    """
+    Flush a counter batch to the database and reflect it onto the application cache.
+    Large batches, and batches with a leftover snapshot or chunk from an interrupted
+    drain, are drained incrementally instead of being read in one go
+
+    Returns:
+        Number of counters flushed
+    """
     # Acquire lock for processing this counter group
     lock_name: str = derive_lock_key(batch_name)
     lock_set: None | Literal[True] = await worker_redis.set(
         lock_name, 1, ex=config.WORKER.COUNTER_FLUSH_LOCK_TTL, nx=True
     )
     if not lock_set:
-        return None
+        return 0
 
     async with locked_operation(worker_redis, lock_name):
+        snapshot_name: str = derive_snapshot_key(batch_name)
+        async with worker_redis.pipeline(transaction=False) as pipeline:
+            pipeline.exists(snapshot_name, derive_chunk_key(batch_name))
+            pipeline.hlen(batch_name)
+            snapshot_exists, pending_deltas = await pipeline.execute()
+
+        if snapshot_exists or pending_deltas >= config.WORKER.COUNTER_DRAIN_THRESHOLD:
+            return await drain_counter_group(
+                config,
+                pool,
+                batch_name,
+                snapshot_name,
+                lock_name,
+                dlq_stream_name,
+                worker_redis,
+                server_redis,
+                resume=bool(snapshot_exists),
+            )
+
         async with worker_redis.pipeline(transaction=True) as pipeline:
             pipeline.hgetall(batch_name)
             pipeline.delete(batch_name)
             res = await pipeline.execute()
 
         if not res[0]:  # hgetall result
-            return None
+            return 0
 
         # Cast back to cache_key:delta key-value pairs
         counters: dict[str, int] = _cache_normalize_raw_counter_data(res[0])
         del res
 
+        group_name, identifier, group_version = extract_batch_metadata(batch_name)
         async with pool.connection() as conn:
             db_normalized_counters: dict[int, int] = (
                 _database_normalize_cache_normalized_counter_data(counters)
             )
             try:
-                await flush_counter_updates(conn, batch_name, db_normalized_counters)
-                return counters
-            except RecoverableDatabaseException:
-                group_name, identifier, group_version = extract_batch_metadata(
-                    batch_name
+                await flush_counter_updates(
+                    conn,
+                    group_name,
+                    db_normalized_counters,
+                    config.WORKER.COUNTER_FLUSH_CHUNK_SIZE,
                 )
+            except RecoverableDatabaseException:
                 if group_version >= config.WORKER.MAX_RETRIES:
                     await declare_counters_event_dead(
                         worker_redis,
+                        config.WORKER,
                         dlq_stream_name,
-                        batch_name,
+                        group_name,
                         db_normalized_counters,
                         config.WORKER.MAX_RETRIES,
                     )
@@ -158,13 +268,215 @@ async def batch_update_counter_group(
                         current_retry_count=group_version,
                         identifier=identifier,
                     )
-                return None
+                return 0
             except Exception:
                 await declare_counters_event_dead(
                     worker_redis,
+                    config.WORKER,
                     dlq_stream_name,
-                    batch_name,
+                    group_name,
                     db_normalized_counters,
                     config.WORKER.MAX_RETRIES,
                 )
-                return None
+                return 0
+
+        await reflect_processed_counters(server_redis, group_name, counters)
+        return len(counters)
+
+
+async def _flush_drained_chunk(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    group_name: str,
+    token: str,
+    counters: dict[int, int],
+) -> bool:
+    """
+    Flush a drained chunk, recording its token in the same transaction
+
+    Returns:
+        Whether the chunk was flushed, rather than found to be flushed already
+    """
+    async with pool.connection() as conn:
+        try:
+            async with conn.transaction():
+                fresh: bool = await dedup_insert_event(
+                    conn, token, config.WORKER.DEDUP_WINDOW
+                )
+                if fresh:
+                    await flush_counter_updates(
+                        conn,
+                        group_name,
+                        counters,
+                        config.WORKER.COUNTER_FLUSH_CHUNK_SIZE,
+                    )
+        except POTENTIAL_TRANSIENT_ERRORS:
+            raise RecoverableDatabaseException()
+    return fresh
+
+
+async def _retry_drain_remainder(
+    config: AppConfig,
+    worker_redis: Redis,
+    dlq_stream_name: StreamName,
+    batch_name: str,
+    drain_keys: tuple[str, str, str],
+    chunk_counters: dict[str, int],
+) -> None:
+    """
+    Move the failed chunk and the rest of its snapshot to the next retry batch,
+    or to the DLQ once the batch is out of retries
+    """
+    snapshot_name, *_ = drain_keys
+    remainder: dict[str, int] = _cache_normalize_raw_counter_data(
+        await worker_redis.hgetall(snapshot_name)  # type: ignore[reportGeneralTypeIssues]
+    )
+    for cache_key, delta in chunk_counters.items():
+        remainder[cache_key] = remainder.get(cache_key, 0) + delta
+
+    group_name, identifier, group_version = extract_batch_metadata(batch_name)
+    if group_version >= config.WORKER.MAX_RETRIES:
+        await declare_counters_event_dead(
+            worker_redis,
+            config.WORKER,
+            dlq_stream_name,
+            group_name,
+            _database_normalize_cache_normalized_counter_data(remainder),
+            config.WORKER.MAX_RETRIES,
+        )
+        await worker_redis.delete(*drain_keys)
+    else:
+        await dispatch_to_retrier(
+            config,
+            worker_redis,
+            group_name,
+            remainder,
+            current_retry_count=group_version,
+            identifier=identifier,
+            discarded_keys=drain_keys,
+        )
+
+
+async def _drained_chunks(
+    config: AppConfig,
+    snapshot_name: str,
+    chunk_name: str,
+    token_name: str,
+    worker_redis: Redis,
+    *,
+    resume: bool = False,
+) -> AsyncIterator[tuple[str, MutableMapping[str, str]]]:
+    """
+    Move chunks from a snapshot to the in-flight chunk key one at a time, each
+    with a fresh token, starting with the chunk left in flight when resuming
+    """
+    if resume:
+        async with worker_redis.pipeline(transaction=False) as pipeline:
+            pipeline.get(token_name)
+            pipeline.hgetall(chunk_name)
+            token, raw_counters = await pipeline.execute()
+        if token:
+            yield decode_reply(token), raw_counters
+
+    cursor: int = 0
+    while True:
+        next_cursor, raw_counters = await worker_redis.hscan(
+            snapshot_name, cursor, count=config.WORKER.COUNTER_DRAIN_CHUNK_SIZE
+        )
+        if raw_counters:
+            token = generate_chunk_token(snapshot_name, cursor)
+            async with worker_redis.pipeline(transaction=True) as pipeline:
+                pipeline.hset(chunk_name, mapping=raw_counters)
+                pipeline.set(token_name, token)
+                pipeline.hdel(snapshot_name, *raw_counters)
+                await pipeline.execute()
+            yield token, raw_counters
+
+        cursor = next_cursor
+        if not cursor:
+            break
+
+
+async def drain_counter_group(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    batch_name: str,
+    snapshot_name: str,
+    lock_name: str,
+    dlq_stream_name: StreamName,
+    worker_redis: Redis,
+    server_redis: Redis,
+    *,
+    resume: bool = False,
+) -> int:
+    """
+    Atomically move a counter batch to a snapshot key and flush it chunk by chunk,
+    each in its own transaction. Every chunk is moved from the snapshot to a chunk
+    key along with a token, and its flush transaction records the token in the
+    event dedup table. An interrupted drain first settles the chunk left in flight,
+    skipping its flush if its token was recorded, then resumes from whatever is
+    left in the snapshot.
+
+    Returns:
+        Number of counters flushed
+    """
+    if not resume:
+        try:
+            await worker_redis.rename(batch_name, snapshot_name)
+        except ResponseError:  # Batch was emptied in the meantime
+            return 0
+
+    chunk_name: str = derive_chunk_key(batch_name)
+    token_name: str = derive_chunk_token_key(batch_name)
+    group_name, _, _ = extract_batch_metadata(batch_name)
+    flushed_count: int = 0
+    async for token, raw_counters in _drained_chunks(
+        config, snapshot_name, chunk_name, token_name, worker_redis, resume=resume
+    ):
+        counters: dict[str, int] = _cache_normalize_raw_counter_data(raw_counters)
+        db_normalized_counters: dict[int, int] = (
+            _database_normalize_cache_normalized_counter_data(counters)
+        )
+        flushed: bool = True
+        try:
+            flushed = await _flush_drained_chunk(
+                config, pool, group_name, token, db_normalized_counters
+            )
+        except RecoverableDatabaseException:
+            # Nothing in the chunk was committed, so whatever is left of the drain
+            # is retried as a whole, like a batch failing outside of a drain
+            await _retry_drain_remainder(
+                config,
+                worker_redis,
+                dlq_stream_name,
+                batch_name,
+                (snapshot_name, chunk_name, token_name),
+                counters,
+            )
+            return flushed_count
+        except Exception:
+            await declare_counters_event_dead(
+                worker_redis,
+                config.WORKER,
+                dlq_stream_name,
+                group_name,
+                db_normalized_counters,
+                config.WORKER.MAX_RETRIES,
+            )
+            counters = {}
+
+        async with worker_redis.pipeline(transaction=True) as pipeline:
+            pipeline.delete(chunk_name, token_name)
+            # Long drains must not outlive the flush lock
+            pipeline.expire(lock_name, config.WORKER.COUNTER_FLUSH_LOCK_TTL)
+            await pipeline.execute()
+
+        # Reflection follows the chunk's removal, so a chunk flushed before an
+        # interruption is yet to be reflected even when its flush is skipped
+        if counters:
+            await reflect_processed_counters(server_redis, group_name, counters)
+        if flushed:
+            flushed_count += len(counters)
+
+    await worker_redis.delete(snapshot_name)
+    return flushed_count
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from psycopg import AsyncConnection
 from psycopg.sql import Composed
@@ -24,13 +24,22 @@ async def soft_delete_strong_entity(
 
 async def downstream_soft_delete_strong_entity(
     conn: AsyncConnection,
-    parent_foreign_key: int,
     orphan_table: str,
     foreign_key_column: str,
-    deletion_time: datetime | None = None,
+    deletion_data: Sequence[tuple[int, int, datetime]],
 ) -> None:
-    deletion_time = deletion_time or datetime.now()
+    """
+    Soft-delete the orphans of all given parents in a single statement
+
+    Args:
+        deletion_data: Parent foreign key, deletion author event ID, and deletion
+        time of each deleted parent
+    """
     deletion_statement: Composed = prepare_orphan_deletion(
-        orphan_table, foreign_key_column, parent_foreign_key, deletion_time
+        orphan_table, foreign_key_column
+    )
+    parent_fks, deletion_authors, deletion_times = zip(*deletion_data)
+    await conn.execute(
+        deletion_statement,
+        (list(parent_fks), list(deletion_authors), list(deletion_times)),
     )
-    await conn.execute(deletion_statement)
@@ -1,9 +1,11 @@
 import asyncio
-from typing import Any, Sequence
+import sys
+from types import MappingProxyType
+from typing import Any, Final, MutableSequence, Sequence
 
 from psycopg import AsyncConnection
+from psycopg.types.json import Jsonb
 from psycopg_pool import AsyncConnectionPool
-from psycopg.sql import Composed
 
 from auxillary.utils import json_repr
 
@@ -15,30 +17,83 @@ from resource_auxillary.events import (
     IntentUpdate,
     StreamedEvent,
 )
+from resource_auxillary.constants import POTENTIAL_TRANSIENT_ERRORS
+from resource_auxillary.event_processing.bulk_copy import copy_rows
 from resource_auxillary.event_processing.db_qos import (
+    batch_dedup_insert_events,
     db_execute_with_retries,
-    dedup_insert_event,
 )
 from resource_auxillary.event_processing.post_processing import acknowledge_event
+from resource_auxillary.event_processing.pre_processing import (
+    populate_events_batch_from_event_queue,
+)
 from resource_auxillary.event_processing.qos import execute_with_redis_retries
-from resource_auxillary.datastructures.database import SideEffectType
+from resource_auxillary.datastructures.database import (
+    CopyFormat,
+    DeadLetterQueueLiteral,
+    EventLiteral,
+    SideEffectType,
+)
 from resource_auxillary.strings import EventName, StreamName
 
 from resource_database_workers.datastructures.dead_counter_batch import DeadCounterBatch
 from resource_database_workers.config.config import AppConfig
-from resource_database_workers.config.sub_config import WorkerConfig
+
+# Columns populated by DLQ workers, per DLQ table
+DLQ_COLUMNS: Final[MappingProxyType[DeadLetterQueueLiteral, tuple[str, ...]]] = (
+    MappingProxyType(
+        {
+            DeadLetterQueueLiteral.TABLE_NAME: (
+                EventLiteral.EVENT_ID_COLUMN_NAME,
+                DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME,
+            ),
+            DeadLetterQueueLiteral.COUNTERS_TABLE_NAME: (
+                DeadLetterQueueLiteral.COUNTERS_AFFECTED_RELATION_COLUMN_NAME,
+                DeadLetterQueueLiteral.COUNTERS_AFFECTED_COLUMN_COLUMN_NAME,
+                DeadLetterQueueLiteral.COUNTERS_FAILURE_TIME_COLUMN_NAME,
+                DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME,
+            ),
+            DeadLetterQueueLiteral.FAILED_SIDE_EFFECTS_TABLE_NAME: (
+                EventLiteral.EVENT_ID_COLUMN_NAME,
+                DeadLetterQueueLiteral.SIDE_EFFECT_TYPE_COLUMN_NAME,
+                DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME,
+            ),
+        }
+    )
+)
+
+
+def _get_standard_dlq_insertion_parameters(
+    event: StreamedEvent,
+) -> tuple[DeadLetterQueueLiteral, tuple[tuple[Any, ...], ...]]:
+    return DeadLetterQueueLiteral.TABLE_NAME, (
+        (str(event.event_id), Jsonb(json_repr(event))),
+    )
 
 
-def get_dlq_insertion_parameters(event: StreamedEvent) -> tuple[Any, ...]:
+def get_dlq_insertion_parameters(
+    event: StreamedEvent,
+) -> tuple[DeadLetterQueueLiteral, tuple[tuple[Any, ...], ...]]:
+    """
+    Resolve the DLQ table of an event, and the rows it should be recorded as,
+    in the column order of `DLQ_COLUMNS`. Malformed dead counter batches are
+    recorded as they are, like any standard failed event, as there is nothing
+    downstream of the DLQ to dead-letter them to
+    """
     if event.name == EventName.DLQ_COUNTER:
-        dead_counter_batch: DeadCounterBatch = (
-            DeadCounterBatch.construct_from_event_payload(event.payload)
-        )
-        return (
-            dead_counter_batch.table,
-            dead_counter_batch.column,
-            dead_counter_batch.failure_time,
-            dead_counter_batch.counters,
+        try:
+            dead_counter_batch: DeadCounterBatch = (
+                DeadCounterBatch.construct_from_event_payload(event.payload)
+            )
+        except (KeyError, TypeError, ValueError):
+            return _get_standard_dlq_insertion_parameters(event)
+        return DeadLetterQueueLiteral.COUNTERS_TABLE_NAME, (
+            (
+                dead_counter_batch.table,
+                dead_counter_batch.column,
+                dead_counter_batch.failure_time,
+                Jsonb(dead_counter_batch.counters),
+            ),
         )
     elif event.name == EventName.DLQ_SIDE_EFFECTS:
         side_effect_groups: tuple[
@@ -60,35 +115,103 @@ def get_dlq_insertion_parameters(event: StreamedEvent) -> tuple[Any, ...]:
                 event.side_effects.intent_updates,
             ),
         )
-        return tuple(
-            (event.event_id, side_effect_type.value, json_repr(side_effect))
+        return DeadLetterQueueLiteral.FAILED_SIDE_EFFECTS_TABLE_NAME, tuple(
+            (event.event_id, side_effect_type.value, Jsonb(json_repr(side_effect)))
             for (side_effect_type, side_effects) in side_effect_groups
             for side_effect in side_effects
         )
     else:  # Standard failed StreamedEvent
-        return (event.event_id, json_repr(event))
+        return _get_standard_dlq_insertion_parameters(event)
 
 
-async def _acknowledge_dlq_event(
-    redis: Redis,
-    worker_config: WorkerConfig,
-    dlq_event: StreamedEvent,
-    stream_name: StreamName,
-    group_name: str,
-) -> None:
-    ack_coroutine = lambda: acknowledge_event(
-        redis, [dlq_event], stream_name, group_name
-    )
-    await execute_with_redis_retries(worker_config, ack_coroutine)
+async def _insert_dlq_records(
+    connection: AsyncConnection,
+    events: Sequence[StreamedEvent],
+    dlq_rows: dict[DeadLetterQueueLiteral, list[tuple[Any, ...]]],
+    dedup_window: float,
+    copy_format: CopyFormat,
+) -> tuple[int, ...]:
+    """
+    Deduplicate a batch of DLQ events and COPY the records of fresh events,
+    all in one transaction
+
+    Returns:
+        IDs of fresh events
+    """
+    async with connection.transaction():
+        fresh_event_ids: tuple[int, ...] = await batch_dedup_insert_events(
+            connection,
+            (event.event_id for event in events),
+            dedup_window,
+            copy_format=copy_format,
+        )
+        fresh_id_set: frozenset[int] = frozenset(fresh_event_ids)
+        async with connection.cursor() as cursor:
+            for table, rows in dlq_rows.items():
+                fresh_rows: list[tuple[Any, ...]] = [
+                    row for event_id, *row in rows if event_id in fresh_id_set
+                ]
+                if fresh_rows:
+                    await copy_rows(
+                        cursor, table, DLQ_COLUMNS[table], fresh_rows, copy_format
+                    )
+    return fresh_event_ids
+
+
+def _tag_dlq_rows(
+    events: Sequence[StreamedEvent],
+) -> dict[DeadLetterQueueLiteral, list[tuple[Any, ...]]]:
+    # Rows are tagged with their event's ID, so that
+    # duplicates can be dropped once deduplication is done
+    dlq_rows: dict[DeadLetterQueueLiteral, list[tuple[Any, ...]]] = {}
+    for dlq_event in events:
+        table, rows = get_dlq_insertion_parameters(dlq_event)
+        dlq_rows.setdefault(table, []).extend(
+            (dlq_event.event_id, *row) for row in rows
+        )
+    return dlq_rows
 
 
-async def _insert_dlq_record(
+async def record_dlq_events_with_isolation(
+    config: AppConfig,
     connection: AsyncConnection,
-    composed_statement: Composed,
-    insertion_parameters: Sequence[Any],
+    events: Sequence[StreamedEvent],
+    recorded_events: MutableSequence[StreamedEvent],
+    copy_format: CopyFormat,
 ) -> None:
-    await connection.execute(composed_statement, insertion_parameters)
-    await connection.commit()
+    """
+    Record a batch of DLQ events, bisecting it on non-transient failures until the
+    failing events are isolated. Isolated events are logged and left pending, so
+    that they do not hold back the rest of their batch. Transient failures that
+    outlast their retries are raised
+    """
+    db_coroutine = lambda: _insert_dlq_records(
+        connection,
+        events,
+        _tag_dlq_rows(events),
+        config.WORKER.DEDUP_WINDOW,
+        copy_format,
+    )
+    try:
+        await db_execute_with_retries(config.WORKER, connection, db_coroutine)
+    except POTENTIAL_TRANSIENT_ERRORS:
+        raise
+    except Exception as e:
+        if len(events) == 1:
+            print(
+                f"Failed to record DLQ event {events[0].event_id}: {e!r}",
+                file=sys.stderr,
+            )
+            return
+        bisected_length: int = len(events) // 2
+        await record_dlq_events_with_isolation(
+            config, connection, events[:bisected_length], recorded_events, copy_format
+        )
+        await record_dlq_events_with_isolation(
+            config, connection, events[bisected_length:], recorded_events, copy_format
+        )
+        return
+    recorded_events.extend(events)
 
 
 async def dlq_consumer(
@@ -98,28 +221,36 @@ async def dlq_consumer(
     redis: Redis,
     group_name: str,
     queue: asyncio.Queue[StreamedEvent],
-    composed_statement: Composed,
 ) -> None:
+    batch: list[StreamedEvent] = []
+    recorded_events: list[StreamedEvent] = []
+    copy_format: CopyFormat = config.WORKER.resolve_copy_format(stream_name)
     while True:
-        dlq_event: StreamedEvent = await queue.get()
+        batch.clear()
+        recorded_events.clear()
+        await populate_events_batch_from_event_queue(
+            queue, batch, config.WORKER.DLQ_BATCH_SIZE
+        )
+
         async with pool.connection() as conn:
-            # Apply deduplication
-            if not await dedup_insert_event(conn, dlq_event.event_id):
-                await _acknowledge_dlq_event(
-                    redis, config.WORKER, dlq_event, stream_name, group_name
+            try:
+                await record_dlq_events_with_isolation(
+                    config, conn, batch, recorded_events, copy_format
+                )
+            except POTENTIAL_TRANSIENT_ERRORS as e:
+                # Nothing downstream of the DLQ, so unrecorded events are left
+                # pending rather than taking the consumer down, and are read again
+                # from the consumer's history once it restarts
+                print(
+                    f"Failed to record {len(batch) - len(recorded_events)} "
+                    f"DLQ events: {e!r}",
+                    file=sys.stderr,
                 )
 
-            # !duplicate event
-            insertion_params: tuple[Any, ...] = get_dlq_insertion_parameters(dlq_event)
-            db_coroutine = lambda: _insert_dlq_record(
-                conn, composed_statement, insertion_params
-            )
-            await db_execute_with_retries(config.WORKER, conn, db_coroutine)
-            await _acknowledge_dlq_event(
-                redis, config.WORKER, dlq_event, stream_name, group_name
-            )
-
-            ack_coroutine = lambda: acknowledge_event(
-                redis, [dlq_event], stream_name, group_name
-            )
-            await execute_with_redis_retries(config.WORKER, ack_coroutine)
+        if not recorded_events:
+            continue
+        # Duplicates were recorded before, so every recorded event is acknowledged
+        ack_coroutine = lambda: acknowledge_event(
+            redis, recorded_events, stream_name, group_name
+        )
+        await execute_with_redis_retries(config.WORKER, ack_coroutine)
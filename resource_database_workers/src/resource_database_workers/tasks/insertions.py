@@ -6,6 +6,11 @@ from psycopg.errors import IntegrityError
 from psycopg.sql import Composed
 
 from resource_auxillary.events import StreamedEvent
+from resource_auxillary.datastructures.database import (
+    CopyFormat,
+    EventMetadataLiteral,
+)
+from resource_auxillary.event_processing.bulk_copy import copy_rows
 from resource_auxillary.datastructures.translation import (
     EVENT_PAYLOAD_TYPES,
     ASSOCIATION_DB_METADATA,
@@ -16,7 +21,6 @@ from resource_auxillary.datastructures.casting import (
 )
 from resource_auxillary.templates.sql import (
     prepare_temp_table_sql,
-    prepare_weak_insertion_copy_sql,
     prepare_weak_insertion_sql,
 )
 
@@ -35,12 +39,15 @@ async def batch_insert_with_isolation(
     events: Sequence[StreamedEvent],
     successfully_inserted: MutableSequence[int],
     action: t_action_literal | None,
+    copy_format: CopyFormat = CopyFormat.BINARY,
 ) -> None:
     try:
         async with conn.transaction():
             if action:
                 successfully_inserted.extend(
-                    await batch_insert_association_entities(conn, events, action)
+                    await batch_insert_association_entities(
+                        conn, events, action, copy_format
+                    )
                 )
             else:
                 successfully_inserted.extend(
@@ -51,10 +58,10 @@ async def batch_insert_with_isolation(
             return
         bisected_length: int = len(events) // 2
         await batch_insert_with_isolation(
-            conn, events[:bisected_length], successfully_inserted, action
+            conn, events[:bisected_length], successfully_inserted, action, copy_format
         )
         await batch_insert_with_isolation(
-            conn, events[bisected_length:], successfully_inserted, action
+            conn, events[bisected_length:], successfully_inserted, action, copy_format
         )
 
 
@@ -62,6 +69,7 @@ async def batch_insert_association_entities(
     conn: AsyncConnection,
     events: Sequence[StreamedEvent],
     action: Literal["save", "vote", "subscribe"],
+    copy_format: CopyFormat = CopyFormat.BINARY,
 ) -> list[int]:
     payload_type = EVENT_PAYLOAD_TYPES.get(events[0].name)
     if not payload_type:
@@ -70,29 +78,36 @@ async def batch_insert_association_entities(
     payload_field_types: dict[str, type] = get_type_hints(payload_type)
 
     table, pk_columns = resolve_entity_metadata(events[0])
-    columns: tuple[str, ...] = tuple(payload_field_types)
+    # Rows carry their event's ID, so that only later events overwrite them
+    columns: tuple[str, ...] = (
+        *payload_field_types,
+        EventMetadataLiteral.LAST_EVENT_IDENTIFIER_COLUMN_NAME,
+    )
 
     temp_table = f"_staging_{table}_{uuid4().hex}"
 
+    rows: list[list[Any]] = []
+    for event in events:
+        row: list[Any] = []
+        for field, field_type in payload_field_types.items():
+            value = event.payload[field]
+            if value == "":
+                row.append(None)
+                continue
+
+            cast_function = CAST_MAPPING.get(field_type)
+            if cast_function:
+                row.append(cast_function(value))
+            else:
+                row.append(default_serializer(value, field_type))
+        row.append(event.event_id)
+        rows.append(row)
+
     async with conn.cursor() as cursor:
         await cursor.execute(prepare_temp_table_sql(temp_table, table))
-        async with cursor.copy(
-            prepare_weak_insertion_copy_sql(temp_table, *columns)
-        ) as copy:
-            for event in events:
-                row: list[Any] = []
-                for field, field_type in payload_field_types.items():
-                    value = event.payload[field]
-                    if value == "":
-                        row.append(None)
-                        continue
-
-                    cast_function = CAST_MAPPING.get(field_type)
-                    if cast_function:
-                        row.append(cast_function(value))
-                    else:
-                        row.append(default_serializer(value, field_type))
-                await copy.write_row(row)
+        await copy_rows(
+            cursor, temp_table, columns, rows, copy_format, type_reference=table
+        )
 
         await cursor.execute(
             prepare_weak_insertion_sql(table, temp_table, columns, pk_columns, action)
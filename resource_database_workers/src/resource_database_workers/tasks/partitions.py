@@ -0,0 +1,171 @@
+"""Creation and retention of the event dedup table's time range partitions"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+import re
+from typing import Final
+
+from psycopg import AsyncConnection
+from psycopg.errors import LockNotAvailable
+from psycopg.sql import Composed
+from psycopg_pool import AsyncConnectionPool
+
+from redis.asyncio import Redis
+
+from resource_auxillary.datastructures.database import EventLiteral
+from resource_auxillary.event_processing.db_qos import db_execute_with_retries
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.utils.sql_templates import (
+    prepare_database_time_selection,
+    prepare_event_partition_creation,
+    prepare_event_partition_drop,
+    prepare_event_partitions_selection,
+    prepare_partition_lock_timeout,
+)
+from resource_database_workers.utils.strings import decode_reply, derive_lock_key
+
+# Partitions are named after the start of their range, matching the ones created
+# by the migration partitioning the table
+EVENT_PARTITION_NAME_FORMAT: Final[str] = "{table}_p{start:%Y%m%d}"
+# Upper bound of a range partition's bound expression, e.g.
+# FOR VALUES FROM ('2026-10-18 00:00:00') TO ('2026-10-19 00:00:00')
+PARTITION_UPPER_BOUND_PATTERN: Final[re.Pattern[str]] = re.compile(r"TO \('(.+?)'\)")
+
+
+def derive_event_partition_name(start: date) -> str:
+    return EVENT_PARTITION_NAME_FORMAT.format(
+        table=EventLiteral.EVENTS_TABLE_NAME, start=start
+    )
+
+
+async def _select_partition_upper_bounds(
+    conn: AsyncConnection,
+) -> tuple[datetime, dict[str, datetime]]:
+    """
+    Returns:
+        Database time, and the upper bound of every range partition
+    """
+    # Committed right away, so that each DDL statement after it runs in its own
+    # transaction rather than in a savepoint of this one. A lock timeout then only
+    # rolls back its own statement, and locks taken on the parent table are not
+    # held until the whole pass is done
+    async with conn.transaction(), conn.cursor() as cursor:
+        await cursor.execute(prepare_database_time_selection())
+        now, *_ = await cursor.fetchone()  # type: ignore[reportOptionalIterable]
+        await cursor.execute(prepare_event_partitions_selection())
+        partitions: list[tuple[str, str]] = await cursor.fetchall()
+    # Default partitions have no range, and are left alone
+    return now, {
+        name: datetime.fromisoformat(match.group(1))
+        for name, bound in partitions
+        if (match := PARTITION_UPPER_BOUND_PATTERN.search(bound))
+    }
+
+
+async def _execute_partition_ddl(
+    config: AppConfig, conn: AsyncConnection, statement: Composed
+) -> bool:
+    """
+    Returns:
+        Whether the statement went through, rather than timing out on the parent
+        table's lock, in which case it is left for the next pass
+    """
+
+    async def _execute() -> None:
+        async with conn.transaction():
+            await conn.execute(
+                prepare_partition_lock_timeout(
+                    config.WORKER.EVENT_PARTITION_LOCK_TIMEOUT
+                )
+            )
+            await conn.execute(statement)
+
+    try:
+        await db_execute_with_retries(config.WORKER, conn, _execute, attempts=1)
+    except LockNotAvailable:
+        return False
+    return True
+
+
+async def manage_event_partitions(
+    config: AppConfig, pool: AsyncConnectionPool
+) -> tuple[int, int]:
+    """
+    Create partitions covering the configured number of spans ahead, contiguous
+    with the latest existing one, and drop partitions whose range ended before the
+    dedup window, since no lookup reaches them any more. Time is read from the
+    database along with partition bounds, so that both share a clock and time zone
+
+    Returns:
+        Number of partitions created and dropped
+    """
+    span: timedelta = timedelta(days=config.WORKER.EVENT_PARTITION_SPAN)
+
+    created: int = 0
+    dropped: int = 0
+    async with pool.connection() as conn:
+        now: datetime
+        upper_bounds: dict[str, datetime]
+        now, upper_bounds = await db_execute_with_retries(
+            config.WORKER, conn, lambda: _select_partition_upper_bounds(conn)
+        )
+        horizon: datetime = now + span * config.WORKER.EVENT_PARTITIONS_AHEAD
+        retention_start: datetime = now - timedelta(seconds=config.WORKER.DEDUP_WINDOW)
+
+        start: datetime = max(
+            upper_bounds.values(), default=datetime.combine(now.date(), time())
+        )
+        while start < horizon:
+            end: datetime = start + span
+            if not await _execute_partition_ddl(
+                config,
+                conn,
+                prepare_event_partition_creation(
+                    derive_event_partition_name(start), start, end
+                ),
+            ):
+                break
+            created += 1
+            start = end
+
+        for partition, upper_bound in upper_bounds.items():
+            if upper_bound > retention_start:
+                continue
+            if await _execute_partition_ddl(
+                config, conn, prepare_event_partition_drop(partition)
+            ):
+                dropped += 1
+
+    return created, dropped
+
+
+async def _hold_partition_lease(
+    config: AppConfig, redis: Redis, worker_name: str
+) -> bool:
+    lease_name: str = derive_lock_key(EventLiteral.EVENTS_TABLE_NAME)
+    if await redis.set(
+        lease_name, worker_name, ex=config.WORKER.EVENT_PARTITION_LEASE_TTL, nx=True
+    ):
+        return True
+    lease_holder: bytes | str | None = await redis.get(lease_name)
+    if lease_holder is None or decode_reply(lease_holder) != worker_name:
+        return False
+    return bool(await redis.expire(lease_name, config.WORKER.EVENT_PARTITION_LEASE_TTL))
+
+
+async def maintain_event_partitions(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    worker_name: str,
+) -> None:
+    """
+    Keep the event dedup table partitioned ahead of incoming acknowledgements, and
+    within the dedup window. Only the worker holding the partition lease manages
+    partitions, and any other worker stands by until the lease expires
+    """
+    while True:
+        if await _hold_partition_lease(config, worker_redis, worker_name):
+            await manage_event_partitions(config, pool)
+        await asyncio.sleep(config.WORKER.EVENT_PARTITION_CHECK_INTERVAL)
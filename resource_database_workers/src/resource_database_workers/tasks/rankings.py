@@ -0,0 +1,217 @@
+"""Incremental maintenance of per-forum post rankings"""
+
+import asyncio
+from datetime import datetime
+import time
+from typing import Any, Final, Sequence
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from psycopg.sql import Composed
+
+from redis.asyncio import Redis
+
+from resource_auxillary.cache import derive_cache_key, derive_hashmap_name
+from resource_auxillary.datastructures.database import StrongEntity
+from resource_auxillary.events import Event
+from resource_auxillary.event_processing.db_qos import db_execute_with_retries
+from resource_auxillary.event_processing.qos import execute_with_redis_retries
+from resource_auxillary.rankings import (
+    RankingName,
+    compute_rankings,
+    derive_ranking_key,
+)
+from resource_auxillary.strings import EventName, StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.utils.sql_templates import (
+    prepare_ranked_posts_selection,
+    prepare_recent_posts_selection,
+)
+from resource_database_workers.utils.strings import (
+    decode_mapping_reply,
+    decode_reply,
+    derive_lock_key,
+)
+
+RANKING_INITIAL_CHECKPOINT: Final[str] = "0-0"
+SCORE_COUNTER_GROUP: Final[str] = derive_hashmap_name(StrongEntity.POST, "score")
+
+
+async def _select_ranked_posts(
+    conn: AsyncConnection, statement: Composed, parameters: Sequence[Any]
+) -> list[tuple[int, int, int, datetime, bool]]:
+    async with conn.cursor() as cursor:
+        await cursor.execute(statement, parameters, prepare=True)
+        return await cursor.fetchall()
+
+
+def _collect_ranking_changes(
+    entries: Sequence[tuple[str, dict[str, str]]],
+) -> tuple[set[int], dict[int, datetime]]:
+    """
+    Posts whose score or deletion changed, and the earliest creation time per forum
+    """
+    changed_posts: set[int] = set()
+    created_since: dict[int, datetime] = {}
+    for _stream_id, stream_entry in entries:
+        try:
+            event: Event = Event.reconstruct_from_stream(
+                decode_mapping_reply(stream_entry)
+            )
+        except ValueError:
+            # Malformed entries are dead-lettered by the stream readers
+            continue
+        match event.name:
+            case EventName.POST_VOTE | EventName.POST_UNVOTE | EventName.POST_DELETE:
+                changed_posts.add(int(event.payload["post_id"]))
+            case EventName.POST_CREATE:
+                forum_id: int = int(event.payload["forum_id"])
+                time_posted: datetime = datetime.fromisoformat(
+                    event.payload["time_posted"]
+                )
+                if (
+                    forum_id not in created_since
+                    or time_posted < created_since[forum_id]
+                ):
+                    created_since[forum_id] = time_posted
+    return changed_posts, created_since
+
+
+async def _apply_rankings(
+    config: AppConfig,
+    worker_redis: Redis,
+    server_redis: Redis,
+    rows: Sequence[tuple[int, int, int, datetime, bool]],
+) -> None:
+    # Votes are only reflected in Postgres once their counter group is flushed, so
+    # pending deltas are added on top to keep rankings close to live scores
+    pending_deltas: list[str | None] = await execute_with_redis_retries(
+        config.WORKER,
+        lambda: worker_redis.hmget(
+            SCORE_COUNTER_GROUP,
+            [derive_cache_key(StrongEntity.POST, row[0]) for row in rows],
+        ),
+    )
+
+    ranking_keys: set[str] = set()
+    async with server_redis.pipeline(transaction=False) as pipeline:
+        for (post_id, forum_id, score, time_posted, deleted), pending_delta in zip(
+            rows, pending_deltas
+        ):
+            if deleted:
+                for ranking in RankingName:
+                    pipeline.zrem(derive_ranking_key(ranking, forum_id), post_id)
+                continue
+            for ranking, rank in compute_rankings(
+                score + int(pending_delta or 0), time_posted
+            ).items():
+                ranking_key: str = derive_ranking_key(ranking, forum_id)
+                pipeline.zadd(ranking_key, {str(post_id): rank})
+                ranking_keys.add(ranking_key)
+
+        # Lowest ranks go first, keeping the top K
+        for ranking_key in ranking_keys:
+            pipeline.zremrangebyrank(ranking_key, 0, -(config.WORKER.RANKING_TOP_K + 1))
+        await pipeline.execute()
+
+
+async def refresh_rankings(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    server_redis: Redis,
+) -> int:
+    """
+    Apply the next page of post events to forum rankings, and advance the checkpoint.
+
+    Events only mark posts as changed, ranking inputs are then read from Postgres in
+    bulk, since vote events carry no forum and creation events carry no post ID.
+    Entries younger than the configured lag are left for a later pass, so that the
+    posts they create have been committed by then
+
+    Returns:
+        Number of stream entries consumed
+    """
+    checkpoint: str = decode_reply(
+        await worker_redis.get(config.WORKER.RANKING_CHECKPOINT_NAME)
+        or RANKING_INITIAL_CHECKPOINT
+    )
+    entries: list[tuple[str, dict[str, str]]] = await worker_redis.xrange(
+        StreamName.POSTS,
+        min=f"({checkpoint}",
+        max=str(int(time.time() * 1000) - config.WORKER.RANKING_LAG),
+        count=config.WORKER.RANKING_READ_SIZE,
+    )
+    if not entries:
+        return 0
+
+    changed_posts, created_since = _collect_ranking_changes(entries)
+    rows: list[tuple[int, int, int, datetime, bool]] = []
+    async with pool.connection() as conn:
+        if changed_posts:
+            rows.extend(
+                await db_execute_with_retries(
+                    config.WORKER,
+                    conn,
+                    lambda: _select_ranked_posts(
+                        conn, prepare_ranked_posts_selection(), (list(changed_posts),)
+                    ),
+                )
+            )
+        if created_since:
+            rows.extend(
+                await db_execute_with_retries(
+                    config.WORKER,
+                    conn,
+                    lambda: _select_ranked_posts(
+                        conn,
+                        prepare_recent_posts_selection(),
+                        (list(created_since), list(created_since.values())),
+                    ),
+                )
+            )
+
+    if rows:
+        await _apply_rankings(config, worker_redis, server_redis, rows)
+
+    await worker_redis.set(
+        config.WORKER.RANKING_CHECKPOINT_NAME, decode_reply(entries[-1][0])
+    )
+    return len(entries)
+
+
+async def _hold_ranking_lease(
+    config: AppConfig, redis: Redis, worker_name: str
+) -> bool:
+    lease_name: str = derive_lock_key(config.WORKER.RANKING_CHECKPOINT_NAME)
+    if await redis.set(
+        lease_name, worker_name, ex=config.WORKER.RANKING_LEASE_TTL, nx=True
+    ):
+        return True
+    lease_holder: bytes | str | None = await redis.get(lease_name)
+    if lease_holder is None or decode_reply(lease_holder) != worker_name:
+        return False
+    return bool(await redis.expire(lease_name, config.WORKER.RANKING_LEASE_TTL))
+
+
+async def maintain_rankings(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    server_redis: Redis,
+    worker_name: str,
+) -> None:
+    """
+    Keep per-forum hot and top rankings up to date from the posts stream. Rankings
+    are shared by all readers, so only the worker holding the ranking lease applies
+    events, and any other worker stands by until the lease expires
+    """
+    while True:
+        if not await _hold_ranking_lease(config, worker_redis, worker_name):
+            await asyncio.sleep(config.WORKER.RANKING_INTERVAL)
+            continue
+        consumed: int = await refresh_rankings(config, pool, worker_redis, server_redis)
+        # Keep going without pause while catching up on a backlog
+        if consumed < config.WORKER.RANKING_READ_SIZE:
+            await asyncio.sleep(config.WORKER.RANKING_INTERVAL)
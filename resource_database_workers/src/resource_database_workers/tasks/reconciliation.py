@@ -0,0 +1,396 @@
+"""Incremental reconciliation of forum and user counters with their true aggregates"""
+
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import time
+from typing import Any, Final, Sequence
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from psycopg.sql import Composed
+
+from redis.asyncio import Redis
+
+from resource_auxillary.cache import derive_cache_key, derive_hashmap_name
+from resource_auxillary.datastructures.database import (
+    ForeignKeyColumnLiteral,
+    StrongEntity,
+)
+from resource_auxillary.events import CounterUpdate, Event
+from resource_auxillary.event_processing.db_qos import db_execute_with_retries
+from resource_auxillary.event_processing.metrics import (
+    RECONCILED_ENTITIES,
+    RECONCILIATION_CORRECTIONS,
+)
+from resource_auxillary.event_processing.qos import execute_with_redis_retries
+from resource_auxillary.strings import NAME_SEPERATOR, EventName, StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.token_bucket import TokenBucket
+from resource_database_workers.utils.sql_templates import (
+    prepare_forum_owners_selection,
+    prepare_forum_statistics_selection,
+    prepare_references_selection,
+    prepare_user_statistics_selection,
+)
+from resource_database_workers.utils.strings import (
+    decode_mapping_reply,
+    decode_reply,
+    derive_lock_key,
+)
+from resource_database_workers.workers.redis.counters import (
+    apply_counter_updates,
+    retrieve_pending_counter_deltas,
+)
+
+RECONCILIATION_INITIAL_WATERMARK: Final[str] = "0-0"
+RECONCILED_STREAMS: Final[tuple[StreamName, ...]] = (
+    StreamName.POSTS,
+    StreamName.COMMENTS,
+    StreamName.FORUMS,
+)
+
+# (Field, counter group) per reconciled counter, in the order they are selected in.
+# Counter groups are the ones incremented by live traffic
+FORUM_COUNTERS: Final[tuple[tuple[str, str], ...]] = (
+    ("posts", derive_hashmap_name(StrongEntity.FORUM, "posts")),
+    ("subscribers", derive_hashmap_name(StrongEntity.FORUM, "subscriptions")),
+)
+USER_COUNTERS: Final[tuple[tuple[str, str], ...]] = (
+    ("aura", derive_hashmap_name(StrongEntity.USER, "aura")),
+    ("total_posts", derive_hashmap_name(StrongEntity.USER, "total_posts")),
+    ("total_comments", derive_hashmap_name(StrongEntity.USER, "total_comments")),
+)
+
+
+@dataclass(slots=True)
+class ChangedEntities:
+    """
+    Entities referenced by stream events. Posts, comments and subscribed forums
+    are resolved to the forums and users whose counters they count towards
+    """
+
+    forums: set[int] = field(default_factory=set)
+    users: set[int] = field(default_factory=set)
+    posts: set[int] = field(default_factory=set)
+    comments: set[int] = field(default_factory=set)
+    subscribed_forums: set[int] = field(default_factory=set)
+
+
+def _collect_changed_entities(
+    entries: Sequence[tuple[str, dict[str, str]]], changed: ChangedEntities
+) -> None:
+    for _stream_id, stream_entry in entries:
+        try:
+            event: Event = Event.reconstruct_from_stream(
+                decode_mapping_reply(stream_entry)
+            )
+        except ValueError:
+            # Malformed entries are dead-lettered by the stream readers
+            continue
+        match event.name:
+            case EventName.POST_CREATE:
+                changed.forums.add(int(event.payload["forum_id"]))
+                changed.users.add(int(event.payload["author_id"]))
+            case EventName.POST_VOTE | EventName.POST_UNVOTE | EventName.POST_DELETE:
+                changed.posts.add(int(event.payload["post_id"]))
+            case EventName.COMMENT_CREATE:
+                changed.users.add(int(event.payload["author_id"]))
+            case (
+                EventName.COMMENT_VOTE
+                | EventName.COMMENT_UNVOTE
+                | EventName.COMMENT_DELETE
+            ):
+                changed.comments.add(int(event.payload["comment_id"]))
+            case EventName.FORUM_SUB | EventName.FORUM_UNSUB:
+                changed.subscribed_forums.add(int(event.payload["forum_id"]))
+
+
+async def _select_rows(
+    conn: AsyncConnection, statement: Composed, parameters: Sequence[Any]
+) -> list[tuple[Any, ...]]:
+    async with conn.cursor() as cursor:
+        await cursor.execute(statement, parameters, prepare=True)
+        return await cursor.fetchall()
+
+
+async def _resolve_changed_entities(
+    config: AppConfig, conn: AsyncConnection, changed: ChangedEntities
+) -> None:
+    if changed.posts:
+        for forum_id, author_id in await db_execute_with_retries(
+            config.WORKER,
+            conn,
+            lambda: _select_rows(
+                conn,
+                prepare_references_selection(
+                    StrongEntity.POST,
+                    (
+                        ForeignKeyColumnLiteral.PARENT_FORUM,
+                        ForeignKeyColumnLiteral.AUTHOR_ID,
+                    ),
+                ),
+                (list(changed.posts),),
+            ),
+        ):
+            changed.forums.add(forum_id)
+            changed.users.add(author_id)
+    if changed.comments:
+        for (author_id,) in await db_execute_with_retries(
+            config.WORKER,
+            conn,
+            lambda: _select_rows(
+                conn,
+                prepare_references_selection(
+                    StrongEntity.COMMENT, (ForeignKeyColumnLiteral.AUTHOR_ID,)
+                ),
+                (list(changed.comments),),
+            ),
+        ):
+            changed.users.add(author_id)
+    if changed.subscribed_forums:
+        changed.forums.update(changed.subscribed_forums)
+        for (owner_id,) in await db_execute_with_retries(
+            config.WORKER,
+            conn,
+            lambda: _select_rows(
+                conn,
+                prepare_forum_owners_selection(),
+                (list(changed.subscribed_forums),),
+            ),
+        ):
+            changed.users.add(owner_id)
+
+
+async def _measure_drift(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    resource_name: StrongEntity,
+    statement: Composed,
+    counters: Sequence[tuple[str, str]],
+    identifiers: Sequence[int],
+) -> set[CounterUpdate]:
+    """
+    Counter updates bringing stored counters, together with their deltas pending
+    a flush, to their recounted values
+    """
+    async with pool.connection() as conn:
+        rows: list[tuple[Any, ...]] = await db_execute_with_retries(
+            config.WORKER,
+            conn,
+            lambda: _select_rows(conn, statement, (list(identifiers),)),
+        )
+    if not rows:
+        return set()
+
+    cache_keys: list[str] = [derive_cache_key(resource_name, row[0]) for row in rows]
+    corrections: set[CounterUpdate] = set()
+    for position, (field_name, counter_group) in enumerate(counters, start=1):
+        pending_deltas: list[int] = await execute_with_redis_retries(
+            config.WORKER,
+            lambda: retrieve_pending_counter_deltas(
+                worker_redis, counter_group, cache_keys
+            ),
+        )
+        for row, cache_key, pending_delta in zip(rows, cache_keys, pending_deltas):
+            drift: int = row[position + len(counters)] - (row[position] + pending_delta)
+            if drift:
+                corrections.add(
+                    CounterUpdate(
+                        counter_group=counter_group,
+                        cache_key=cache_key,
+                        field_name=field_name,
+                        delta=drift,
+                    )
+                )
+    return corrections
+
+
+async def _reconcile_batch(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    resource_name: StrongEntity,
+    statement: Composed,
+    counters: Sequence[tuple[str, str]],
+    identifiers: Sequence[int],
+) -> set[CounterUpdate]:
+    """
+    Corrections for drift that persists over the settle time. Events in flight
+    show up as drift until their rows are written and their deltas are counted,
+    so drift is measured again before being corrected, and only kept if unchanged
+    """
+    drift: set[CounterUpdate] = await _measure_drift(
+        config, pool, worker_redis, resource_name, statement, counters, identifiers
+    )
+    if not drift:
+        return drift
+
+    await asyncio.sleep(config.WORKER.RECONCILIATION_SETTLE_TIME)
+    drifted_identifiers: list[int] = sorted(
+        {int(correction.cache_key.split(NAME_SEPERATOR)[1]) for correction in drift}
+    )
+    return drift & await _measure_drift(
+        config,
+        pool,
+        worker_redis,
+        resource_name,
+        statement,
+        counters,
+        drifted_identifiers,
+    )
+
+
+async def _apply_corrections(
+    config: AppConfig,
+    worker_redis: Redis,
+    server_redis: Redis,
+    corrections: Sequence[CounterUpdate],
+) -> None:
+    # Corrections are flushed like any other delta, and are visible to readers of
+    # the application cache until their flush is reflected onto it. Reflection
+    # skips deltas missing from the application cache, so they are added there
+    # first, lest a flush in between leave them counted twice
+    await execute_with_redis_retries(
+        config.WORKER, lambda: apply_counter_updates(server_redis, corrections)
+    )
+    try:
+        await execute_with_redis_retries(
+            config.WORKER, lambda: apply_counter_updates(worker_redis, corrections)
+        )
+    except Exception:
+        reverted: tuple[CounterUpdate, ...] = tuple(
+            correction.model_copy(update={"delta": -correction.delta})
+            for correction in corrections
+        )
+        await execute_with_redis_retries(
+            config.WORKER, lambda: apply_counter_updates(server_redis, reverted)
+        )
+        raise
+    for correction in corrections:
+        RECONCILIATION_CORRECTIONS.inc(correction.counter_group)
+
+
+async def reconcile_statistics(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    server_redis: Redis,
+    bucket: TokenBucket,
+    worker_name: str,
+) -> int:
+    """
+    Recount the counters of forums and users referenced by stream events past the
+    last event identifier reconciled per stream, correct any drift, and advance
+    the watermarks.
+
+    Only changed entities are recounted, in batches paced by the token bucket.
+    Watermarks are left as they are if the lease is lost midway, recounting being
+    idempotent
+
+    Returns:
+        Largest number of entries consumed from a single stream
+    """
+    watermarks: dict[str, str] = decode_mapping_reply(
+        await worker_redis.hgetall(config.WORKER.RECONCILIATION_WATERMARK_NAME)
+    )
+    settled_until: str = str(int(time.time() * 1000) - config.WORKER.RECONCILIATION_LAG)
+
+    changed: ChangedEntities = ChangedEntities()
+    advanced_watermarks: dict[str, str] = {}
+    consumed: int = 0
+    for stream in RECONCILED_STREAMS:
+        entries: list[tuple[str, dict[str, str]]] = await worker_redis.xrange(
+            stream,
+            min=f"({watermarks.get(stream, RECONCILIATION_INITIAL_WATERMARK)}",
+            max=settled_until,
+            count=config.WORKER.RECONCILIATION_READ_SIZE,
+        )
+        if not entries:
+            continue
+        _collect_changed_entities(entries, changed)
+        advanced_watermarks[stream] = decode_reply(entries[-1][0])
+        consumed = max(consumed, len(entries))
+    if not advanced_watermarks:
+        return 0
+
+    async with pool.connection() as conn:
+        await _resolve_changed_entities(config, conn, changed)
+
+    for resource_name, statement, counters, identifiers in (
+        (
+            StrongEntity.FORUM,
+            prepare_forum_statistics_selection(),
+            FORUM_COUNTERS,
+            changed.forums,
+        ),
+        (
+            StrongEntity.USER,
+            prepare_user_statistics_selection(),
+            USER_COUNTERS,
+            changed.users,
+        ),
+    ):
+        for batch in itertools.batched(
+            sorted(identifiers), config.WORKER.RECONCILIATION_BATCH_SIZE
+        ):
+            if not await _hold_reconciliation_lease(config, worker_redis, worker_name):
+                return 0
+            await bucket.acquire(len(batch))
+            corrections: set[CounterUpdate] = await _reconcile_batch(
+                config, pool, worker_redis, resource_name, statement, counters, batch
+            )
+            RECONCILED_ENTITIES.inc(resource_name, amount=len(batch))
+            if corrections:
+                await _apply_corrections(
+                    config, worker_redis, server_redis, tuple(corrections)
+                )
+
+    await worker_redis.hset(
+        config.WORKER.RECONCILIATION_WATERMARK_NAME, mapping=advanced_watermarks
+    )
+    return consumed
+
+
+async def _hold_reconciliation_lease(
+    config: AppConfig, redis: Redis, worker_name: str
+) -> bool:
+    lease_name: str = derive_lock_key(config.WORKER.RECONCILIATION_WATERMARK_NAME)
+    if await redis.set(
+        lease_name, worker_name, ex=config.WORKER.RECONCILIATION_LEASE_TTL, nx=True
+    ):
+        return True
+    lease_holder: bytes | str | None = await redis.get(lease_name)
+    if lease_holder is None or decode_reply(lease_holder) != worker_name:
+        return False
+    return bool(await redis.expire(lease_name, config.WORKER.RECONCILIATION_LEASE_TTL))
+
+
+async def maintain_reconciliation(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    server_redis: Redis,
+    worker_name: str,
+) -> None:
+    """
+    Keep forum and user counters consistent with the rows they count. Only the
+    worker holding the reconciliation lease recounts, at no more than the
+    configured rate, so that recounts stay clear of live traffic
+    """
+    bucket: TokenBucket = TokenBucket(
+        rate=config.WORKER.RECONCILIATION_RATE,
+        capacity=config.WORKER.RECONCILIATION_BATCH_SIZE,
+    )
+    while True:
+        if not await _hold_reconciliation_lease(config, worker_redis, worker_name):
+            await asyncio.sleep(config.WORKER.RECONCILIATION_INTERVAL)
+            continue
+        consumed: int = await reconcile_statistics(
+            config, pool, worker_redis, server_redis, bucket, worker_name
+        )
+        # Keep going without pause while catching up on a backlog
+        if consumed < config.WORKER.RECONCILIATION_READ_SIZE:
+            await asyncio.sleep(config.WORKER.RECONCILIATION_INTERVAL)
@@ -0,0 +1,197 @@
+"""Replay of dead-lettered events, counter batches and side-effects"""
+
+from collections import defaultdict
+from typing import Any, Sequence
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from psycopg.sql import Composed
+
+from auxillary.utils import cache_repr
+
+from redis.asyncio import Redis
+
+from resource_auxillary.cache import derive_cache_key
+from resource_auxillary.datastructures.database import SideEffectType
+from resource_auxillary.events import (
+    CacheUpdate,
+    CounterUpdate,
+    Event,
+    EventSideEffects,
+    IntentUpdate,
+)
+from resource_auxillary.event_processing.db_qos import db_execute_with_retries
+from resource_auxillary.event_processing.post_processing import emit_side_effects
+from resource_auxillary.event_processing.qos import execute_with_redis_retries
+from resource_auxillary.strings import NAME_SEPERATOR, StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.replay import (
+    REPLAY_SOURCE_METADATA,
+    ReplayFilter,
+    ReplaySource,
+)
+from resource_database_workers.datastructures.streams import EVENT_STREAM_MAPPING
+from resource_database_workers.datastructures.token_bucket import TokenBucket
+from resource_database_workers.utils.sql_templates import (
+    prepare_dlq_replay_selection,
+)
+from resource_database_workers.utils.strings import generate_retry_batch_name
+
+
+async def _select_dlq_page(
+    conn: AsyncConnection,
+    statement: Composed,
+    parameters: Sequence[Any],
+    batch_size: int,
+) -> list[tuple[Any, ...]]:
+    async with conn.cursor() as cursor:
+        await cursor.execute(statement, (*parameters, batch_size))
+        return await cursor.fetchall()
+
+
+async def _reinject_events(redis: Redis, rows: Sequence[tuple[Any, ...]]) -> int:
+    """Re-stream dead events into their originating streams, as fresh events"""
+    reinjected: int = 0
+    async with redis.pipeline(transaction=False) as pipeline:
+        for _event_id, payload in rows:
+            event: Event = Event.model_validate(payload)
+            stream_name: StreamName | None = EVENT_STREAM_MAPPING.get(event.name)
+            if not stream_name:
+                continue
+            pipeline.xadd(stream_name, cache_repr(event))
+            reinjected += 1
+        await pipeline.execute()
+    return reinjected
+
+
+async def _reinject_counter_batches(
+    config: AppConfig, redis: Redis, rows: Sequence[tuple[Any, ...]]
+) -> int:
+    """Hand dead counter batches over to counter retry workers, as fresh retries"""
+    async with redis.pipeline(transaction=True) as pipeline:
+        for _id, table, column, counters in rows:
+            batch_name: str = generate_retry_batch_name(
+                NAME_SEPERATOR.join((table, column))
+            )
+            pipeline.hset(
+                batch_name,
+                mapping={
+                    derive_cache_key(table, identifier): delta
+                    for identifier, delta in counters.items()
+                },
+            )
+            pipeline.rpush(config.WORKER.COUNTER_RETRY_REGISTRY_NAME, batch_name)
+        await pipeline.execute()
+    return len(rows)
+
+
+async def _reapply_side_effects(redis: Redis, rows: Sequence[tuple[Any, ...]]) -> int:
+    """Re-emit failed side-effects, grouped by their originating event"""
+    grouped_side_effects: defaultdict[int, dict[SideEffectType, list[Any]]] = (
+        defaultdict(lambda: defaultdict(list))
+    )
+    for _id, event_id, side_effect_type, payload in rows:
+        side_effect: CounterUpdate | IntentUpdate | CacheUpdate
+        match SideEffectType(side_effect_type):
+            case SideEffectType.COUNTER_UPDATE:
+                side_effect = CounterUpdate.model_validate(payload)
+            case SideEffectType.INTENT_INVALIDATION:
+                side_effect = IntentUpdate.model_validate(payload)
+            case SideEffectType.CACHE_INVALIDATION:
+                side_effect = CacheUpdate.model_validate(payload)
+        grouped_side_effects[event_id][SideEffectType(side_effect_type)].append(
+            side_effect
+        )
+
+    await emit_side_effects(
+        redis,
+        [
+            EventSideEffects(
+                counter_updates=tuple(side_effects[SideEffectType.COUNTER_UPDATE]),
+                intent_updates=tuple(side_effects[SideEffectType.INTENT_INVALIDATION]),
+                cache_invalidations=tuple(
+                    side_effects[SideEffectType.CACHE_INVALIDATION]
+                ),
+            )
+            for side_effects in grouped_side_effects.values()
+        ],
+    )
+    return len(rows)
+
+
+async def replay_dead_letters(
+    config: AppConfig,
+    pool: AsyncConnectionPool,
+    worker_redis: Redis,
+    server_redis: Redis,
+    replay_filter: ReplayFilter,
+    *,
+    rate: float,
+    batch_size: int,
+    restart: bool = False,
+) -> int:
+    """
+    Replay DLQ rows matching a filter in keyset order, at most `rate` rows per
+    second. Progress is checkpointed after every page, so an interrupted replay
+    with the same filter picks up where it left off.
+
+    Failed events are re-streamed to their originating streams, failed counter
+    batches are handed to counter retry workers, and failed side-effects are
+    re-emitted onto the application cache.
+
+    Returns:
+        Number of rows replayed
+    """
+    checkpoint_name: str = replay_filter.derive_checkpoint_name(
+        config.WORKER.DLQ_REPLAY_CHECKPOINT_PREFIX
+    )
+    if restart:
+        await worker_redis.delete(checkpoint_name)
+
+    keyset_type = REPLAY_SOURCE_METADATA[replay_filter.source].keyset_type
+    raw_checkpoint: bytes | str | None = await worker_redis.get(checkpoint_name)
+    checkpoint: str | int | None = (
+        keyset_type(
+            raw_checkpoint.decode()
+            if isinstance(raw_checkpoint, bytes)
+            else raw_checkpoint
+        )
+        if raw_checkpoint is not None
+        else None
+    )
+
+    bucket: TokenBucket = TokenBucket(rate=rate, capacity=batch_size)
+    replayed: int = 0
+    while True:
+        statement, parameters = prepare_dlq_replay_selection(replay_filter, checkpoint)
+        async with pool.connection() as conn:
+            selection_coroutine = lambda: _select_dlq_page(
+                conn, statement, parameters, batch_size
+            )
+            rows: list[tuple[Any, ...]] = await db_execute_with_retries(
+                config.WORKER, conn, selection_coroutine
+            )
+        if not rows:
+            break
+
+        await bucket.acquire(len(rows))
+        match replay_filter.source:
+            case ReplaySource.EVENTS:
+                reinjection_coroutine = lambda: _reinject_events(worker_redis, rows)
+            case ReplaySource.COUNTERS:
+                reinjection_coroutine = lambda: _reinject_counter_batches(
+                    config, worker_redis, rows
+                )
+            case ReplaySource.SIDE_EFFECTS:
+                reinjection_coroutine = lambda: _reapply_side_effects(
+                    server_redis, rows
+                )
+        replayed += await execute_with_redis_retries(
+            config.WORKER, reinjection_coroutine
+        )
+
+        checkpoint = rows[-1][0]
+        await worker_redis.set(checkpoint_name, str(checkpoint))
+
+    return replayed
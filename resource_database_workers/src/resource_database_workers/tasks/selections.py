@@ -8,17 +8,19 @@ async def select_decrement_deltas(
     conn: AsyncConnection,
     foreign_key_column: ForeignKeyColumnLiteral,
     limit: int,
-    offset: int,
+    last_foreign_key: int,
     table: str,
     deletion_author_event_id: int,
-) -> list[tuple[str, int]]:
-    selection_statement = prepare_deltas_selection(
-        foreign_key_column,
-        table,
-        deletion_author_event_id,
-        limit,
-        offset,
-    )
+) -> list[tuple[int, int]]:
+    """
+    Select the next page of (foreign key, delta) pairs after `last_foreign_key`,
+    ordered by foreign key. Foreign keys are positive, so 0 selects the first page
+    """
+    selection_statement = prepare_deltas_selection(foreign_key_column, table)
     async with conn.cursor() as cursor:
-        await cursor.execute(selection_statement)
+        await cursor.execute(
+            selection_statement,
+            (deletion_author_event_id, last_foreign_key, limit),
+            prepare=True,
+        )
         return await cursor.fetchall()
@@ -5,8 +5,15 @@ from typing import Literal, Mapping
 from redis.asyncio import Redis
 
 from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.queues import QueueRegistry
+from resource_database_workers.dependencies import get_queue_registry
 from resource_auxillary.strings import EventName, StreamName
 from resource_auxillary.events import StreamedEvent
+from resource_auxillary.event_processing.metrics import (
+    BATCH_SIZE,
+    QUEUE_DEPTH,
+    STAGE_LATENCY,
+)
 
 
 async def stream_reader(
@@ -23,33 +30,37 @@ async def stream_reader(
     # list[list[str, list[tuple[str, dict[str, str]]]]]
     #            |-> 0th element is stream name
     # Hinted as ResponseT btw, bravo
-    result: list[list[list[tuple[str, dict[str, str]]]]] = await redis.xreadgroup(
-        groupname=group_name,
-        consumername=consumer_name,
-        streams={stream_name.value: requested_id},
-        count=config.WORKER.CONSUMER_READ_SIZE,
-        noack=False,
-        block=config.WORKER.CONSUMER_BLOCK_TIME,
-    )
-
-    if len(result[0][1]) == 0:
+    with STAGE_LATENCY.time(stream_name, "read"):
+        result: list[list[list[tuple[str, dict[str, str]]]]] = await redis.xreadgroup(
+            groupname=group_name,
+            consumername=consumer_name,
+            streams={stream_name.value: requested_id},
+            count=config.WORKER.CONSUMER_READ_SIZE,
+            noack=False,
+            block=config.WORKER.CONSUMER_BLOCK_TIME,
+        )
+
+    # Reads timing out on an idle stream reply with nothing at all
+    if not result or len(result[0][1]) == 0:
         return []
 
     event_stream_subset = result[0][1]
     del result
 
+    BATCH_SIZE.observe(stream_name, "read", value=len(event_stream_subset))
     events: list[StreamedEvent] = []
-    for event_data in event_stream_subset:
-        try:
-            event: StreamedEvent = StreamedEvent.construct_from_stream_record(
-                event_data
-            )
-            events.append(event)
-        except ValueError:
-            await dead_letter_queue.put(
-                StreamedEvent.safe_construct_from_malformed_stream(event_data)
-            )
-            continue
+    with STAGE_LATENCY.time(stream_name, "decode"):
+        for event_data in event_stream_subset:
+            try:
+                event: StreamedEvent = StreamedEvent.construct_from_stream_record(
+                    event_data
+                )
+                events.append(event)
+            except ValueError:
+                await dead_letter_queue.put(
+                    StreamedEvent.safe_construct_from_malformed_stream(event_data)
+                )
+                continue
 
     return events
 
@@ -65,6 +76,7 @@ async def upstream_dispatcher(
     read_history: bool = True,
 ) -> None:
     requested_id: Literal[">"] | int = 0 if read_history else ">"
+    queue_registry: QueueRegistry = get_queue_registry()
     while True:
         events: list[StreamedEvent] = await stream_reader(
             config,
@@ -73,7 +85,7 @@ async def upstream_dispatcher(
             dead_letter_queue,
             group_name,
             consumer_name,
-            read_history,
+            requested_id,
         )
 
         if not events and requested_id == requested_id == 0:
@@ -86,8 +98,12 @@ async def upstream_dispatcher(
             event_mapping[queue_mapping[event.name]].append(event)
         for consumer_queue, events_batch in event_mapping.items():
             await consumer_queue.put(tuple(events_batch))
+            QUEUE_DEPTH.set(
+                queue_registry.resolve_queue_name(consumer_queue),
+                value=consumer_queue.qsize(),
+            )
 
-        await asyncio.sleep(config.WORKER.CONSUMER_READ_INTERVAL)
+        await asyncio.sleep(config.WORKER.CONSUMER_READ_INTERVAL / 1000)
 
 
 async def downstream_dispatcher(
@@ -101,6 +117,7 @@ async def downstream_dispatcher(
     read_history: bool = True,
 ) -> None:
     requested_id: Literal[">"] | int = 0 if read_history else ">"
+    queue_registry: QueueRegistry = get_queue_registry()
     while True:
         events: list[StreamedEvent] = await stream_reader(
             config,
@@ -109,7 +126,7 @@ async def downstream_dispatcher(
             dead_letter_queue,
             group_name,
             consumer_name,
-            read_history,
+            requested_id,
         )
 
         if not events and requested_id == requested_id == 0:
@@ -123,5 +140,9 @@ async def downstream_dispatcher(
         for consumer_queue, events_batch in event_mapping.items():
             for event in events_batch:
                 await consumer_queue.put(event)
+            QUEUE_DEPTH.set(
+                queue_registry.resolve_queue_name(consumer_queue),
+                value=consumer_queue.qsize(),
+            )
 
-        await asyncio.sleep(config.WORKER.CONSUMER_READ_INTERVAL)
+        await asyncio.sleep(config.WORKER.CONSUMER_READ_INTERVAL / 1000)
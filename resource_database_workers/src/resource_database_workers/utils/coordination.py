@@ -1,13 +1,14 @@
 from typing import Mapping, Sequence
 
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 
 from resource_auxillary.strings import StreamName
 from resource_database_workers.datastructures.redis import (
     XInfoGroupResponse,
     XPendingRangeResponse,
 )
-from resource_database_workers.src.resource_database_workers.workers.redis.helpers import (
+from resource_database_workers.workers.redis.helpers import (
     get_min_max_from_xread,
 )
 
@@ -18,12 +19,16 @@ async def get_existing_worker_groups(
     async with redis.pipeline(transaction=True) as pipeline:
         for stream_name in stream_names:
             pipeline.xinfo_groups(stream_name)
-        results: list[list[XInfoGroupResponse]] = await pipeline.execute()
+        # Streams that do not exist yet fail with an error reply, and have no groups
+        results: list[list[XInfoGroupResponse] | ResponseError] = (
+            await pipeline.execute(raise_on_error=False)
+        )
 
     return set(
         stream_names[i]
         for i, result in enumerate(results)
-        if result and any(g_info["name"] == consumer_group_name for g_info in result)
+        if isinstance(result, list)
+        and any(g_info["name"] == consumer_group_name for g_info in result)
     )
 
 
@@ -40,7 +45,10 @@ async def establish_consumer_groups(
         for stream_name, consumer_names in stream_consumer_mapping.items():
             if stream_name not in existing_group:
                 # Consumer group does not exist
-                pipeline.xgroup_create(stream_name, consumer_group_name, mkstream=True)
+                # Read from the start, events may be streamed before workers are up
+                pipeline.xgroup_create(
+                    stream_name, consumer_group_name, id="0", mkstream=True
+                )
             for consumer_name in consumer_names:
                 pipeline.xgroup_createconsumer(
                     stream_name, consumer_name, consumer_group_name
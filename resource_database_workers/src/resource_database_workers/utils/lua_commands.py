@@ -1,11 +1,26 @@
+import hashlib
 from typing import Final, LiteralString
 
-CONDITIONAL_COUNTER_DECREMENT_TEMPLATE: Final[LiteralString] = """
-local counter_value = redis.call("HGET", KEYS[1], KEYS[2])
-if counter_value ~= nil then
-    redis.call("HINCRBY", KEYS[1], KEYS[2], ARGV[1])
-    return true
+# KEYS[1]: Counter group, ARGV: Flattened (cache key, flushed delta) pairs.
+# Flushed deltas are now part of the database value, so they are taken off the
+# pending deltas held in cache. Missing fields are left alone, and fields that
+# drop to zero are removed to keep counter hashes small.
+# HGET returns false rather than nil for missing fields, hence HEXISTS.
+COUNTER_REFLECTION_TEMPLATE: Final[LiteralString] = """
+local reflected = 0
+for i = 1, #ARGV, 2 do
+    if redis.call("HEXISTS", KEYS[1], ARGV[i]) == 1 then
+        local remaining = redis.call("HINCRBY", KEYS[1], ARGV[i], -tonumber(ARGV[i + 1]))
+        if remaining == 0 then
+            redis.call("HDEL", KEYS[1], ARGV[i])
+        end
+        reflected = reflected + 1
+    end
 end
 
-return false
+return reflected
 """
+
+COUNTER_REFLECTION_SHA: Final[str] = hashlib.sha1(
+    COUNTER_REFLECTION_TEMPLATE.encode("utf-8"), usedforsecurity=False
+).hexdigest()
@@ -1,36 +1,43 @@
 from datetime import datetime
-from typing import Final, Iterable, Mapping, Sequence
+from typing import Any, Final, Iterable, Sequence
 
-from psycopg.sql import Literal, Identifier, SQL, Composed, Placeholder
+from psycopg.sql import Identifier, Literal, SQL, Composed, Placeholder
 
 from resource_auxillary.datastructures.database import (
+    AssociationColumnLiteral,
     DeletionColumnLiteral,
     DeadLetterQueueLiteral,
+    EventLiteral,
+    EventMetadataLiteral,
+    ForeignKeyColumnLiteral,
+    GenericLiterals,
+    StrongEntity,
 )
 
-UPDATION_SQL: Final[SQL] = SQL("""UPDATE {table} t
-                               SET t.{column} = t.{column} + v.delta
-                               FROM (
-                               VALUES
-                               {values}
-                               ) AS v({identifier}, delta)
+from resource_database_workers.datastructures.replay import (
+    REPLAY_SOURCE_METADATA,
+    ReplayFilter,
+    ReplaySourceMetadata,
+)
+
+UPDATION_SQL: Final[SQL] = SQL("""UPDATE {table} AS t
+                               SET {column} = t.{column} + v.delta
+                               FROM unnest({identifiers}::bigint[], {deltas}::bigint[])
+                               AS v({identifier}, delta)
                                WHERE t.{identifier} = v.{identifier};""")
 
 
-def prepare_updation_sql(
-    table: str, column: str, identifier: str, counter_data: Mapping[int, int]
-) -> Composed:
+def prepare_updation_sql(table: str, column: str, identifier: str) -> Composed:
+    """
+    Counter deltas are bound as a pair of arrays, so the statement text only
+    depends on the counter group and can be prepared once per connection
+    """
     return UPDATION_SQL.format(
         table=Identifier(table),
         column=Identifier(column),
         identifier=Identifier(identifier),
-        values=SQL(",").join(
-            SQL("({}, {})").format(
-                Literal(id_),
-                Literal(delta),
-            )
-            for id_, delta in counter_data.items()
-        ),
+        identifiers=Placeholder(),
+        deltas=Placeholder(),
     )
 
 
@@ -46,27 +53,6 @@ def format_strong_insertion_sql(table: str, columns: Sequence[str]) -> Composed:
     )
 
 
-def format_dlq_insertion_sql() -> Composed:
-    return STRONG_INSERTION_SQL.format(
-        table=Identifier(DeadLetterQueueLiteral.TABLE_NAME),
-        placeholders=SQL(", ").join(Placeholder() * 2),
-    )
-
-
-def format_counters_dlq_insertion_sql() -> Composed:
-    return STRONG_INSERTION_SQL.format(
-        table=Identifier(DeadLetterQueueLiteral.COUNTERS_TABLE_NAME),
-        placeholders=SQL(", ").join(Placeholder() * 4),
-    )
-
-
-def format_failed_side_effects_sql() -> Composed:
-    return STRONG_INSERTION_SQL.format(
-        table=Identifier(DeadLetterQueueLiteral.FAILED_SIDE_EFFECTS_TABLE_NAME),
-        placeholder=SQL(", ").join(Placeholder() * 3),
-    )
-
-
 STRONG_DELETION_SQL: Final[SQL] = SQL("""UPDATE {table}
     SET {deletion_column} = data.{deletion_column},
     {deleted_at} = data.{deleted_at}
@@ -94,49 +80,354 @@ def prepare_strong_deletion_sql(
     )
 
 
-KILL_ORPHANS_SQL: Final[SQL] = SQL("""UPDATE {orphan_table}
-    SET {deletion_column} = true;
-    {deleted_at} = {deletion_time}
-    WHERE {parent_fk_column} = {parent_fk};""")
+KILL_ORPHANS_SQL: Final[SQL] = SQL("""UPDATE {orphan_table} AS t
+    SET {deletion_column} = true,
+    {deleted_at} = v.{deleted_at},
+    {deletion_author_column} = v.{deletion_author_column}
+    FROM unnest({parent_fks}::bigint[], {deletion_authors}::bigint[], {deletion_times}::timestamptz[])
+    AS v({parent_fk_column}, {deletion_author_column}, {deleted_at})
+    WHERE t.{parent_fk_column} = v.{parent_fk_column}
+    AND NOT t.{deletion_column};""")
 
 
-def prepare_orphan_deletion(
-    orphan_table: str, parent_fk_column: str, parent_fk: int, deletion_time: datetime
-) -> Composed:
+def prepare_orphan_deletion(orphan_table: str, parent_fk_column: str) -> Composed:
+    """
+    Soft-delete all orphans of a batch of deleted parents, with parent keys,
+    deletion author events, and deletion times bound as parallel arrays
+    """
     return KILL_ORPHANS_SQL.format(
         orphan_table=Identifier(orphan_table),
         deletion_column=Identifier(DeletionColumnLiteral.DELETED_COLUMN_NAME),
         deleted_at=Identifier(DeletionColumnLiteral.DELETION_TIME_COLUMN_NAME),
-        deletion_time=Literal(deletion_time),
+        deletion_author_column=Identifier(DeletionColumnLiteral.DELETION_AUTHOR_EVENT),
         parent_fk_column=Identifier(parent_fk_column),
-        parent_values=Literal(parent_fk),
+        parent_fks=Placeholder(),
+        deletion_authors=Placeholder(),
+        deletion_times=Placeholder(),
     )
 
 
 SELECT_DECREMENT_DELTAS_SQL: Final[SQL] = SQL(
-    """SELECT {idenfitier_column}, COUNT({identifier_column}) AS delta
+    """SELECT {identifier_column}, COUNT(*) AS delta
     FROM {table}
     WHERE {deletion_author_event_id_column} = {deletion_author_event_id}
-    LIMIT {limit}
-    OFFSET {offset};
+    AND {identifier_column} > {last_identifier}
+    GROUP BY {identifier_column}
+    ORDER BY {identifier_column}
+    LIMIT {limit};
     """
 )
 
 
-def prepare_deltas_selection(
-    foreign_key_column: str,
-    table: str,
-    deletion_author_event_id: int,
-    limit: int,
-    offset: int,
-) -> Composed:
+def prepare_deltas_selection(foreign_key_column: str, table: str) -> Composed:
+    """
+    Keyset-paginated decrement deltas per foreign key, bound as
+    (deletion author event ID, last seen foreign key, page size)
+    """
     return SELECT_DECREMENT_DELTAS_SQL.format(
         identifier_column=Identifier(foreign_key_column),
         table=Identifier(table),
         deletion_author_event_id_column=Identifier(
             DeletionColumnLiteral.DELETION_AUTHOR_EVENT
         ),
-        deletion_author_event_id=Literal(deletion_author_event_id),
-        limit=Literal(limit),
-        offset=Literal(offset),
+        deletion_author_event_id=Placeholder(),
+        last_identifier=Placeholder(),
+        limit=Placeholder(),
+    )
+
+
+DLQ_REPLAY_SELECTION_SQL: Final[SQL] = SQL("""SELECT {columns}
+    FROM {table}
+    WHERE {conditions}
+    ORDER BY {keyset_column}
+    LIMIT {limit};""")
+
+
+def prepare_dlq_replay_selection(
+    replay_filter: ReplayFilter, checkpoint: str | int | None
+) -> tuple[Composed, list[Any]]:
+    """
+    Select the next page of DLQ rows matching a replay filter, after the
+    given checkpoint (if any). Returns the statement along with its parameters
+    """
+    metadata: ReplaySourceMetadata = REPLAY_SOURCE_METADATA[replay_filter.source]
+    conditions: list[Composed] = []
+    parameters: list[Any] = []
+
+    if checkpoint is not None:
+        conditions.append(
+            SQL("{} > {}").format(Identifier(metadata.keyset_column), Placeholder())
+        )
+        parameters.append(checkpoint)
+    if metadata.time_column and replay_filter.since:
+        conditions.append(
+            SQL("{} >= {}").format(Identifier(metadata.time_column), Placeholder())
+        )
+        parameters.append(replay_filter.since)
+    if metadata.time_column and replay_filter.until:
+        conditions.append(
+            SQL("{} < {}").format(Identifier(metadata.time_column), Placeholder())
+        )
+        parameters.append(replay_filter.until)
+    if replay_filter.event_names:
+        conditions.append(
+            SQL("{} ->> 'name' = ANY({})").format(
+                Identifier(DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME), Placeholder()
+            )
+        )
+        parameters.append([event.value for event in replay_filter.event_names])
+    if replay_filter.side_effect_types:
+        conditions.append(
+            SQL("{}::text = ANY({})").format(
+                Identifier(DeadLetterQueueLiteral.SIDE_EFFECT_TYPE_COLUMN_NAME),
+                Placeholder(),
+            )
+        )
+        parameters.append([effect.value for effect in replay_filter.side_effect_types])
+    if replay_filter.counter_tables:
+        counter_table_column: str = (
+            DeadLetterQueueLiteral.COUNTERS_AFFECTED_RELATION_COLUMN_NAME
+        )
+        conditions.append(
+            SQL("{} = ANY({})").format(Identifier(counter_table_column), Placeholder())
+        )
+        parameters.append(list(replay_filter.counter_tables))
+
+    statement: Composed = DLQ_REPLAY_SELECTION_SQL.format(
+        columns=SQL(", ").join(map(Identifier, metadata.columns)),
+        table=Identifier(metadata.table),
+        conditions=SQL(" AND ").join(conditions) if conditions else SQL("true"),
+        keyset_column=Identifier(metadata.keyset_column),
+        limit=Placeholder(),
+    )
+    return statement, parameters
+
+
+RANKED_POSTS_COLUMNS: Final[tuple[str, ...]] = (
+    GenericLiterals.ID,
+    ForeignKeyColumnLiteral.PARENT_FORUM,
+    "score",
+    "time_posted",
+    DeletionColumnLiteral.DELETED_COLUMN_NAME,
+)
+
+RANKED_POSTS_BY_ID_SQL: Final[SQL] = SQL("""SELECT {columns}
+    FROM {table}
+    WHERE {identifier} = ANY({identifiers}::bigint[]);""")
+
+RANKED_POSTS_BY_FORUM_SQL: Final[SQL] = SQL("""SELECT {columns}
+    FROM {table} AS t
+    JOIN unnest({forums}::bigint[], {since}::timestamp[]) AS v(forum, since)
+    ON t.{forum_column} = v.forum AND t.{time_column} >= v.since
+    WHERE NOT t.{deleted_column};""")
+
+
+def prepare_ranked_posts_selection() -> Composed:
+    """
+    Ranking inputs of posts by ID, bound as (post IDs). Deleted posts are
+    selected too, so that they can be evicted from rankings
+    """
+    return RANKED_POSTS_BY_ID_SQL.format(
+        columns=SQL(", ").join(map(Identifier, RANKED_POSTS_COLUMNS)),
+        table=Identifier(StrongEntity.POST),
+        identifier=Identifier(GenericLiterals.ID),
+        identifiers=Placeholder(),
+    )
+
+
+def prepare_recent_posts_selection() -> Composed:
+    """
+    Ranking inputs of live posts created in each forum since a given time, bound
+    as (forum IDs, earliest creation times). Served off the (forum, time) index
+    """
+    return RANKED_POSTS_BY_FORUM_SQL.format(
+        columns=SQL(", ").join(
+            SQL("t.{}").format(Identifier(column)) for column in RANKED_POSTS_COLUMNS
+        ),
+        table=Identifier(StrongEntity.POST),
+        forums=Placeholder(),
+        since=Placeholder(),
+        forum_column=Identifier(ForeignKeyColumnLiteral.PARENT_FORUM),
+        time_column=Identifier("time_posted"),
+        deleted_column=Identifier(DeletionColumnLiteral.DELETED_COLUMN_NAME),
+    )
+
+
+# Association tables counted towards forum and user statistics
+POST_VOTES_TABLE: Final[str] = "post_votes"
+COMMENT_VOTES_TABLE: Final[str] = "comment_votes"
+FORUM_SUBSCRIPTIONS_TABLE: Final[str] = "forum_subscriptions"
+FORUM_ADMINS_TABLE: Final[str] = "forum_admins"
+
+REFERENCES_BY_ID_SQL: Final[SQL] = SQL("""SELECT {columns}
+    FROM {table}
+    WHERE {identifier} = ANY({identifiers}::bigint[]);""")
+
+
+def prepare_references_selection(table: str, columns: Sequence[str]) -> Composed:
+    """
+    Columns referencing other entities, of rows by ID, bound as (row IDs)
+    """
+    return REFERENCES_BY_ID_SQL.format(
+        columns=SQL(", ").join(map(Identifier, columns)),
+        table=Identifier(table),
+        identifier=Identifier(GenericLiterals.ID),
+        identifiers=Placeholder(),
+    )
+
+
+FORUM_OWNERS_SQL: Final[SQL] = SQL("""SELECT {user_id}
+    FROM {table}
+    WHERE {forum_id} = ANY({forums}::bigint[])
+    AND {role} = 'OWNER';""")
+
+
+def prepare_forum_owners_selection() -> Composed:
+    """
+    Owners of forums, who are credited aura for their subscribers, bound as
+    (forum IDs)
+    """
+    return FORUM_OWNERS_SQL.format(
+        user_id=Identifier(AssociationColumnLiteral.USER_ID),
+        table=Identifier(FORUM_ADMINS_TABLE),
+        forum_id=Identifier(AssociationColumnLiteral.FORUM_ID),
+        role=Identifier("role"),
+        forums=Placeholder(),
+    )
+
+
+# Each statistic is selected twice, first as stored and then as recounted, with
+# every recount served off an index over the counted entity's parent
+FORUM_STATISTICS_SQL: Final[SQL] = SQL("""SELECT f.{id}, f.{posts}, f.{subscribers},
+    (SELECT COUNT(*) FROM {posts_table} AS p
+        WHERE p.{parent_forum} = f.{id} AND NOT p.{deleted}),
+    (SELECT COUNT(*) FROM {subscriptions_table} AS s
+        WHERE s.{forum_id} = f.{id} AND s.{is_subscribed})
+    FROM {forums_table} AS f
+    WHERE f.{id} = ANY({identifiers}::bigint[]) AND NOT f.{deleted}
+    ORDER BY f.{id};""")
+
+# Aura is the net score of a user's posts and comments, deleted or not, plus the
+# subscribers of the forums they own
+USER_STATISTICS_SQL: Final[SQL] = SQL("""SELECT u.{id}, u.{aura}, u.{total_posts},
+    u.{total_comments},
+    COALESCE((SELECT SUM(CASE WHEN v.{vote} THEN 1 ELSE -1 END)
+        FROM {posts_table} AS p JOIN {post_votes_table} AS v ON v.{post_id} = p.{id}
+        WHERE p.{author_id} = u.{id} AND v.{vote} IS NOT NULL), 0)
+    + COALESCE((SELECT SUM(CASE WHEN v.{vote} THEN 1 ELSE -1 END)
+        FROM {comments_table} AS c
+        JOIN {comment_votes_table} AS v ON v.{comment_id} = c.{id}
+        WHERE c.{author_id} = u.{id} AND v.{vote} IS NOT NULL), 0)
+    + (SELECT COUNT(*) FROM {forum_admins_table} AS a
+        JOIN {subscriptions_table} AS s ON s.{forum_id} = a.{forum_id}
+        WHERE a.{user_id} = u.{id} AND a.{role} = 'OWNER' AND s.{is_subscribed}),
+    (SELECT COUNT(*) FROM {posts_table} AS p
+        WHERE p.{author_id} = u.{id} AND NOT p.{deleted}),
+    (SELECT COUNT(*) FROM {comments_table} AS c
+        WHERE c.{author_id} = u.{id} AND NOT c.{deleted})
+    FROM {users_table} AS u
+    WHERE u.{id} = ANY({identifiers}::bigint[]) AND NOT u.{deleted}
+    ORDER BY u.{id};""")
+
+
+def prepare_forum_statistics_selection() -> Composed:
+    """
+    Stored and recounted (posts, subscribers) of live forums, bound as (forum IDs)
+    """
+    return FORUM_STATISTICS_SQL.format(
+        id=Identifier(GenericLiterals.ID),
+        posts=Identifier("posts"),
+        subscribers=Identifier("subscribers"),
+        posts_table=Identifier(StrongEntity.POST),
+        parent_forum=Identifier(ForeignKeyColumnLiteral.PARENT_FORUM),
+        deleted=Identifier(DeletionColumnLiteral.DELETED_COLUMN_NAME),
+        subscriptions_table=Identifier(FORUM_SUBSCRIPTIONS_TABLE),
+        forum_id=Identifier(AssociationColumnLiteral.FORUM_ID),
+        is_subscribed=Identifier(EventMetadataLiteral.EVENT_SUB_COLUMN_NAME),
+        forums_table=Identifier(StrongEntity.FORUM),
+        identifiers=Placeholder(),
     )
+
+
+def prepare_user_statistics_selection() -> Composed:
+    """
+    Stored and recounted (aura, total posts, total comments) of live users, bound
+    as (user IDs)
+    """
+    return USER_STATISTICS_SQL.format(
+        id=Identifier(GenericLiterals.ID),
+        aura=Identifier("aura"),
+        total_posts=Identifier("total_posts"),
+        total_comments=Identifier("total_comments"),
+        vote=Identifier(EventMetadataLiteral.EVENT_VOTE_COLUMN_NAME),
+        posts_table=Identifier(StrongEntity.POST),
+        post_votes_table=Identifier(POST_VOTES_TABLE),
+        post_id=Identifier(AssociationColumnLiteral.POST_ID),
+        author_id=Identifier(ForeignKeyColumnLiteral.AUTHOR_ID),
+        comments_table=Identifier(StrongEntity.COMMENT),
+        comment_votes_table=Identifier(COMMENT_VOTES_TABLE),
+        comment_id=Identifier(AssociationColumnLiteral.COMMENT_ID),
+        forum_admins_table=Identifier(FORUM_ADMINS_TABLE),
+        subscriptions_table=Identifier(FORUM_SUBSCRIPTIONS_TABLE),
+        forum_id=Identifier(AssociationColumnLiteral.FORUM_ID),
+        user_id=Identifier(AssociationColumnLiteral.USER_ID),
+        role=Identifier("role"),
+        is_subscribed=Identifier(EventMetadataLiteral.EVENT_SUB_COLUMN_NAME),
+        deleted=Identifier(DeletionColumnLiteral.DELETED_COLUMN_NAME),
+        users_table=Identifier(StrongEntity.USER),
+        identifiers=Placeholder(),
+    )
+
+
+# Event dedup partitions, bounded by their range over acknowledgement times
+# Partition bounds are timestamps without a time zone, so time is read as such
+DATABASE_TIME_SQL: Final[SQL] = SQL("SELECT LOCALTIMESTAMP;")
+EVENT_PARTITIONS_SQL: Final[SQL] = SQL(
+    """SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+    FROM pg_inherits AS i JOIN pg_class AS c ON c.oid = i.inhrelid
+    WHERE i.inhparent = {table}::regclass;"""
+)
+EVENT_PARTITION_CREATION_SQL: Final[SQL] = SQL(
+    "CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table} "
+    "FOR VALUES FROM ({start}) TO ({end});"
+)
+EVENT_PARTITION_DROP_SQL: Final[SQL] = SQL("DROP TABLE IF EXISTS {partition};")
+# Partition DDL locks the parent table exclusively, so it gives up rather than
+# queueing dedup inserts behind it for long
+PARTITION_LOCK_TIMEOUT_SQL: Final[SQL] = SQL("SET LOCAL lock_timeout = {timeout};")
+
+
+def prepare_database_time_selection() -> Composed:
+    return DATABASE_TIME_SQL.format()
+
+
+def prepare_event_partitions_selection() -> Composed:
+    """
+    (Name, bound expression) of every partition of the event dedup table
+    """
+    return EVENT_PARTITIONS_SQL.format(
+        table=Literal(EventLiteral.EVENTS_TABLE_NAME.value)
+    )
+
+
+def prepare_event_partition_creation(
+    partition: str, start: datetime, end: datetime
+) -> Composed:
+    return EVENT_PARTITION_CREATION_SQL.format(
+        partition=Identifier(partition),
+        table=Identifier(EventLiteral.EVENTS_TABLE_NAME),
+        start=Literal(start),
+        end=Literal(end),
+    )
+
+
+def prepare_event_partition_drop(partition: str) -> Composed:
+    return EVENT_PARTITION_DROP_SQL.format(partition=Identifier(partition))
+
+
+def prepare_partition_lock_timeout(timeout: int) -> Composed:
+    """
+    Args:
+        timeout: Milliseconds to wait on the parent table's lock
+    """
+    return PARTITION_LOCK_TIMEOUT_SQL.format(timeout=Literal(timeout))
@@ -1,5 +1,5 @@
 import time
-from typing import Final, LiteralString
+from typing import Final, LiteralString, Mapping
 
 from resource_auxillary.strings import NAME_SEPERATOR, StreamName
 import random
@@ -8,10 +8,33 @@ INTERNAL_NAME_SEPERATOR: Final[LiteralString] = "-"
 assert INTERNAL_NAME_SEPERATOR != NAME_SEPERATOR  # nosec
 
 
+def decode_reply(reply: bytes | str) -> str:
+    """
+    Redis replies are bytes unless the client was created with decode_responses
+    """
+    return reply.decode() if isinstance(reply, bytes) else reply
+
+
+def decode_mapping_reply(reply: Mapping[bytes | str, bytes | str]) -> dict[str, str]:
+    return {decode_reply(key): decode_reply(value) for key, value in reply.items()}
+
+
 def derive_lock_key(name: str) -> str:
     return INTERNAL_NAME_SEPERATOR.join(("lock", name))
 
 
+def derive_snapshot_key(name: str) -> str:
+    return INTERNAL_NAME_SEPERATOR.join(("snapshot", name))
+
+
+def derive_chunk_key(name: str) -> str:
+    return INTERNAL_NAME_SEPERATOR.join(("chunk", name))
+
+
+def derive_chunk_token_key(name: str) -> str:
+    return INTERNAL_NAME_SEPERATOR.join(("chunk_token", name))
+
+
 # Assuming NAME_SEPARATOR=':',
 # counter batch names follow the convention
 # counter_name:identifier:version,
@@ -42,11 +65,21 @@ def generate_retry_batch_name(
     )
 
 
+def generate_chunk_token(snapshot_name: str, cursor: int) -> str:
+    """
+    Create a token for a chunk drained from a snapshot. Snapshots and cursors are
+    reused by later drains, so tokens also carry an identifier unique to the chunk
+    """
+    return INTERNAL_NAME_SEPERATOR.join(
+        (snapshot_name, _generate_batch_identifier(), str(cursor))
+    )
+
+
 def extract_batch_metadata(batch: str) -> tuple[str, str | None, int]:
     """
     Extract group name, identifier, and version from a counter batch's name
     """
-    if len(split := INTERNAL_NAME_SEPERATOR.split(batch)) != 3:
+    if len(split := batch.split(INTERNAL_NAME_SEPERATOR)) != 3:
         return split[0], None, 0
     return split[0], split[1], int(split[2])
 
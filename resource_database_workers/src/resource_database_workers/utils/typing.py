@@ -3,6 +3,7 @@ from typing import Any, ClassVar, Iterable, Literal, MutableSequence, Protocol,
 
 from psycopg import AsyncConnection
 
+from resource_auxillary.datastructures.database import CopyFormat
 from resource_auxillary.events import StreamedEvent
 
 type t_action_literal = Literal["save", "vote", "subscribe"]
@@ -17,6 +18,7 @@ class BatchInsertionFunction(Protocol):
         events: Sequence[StreamedEvent],
         successfully_inserted: MutableSequence[int],
         action: t_action_literal | None,
+        copy_format: CopyFormat,
         /,
     ) -> None: ...
 
@@ -36,10 +38,9 @@ class BatchDownstreamDeletionFunction(Protocol):
     async def __call__(
         self,
         conn: AsyncConnection,
-        parent_foreign_key: int,
         orphan_table: str,
         foreign_key_column: str,
-        deletion_time: datetime | None = None,
+        deletion_data: Sequence[tuple[int, int, datetime]],
         /,
     ) -> None: ...
 
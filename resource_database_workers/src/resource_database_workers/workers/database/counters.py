@@ -1,3 +1,5 @@
+import itertools
+
 from psycopg import AsyncConnection
 from psycopg.sql import Composed
 from psycopg.errors import OperationalError, LockNotAvailable, InternalError, Error
@@ -11,7 +13,7 @@ from resource_database_workers.datastructures.exceptions import (
     RecoverableDatabaseException,
     UnrecoverableDatabaseException,
 )
-from resource_database_workers.src.resource_database_workers.utils.sql_templates import (
+from resource_database_workers.utils.sql_templates import (
     prepare_updation_sql,
 )
 
@@ -20,18 +22,25 @@ async def flush_counter_updates(
     conn: AsyncConnection,
     counter_group: str,
     counters: dict[int, int],
+    chunk_size: int,
 ) -> None:
     table, column = counter_group.split(NAME_SEPERATOR)[:2]
-    updation_sql: Composed = prepare_updation_sql(
-        table, column, GenericLiterals.ID, counters
-    )
-    async with conn.transaction():
-        try:
-            await conn.execute(updation_sql)
-            await conn.commit()
-        except (OperationalError, LockNotAvailable, InternalError):
-            # Transient, possibly recoverable errors
-            raise RecoverableDatabaseException()
-        except Error:
-            # Unrecoverable databse errors
-            raise UnrecoverableDatabaseException()
+    updation_sql: Composed = prepare_updation_sql(table, column, GenericLiterals.ID)
+
+    # Rows are always locked in ascending ID order, so that concurrent flushes
+    # touching overlapping rows wait on each other instead of deadlocking
+    ordered_ids: list[int] = sorted(counters)
+    try:
+        async with conn.transaction():
+            for chunk in itertools.batched(ordered_ids, chunk_size):
+                await conn.execute(
+                    updation_sql,
+                    (list(chunk), [counters[id_] for id_ in chunk]),
+                    prepare=True,
+                )
+    except (OperationalError, LockNotAvailable, InternalError):
+        # Transient, possibly recoverable errors
+        raise RecoverableDatabaseException()
+    except Error:
+        # Unrecoverable databse errors
+        raise UnrecoverableDatabaseException()
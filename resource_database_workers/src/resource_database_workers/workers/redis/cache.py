@@ -1,20 +1,37 @@
 """Functions interfacing with application cache"""
 
-from typing import Mapping
+import itertools
+from typing import Final, Mapping
 
 from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
 
 from resource_database_workers.utils.lua_commands import (
-    CONDITIONAL_COUNTER_DECREMENT_TEMPLATE,
+    COUNTER_REFLECTION_SHA,
+    COUNTER_REFLECTION_TEMPLATE,
 )
 
+# Upper bound on counters reflected per script call, so that a single
+# call does not monopolize the application Redis for too long
+REFLECTION_CHUNK_SIZE: Final[int] = 5000
+
+
+async def load_counter_reflection_script(server_redis: Redis) -> None:
+    await server_redis.script_load(COUNTER_REFLECTION_TEMPLATE)
+
 
 async def reflect_processed_counters(
     server_redis: Redis, counter_group: str, counters: Mapping[str, int]
 ) -> None:
-    async with server_redis.pipeline(transaction=True) as pipeline:
-        for k, v in counters.items():
-            pipeline.eval(
-                CONDITIONAL_COUNTER_DECREMENT_TEMPLATE, 2, counter_group, k, v
+    for chunk in itertools.batched(counters.items(), REFLECTION_CHUNK_SIZE):
+        arguments: list[str | int] = list(itertools.chain.from_iterable(chunk))
+        try:
+            await server_redis.evalsha(  # type: ignore[reportGeneralTypeIssues]
+                COUNTER_REFLECTION_SHA, 1, counter_group, *arguments
+            )
+        except NoScriptError:
+            # Script cache was flushed, i.e. Redis restarted since worker startup
+            await load_counter_reflection_script(server_redis)
+            await server_redis.evalsha(  # type: ignore[reportGeneralTypeIssues]
+                COUNTER_REFLECTION_SHA, 1, counter_group, *arguments
             )
-        await pipeline.execute()
@@ -1,18 +1,26 @@
 """Utilities for counter workers"""
 
+import time
+from typing import Iterable, Sequence
+
 from redis.asyncio import Redis
 
-from resource_database_workers.src.resource_database_workers.config.config import (
+from resource_auxillary.events import CounterUpdate
+
+from resource_database_workers.config.config import (
     AppConfig,
 )
-from resource_database_workers.src.resource_database_workers.utils.strings import (
+from resource_database_workers.utils.strings import (
+    decode_reply,
+    derive_chunk_key,
+    derive_snapshot_key,
     generate_retry_batch_name,
 )
 
 
 async def retrieve_counter_group_names(redis: Redis, registry_name: str) -> set[str]:
     return {
-        str(i)
+        decode_reply(i)
         for i in (
             await redis.smembers(registry_name)  # type: ignore[reportGeneralTypeIssues]
         )
@@ -27,11 +35,92 @@ async def dispatch_to_retrier(
     *,
     current_retry_count: int = 0,
     identifier: str | None = None,
+    discarded_keys: Sequence[str] = (),
 ) -> None:
+    """
+    Register counters for a retry, deleting `discarded_keys` they were taken from
+    in the same transaction
+    """
     batch_name: str = generate_retry_batch_name(
         counter_group, current_retry_count + 1, identifier
     )
     async with worker_redis.pipeline(transaction=True) as pipeline:
         pipeline.rpush(config.WORKER.COUNTER_RETRY_REGISTRY_NAME, batch_name)
         pipeline.hset(batch_name, mapping=counter_data)
+        if discarded_keys:
+            pipeline.delete(*discarded_keys)
+        await pipeline.execute()
+
+
+async def renew_worker_lease(
+    redis: Redis, registry_name: str, worker_name: str, lease_ttl: float
+) -> set[str]:
+    """
+    Renew this worker's lease in the worker registry, evict workers whose leases
+    have expired, and return the names of all live workers (including this one).
+    Leases are stored as a sorted set of worker names scored by expiry time
+    """
+    now: float = time.time()
+    async with redis.pipeline(transaction=True) as pipeline:
+        pipeline.zadd(registry_name, {worker_name: now + lease_ttl})
+        pipeline.zremrangebyscore(registry_name, "-inf", now)
+        pipeline.zrange(registry_name, 0, -1)
+        *_, live_workers = await pipeline.execute()
+    return {decode_reply(worker) for worker in live_workers}
+
+
+async def release_worker_lease(
+    redis: Redis, registry_name: str, worker_name: str
+) -> None:
+    await redis.zrem(registry_name, worker_name)
+
+
+async def retrieve_pending_counter_sizes(
+    redis: Redis, counter_groups: list[str]
+) -> dict[str, int]:
+    """
+    Number of pending deltas per counter group, including deltas left
+    over in the snapshot and in-flight chunk of an interrupted drain
+    """
+    async with redis.pipeline(transaction=False) as pipeline:
+        for counter_group in counter_groups:
+            pipeline.hlen(counter_group)
+            pipeline.hlen(derive_snapshot_key(counter_group))
+            pipeline.hlen(derive_chunk_key(counter_group))
+        sizes: list[int] = await pipeline.execute()
+    return {
+        counter_group: sum(sizes[3 * i : 3 * i + 3])
+        for i, counter_group in enumerate(counter_groups)
+    }
+
+
+async def retrieve_pending_counter_deltas(
+    redis: Redis, counter_group: str, cache_keys: Sequence[str]
+) -> list[int]:
+    """
+    Deltas of a counter group not yet flushed to the database, per cache key,
+    including deltas left over in the snapshot and in-flight chunk of an
+    interrupted drain
+    """
+    async with redis.pipeline(transaction=False) as pipeline:
+        pipeline.hmget(counter_group, cache_keys)
+        pipeline.hmget(derive_snapshot_key(counter_group), cache_keys)
+        pipeline.hmget(derive_chunk_key(counter_group), cache_keys)
+        pending, snapshotted, chunked = await pipeline.execute()
+    return [
+        sum(int(delta or 0) for delta in deltas)
+        for deltas in zip(pending, snapshotted, chunked)
+    ]
+
+
+async def apply_counter_updates(
+    redis: Redis, counter_updates: Iterable[CounterUpdate]
+) -> None:
+    async with redis.pipeline(transaction=True) as pipeline:
+        for counter_update in counter_updates:
+            pipeline.hincrby(
+                counter_update.counter_group,
+                counter_update.cache_key,
+                counter_update.delta,
+            )
         await pipeline.execute()
@@ -6,7 +6,7 @@ from redis.asyncio import Redis
 
 from auxillary.utils import cache_repr, json_repr
 
-from resource_auxillary.events import Event, StreamedEvent
+from resource_auxillary.events import Event, EventSideEffects, StreamedEvent
 from resource_auxillary.event_processing.post_processing import stream_events
 from resource_auxillary.event_processing.qos import execute_with_redis_retries
 from resource_auxillary.strings import NAME_SEPERATOR, EventName, StreamName
@@ -17,6 +17,7 @@ from resource_database_workers.datastructures.dead_counter_batch import DeadCoun
 
 async def declare_counters_event_dead(
     redis: Redis,
+    worker_config: WorkerConfig,
     dlq_stream_name: StreamName,
     counter_group: str,
     batch: dict[int, int],
@@ -33,7 +34,7 @@ async def declare_counters_event_dead(
     )
 
     xack_coroutine = lambda: redis.xadd(dlq_stream_name, cache_repr(failure_event))
-    await execute_with_redis_retries(xack_coroutine, attempts)  # type: ignore[reportArgumentType]
+    await execute_with_redis_retries(worker_config, xack_coroutine, attempts)
 
 
 async def declare_side_effects_event_dead(
@@ -7,7 +7,7 @@ from auxillary.utils import cache_repr
 
 from resource_auxillary.cache import derive_cache_key
 from resource_auxillary.datastructures.database import StrongEntity
-from resource_auxillary.events import Event
+from resource_auxillary.events import Event, EventSideEffects
 from resource_auxillary.event_processing.qos import (
     execute_with_redis_retries,
 )
@@ -22,10 +22,10 @@ from resource_database_workers.datastructures.downstream import (
     t_downstream_counter_event_metadata,
 )
 
-from resource_database_workers.src.resource_database_workers.config.sub_config import (
+from resource_database_workers.config.sub_config import (
     WorkerConfig,
 )
-from resource_database_workers.src.resource_database_workers.workers.redis.declarations import (
+from resource_database_workers.workers.redis.declarations import (
     declare_standard_event_dead,
 )
 
@@ -85,7 +85,7 @@ async def dispatch_downstream_counter_decrements(
     redis: Redis,
     worker_config: WorkerConfig,
     deleted_entity: StrongEntity,
-    deletion_author_event_id: int,
+    deletion_author_event_ids: Iterable[int],
     dlq_stream_name: StreamName,
 ) -> None:
     downstream_counter_data: tuple[t_downstream_counter_event_metadata, ...] | None = (
@@ -107,6 +107,7 @@ async def dispatch_downstream_counter_decrements(
             ),  # type: ignore
             side_effects=EventSideEffects(),  # type: ignore
         )
+        for deletion_author_event_id in deletion_author_event_ids
         for (event_name, foreign_key_column, hashmap_name) in downstream_counter_data
     ]
 
@@ -119,7 +120,7 @@ async def dispatch_downstream_counter_decrements(
 
 async def emit_downstream_counter_decrement_updates(
     redis: Redis,
-    deltas: Iterable[tuple[str, int]],
+    deltas: Iterable[tuple[int, int]],
     hashmap_name: str,
     hash_key_prefix: StrongEntity,
 ) -> None:
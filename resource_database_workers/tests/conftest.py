@@ -0,0 +1,103 @@
+"""
+Fixtures for running workers against live Postgres and Redis instances.
+
+Tests are skipped unless TENJIN_TEST_POSTGRES_URL and TENJIN_TEST_REDIS_URL point at
+a scratch database and Redis database, both of which are wiped by every test. The
+Redis database after the given one stands in for the application cache
+"""
+
+import os
+from typing import Final, Iterator
+from urllib.parse import urlsplit
+
+import pytest
+from redis import Redis
+from sqlalchemy import Engine, create_engine, text
+
+from resource_auxillary.datastructures.database import EventLiteral
+
+POSTGRES_URL_VARIABLE: Final[str] = "TENJIN_TEST_POSTGRES_URL"
+REDIS_URL_VARIABLE: Final[str] = "TENJIN_TEST_REDIS_URL"
+
+# Two users, one forum, and two posts by the first user in it, with every stored
+# counter left at 0
+_SEED_STATEMENTS: Final[tuple[str, ...]] = (
+    """
+    INSERT INTO users (username, email, pw_hash)
+    SELECT 'test_user_' || g, 'test_user_' || g || '@example.com', '\\x00'
+    FROM generate_series(1, 2) AS g
+    """,
+    "INSERT INTO animes (title, synopsis) VALUES ('test_anime', 'Test anime')",
+    """
+    INSERT INTO forums (name_, parent_anime, created_at)
+    VALUES ('test_forum', 1, CURRENT_TIMESTAMP)
+    """,
+    """
+    INSERT INTO posts (author_id, parent_forum, title, body_text)
+    SELECT 1, 1, 'test_post_' || g, 'Test post' FROM generate_series(1, 2) AS g
+    """,
+)
+
+_EVENT_PARTITION_STATEMENT: Final[str] = f"""
+    CREATE TABLE {EventLiteral.EVENTS_TABLE_NAME}_test
+    PARTITION OF {EventLiteral.EVENTS_TABLE_NAME} DEFAULT
+"""
+
+
+def _require_url(variable: str) -> str:
+    url: str | None = os.environ.get(variable)
+    if not url:
+        pytest.skip(f"{variable} is not set")
+    return url
+
+
+@pytest.fixture(scope="session")
+def database_engine() -> Iterator[Engine]:
+    database = pytest.importorskip("resource_server.models.database")
+    url: str = _require_url(POSTGRES_URL_VARIABLE)
+    engine: Engine = create_engine(
+        url.replace("postgresql://", "postgresql+psycopg://")
+    )
+    database.Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        # Enabled by migrations in deployments, trigram indexes depend on it
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    database.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(_EVENT_PARTITION_STATEMENT))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def postgres_url(database_engine: Engine) -> str:
+    with database_engine.begin() as conn:
+        tables: list[str] = list(
+            conn.execute(
+                text("SELECT tablename FROM pg_tables WHERE schemaname = 'public'")
+            ).scalars()
+        )
+        conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+        for statement in _SEED_STATEMENTS:
+            conn.execute(text(statement))
+    return database_engine.url.set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+@pytest.fixture
+def redis_url() -> str:
+    url: str = _require_url(REDIS_URL_VARIABLE)
+    with Redis.from_url(url) as redis:
+        redis.flushdb()
+    return url
+
+
+@pytest.fixture
+def cache_redis_url(redis_url: str) -> str:
+    with Redis.from_url(redis_url) as redis:
+        db: int = redis.connection_pool.connection_kwargs.get("db", 0)
+    url: str = urlsplit(redis_url)._replace(path=f"/{db + 1}").geturl()
+    with Redis.from_url(url) as redis:
+        redis.flushdb()
+    return url
@@ -0,0 +1,37 @@
+import asyncio
+
+from psycopg import AsyncConnection
+
+from resource_auxillary.datastructures.database import CopyFormat
+from resource_auxillary.event_processing.bulk_copy import copy_rows
+
+
+async def _copy_untyped_rows(postgres_url: str) -> tuple[CopyFormat, list[tuple]]:
+    """
+    Copy rows whose values do not match their columns' types within a transaction,
+    and read them back in the same transaction
+    """
+    async with await AsyncConnection.connect(postgres_url) as conn:
+        async with conn.transaction(), conn.cursor() as cursor:
+            await cursor.execute(
+                "CREATE TEMP TABLE staged_users AS "
+                "SELECT id_, total_posts FROM users WITH NO DATA"
+            )
+            copy_format: CopyFormat = await copy_rows(
+                cursor,
+                "staged_users",
+                ("id_", "total_posts"),
+                [("1", "2"), ("2", "3")],
+                type_reference="users",
+            )
+            await cursor.execute(
+                "SELECT id_, total_posts FROM staged_users ORDER BY id_"
+            )
+            return copy_format, await cursor.fetchall()
+
+
+def test_untyped_rows_are_copied_as_text(postgres_url: str) -> None:
+    copy_format, rows = asyncio.run(_copy_untyped_rows(postgres_url))
+
+    assert copy_format == CopyFormat.TEXT
+    assert rows == [(1, 2), (2, 3)]
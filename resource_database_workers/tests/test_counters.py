@@ -0,0 +1,318 @@
+import asyncio
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from resource_auxillary.cache import derive_cache_key, derive_hashmap_name
+from resource_auxillary.datastructures.database import EventLiteral, StrongEntity
+from resource_auxillary.strings import StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.tasks.counters import batch_update_counter_group
+from resource_database_workers.utils.strings import (
+    derive_chunk_key,
+    derive_chunk_token_key,
+    derive_snapshot_key,
+    extract_batch_metadata,
+    generate_chunk_token,
+    generate_retry_batch_name,
+)
+
+FORUM_POSTS: str = derive_hashmap_name(StrongEntity.FORUM, "posts")
+USER_TOTAL_POSTS: str = derive_hashmap_name(StrongEntity.USER, "total_posts")
+
+
+def _draining_config() -> AppConfig:
+    config: AppConfig = AppConfig()
+    return config.model_copy(
+        update={
+            "WORKER": config.WORKER.model_copy(
+                update={"COUNTER_DRAIN_THRESHOLD": 1, "COUNTER_DRAIN_CHUNK_SIZE": 1}
+            )
+        }
+    )
+
+
+async def _select_counters(postgres_url: str) -> tuple[int, list[int]]:
+    async with await AsyncConnection.connect(postgres_url) as conn:
+        forum_posts, *_ = await (
+            await conn.execute("SELECT posts FROM forums WHERE id_ = 1")
+        ).fetchone()
+        users_posts = await (
+            await conn.execute("SELECT total_posts FROM users ORDER BY id_")
+        ).fetchall()
+    return forum_posts, [total_posts for (total_posts,) in users_posts]
+
+
+async def _count_dead_letters(redis_url: str) -> int:
+    async with Redis.from_url(redis_url) as worker_redis:
+        return await worker_redis.xlen(StreamName.DEAD_LETTER_QUEUE)
+
+
+async def _flush(
+    config: AppConfig,
+    postgres_url: str,
+    redis_url: str,
+    cache_redis_url: str,
+    batch_name: str,
+    worker_deltas: dict[str, int],
+    cache_deltas: dict[str, int],
+) -> tuple[int, dict[str, str], dict[str, str]]:
+    """
+    Flush a batch of deltas pending in the worker Redis, against the application
+    cache holding `cache_deltas`, which also include deltas counted after the flush
+    read its batch
+    """
+    counter_group, _, _ = extract_batch_metadata(batch_name)
+    worker_redis: Redis = Redis.from_url(redis_url, decode_responses=True)
+    server_redis: Redis = Redis.from_url(cache_redis_url, decode_responses=True)
+    if worker_deltas:
+        await worker_redis.hset(batch_name, mapping=worker_deltas)
+    await server_redis.hset(counter_group, mapping=cache_deltas)
+
+    async with AsyncConnectionPool(postgres_url, open=False) as pool:
+        flushed: int = await batch_update_counter_group(
+            config,
+            pool,
+            batch_name,
+            StreamName.DEAD_LETTER_QUEUE,
+            worker_redis,
+            server_redis,
+        )
+
+    pending: dict[str, str] = await worker_redis.hgetall(batch_name)
+    cached: dict[str, str] = await server_redis.hgetall(counter_group)
+    await worker_redis.aclose()
+    await server_redis.aclose()
+    return flushed, pending, cached
+
+
+async def _resume_committed_drain(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> tuple[int, dict[str, str], dict[str, str], int]:
+    """
+    Resume a drain interrupted after its in-flight chunk, holding the first user's
+    deltas, was committed, but before it was removed from the chunk key
+    """
+    users: list[str] = [derive_cache_key(StrongEntity.USER, i) for i in (1, 2)]
+    snapshot_name: str = derive_snapshot_key(USER_TOTAL_POSTS)
+    token: str = generate_chunk_token(snapshot_name, 0)
+    async with await AsyncConnection.connect(postgres_url, autocommit=True) as conn:
+        await conn.execute("UPDATE users SET total_posts = 2 WHERE id_ = 1")
+        await conn.execute(
+            f"INSERT INTO {EventLiteral.EVENTS_TABLE_NAME} "
+            f"({EventLiteral.EVENT_ID_COLUMN_NAME}) VALUES (%s)",
+            (token,),
+        )
+
+    async with Redis.from_url(redis_url, decode_responses=True) as worker_redis:
+        await worker_redis.hset(snapshot_name, mapping={users[1]: 3})
+        await worker_redis.hset(
+            derive_chunk_key(USER_TOTAL_POSTS), mapping={users[0]: 2}
+        )
+        await worker_redis.set(derive_chunk_token_key(USER_TOTAL_POSTS), token)
+
+    flushed, pending, cached = await _flush(
+        _draining_config(),
+        postgres_url,
+        redis_url,
+        cache_redis_url,
+        USER_TOTAL_POSTS,
+        {},
+        {users[0]: 2, users[1]: 3},
+    )
+    async with Redis.from_url(redis_url) as worker_redis:
+        leftover_keys: int = await worker_redis.exists(
+            snapshot_name,
+            derive_chunk_key(USER_TOTAL_POSTS),
+            derive_chunk_token_key(USER_TOTAL_POSTS),
+        )
+    return flushed, pending, cached, leftover_keys
+
+
+async def _drain_with_locked_users(
+    postgres_url: str, redis_url: str, cache_redis_url: str, version: int
+) -> tuple[int, dict[str, dict[str, str]], int, int]:
+    """
+    Drain a retry batch while its users are locked, so its first chunk fails with
+    a recoverable lock timeout
+    """
+    users: list[str] = [derive_cache_key(StrongEntity.USER, i) for i in (1, 2)]
+    batch_name: str = generate_retry_batch_name(
+        USER_TOTAL_POSTS, version=version, identifier="1"
+    )
+    async with await AsyncConnection.connect(postgres_url) as blocker:
+        await blocker.execute("SELECT id_ FROM users FOR UPDATE")
+        flushed, _, _ = await _flush(
+            _draining_config(),
+            f"{postgres_url}?options=-c%20lock_timeout%3D100",
+            redis_url,
+            cache_redis_url,
+            batch_name,
+            {users[0]: 2, users[1]: 3},
+            {users[0]: 2, users[1]: 3},
+        )
+        await blocker.rollback()
+
+    config: AppConfig = AppConfig()
+    async with Redis.from_url(redis_url, decode_responses=True) as worker_redis:
+        retried: dict[str, dict[str, str]] = {
+            retry_name: await worker_redis.hgetall(retry_name)
+            for retry_name in await worker_redis.lrange(
+                config.WORKER.COUNTER_RETRY_REGISTRY_NAME, 0, -1
+            )
+        }
+        dead_letters: int = await worker_redis.xlen(StreamName.DEAD_LETTER_QUEUE)
+        leftover_keys: int = await worker_redis.exists(
+            derive_snapshot_key(batch_name),
+            derive_chunk_key(batch_name),
+            derive_chunk_token_key(batch_name),
+        )
+    return flushed, retried, dead_letters, leftover_keys
+
+
+def test_flushed_counters_converge(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    forum: str = derive_cache_key(StrongEntity.FORUM, 1)
+    flushed, pending, cached = asyncio.run(
+        _flush(
+            AppConfig(),
+            postgres_url,
+            redis_url,
+            cache_redis_url,
+            FORUM_POSTS,
+            {forum: 5},
+            {forum: 6},
+        )
+    )
+    forum_posts, _ = asyncio.run(_select_counters(postgres_url))
+
+    assert flushed == 1
+    assert pending == {}
+    assert forum_posts == 5
+    # Readers add pending cache deltas to stored counters, and still see all 6
+    assert cached == {forum: "1"}
+
+
+def test_drained_counters_converge(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    users: list[str] = [derive_cache_key(StrongEntity.USER, i) for i in (1, 2)]
+    flushed, pending, cached = asyncio.run(
+        _flush(
+            _draining_config(),
+            postgres_url,
+            redis_url,
+            cache_redis_url,
+            USER_TOTAL_POSTS,
+            {users[0]: 2, users[1]: 3},
+            {users[0]: 2, users[1]: 3},
+        )
+    )
+    _, users_posts = asyncio.run(_select_counters(postgres_url))
+
+    assert flushed == 2
+    assert pending == {}
+    assert users_posts == [2, 3]
+    assert cached == {}
+
+
+def test_retried_counters_converge(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    forum: str = derive_cache_key(StrongEntity.FORUM, 1)
+    flushed, pending, cached = asyncio.run(
+        _flush(
+            AppConfig(),
+            postgres_url,
+            redis_url,
+            cache_redis_url,
+            generate_retry_batch_name(FORUM_POSTS, version=1),
+            {forum: 4},
+            {forum: 4},
+        )
+    )
+    forum_posts, _ = asyncio.run(_select_counters(postgres_url))
+
+    assert flushed == 1
+    assert pending == {}
+    assert forum_posts == 4
+    assert cached == {}
+
+
+def test_rejected_counters_are_dead_lettered(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    forum: str = derive_cache_key(StrongEntity.FORUM, 1)
+    # Stored counters are checked to never go negative
+    flushed, pending, cached = asyncio.run(
+        _flush(
+            AppConfig(),
+            postgres_url,
+            redis_url,
+            cache_redis_url,
+            FORUM_POSTS,
+            {forum: -1},
+            {forum: -1},
+        )
+    )
+    dead_letters: int = asyncio.run(_count_dead_letters(redis_url))
+
+    assert flushed == 0
+    assert pending == {}
+    assert dead_letters == 1
+    assert cached == {forum: "-1"}
+
+
+def test_resumed_drain_skips_committed_chunk(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    flushed, pending, cached, leftover_keys = asyncio.run(
+        _resume_committed_drain(postgres_url, redis_url, cache_redis_url)
+    )
+    _, users_posts = asyncio.run(_select_counters(postgres_url))
+
+    # Only the snapshot's remainder is flushed, the committed chunk is not re-applied
+    assert flushed == 1
+    assert pending == {}
+    assert users_posts == [2, 3]
+    assert leftover_keys == 0
+    # Both chunks are reflected, as the committed one was yet to be
+    assert cached == {}
+
+
+def test_failed_drain_is_retried_with_next_version(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    users: list[str] = [derive_cache_key(StrongEntity.USER, i) for i in (1, 2)]
+    flushed, retried, dead_letters, leftover_keys = asyncio.run(
+        _drain_with_locked_users(postgres_url, redis_url, cache_redis_url, version=1)
+    )
+
+    assert flushed == 0
+    assert retried == {
+        generate_retry_batch_name(USER_TOTAL_POSTS, version=2, identifier="1"): {
+            users[0]: "2",
+            users[1]: "3",
+        }
+    }
+    assert dead_letters == 0
+    assert leftover_keys == 0
+
+
+def test_failed_drain_out_of_retries_is_dead_lettered(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    max_retries: int = AppConfig().WORKER.MAX_RETRIES
+    flushed, retried, dead_letters, leftover_keys = asyncio.run(
+        _drain_with_locked_users(
+            postgres_url, redis_url, cache_redis_url, version=max_retries
+        )
+    )
+
+    assert flushed == 0
+    assert retried == {}
+    assert dead_letters == 1
+    assert leftover_keys == 0
@@ -0,0 +1,152 @@
+import asyncio
+from typing import Any
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from auxillary.utils import json_repr
+from resource_auxillary.datastructures.database import DeadLetterQueueLiteral
+from resource_auxillary.events import EventSideEffects, StreamedEvent
+from resource_auxillary.strings import EventName, StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.dead_counter_batch import (
+    DeadCounterBatch,
+)
+from resource_database_workers.tasks.dlq_workers import dlq_consumer
+
+# Recorded before the test, outside of the dedup table
+CONFLICTING_EVENT_ID: int = 42
+GROUP_NAME: str = "test_group"
+
+
+def _dlq_event(
+    name: EventName, payload: dict[str, Any], event_id: int
+) -> StreamedEvent:
+    return StreamedEvent(
+        name=name,
+        payload=payload,
+        side_effects=EventSideEffects(),  # type: ignore[reportCallIssue]
+        event_id=event_id,
+    )
+
+
+async def _select_dlq_records(
+    conn: AsyncConnection,
+) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]:
+    counters = await (
+        await conn.execute(
+            f"SELECT {DeadLetterQueueLiteral.COUNTERS_AFFECTED_RELATION_COLUMN_NAME}, "
+            f"{DeadLetterQueueLiteral.PAYLOAD_COLUMN_NAME} "
+            f"FROM {DeadLetterQueueLiteral.COUNTERS_TABLE_NAME}"
+        )
+    ).fetchall()
+    events = await (
+        await conn.execute(
+            f"SELECT event_id FROM {DeadLetterQueueLiteral.TABLE_NAME} "
+            "ORDER BY event_id"
+        )
+    ).fetchall()
+    return counters, events
+
+
+async def _deliver(redis: Redis, events: list[StreamedEvent]) -> None:
+    """Leave an entry pending for each event, with the event's ID as its entry ID"""
+    # Entry IDs have to increase
+    for event in sorted(events, key=lambda e: e.event_id):
+        await redis.xadd(
+            StreamName.DEAD_LETTER_QUEUE, {"name": event.name}, id=f"{event.event_id}-0"
+        )
+    await redis.xgroup_create(StreamName.DEAD_LETTER_QUEUE, GROUP_NAME, id="0")
+    await redis.xreadgroup(
+        GROUP_NAME, "test_consumer", {StreamName.DEAD_LETTER_QUEUE: ">"}
+    )
+
+
+async def _consume(
+    postgres_url: str, redis_url: str, batches: list[list[StreamedEvent]]
+) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]], list[str]]:
+    """
+    Run a DLQ consumer over each batch in turn, until it is done with all of them
+
+    Returns:
+        Recorded dead counter batches, recorded events, and entries left pending
+    """
+    config: AppConfig = AppConfig()
+    async with await AsyncConnection.connect(postgres_url, autocommit=True) as conn:
+        await conn.execute(
+            f"INSERT INTO {DeadLetterQueueLiteral.TABLE_NAME} (event_id, payload) "
+            "VALUES (%s, '{}')",
+            (str(CONFLICTING_EVENT_ID),),
+        )
+
+        queue: asyncio.Queue[StreamedEvent] = asyncio.Queue()
+        async with (
+            AsyncConnectionPool(postgres_url, open=False) as pool,
+            Redis.from_url(redis_url, decode_responses=True) as redis,
+        ):
+            await _deliver(redis, [event for batch in batches for event in batch])
+            consumer: asyncio.Task = asyncio.create_task(
+                dlq_consumer(
+                    config,
+                    StreamName.DEAD_LETTER_QUEUE,
+                    pool,
+                    redis,
+                    GROUP_NAME,
+                    queue,
+                )
+            )
+            for batch in batches:
+                for event in batch:
+                    queue.put_nowait(event)
+                # Batches are only taken from the queue once the previous one is done
+                while not (queue.empty() or consumer.done()):
+                    await asyncio.sleep(0.05)
+            # Give the last batch time to be recorded
+            await asyncio.sleep(0.5)
+            assert not consumer.done()
+            consumer.cancel()
+            pending: list[dict[str, Any]] = await redis.xpending_range(
+                StreamName.DEAD_LETTER_QUEUE, GROUP_NAME, "-", "+", 100
+            )
+
+        counters, events = await _select_dlq_records(conn)
+        return counters, events, [entry["message_id"] for entry in pending]
+
+
+def test_dlq_consumer_records_and_survives_failures(
+    postgres_url: str, redis_url: str
+) -> None:
+    dead_counter_batch: DeadCounterBatch = DeadCounterBatch.construct_from_failed_batch(
+        "forums", "posts", {1: -1}
+    )
+    counters, events, pending = asyncio.run(
+        _consume(
+            postgres_url,
+            redis_url,
+            [
+                [_dlq_event(EventName.FORUM_SUB, {}, 1)],
+                [
+                    _dlq_event(EventName.FORUM_SUB, {}, 2),
+                    # Conflicts with an existing record, in the middle of its batch
+                    _dlq_event(EventName.FORUM_SUB, {}, CONFLICTING_EVENT_ID),
+                    _dlq_event(EventName.DLQ_COUNTER, json_repr(dead_counter_batch), 3),
+                    # Malformed, and recorded as it is
+                    _dlq_event(EventName.DLQ_COUNTER, {"table": "forums"}, 4),
+                    _dlq_event(EventName.FORUM_SUB, {}, 5),
+                ],
+            ],
+        )
+    )
+
+    assert counters == [("forums", {"1": -1})]
+    assert events == [
+        ("1",),
+        ("2",),
+        ("4",),
+        (str(CONFLICTING_EVENT_ID),),
+        ("5",),
+    ]
+    # Only the poison event is left unacknowledged
+    assert pending == [f"{CONFLICTING_EVENT_ID}-0"]
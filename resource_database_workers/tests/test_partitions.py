@@ -0,0 +1,115 @@
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from resource_auxillary.datastructures.database import EventLiteral
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.tasks.partitions import (
+    derive_event_partition_name,
+    manage_event_partitions,
+)
+from resource_database_workers.utils.sql_templates import (
+    prepare_event_partition_creation,
+    prepare_event_partition_drop,
+)
+
+# Long out of the dedup window, and due to be dropped
+EXPIRED_PARTITION_START: datetime = datetime(2020, 1, 1)
+
+
+async def _select_partitions(conn: AsyncConnection) -> set[str]:
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = %s::regclass",
+            (EventLiteral.EVENTS_TABLE_NAME,),
+        )
+        return {name for (name,) in await cursor.fetchall()}
+
+
+async def _manage_with_locked_expired_partition(
+    postgres_url: str,
+) -> tuple[int, int, set[str]]:
+    config: AppConfig = AppConfig()
+    today: datetime = datetime.combine(date.today(), time())
+    expired_partition: str = derive_event_partition_name(EXPIRED_PARTITION_START)
+    async with await AsyncConnection.connect(postgres_url, autocommit=True) as conn:
+        for start in (EXPIRED_PARTITION_START, today):
+            await conn.execute(
+                prepare_event_partition_creation(
+                    derive_event_partition_name(start), start, start + timedelta(days=1)
+                )
+            )
+        preexisting: set[str] = await _select_partitions(conn)
+
+        # Held until the pass is over, so that dropping the expired partition
+        # times out after new partitions have been created
+        async with await AsyncConnection.connect(postgres_url) as blocker:
+            await blocker.execute(
+                f"LOCK TABLE {expired_partition} IN ACCESS SHARE MODE"
+            )
+            async with AsyncConnectionPool(postgres_url, open=False) as pool:
+                created, dropped = await manage_event_partitions(config, pool)
+            await blocker.rollback()
+
+        partitions: set[str] = await _select_partitions(conn)
+        for partition in partitions - preexisting | {expired_partition}:
+            await conn.execute(prepare_event_partition_drop(partition))
+        await conn.execute(
+            prepare_event_partition_drop(derive_event_partition_name(today))
+        )
+    return created, dropped, partitions - preexisting
+
+
+async def _manage_in_time_zone(
+    postgres_url: str, time_zone: str
+) -> tuple[set[str], set[str]]:
+    """
+    Manage partitions over connections whose session time zone is `time_zone`
+
+    Returns:
+        Names of the created partitions, and of the partitions due from the
+        database's current date on
+    """
+    config: AppConfig = AppConfig()
+    span: timedelta = timedelta(days=config.WORKER.EVENT_PARTITION_SPAN)
+    zoned_url: str = f"{postgres_url}?options=-c%20TimeZone%3D{time_zone}"
+    async with await AsyncConnection.connect(zoned_url, autocommit=True) as conn:
+        preexisting: set[str] = await _select_partitions(conn)
+        async with AsyncConnectionPool(zoned_url, open=False) as pool:
+            await manage_event_partitions(config, pool)
+        partitions: set[str] = await _select_partitions(conn)
+        database_today, *_ = await (
+            await conn.execute("SELECT LOCALTIMESTAMP::date")
+        ).fetchone()
+
+        for partition in partitions - preexisting:
+            await conn.execute(prepare_event_partition_drop(partition))
+    due: set[str] = {
+        derive_event_partition_name(database_today + span * i)
+        for i in range(config.WORKER.EVENT_PARTITIONS_AHEAD)
+    }
+    return partitions - preexisting, due
+
+
+def test_partition_ddl_commits_independently(postgres_url: str) -> None:
+    created, dropped, new_partitions = asyncio.run(
+        _manage_with_locked_expired_partition(postgres_url)
+    )
+
+    assert created == AppConfig().WORKER.EVENT_PARTITIONS_AHEAD
+    assert dropped == 0
+    # Created partitions outlive the timed out drop that followed them
+    assert len(new_partitions) == created
+
+
+def test_partitions_follow_database_time(postgres_url: str) -> None:
+    # Dates 14 hours ahead of and 12 behind UTC always differ, so at least one of
+    # them differs from the worker's
+    for time_zone in ("Etc/GMT-14", "Etc/GMT+12"):
+        created, due = asyncio.run(_manage_in_time_zone(postgres_url, time_zone))
+
+        assert due <= created
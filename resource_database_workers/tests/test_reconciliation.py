@@ -0,0 +1,145 @@
+import asyncio
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from auxillary.utils import cache_repr
+from resource_auxillary.cache import derive_cache_key
+from resource_auxillary.datastructures.database import StrongEntity
+from resource_auxillary.events import Event, EventSideEffects
+from resource_auxillary.strings import EventName, StreamName
+
+from resource_database_workers.config.config import AppConfig
+from resource_database_workers.datastructures.token_bucket import TokenBucket
+from resource_database_workers.tasks.counters import batch_update_counter_group
+from resource_database_workers.tasks.reconciliation import (
+    FORUM_COUNTERS,
+    reconcile_statistics,
+)
+
+# Far enough in the past to have settled under any reconciliation lag
+SETTLED_ENTRY_ID: str = "1000-0"
+
+
+def _settled_config() -> AppConfig:
+    config: AppConfig = AppConfig()
+    return config.model_copy(
+        update={
+            "WORKER": config.WORKER.model_copy(update={"RECONCILIATION_SETTLE_TIME": 0})
+        }
+    )
+
+
+async def _reconcile_twice(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> tuple[int, int, dict[bytes, bytes], dict[bytes, bytes]]:
+    config: AppConfig = _settled_config()
+    # Replies are left undecoded, as with clients not configured to decode them
+    worker_redis: Redis = Redis.from_url(redis_url)
+    server_redis: Redis = Redis.from_url(cache_redis_url)
+    bucket: TokenBucket = TokenBucket(rate=1000, capacity=1000)
+    post_create: Event = Event(
+        name=EventName.POST_CREATE,
+        payload={"forum_id": 1, "author_id": 1, "title": "test_post_3"},
+        side_effects=EventSideEffects(),  # type: ignore[reportCallIssue]
+    )
+    await worker_redis.xadd(
+        StreamName.POSTS, cache_repr(post_create), id=SETTLED_ENTRY_ID
+    )
+
+    async with AsyncConnectionPool(postgres_url, open=False) as pool:
+        first_pass: int = await reconcile_statistics(
+            config, pool, worker_redis, server_redis, bucket, "worker-1"
+        )
+        second_pass: int = await reconcile_statistics(
+            config, pool, worker_redis, server_redis, bucket, "worker-1"
+        )
+
+    watermarks: dict[bytes, bytes] = await worker_redis.hgetall(
+        config.WORKER.RECONCILIATION_WATERMARK_NAME
+    )
+    forum_posts: dict[bytes, bytes] = await worker_redis.hgetall(
+        dict(FORUM_COUNTERS)["posts"]
+    )
+    await worker_redis.aclose()
+    await server_redis.aclose()
+    return first_pass, second_pass, watermarks, forum_posts
+
+
+async def _reconcile_and_flush(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> tuple[int, dict[str, str]]:
+    """
+    Correct the forum's post counter, which leaves out the seeded posts, while a
+    third post's delta is pending a flush, then flush the correction along with it
+    """
+    config: AppConfig = _settled_config()
+    forum_posts_group: str = dict(FORUM_COUNTERS)["posts"]
+    forum: str = derive_cache_key(StrongEntity.FORUM, 1)
+    worker_redis: Redis = Redis.from_url(redis_url, decode_responses=True)
+    server_redis: Redis = Redis.from_url(cache_redis_url, decode_responses=True)
+    post_create: Event = Event(
+        name=EventName.POST_CREATE,
+        payload={"forum_id": 1, "author_id": 1, "title": "test_post_1"},
+        side_effects=EventSideEffects(),  # type: ignore[reportCallIssue]
+    )
+    await worker_redis.xadd(
+        StreamName.POSTS, cache_repr(post_create), id=SETTLED_ENTRY_ID
+    )
+    async with await AsyncConnection.connect(postgres_url, autocommit=True) as conn:
+        await conn.execute(
+            "INSERT INTO posts (author_id, parent_forum, title, body_text) "
+            "VALUES (1, 1, 'test_post_3', 'Test post')"
+        )
+    await worker_redis.hset(forum_posts_group, mapping={forum: 1})
+    await server_redis.hset(forum_posts_group, mapping={forum: 1})
+
+    bucket: TokenBucket = TokenBucket(rate=1000, capacity=1000)
+    async with AsyncConnectionPool(postgres_url, open=False) as pool:
+        await reconcile_statistics(
+            config, pool, worker_redis, server_redis, bucket, "worker-1"
+        )
+        await batch_update_counter_group(
+            config,
+            pool,
+            forum_posts_group,
+            StreamName.DEAD_LETTER_QUEUE,
+            worker_redis,
+            server_redis,
+        )
+    async with await AsyncConnection.connect(postgres_url) as conn:
+        forum_posts, *_ = await (
+            await conn.execute("SELECT posts FROM forums WHERE id_ = 1")
+        ).fetchone()
+
+    cached: dict[str, str] = await server_redis.hgetall(forum_posts_group)
+    await worker_redis.aclose()
+    await server_redis.aclose()
+    return forum_posts, cached
+
+
+def test_reconciliation_pass_advances_watermarks(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    first_pass, second_pass, watermarks, forum_posts = asyncio.run(
+        _reconcile_twice(postgres_url, redis_url, cache_redis_url)
+    )
+
+    assert first_pass == 1
+    assert watermarks == {StreamName.POSTS.encode(): SETTLED_ENTRY_ID.encode()}
+    # Seeded posts are not counted by the stored counter, and are corrected for
+    assert forum_posts == {derive_cache_key(StrongEntity.FORUM, 1).encode(): b"2"}
+    assert second_pass == 0
+
+
+def test_flushed_corrections_are_reflected(
+    postgres_url: str, redis_url: str, cache_redis_url: str
+) -> None:
+    forum_posts, cached = asyncio.run(
+        _reconcile_and_flush(postgres_url, redis_url, cache_redis_url)
+    )
+
+    assert forum_posts == 3
+    # Readers add pending cache deltas to stored counters, and see all 3
+    assert cached == {}
@@ -0,0 +1,86 @@
+"""adds_keyset_pagination_indexes
+
+Revision ID: 08c58421789c
+Revises: 3c8e51f0a7d2
+Create Date: 2026-10-18 22:51:36.482917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "08c58421789c"
+down_revision: Union[str, Sequence[str], None] = "3c8e51f0a7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_posts_parent_forum_time_posted_id",
+        "posts",
+        ["parent_forum", sa.text("time_posted DESC"), sa.text("id_ DESC")],
+        unique=False,
+        postgresql_where=sa.text("NOT deleted"),
+    )
+    op.create_index(
+        "ix_posts_author_id_time_posted_id",
+        "posts",
+        ["author_id", sa.text("time_posted DESC"), sa.text("id_ DESC")],
+        unique=False,
+        postgresql_where=sa.text("NOT deleted"),
+    )
+    op.create_index(
+        "ix_comments_parent_post_time_created_id",
+        "comments",
+        ["parent_post", "time_created", "id_"],
+        unique=False,
+        postgresql_where=sa.text("NOT deleted"),
+    )
+    op.create_index(
+        "ix_forum_subscriptions_user_id_time_subscribed_forum_id",
+        "forum_subscriptions",
+        ["user_id", sa.text("time_subscribed DESC"), sa.text("forum_id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_subscribed"),
+    )
+    op.create_index(
+        "ix_anime_subscriptions_user_id_time_subscribed_anime_id",
+        "anime_subscriptions",
+        ["user_id", sa.text("time_subscribed DESC"), sa.text("anime_id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_subscribed"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_anime_subscriptions_user_id_time_subscribed_anime_id",
+        table_name="anime_subscriptions",
+        postgresql_where=sa.text("is_subscribed"),
+    )
+    op.drop_index(
+        "ix_forum_subscriptions_user_id_time_subscribed_forum_id",
+        table_name="forum_subscriptions",
+        postgresql_where=sa.text("is_subscribed"),
+    )
+    op.drop_index(
+        "ix_comments_parent_post_time_created_id",
+        table_name="comments",
+        postgresql_where=sa.text("NOT deleted"),
+    )
+    op.drop_index(
+        "ix_posts_author_id_time_posted_id",
+        table_name="posts",
+        postgresql_where=sa.text("NOT deleted"),
+    )
+    op.drop_index(
+        "ix_posts_parent_forum_time_posted_id",
+        table_name="posts",
+        postgresql_where=sa.text("NOT deleted"),
+    )
@@ -0,0 +1,50 @@
+"""adds_deletion_author_event_indexes
+
+Revision ID: 3c8e51f0a7d2
+Revises: 76d4417ceeb6
+Create Date: 2026-10-18 11:42:07.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8e51f0a7d2"
+down_revision: Union[str, Sequence[str], None] = "76d4417ceeb6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_posts_deletion_author_event_author_id",
+        "posts",
+        ["deletion_author_event", "author_id"],
+        unique=False,
+        postgresql_where=sa.text("deletion_author_event IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_comments_deletion_author_event_author_id",
+        "comments",
+        ["deletion_author_event", "author_id"],
+        unique=False,
+        postgresql_where=sa.text("deletion_author_event IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_comments_deletion_author_event_author_id",
+        table_name="comments",
+        postgresql_where=sa.text("deletion_author_event IS NOT NULL"),
+    )
+    op.drop_index(
+        "ix_posts_deletion_author_event_author_id",
+        table_name="posts",
+        postgresql_where=sa.text("deletion_author_event IS NOT NULL"),
+    )
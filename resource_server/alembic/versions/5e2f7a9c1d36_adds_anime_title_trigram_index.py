@@ -0,0 +1,40 @@
+"""adds_anime_title_trigram_index
+
+Revision ID: 5e2f7a9c1d36
+Revises: 08c58421789c
+Create Date: 2026-10-18 23:12:07.318462
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2f7a9c1d36"
+down_revision: Union[str, Sequence[str], None] = "08c58421789c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_animes_title_trgm",
+        "animes",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_animes_title_trgm",
+        table_name="animes",
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
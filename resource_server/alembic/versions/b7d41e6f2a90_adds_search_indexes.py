@@ -0,0 +1,78 @@
+"""adds_search_indexes
+
+Revision ID: b7d41e6f2a90
+Revises: 5e2f7a9c1d36
+Create Date: 2026-10-18 23:41:52.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d41e6f2a90"
+down_revision: Union[str, Sequence[str], None] = "5e2f7a9c1d36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm is enabled by 5e2f7a9c1d36
+    op.create_index(
+        "ix_forums_name_trgm",
+        "forums",
+        ["name_"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name_": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_posts_title_trgm",
+        "posts",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.add_column(
+        "posts",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A') || "
+                "setweight(to_tsvector('english', coalesce(body_text, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_posts_search_vector",
+        "posts",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_posts_search_vector", table_name="posts", postgresql_using="gin")
+    op.drop_column("posts", "search_vector")
+    op.drop_index(
+        "ix_posts_title_trgm",
+        table_name="posts",
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.drop_index(
+        "ix_forums_name_trgm",
+        table_name="forums",
+        postgresql_using="gin",
+        postgresql_ops={"name_": "gin_trgm_ops"},
+    )
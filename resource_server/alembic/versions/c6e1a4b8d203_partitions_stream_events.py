@@ -0,0 +1,104 @@
+"""partitions_stream_events
+
+Revision ID: c6e1a4b8d203
+Revises: b7d41e6f2a90
+Create Date: 2026-10-18 23:58:14.602331
+
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e1a4b8d203"
+down_revision: Union[str, Sequence[str], None] = "b7d41e6f2a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Daily partitions created up front, the database workers' partition manager
+# keeps creating them from there on, with the same naming
+INITIAL_PARTITIONS: int = 3
+
+
+def _partition_name(start: date) -> str:
+    return f"stream_events_p{start:%Y%m%d}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("stream_events", "stream_events_legacy")
+    op.execute(
+        "ALTER TABLE stream_events_legacy "
+        "RENAME CONSTRAINT stream_events_pkey TO stream_events_legacy_pkey"
+    )
+    op.execute(
+        "ALTER INDEX ix_stream_events_acknowledgement_time "
+        "RENAME TO ix_stream_events_legacy_acknowledgement_time"
+    )
+
+    op.create_table(
+        "stream_events",
+        sa.Column("event_id", sa.TEXT(), nullable=False),
+        sa.Column(
+            "acknowledgement_time",
+            postgresql.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("event_id", "acknowledgement_time"),
+        postgresql_partition_by="RANGE (acknowledgement_time)",
+    )
+
+    # Existing events are kept as they are, as the partition holding everything
+    # acknowledged until tomorrow. It is dropped like any other partition once it
+    # falls out of the dedup window
+    first_start: datetime = datetime.combine(date.today() + timedelta(days=1), time())
+    op.execute(
+        "ALTER TABLE stream_events ATTACH PARTITION stream_events_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{first_start.isoformat(' ')}')"
+    )
+    for offset in range(INITIAL_PARTITIONS):
+        start: datetime = first_start + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE {_partition_name(start)} PARTITION OF stream_events "
+            f"FOR VALUES FROM ('{start.isoformat(' ')}') "
+            f"TO ('{(start + timedelta(days=1)).isoformat(' ')}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "stream_events_unpartitioned",
+        sa.Column("event_id", sa.TEXT(), nullable=False),
+        sa.Column(
+            "acknowledgement_time",
+            postgresql.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("event_id", name="stream_events_unpartitioned_pkey"),
+    )
+    op.execute(
+        "INSERT INTO stream_events_unpartitioned (event_id, acknowledgement_time) "
+        "SELECT DISTINCT ON (event_id) event_id, acknowledgement_time "
+        "FROM stream_events ORDER BY event_id, acknowledgement_time"
+    )
+    # Partitions are dropped along with the partitioned table
+    op.drop_table("stream_events")
+
+    op.rename_table("stream_events_unpartitioned", "stream_events")
+    op.execute(
+        "ALTER TABLE stream_events "
+        "RENAME CONSTRAINT stream_events_unpartitioned_pkey TO stream_events_pkey"
+    )
+    op.create_index(
+        op.f("ix_stream_events_acknowledgement_time"),
+        "stream_events",
+        ["acknowledgement_time"],
+        unique=False,
+    )
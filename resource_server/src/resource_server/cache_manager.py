@@ -1,6 +1,7 @@
 import asyncio
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from hashlib import blake2b
 from random import randint
 import time
 from typing import (
@@ -30,10 +31,19 @@ from resource_server.datastructures.exceptions import (
     ConflictingIntentException,
     DuplicateRequestException,
 )
+from resource_server.datastructures.requests import RankingCursor
+from resource_server.replica_router import replica_reads
 from resource_server.repositories.result_protocol import AbstractResult
+from resource_server.utils.helpers import decode_mapping_reply, decode_reply
+from resource_server.utils.search import normalize_search_query
 
 from resource_auxillary.strings import Action, IntentFlag, NAME_SEPERATOR
-from resource_auxillary.cache import create_intent_flag
+from resource_auxillary.cache import (
+    USER_STATE_ACTIONS,
+    create_intent_flag,
+    derive_cache_key,
+    derive_user_state_key,
+)
 
 DTO_T = TypeVar("DTO_T", bound=AbstractResult)
 
@@ -45,6 +55,27 @@ type pagination_database_fallback_callable = Callable[
     [], Coroutine[Any, Any, Sequence[AbstractResult]]
 ]
 
+# Keyset pages are loaded together with the cursor of the page after them
+type keyset_pagination_database_fallback_callable = Callable[
+    [], Coroutine[Any, Any, tuple[Sequence[AbstractResult], str | None]]
+]
+
+# Bulk loads map every found identifier to its resource
+type bulk_database_fallback_callable = Callable[
+    [Sequence[int]], Coroutine[Any, Any, Mapping[int, AbstractResult]]
+]
+
+# User state loads map resource identifiers to the intent flag matching their state
+type user_state_database_fallback_callable = Callable[
+    [Sequence[int]], Coroutine[Any, Any, Mapping[int, IntentFlag]]
+]
+
+
+def _decode_ranked_members(
+    members: Sequence[tuple[bytes | str, float]],
+) -> list[tuple[str, float]]:
+    return [(decode_reply(member), rank) for member, rank in members]
+
 
 @dataclass(init=False, slots=True, weakref_slot=True)
 class CacheManager(metaclass=SingletonMetaclass):
@@ -63,6 +94,8 @@ class CacheManager(metaclass=SingletonMetaclass):
     PAGINATION_SUB_KEY_SEPERATOR: ClassVar[LiteralString] = "-"
     CURSOR_UNDERIVABLE_SENTINEL: ClassVar[LiteralString] = "X"
     PAGINATION_VERSION_MAP: ClassVar[LiteralString] = "pagination_versions"
+    SEARCH_SUB_KEY: ClassVar[LiteralString] = "search"
+    PRIMARY_PIN_PREFIX: ClassVar[LiteralString] = "primary_pin"
     MAX_CACHE_VERSION: ClassVar[int] = 64
 
     def __init__(self, redis: Redis, cache_config: CacheConfig) -> None:
@@ -73,10 +106,23 @@ class CacheManager(metaclass=SingletonMetaclass):
     def derive_lock_key(*args: str) -> str:
         return NAME_SEPERATOR.join(("lock", *args))
 
+    @classmethod
+    def derive_primary_pin_key(cls, key: str) -> str:
+        return NAME_SEPERATOR.join((cls.PRIMARY_PIN_PREFIX, key))
+
+    async def pin_to_primary(self, key: str) -> None:
+        """
+        Have cache misses on a resource read it from the primary for a while after
+        it is written, until every replica serving reads has caught up with the write
+        """
+        await self.redis_client.set(
+            self.derive_primary_pin_key(key), 1, ex=self.cache_config.TTL_PRIMARY_PIN
+        )
+
     async def derive_pagination_key(
         self,
         resource_name: str,
-        cursor: int = 0,
+        cursor: int | str = 0,
         *args: str,
     ) -> str:
         version: str = (
@@ -85,6 +131,21 @@ class CacheManager(metaclass=SingletonMetaclass):
         )
         return NAME_SEPERATOR.join((version, resource_name, str(cursor), *args))
 
+    async def derive_search_key(
+        self, resource_name: str, query: str, cursor: str = ""
+    ) -> str:
+        """
+        Page key for search results, versioned along with the resource's pages.
+        Queries are normalized and then digested, so that equivalent queries share
+        cached pages, and arbitrary query text never ends up in a key
+        """
+        query_digest: str = blake2b(
+            normalize_search_query(query).encode(), digest_size=16
+        ).hexdigest()
+        return await self.derive_pagination_key(
+            resource_name, cursor, self.SEARCH_SUB_KEY, query_digest
+        )
+
     @staticmethod
     def derive_resource_from_pagination_key(key: str) -> str:
         return key.split(NAME_SEPERATOR)[0]
@@ -205,7 +266,8 @@ class CacheManager(metaclass=SingletonMetaclass):
         dtype: Literal["mapping", "string"] = "mapping",
     ) -> tuple[int, list[str], list[tuple[dict[str, Any] | None, int]], str]:
         keys: list[str] = await self.redis_client.lrange(page_key, 0, -1)
-        cursor: str = keys.pop(-1)
+        # The trailing element holds the cursor, an empty list is a cache miss
+        cursor: str = keys.pop(-1) if keys else ""
         async with self.redis_client.pipeline(transaction=False) as pipe:
             pipe.ttl(page_key)
             for key in keys:
@@ -295,7 +357,11 @@ class CacheManager(metaclass=SingletonMetaclass):
             )
             if leader:
                 try:
-                    result_dto: AbstractResult | None = await fallback_coroutine()
+                    pinned: bool = bool(
+                        await self.redis_client.exists(self.derive_primary_pin_key(key))
+                    )
+                    with replica_reads(not pinned):
+                        result_dto: AbstractResult | None = await fallback_coroutine()
                     if not result_dto:
                         if fetch_dtype == "mapping":
                             await self.set_negative_mapping(key)
@@ -336,6 +402,109 @@ class CacheManager(metaclass=SingletonMetaclass):
 
         raise CacheCoherenceException(f"Failed to fetch {key}")
 
+    async def distributed_get_many_or_load(
+        self,
+        resource_name: str,
+        identifiers: Sequence[int],
+        fallback_coroutine: bulk_database_fallback_callable,
+        return_dto: type[DTO_T],
+    ) -> list[DTO_T]:
+        """
+        Fetch many resources in a single round trip, and load all cache misses with
+        a single fallback call. Results keep the order of the given identifiers, and
+        resources that do not exist are left out
+        """
+        keys: list[str] = [
+            derive_cache_key(resource_name, identifier) for identifier in identifiers
+        ]
+        counter_fields: Mapping[str, str] = return_dto.counter_fields_map
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+                for map_name in counter_fields.values():
+                    pipe.hget(map_name, key)
+            cache_results: list[Any] = await pipe.execute()
+
+        results: dict[int, DTO_T] = {}
+        missing_identifiers: list[int] = []
+        step: int = 1 + len(counter_fields)
+        for identifier, offset in zip(identifiers, range(0, len(cache_results), step)):
+            raw_entry, *counters = cache_results[offset : offset + step]
+            if not raw_entry:
+                missing_identifiers.append(identifier)
+                continue
+            cache_entry: dict[str, Any] = decode_mapping_reply(raw_entry)
+            if self.cache_config.NF_SENTINEL_KEY in cache_entry:
+                continue
+            for field, counter in zip(counter_fields, counters):
+                cache_entry[field] = int(cache_entry[field]) + int(counter or 0)
+            results[identifier] = return_dto.construct_from_cache(cache_entry)
+
+        if missing_identifiers:
+            loaded_results: Mapping[int, AbstractResult] = await fallback_coroutine(
+                missing_identifiers
+            )
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for identifier in missing_identifiers:
+                    key: str = derive_cache_key(resource_name, identifier)
+                    if (loaded_result := loaded_results.get(identifier)) is None:
+                        pipe.hset(key, mapping=self.cache_config.NF_MAPPING)
+                        pipe.expire(key, self.cache_config.TTL_EPHEMERAL)
+                        continue
+                    pipe.hset(key, mapping=cache_repr(loaded_result))
+                    pipe.expire(key, self.cache_config.TTL_STRONG)
+                    results[identifier] = loaded_result  # type: ignore[reportArgumentType]
+                await pipe.execute()
+
+        return [results[i] for i in identifiers if i in results]
+
+    async def fetch_ranked_page(
+        self, ranking_key: str, cursor: RankingCursor | None, limit: int
+    ) -> tuple[list[int], str | None]:
+        """
+        Read a page of member identifiers off a ranking (sorted set), in descending
+        order of rank. Members sharing a rank are ordered by descending member, as
+        ZREVRANGEBYSCORE does, so the cursor also carries the last member seen
+
+        returns: tuple[page, cursor of the next page, None if this is the last page]
+        """
+        members: list[tuple[str, float]]
+        if not cursor:
+            members = _decode_ranked_members(
+                await self.redis_client.zrevrangebyscore(
+                    ranking_key, "+inf", "-inf", start=0, num=limit, withscores=True
+                )
+            )
+        else:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zrevrangebyscore(
+                    ranking_key, cursor.rank, cursor.rank, withscores=True
+                )
+                pipe.zrevrangebyscore(
+                    ranking_key,
+                    f"({cursor.rank!r}",
+                    "-inf",
+                    start=0,
+                    num=limit,
+                    withscores=True,
+                )
+                tied_members, lower_members = map(
+                    _decode_ranked_members, await pipe.execute()
+                )
+            last_member: str = str(cursor.identifier)
+            members = [
+                *(m for m in tied_members if m[0] < last_member),
+                *lower_members,
+            ][:limit]
+
+        if len(members) < limit:
+            return [int(member) for member, _ in members], None
+        last_member, last_rank = members[-1]
+        return (
+            [int(member) for member, _ in members],
+            RankingCursor(last_rank, int(last_member)).encode(),
+        )
+
     async def fetch_indicators(
         self,
         user_identifier: str,
@@ -420,11 +589,63 @@ class CacheManager(metaclass=SingletonMetaclass):
         intent: str = create_intent_flag(
             resource_name, action, user_identifier, resource_identifier
         )
-        await self.redis_client.set(
-            intent,
-            NAME_SEPERATOR.join((intent_flag, intent_id)),
-            ex=ttl or self.cache_config.TTL_STRONGEST,
+        ttl = ttl or self.cache_config.TTL_STRONGEST
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(intent, NAME_SEPERATOR.join((intent_flag, intent_id)), ex=ttl)
+            if action in USER_STATE_ACTIONS:
+                state_key: str = derive_user_state_key(
+                    resource_name, action, user_identifier
+                )
+                pipe.hset(state_key, resource_identifier, intent_flag)
+                pipe.expire(state_key, ttl)
+            await pipe.execute()
+
+    async def get_user_states(
+        self,
+        user_identifier: int,
+        resource_name: str,
+        action: Action,
+        resource_identifiers: Sequence[int],
+        fallback_coroutine: user_state_database_fallback_callable,
+    ) -> dict[int, IntentFlag]:
+        """
+        Latest intent flag of a user for each of the given resources, in a single
+        round trip to Redis. Flags are mirrored from intents as they are set, and
+        resources without one are loaded with a single fallback call, where
+        resources missing from its result are taken as deletion intents.
+
+        Loaded flags never overwrite flags mirrored in the meantime
+        """
+        state_key: Final[str] = derive_user_state_key(
+            resource_name, action, str(user_identifier)
+        )
+        cached_flags: list[bytes | None] = await self.redis_client.hmget(
+            state_key, [str(identifier) for identifier in resource_identifiers]
         )
+        states: dict[int, IntentFlag] = {
+            identifier: IntentFlag(decode_reply(flag))
+            for identifier, flag in zip(resource_identifiers, cached_flags)
+            if flag
+        }
+        if not (
+            misses := [
+                identifier
+                for identifier in resource_identifiers
+                if identifier not in states
+            ]
+        ):
+            return states
+
+        loaded_states: Mapping[int, IntentFlag] = await fallback_coroutine(misses)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for identifier in misses:
+                states[identifier] = loaded_states.get(
+                    identifier, IntentFlag.RESOURCE_DELETION_PENDING_FLAG
+                )
+                pipe.hsetnx(state_key, str(identifier), states[identifier])
+            pipe.expire(state_key, self.cache_config.TTL_STRONGEST)
+            await pipe.execute()
+        return states
 
     async def _fetch_paginated_resources(
         self,
@@ -469,12 +690,63 @@ class CacheManager(metaclass=SingletonMetaclass):
         member_identifier: str = "id_",
         fetch_dtype: Literal["mapping", "string"] = "mapping",
     ) -> tuple[list[DTO_T], str | None]:
+        async def _load_page() -> tuple[Sequence[AbstractResult], str | None]:
+            return (
+                await fallback_coroutine(),
+                self.derive_cursor_from_pagination_key(page_key),
+            )
+
+        results, next_cursor, loaded = await self._pagination_get_or_load(
+            page_key,
+            _load_page,
+            return_dto,
+            member_identifier=member_identifier,
+            fetch_dtype=fetch_dtype,
+        )
+        if loaded:
+            return results, self.CURSOR_UNDERIVABLE_SENTINEL
+        return results, next_cursor
+
+    async def distributed_keyset_pagination_get_or_load(
+        self,
+        page_key: str,
+        fallback_coroutine: keyset_pagination_database_fallback_callable,
+        return_dto: type[DTO_T],
+        *,
+        member_identifier: str = "id_",
+        fetch_dtype: Literal["mapping", "string"] = "mapping",
+    ) -> tuple[list[DTO_T], str | None]:
+        """
+        Paginate over a keyset, where the next cursor is produced by the fallback
+        and cached along with the page. A next cursor of None marks the last page
+        """
+        results, next_cursor, _ = await self._pagination_get_or_load(
+            page_key,
+            fallback_coroutine,
+            return_dto,
+            member_identifier=member_identifier,
+            fetch_dtype=fetch_dtype,
+        )
+        return results, next_cursor or None
+
+    async def _pagination_get_or_load(
+        self,
+        page_key: str,
+        fallback_coroutine: keyset_pagination_database_fallback_callable,
+        return_dto: type[DTO_T],
+        *,
+        member_identifier: str,
+        fetch_dtype: Literal["mapping", "string"],
+    ) -> tuple[list[DTO_T], str | None, bool]:
+        """
+        returns: tuple[page, cached cursor, whether the page was loaded from DB]
+        """
         cached_results, next_cursor = await self._fetch_paginated_resources(
             page_key, return_dto, element_dtype=fetch_dtype
         )
 
         if cached_results and all(cached_results):
-            return list(cached_results), next_cursor  # type: ignore[reportReturnType]
+            return list(cached_results), next_cursor, False  # type: ignore[reportReturnType]
 
         # Upon cache miss, elect a leader to actually talk to DB
         lock_name: Final[str] = self.derive_lock_key(page_key)
@@ -487,13 +759,17 @@ class CacheManager(metaclass=SingletonMetaclass):
             )
             if leader:
                 try:
-                    results: list[AbstractResult] = list(await fallback_coroutine())
+                    # Pages already trail the writes flushed by workers, so bounded
+                    # replica lag is tolerated without pinning
+                    with replica_reads():
+                        loaded_results, loaded_cursor = await fallback_coroutine()
+                    results: list[AbstractResult] = list(loaded_results)
                     await self.cache_grouped_resource(
                         page_key,
                         {getattr(i, member_identifier): i for i in results},
-                        self.derive_cursor_from_pagination_key(page_key),
+                        loaded_cursor,
                     )
-                    return results, self.CURSOR_UNDERIVABLE_SENTINEL  # type: ignore[reportReturnType]
+                    return results, loaded_cursor, True  # type: ignore[reportReturnType]
                 finally:
                     await self.redis_client.delete(lock_name)
             else:
@@ -508,8 +784,10 @@ class CacheManager(metaclass=SingletonMetaclass):
                         )
                         continue
 
-                    *_, res, _ = await self._primitive_pagination_get_from_cache(
-                        page_key, return_dto.counter_fields_map, dtype=fetch_dtype
+                    *_, res, next_cursor = (
+                        await self._primitive_pagination_get_from_cache(
+                            page_key, return_dto.counter_fields_map, dtype=fetch_dtype
+                        )
                     )
                     # Leader failed, try again
                     if not res:
@@ -524,6 +802,7 @@ class CacheManager(metaclass=SingletonMetaclass):
                             )
                         ),
                         next_cursor,
+                        False,
                     )
 
         raise CacheCoherenceException(f"Failed to fetch {page_key}")
@@ -1,5 +1,6 @@
+import os
 from pathlib import Path
-from typing import Annotated, ClassVar
+from typing import Annotated, ClassVar, Self
 
 from pydantic import Field, model_validator
 from pydantic_settings import (
@@ -13,7 +14,12 @@ from resource_server.config import sub_config
 
 
 class AppConfig(BaseSettings):
-    config_filepath: ClassVar[Path] = Path(__file__).parent / "app_config.toml"
+    # Overridable for deployments and benchmarks that point the server at other services
+    config_filepath: ClassVar[Path] = Path(
+        os.environ.get(
+            "RESOURCE_SERVER_CONFIG_FILEPATH", Path(__file__).parent / "app_config.toml"
+        )
+    )
     model_config = SettingsConfigDict(toml_file=str(config_filepath))
 
     CORE: Annotated[sub_config.CoreConfig, Field(alias="core")]
@@ -23,6 +29,21 @@ class AppConfig(BaseSettings):
     CACHE: Annotated[sub_config.CacheConfig, Field(alias="cache")]
     JWKS: Annotated[sub_config.JWKSConfig, Field(alias="jwks")]
 
+    @model_validator(mode="after")
+    def check_primary_pin_outlasts_replica_lag(self) -> Self:
+        # Pinned resources must not be read from replicas that may not have them yet
+        if self.CACHE.TTL_PRIMARY_PIN < self.DATABASE.REPLICA_MAX_LAG:
+            raise ValueError(
+                " ".join(
+                    (
+                        f"Primary pin lifespan {self.CACHE.TTL_PRIMARY_PIN}",
+                        "must be at least the maximum replica lag",
+                        f"({self.DATABASE.REPLICA_MAX_LAG})",
+                    )
+                )
+            )
+        return self
+
     @classmethod
     def settings_customise_sources(
         cls,
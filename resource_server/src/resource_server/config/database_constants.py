@@ -69,3 +69,10 @@ class UserTicketConstants:
 
 class StreamLinkConstants:
     URL_MAX_LENGTH: Final[int] = 512
+
+
+class SearchConstants:
+    TEXT_SEARCH_CONFIGURATION: Final[str] = "english"
+
+    QUERY_MIN_LENGTH: Final[int] = 2
+    QUERY_MAX_LENGTH: Final[int] = 128
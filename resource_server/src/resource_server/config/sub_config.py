@@ -6,7 +6,10 @@ from auxillary.mixins.db_config import (
     BasicPostgresDatabaseConfigMixin,
     BasicSQLAlchemyConfigMixin,
 )
-from auxillary.mixins.redis_config import BasicRedisConfigMixin
+from auxillary.mixins.redis_config import (
+    BasicRedisConfigMixin,
+    RedisConnectionPoolConfigMixin,
+)
 import jwt
 
 from pydantic import (
@@ -44,14 +47,32 @@ class CoreConfig(BaseModel):
     AUTH_SERVER_NAME: str
 
 
-class SQLAlchemyConfig(BasicSQLAlchemyConfigMixin, BaseModel): ...
+class SQLAlchemyConfig(BasicSQLAlchemyConfigMixin, BaseModel):
+    # psycopg prepares a statement server-side once it has run this many times
+    SQLALCHEMY_PREPARE_THRESHOLD: Annotated[int, Field(ge=0, default=2)]
+    # Milliseconds, replicas only serve cache misses and give up sooner
+    SQLALCHEMY_PRIMARY_STATEMENT_TIMEOUT: Annotated[int, Field(ge=0, default=10_000)]
+    SQLALCHEMY_REPLICA_STATEMENT_TIMEOUT: Annotated[int, Field(ge=0, default=3_000)]
+
+
+class ReplicaConfig(BaseModel):
+    POSTGRES_HOST: str
+    POSTGRES_PORT: Annotated[int, Field(ge=1024, le=65_535)]
 
 
 class DatabaseConfig(BasicPostgresDatabaseConfigMixin, BaseModel):
     SQLALCHEMY: SQLAlchemyConfig
 
+    # Streaming replicas of the primary, serving reads on cache misses
+    REPLICAS: Annotated[list[ReplicaConfig], Field(default_factory=list)]
+    # Seconds a replica may trail the primary before reads skip it
+    REPLICA_MAX_LAG: Annotated[float, Field(gt=0, default=5)]
+    REPLICA_LAG_CHECK_INTERVAL: Annotated[float, Field(gt=0, default=2)]
+
 
-class BaseRedisConfig(BasicRedisConfigMixin, BaseModel): ...
+class BaseRedisConfig(
+    BasicRedisConfigMixin, RedisConnectionPoolConfigMixin, BaseModel
+): ...
 
 
 class RedisConfig(BaseModel):
@@ -67,6 +88,8 @@ class CacheConfig(BaseModel):
     TTL_WEAK: Annotated[int, Field(ge=0)]
     TTL_EPHEMERAL: Annotated[int, Field(ge=0)]
     TTL_OPERATIONAL_LOCK: Annotated[int, Field(ge=0)]
+    # Cache misses on freshly written resources read from the primary for this long
+    TTL_PRIMARY_PIN: Annotated[int, Field(ge=1, default=10)]
 
     # Fetch locks, for thundering herds
     TTL_FETCH_LOCK: Annotated[int, Field(ge=0)]
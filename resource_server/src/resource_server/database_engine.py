@@ -0,0 +1,105 @@
+"""Construction and instrumentation of the resource server's database engines"""
+
+from enum import StrEnum
+import time
+from typing import Any, Final
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from resource_auxillary.event_processing.metrics import Counter, Gauge, Histogram
+
+from resource_server.config.sub_config import SQLAlchemyConfig
+
+
+class EngineRole(StrEnum):
+    PRIMARY = "primary"
+    REPLICA = "replica"
+
+
+POOL_CHECKOUT_WAIT: Final[Histogram] = Histogram(
+    "tenjin_db_pool_checkout_wait_seconds",
+    "Time taken to check out a pooled connection, including opening new ones",
+    ("engine",),
+)
+POOL_CHECKOUT_TIMEOUTS: Final[Counter] = Counter(
+    "tenjin_db_pool_checkout_timeouts",
+    "Pooled connection checkouts that gave up after the pool timeout",
+    ("engine",),
+)
+POOL_CHECKED_OUT: Final[Gauge] = Gauge(
+    "tenjin_db_pool_checked_out",
+    "Pooled connections currently checked out",
+    ("engine",),
+)
+POOL_OVERFLOW: Final[Gauge] = Gauge(
+    "tenjin_db_pool_overflow",
+    "Connections open beyond the pool size, negative until the pool has filled up",
+    ("engine",),
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool recording checkout waits and usage, labelled with the pool's logging
+    name, which is kept when the pool is recreated
+    """
+
+    def _record_usage(self) -> None:
+        POOL_CHECKED_OUT.set(self.logging_name, value=self.checkedout())
+        POOL_OVERFLOW.set(self.logging_name, value=self.overflow())
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start: float = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(self.logging_name)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(
+                self.logging_name, value=time.perf_counter() - start
+            )
+            self._record_usage()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._record_usage()
+
+
+def create_database_engine(
+    config: SQLAlchemyConfig, uri: str, role: EngineRole, name: str
+) -> AsyncEngine:
+    """
+    Async psycopg (3) engine with the configured pool, per process. Statements run
+    past the prepare threshold are prepared server-side on each connection, and
+    statement timeouts are set per role at connection time
+
+    Args:
+        name: Label of the engine's pool metrics, unique per engine
+    """
+    options: list[str] = [
+        f"-c statement_timeout={config.SQLALCHEMY_PRIMARY_STATEMENT_TIMEOUT}"
+    ]
+    if role == EngineRole.REPLICA:
+        options = [
+            f"-c statement_timeout={config.SQLALCHEMY_REPLICA_STATEMENT_TIMEOUT}",
+            "-c default_transaction_read_only=on",
+        ]
+
+    connect_args: dict[str, Any] = {
+        "prepare_threshold": config.SQLALCHEMY_PREPARE_THRESHOLD,
+        "options": " ".join(options),
+    }
+
+    return create_async_engine(
+        uri,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=config.SQLALCHEMY_POOL_SIZE,
+        max_overflow=config.SQLALCHEMY_MAX_OVERFLOW,
+        pool_recycle=config.SQLALCHEMY_POOL_RECYCLE,
+        pool_timeout=config.SQLALCHEMY_POOL_TIMEOUT,
+        pool_logging_name=name,
+        connect_args=connect_args,
+    )
@@ -1,12 +1,23 @@
 from datetime import datetime, timedelta
 from enum import StrEnum
+import struct
 from types import MappingProxyType
-from typing import Callable
+from typing import Callable, Final, NamedTuple, Self
+
+from auxillary.utils import from_keyset_base64url, to_keyset_base64url
 
 
 class SortOption(StrEnum):
     ASCENDING = "asc"
     DESCENDING = "desc"
+    # Served from per-forum rankings maintained by the workers
+    HOT = "hot"
+    TOP = "top"
+
+
+CHRONOLOGICAL_SORT_OPTIONS: Final[frozenset[SortOption]] = frozenset(
+    (SortOption.ASCENDING, SortOption.DESCENDING)
+)
 
 
 class TimeFrameOption(StrEnum):
@@ -30,3 +41,52 @@ TIMEFRAMES: MappingProxyType[TimeFrameOption, Callable[[datetime], datetime]] =
         }
     )
 )
+
+# Feed timestamps are naive (TIMESTAMP WITHOUT TIME ZONE)
+_CURSOR_EPOCH: Final[datetime] = datetime(1970, 1, 1)
+_CURSOR_RESOLUTION: Final[timedelta] = timedelta(microseconds=1)
+
+
+class KeysetCursor(NamedTuple):
+    """
+    Position in a feed ordered by (timestamp, id), encoded as an opaque cursor
+    """
+
+    sort_key: datetime
+    identifier: int
+
+    def encode(self) -> str:
+        return to_keyset_base64url(
+            (self.sort_key - _CURSOR_EPOCH) // _CURSOR_RESOLUTION, self.identifier
+        )
+
+    @classmethod
+    def decode(cls, raw_cursor: str) -> Self:
+        timestamp, identifier = from_keyset_base64url(raw_cursor, 2)
+        return cls(_CURSOR_EPOCH + timestamp * _CURSOR_RESOLUTION, identifier)
+
+    def __str__(self) -> str:
+        return self.encode()
+
+
+class RankingCursor(NamedTuple):
+    """
+    Position in a ranking ordered by (rank, id), encoded as an opaque cursor
+    """
+
+    rank: float
+    identifier: int
+
+    def encode(self) -> str:
+        # Ranks are packed by their IEEE 754 bits, so that they round-trip exactly
+        (rank_bits,) = struct.unpack(">q", struct.pack(">d", self.rank))
+        return to_keyset_base64url(rank_bits, self.identifier)
+
+    @classmethod
+    def decode(cls, raw_cursor: str) -> Self:
+        rank_bits, identifier = from_keyset_base64url(raw_cursor, 2)
+        (rank,) = struct.unpack(">d", struct.pack(">q", rank_bits))
+        return cls(rank, identifier)
+
+    def __str__(self) -> str:
+        return self.encode()
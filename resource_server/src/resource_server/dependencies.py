@@ -2,25 +2,23 @@ import os
 from functools import lru_cache
 from typing import AsyncGenerator, Final
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import (
-    create_async_engine,
-    async_sessionmaker,
-    AsyncSession,
-    AsyncEngine,
-)
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
 
 from resource_server.cache_manager import CacheManager
 from resource_server.config.app_config import AppConfig
+from resource_server.database_engine import EngineRole, create_database_engine
 from resource_server.event_streamer import EventStreamer
 from resource_server.key_manager import KeyManager
 from resource_server.models.database import Genre
+from resource_server.replica_router import ReplicaRouter, RoutingSession
 from resource_server.repositories.anime import AnimeRepository
 from resource_server.repositories.comment import CommentRepository
 from resource_server.repositories.forum import ForumRepository
 from resource_server.repositories.posts import PostRepository
+from resource_server.repositories.search import SearchRepository
 from resource_server.repositories.user import UserRepository
 
 
@@ -34,11 +32,12 @@ def get_app_redis_client() -> Redis:
     config: Final[AppConfig] = get_app_config()
 
     return Redis(
-        host=str(config.REDIS.APP.HOST),
-        port=config.REDIS.APP.PORT,
-        db=config.REDIS.APP.DB,
-        # username=os.environ["RESOURCE_WORKER_REDIS_USERNAME"],
-        # password=os.environ["RESOURCE_WORKER_REDIS_PASSWORD"],
+        connection_pool=BlockingConnectionPool(
+            # username=os.environ["RESOURCE_WORKER_REDIS_USERNAME"],
+            # password=os.environ["RESOURCE_WORKER_REDIS_PASSWORD"],
+            **config.REDIS.APP.to_constructor_kwargs(),
+            **config.REDIS.APP.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
@@ -47,11 +46,12 @@ def get_auth_redis_client() -> Redis:
     config: Final[AppConfig] = get_app_config()
 
     return Redis(
-        host=str(config.REDIS.AUTH.HOST),
-        port=config.REDIS.AUTH.PORT,
-        db=config.REDIS.AUTH.DB,
-        # username=os.environ["RESOURCE_AUTH_WORKER_REDIS_USERNAME"],
-        # password=os.environ["RESOURCE_AUTH_WORKER_REDIS_PASSWORD"],
+        connection_pool=BlockingConnectionPool(
+            # username=os.environ["RESOURCE_AUTH_WORKER_REDIS_USERNAME"],
+            # password=os.environ["RESOURCE_AUTH_WORKER_REDIS_PASSWORD"],
+            **config.REDIS.AUTH.to_constructor_kwargs(),
+            **config.REDIS.AUTH.emit_connection_pool_constructor_kwargs(),
+        )
     )
 
 
@@ -70,19 +70,58 @@ def get_event_streamer() -> EventStreamer:
     return EventStreamer(get_app_redis_client(), get_app_config().CACHE)
 
 
-@lru_cache(maxsize=1)
-def get_database_session_maker() -> async_sessionmaker[AsyncSession]:
+def _create_database_engine(
+    host: str, port: int, role: EngineRole, name: str
+) -> AsyncEngine:
     config: Final[AppConfig] = get_app_config()
 
-    URI: Final[str] = config.DATABASE.derive_sqlalchemy_uri(
+    URI: Final[str] = config.DATABASE.SQLALCHEMY.construct_sqlalchemy_uri(
         username=os.environ["RESOURCE_SERVER_POSTGRES_USERNAME"],
         password=os.environ["RESOURCE_SERVER_POSTGRES_PASSWORD"],
+        host=host,
+        port=port,
+        database=config.DATABASE.POSTGRES_DATABASE,
     )
 
-    engine: Final[AsyncEngine] = create_async_engine(URI)
+    return create_database_engine(config.DATABASE.SQLALCHEMY, URI, role, name)
+
+
+@lru_cache(maxsize=1)
+def get_replica_router() -> ReplicaRouter:
+    config: Final[AppConfig] = get_app_config()
+
+    return ReplicaRouter(
+        _create_database_engine(
+            str(config.DATABASE.POSTGRES_HOST),
+            config.DATABASE.POSTGRES_PORT,
+            EngineRole.PRIMARY,
+            EngineRole.PRIMARY,
+        ),
+        tuple(
+            _create_database_engine(
+                str(replica.POSTGRES_HOST),
+                replica.POSTGRES_PORT,
+                EngineRole.REPLICA,
+                f"{EngineRole.REPLICA}_{index}",
+            )
+            for index, replica in enumerate(config.DATABASE.REPLICAS)
+        ),
+        config.DATABASE.REPLICA_MAX_LAG,
+        config.DATABASE.REPLICA_LAG_CHECK_INTERVAL,
+    )
 
+
+@lru_cache(maxsize=1)
+def get_database_session_maker() -> async_sessionmaker[AsyncSession]:
+    router: Final[ReplicaRouter] = get_replica_router()
+
+    # Writes always go to the primary, reads only leave it within `replica_reads`
     session_maker: Final[async_sessionmaker[AsyncSession]] = async_sessionmaker(
-        bind=engine, autocommit=False, autoflush=False
+        bind=router.primary,
+        sync_session_class=RoutingSession,
+        router=router,
+        autocommit=False,
+        autoflush=False,
     )
 
     return session_maker
@@ -126,3 +165,8 @@ def get_user_repository() -> UserRepository:
 @lru_cache(maxsize=1)
 def get_comment_repository() -> CommentRepository:
     return CommentRepository(get_database_session_maker())
+
+
+@lru_cache(maxsize=1)
+def get_search_repository() -> SearchRepository:
+    return SearchRepository(get_database_session_maker())
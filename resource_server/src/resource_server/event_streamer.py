@@ -7,6 +7,11 @@ from auxillary.utils import cache_repr
 from resource_server.config.sub_config import CacheConfig
 from auxillary.singleton import SingletonMetaclass
 
+from resource_auxillary.cache import (
+    USER_STATE_ACTIONS,
+    derive_user_state_key,
+    parse_intent_flag,
+)
 from resource_auxillary.events import Event
 from resource_auxillary.strings import StreamName
 
@@ -30,6 +35,21 @@ class EventStreamer(metaclass=SingletonMetaclass):
     ) -> None:
         pipeline.set(name, intent, ex=ttl)
 
+    def _pipeline_set_user_state(
+        self, pipeline: Pipeline, intent_name: str, intent_flag: str, ttl: int
+    ) -> None:
+        """
+        Mirror an intent flag into the user's state hash, if its action has one
+        """
+        entity, action, user_identifier, resource_identifier = parse_intent_flag(
+            intent_name
+        )
+        if action not in USER_STATE_ACTIONS:
+            return
+        state_key: str = derive_user_state_key(entity, action, user_identifier)
+        pipeline.hset(state_key, resource_identifier, intent_flag)
+        pipeline.expire(state_key, ttl)
+
     def _pipeline_create_event(
         self,
         pipeline: Pipeline,
@@ -55,6 +75,12 @@ class EventStreamer(metaclass=SingletonMetaclass):
                     intent_update.intent_value,
                     self.cache_config.TTL_STRONGEST,
                 )
+                self._pipeline_set_user_state(
+                    pipeline,
+                    intent_update.intent_name,
+                    intent_update.intent_flag,
+                    self.cache_config.TTL_STRONGEST,
+                )
             self._pipeline_create_event(pipeline, stream, event)
 
             await pipeline.execute()
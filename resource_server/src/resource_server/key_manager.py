@@ -87,12 +87,12 @@ class KeyManager(metaclass=SingletonMetaclass):
 
     async def get_global_key_mapping(self) -> dict[str, bytes]:
         """Get JWKS cache in Redis"""
-        res: dict[str, str] = await self.app_redis_client.hgetall(
+        res: dict[bytes, bytes] = await self.app_redis_client.hgetall(
             RedisConstants.JWKS_MAPPING
         )  # type: ignore[reportGeneralTypeIssues]
 
-        # crypto APIs expect bytes
-        return {kid: pub_pem.encode() for kid, pub_pem in res.items()}
+        # The app client does not decode responses, and crypto APIs expect bytes
+        return {kid.decode(): pub_pem for kid, pub_pem in res.items()}
 
     async def get_jwks(self) -> list[JWKSEntry] | None:
         """Read and return JWKS from source"""
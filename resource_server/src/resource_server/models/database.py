@@ -1,13 +1,15 @@
 from sqlalchemy import (
+    Computed,
     ForeignKey,
     CheckConstraint,
+    Index,
     UniqueConstraint,
     and_,
     or_,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import text, func
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, BYTEA, ENUM
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, TSVECTOR, BYTEA, ENUM
 from sqlalchemy.types import INTEGER, SMALLINT, BOOLEAN, VARCHAR, BIGINT, TEXT
 
 from datetime import datetime
@@ -18,7 +20,9 @@ from types import FunctionType
 from resource_auxillary.datastructures.database import (
     StrongEntity,
     EventLiteral,
+    EventMetadataLiteral,
     DeadLetterQueueLiteral,
+    DeletionColumnLiteral,
     ForeignKeyColumnLiteral,
     AssociationColumnLiteral,
     GenericLiterals,
@@ -80,6 +84,16 @@ SIDE_EFFECT_TYPES = ENUM(
     *(i.value for i in SideEffectType), name=SideEffectType.__NAME__, create_type=True
 )
 
+### Full-text search ###
+SEARCH_CONFIGURATION: str = database_constants.SearchConstants.TEXT_SEARCH_CONFIGURATION
+POST_SEARCH_DOCUMENT: str = " || ".join(
+    (
+        f"setweight(to_tsvector('{SEARCH_CONFIGURATION}', title), 'A')",
+        f"setweight(to_tsvector('{SEARCH_CONFIGURATION}', coalesce(body_text, '')),"
+        " 'B')",
+    )
+)
+
 
 ### Assosciation Tables ###
 class ForumSubscription(SubAssociationMixin, Base):
@@ -100,6 +114,17 @@ class ForumSubscription(SubAssociationMixin, Base):
         TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # Keyset pagination over a user's subscribed forums
+        Index(
+            "ix_forum_subscriptions_user_id_time_subscribed_forum_id",
+            user_id,
+            time_subscribed.desc(),
+            forum_id.desc(),
+            postgresql_where=text(EventMetadataLiteral.EVENT_SUB_COLUMN_NAME),
+        ),
+    )
+
 
 class AnimeSubscription(SubAssociationMixin, Base):
     __tablename__ = "anime_subscriptions"
@@ -119,6 +144,17 @@ class AnimeSubscription(SubAssociationMixin, Base):
         TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # Keyset pagination over a user's subscribed animes
+        Index(
+            "ix_anime_subscriptions_user_id_time_subscribed_anime_id",
+            user_id,
+            time_subscribed.desc(),
+            anime_id.desc(),
+            postgresql_where=text(EventMetadataLiteral.EVENT_SUB_COLUMN_NAME),
+        ),
+    )
+
 
 class PostVote(VoteAssociationMixin, Base):
     __tablename__ = "post_votes"
@@ -273,7 +309,7 @@ class ForumAdmin(Base):
         name=AssociationColumnLiteral.USER_ID,
     )
     role: Mapped[str] = mapped_column(
-        ADMIN_ROLES, nullable=False, server_default=text(AdminRoles.ADMIN)
+        ADMIN_ROLES, nullable=False, server_default=AdminRoles.ADMIN.value
     )
 
 
@@ -390,7 +426,16 @@ class Anime(Base):
         nullable=False,
     )
 
-    __table_args__ = (CheckConstraint(members >= 0, "check_members_positive"),)
+    __table_args__ = (
+        CheckConstraint(members >= 0, "check_members_positive"),
+        # Substring and similarity searches over titles, requires pg_trgm
+        Index(
+            "ix_animes_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
 
 @dataclass
@@ -465,6 +510,13 @@ class Forum(SoftEventDeletionMixin, Base):
             name="check_title_length",
         ),
         UniqueConstraint("name_", name="uq_forum_name"),
+        # Substring and similarity searches over names, requires pg_trgm
+        Index(
+            "ix_forums_name_trgm",
+            name_,
+            postgresql_using="gin",
+            postgresql_ops={"name_": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -561,6 +613,14 @@ class Post(SoftEventDeletionMixin, Base):
         BOOLEAN, nullable=False, server_default=text("false")
     )
 
+    # Full-text search document, with titles weighted above bodies. Deferred, since
+    # only search predicates and ranks need it
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(POST_SEARCH_DOCUMENT, persisted=True),
+        deferred=True,
+    )
+
     __table_args__ = (
         CheckConstraint(
             func.length(title) >= database_constants.PostConstants.TITLE_MIN_LENGTH,
@@ -574,6 +634,39 @@ class Post(SoftEventDeletionMixin, Base):
             ),
             name="check_body_text",
         ),
+        # Downstream counter decrements aggregate by author per deletion event
+        Index(
+            "ix_posts_deletion_author_event_author_id",
+            DeletionColumnLiteral.DELETION_AUTHOR_EVENT,
+            ForeignKeyColumnLiteral.AUTHOR_ID,
+            postgresql_where=text(
+                f"{DeletionColumnLiteral.DELETION_AUTHOR_EVENT} IS NOT NULL"
+            ),
+        ),
+        # Keyset pagination over forum and user feeds, (time_posted, id) being
+        # both the sort order and the cursor
+        Index(
+            "ix_posts_parent_forum_time_posted_id",
+            forum_id,
+            time_posted.desc(),
+            id_.desc(),
+            postgresql_where=text(f"NOT {DeletionColumnLiteral.DELETED_COLUMN_NAME}"),
+        ),
+        Index(
+            "ix_posts_author_id_time_posted_id",
+            author_id,
+            time_posted.desc(),
+            id_.desc(),
+            postgresql_where=text(f"NOT {DeletionColumnLiteral.DELETED_COLUMN_NAME}"),
+        ),
+        # Post search, over titles by similarity and over whole posts by full-text
+        Index(
+            "ix_posts_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("ix_posts_search_vector", search_vector, postgresql_using="gin"),
     )
 
 
@@ -625,6 +718,23 @@ class Comment(SoftEventDeletionMixin, Base):
             func.length(body) >= database_constants.CommentConstants.COMMENT_MIN_LENGTH,
             "check_comment_length",
         ),
+        # Downstream counter decrements aggregate by author per deletion event
+        Index(
+            "ix_comments_deletion_author_event_author_id",
+            DeletionColumnLiteral.DELETION_AUTHOR_EVENT,
+            ForeignKeyColumnLiteral.AUTHOR_ID,
+            postgresql_where=text(
+                f"{DeletionColumnLiteral.DELETION_AUTHOR_EVENT} IS NOT NULL"
+            ),
+        ),
+        # Keyset pagination over a post's comments
+        Index(
+            "ix_comments_parent_post_time_created_id",
+            parent_post,
+            time_created,
+            id_,
+            postgresql_where=text(f"NOT {DeletionColumnLiteral.DELETED_COLUMN_NAME}"),
+        ),
     )
 
 
@@ -634,13 +744,20 @@ class StreamEvent(Base):
     event_id: Mapped[str] = mapped_column(
         TEXT, primary_key=True, name=EventLiteral.EVENT_ID_COLUMN_NAME
     )
+    # Partition key, so it has to be part of the primary key. Partitions are
+    # created ahead of time, and dropped past the dedup window, by the database
+    # workers' partition manager
     acknowledgement_time: Mapped[datetime] = mapped_column(
         TIMESTAMP,
+        primary_key=True,
         server_default=text("CURRENT_TIMESTAMP"),
-        index=True,
         name=EventLiteral.EVENT_TIMESTAMP_COLUMN_NAME,
     )
 
+    __table_args__ = {
+        "postgresql_partition_by": f"RANGE ({EventLiteral.EVENT_TIMESTAMP_COLUMN_NAME})"
+    }
+
 
 class DeadLetterQueue(Base):
     __tablename__ = DeadLetterQueueLiteral.TABLE_NAME
@@ -0,0 +1,126 @@
+"""Routing of repository reads between the primary and its streaming replicas"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Final, Iterator
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from auxillary.singleton import SingletonMetaclass
+
+# Seconds since the last replayed transaction, or 0 once a replica has replayed all
+# of the WAL it received, so that replicas of an idle primary are not seen as lagging.
+# Primaries, replicas that never replayed anything, and replicas that are not
+# streaming from the primary yield NULL. A replica cut off from the primary has
+# replayed all it received and would otherwise look caught up however stale it is
+REPLICA_LAG_QUERY: Final = text("""
+    SELECT CASE
+        WHEN NOT EXISTS (
+            SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """)
+
+_replica_reads: Final[ContextVar[bool]] = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """Let sessions opened within this context read from replicas"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@dataclass(slots=True, weakref_slot=True)
+class ReplicaRouter(metaclass=SingletonMetaclass):
+    """
+    Pick engines for reads. Replicas are only used within `replica_reads`, and only
+    while their last measured lag is within bounds, otherwise reads go to the primary
+    """
+
+    primary: Final[AsyncEngine]
+    replicas: Final[tuple[AsyncEngine, ...]]
+    max_lag: float
+    lag_check_interval: float
+    _healthy_replicas: tuple[AsyncEngine, ...] = field(init=False, default=())
+    _next_replica: int = field(init=False, default=0)
+    _monitoring_task: asyncio.Task | None = field(init=False, default=None)
+
+    def route_read(self) -> AsyncEngine:
+        healthy_replicas: tuple[AsyncEngine, ...] = self._healthy_replicas
+        if not (_replica_reads.get() and healthy_replicas):
+            return self.primary
+        self._next_replica = (self._next_replica + 1) % len(healthy_replicas)
+        return healthy_replicas[self._next_replica]
+
+    async def measure_lag(self, replica: AsyncEngine) -> float | None:
+        try:
+            async with replica.connect() as conn:
+                lag: Any = (await conn.execute(REPLICA_LAG_QUERY)).scalar_one()
+        except (SQLAlchemyError, OSError):
+            return None
+        return None if lag is None else float(lag)
+
+    async def check_replicas(self) -> None:
+        lags: list[float | None] = await asyncio.gather(
+            *(self.measure_lag(replica) for replica in self.replicas)
+        )
+        self._healthy_replicas = tuple(
+            replica
+            for replica, lag in zip(self.replicas, lags)
+            if lag is not None and lag <= self.max_lag
+        )
+
+    async def monitor_replicas(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self.lag_check_interval)
+
+    def start_replica_monitoring(self) -> None:
+        if self.replicas and not self._monitoring_task:
+            self._monitoring_task = asyncio.create_task(
+                self.monitor_replicas(),
+                name=f"{self}:{self.start_replica_monitoring.__name__}",
+            )
+
+    async def stop_replica_monitoring(self) -> None:
+        if not self._monitoring_task:
+            return
+
+        self._monitoring_task.cancel()
+        try:
+            await self._monitoring_task
+        except asyncio.CancelledError:
+            pass
+        self._monitoring_task = None
+
+
+class RoutingSession(Session):
+    """
+    Session sending writes to the primary, and reads to the engine picked by its
+    router. A session keeps reading from the engine it picked first, so that all of
+    its reads run in the same transaction
+    """
+
+    def __init__(self, *args: Any, router: ReplicaRouter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.router: Final[ReplicaRouter] = router
+        self._read_bind: Engine | None = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs: Any) -> Engine:
+        if self._flushing or isinstance(clause, UpdateBase):
+            return self.router.primary.sync_engine
+        if not self._read_bind:
+            self._read_bind = self.router.route_read().sync_engine
+        return self._read_bind
@@ -1,14 +1,28 @@
-from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Callable, ClassVar, Mapping, Self, Sequence
+from datetime import datetime
+from typing import Any, ClassVar, Final, Mapping, Self, Sequence
 
 import orjson
 
 from redis.typing import FieldT, EncodableT
 
-from resource_server.datastructures.requests import SortOption
-from sqlalchemy import Row, UnaryExpression, and_, select, ColumnElement
+from resource_server.datastructures.requests import KeysetCursor, SortOption
+from sqlalchemy import (
+    Row,
+    ScalarSelect,
+    and_,
+    any_,
+    func,
+    literal,
+    select,
+    text,
+    tuple_,
+    ColumnElement,
+)
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.types import INTEGER
 
 from resource_server.models.database import (
     Anime,
@@ -19,9 +33,32 @@ from resource_server.models.database import (
 )
 from auxillary.singleton import SingletonMetaclass
 from resource_server.repositories.result_protocol import AbstractResult
+from resource_server.utils.search import matches_title
 
 from resource_auxillary.strings import NAME_SEPERATOR
 
+# Genre names and stream links are aggregated per anime row, so that an anime is read
+# along with its details in a single statement
+ANIME_GENRES: Final[ScalarSelect] = (
+    select(func.coalesce(func.array_agg(Genre.name_), text("'{}'")))
+    .select_from(AnimeGenre)
+    .join(Genre, Genre.id_ == AnimeGenre.genre_id)
+    .where(AnimeGenre.anime_id == Anime.id_)
+    .correlate(Anime)
+    .scalar_subquery()
+)
+ANIME_STREAM_LINKS: Final[ScalarSelect] = (
+    select(
+        func.coalesce(
+            func.json_object_agg(StreamLink.website, StreamLink.url),
+            text("'{}'::json"),
+        )
+    )
+    .where(StreamLink.anime_id == Anime.id_)
+    .correlate(Anime)
+    .scalar_subquery()
+)
+
 
 @dataclass(slots=True, init=False)
 class AnimeResult(AbstractResult):
@@ -35,10 +72,18 @@ class AnimeResult(AbstractResult):
 
     COUNTER_FIELDS: ClassVar[tuple[str]] = ("members",)
     resource_name: ClassVar[str] = Anime.__tablename__
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute | ColumnElement]] = {
+        "id_": Anime.id_,
+        "title": Anime.title,
+        "members": Anime.members,
+        "synopsis": Anime.synopsis,
+        "genres": ANIME_GENRES,
+        "stream_links": ANIME_STREAM_LINKS,
+    }
 
     @classmethod
     def construct_from_cache(cls, mapping: Mapping[str, Any]) -> Self:
-        instance = super().construct_from_cache(mapping)
+        instance = super(AnimeResult, cls).construct_from_cache(mapping)
         instance.genres = orjson.loads(mapping["genres"])
         instance.stream_links = orjson.loads(mapping["stream_links"])
         return instance
@@ -52,7 +97,7 @@ class AnimeResult(AbstractResult):
         *args,
         **kwargs,
     ) -> Self:
-        instance = super().construct_from_orm(obj)
+        instance = super(AnimeResult, cls).construct_from_orm(obj)
         instance.genres = [g.name_ for g in genres]
         instance.stream_links = {s.website: s.url for s in stream_links}
         return instance
@@ -71,6 +116,8 @@ class AnimeResult(AbstractResult):
             "title": self.title,
             "members": self.members,
             "synopsis": self.synopsis,
+            "genres": orjson.dumps(self.genres).decode(),
+            "stream_links": orjson.dumps(self.stream_links).decode(),
         }
 
 
@@ -80,51 +127,17 @@ class AnimeRepository(metaclass=SingletonMetaclass):
 
     async def get_anime(self, anime_id: int) -> AnimeResult | None:
         async with self.session_maker() as session:
-            anime: Anime | None = (
-                await session.execute(select(Anime).where(Anime.id_ == anime_id))
-            ).scalar_one_or_none()
-            if not anime:
-                return None
-
-            genres, stream_links = await self.get_anime_details(
-                anime_id, session=session
-            )
-
-            return AnimeResult.construct_from_orm(anime, genres, stream_links)
-
-    async def get_anime_details(
-        self, anime_id: int, *, session: AsyncSession | None = None
-    ) -> tuple[list[Genre], list[StreamLink]]:
-        local_only_session: bool = session is None
-        session = session or self.session_maker()
-
-        try:
-            genres: list[Genre] = list(
-                (
-                    await session.execute(
-                        select(Genre)
-                        .join(AnimeGenre, AnimeGenre.genre_id == Genre.id_)
-                        .where(AnimeGenre.anime_id == anime_id)
-                    )
-                )
-                .scalars()
-                .all()
-            )
-
-            stream_links: list[StreamLink] = list(
-                (
-                    await session.execute(
-                        select(StreamLink).where(StreamLink.anime_id == anime_id)
+            anime: Row[tuple[Any, ...]] | None = (
+                await session.execute(
+                    select(*AnimeResult.projected_columns()).where(
+                        Anime.id_ == anime_id
                     )
                 )
-                .scalars()
-                .all()
-            )
+            ).one_or_none()
+            if not anime:
+                return None
 
-            return genres, stream_links
-        finally:
-            if local_only_session:
-                await session.close()
+            return AnimeResult.construct_from_row(anime)
 
     async def check_subscription(self, anime_id: int, user_id: int) -> bool:
         async with self.session_maker() as session:
@@ -139,167 +152,119 @@ class AnimeRepository(metaclass=SingletonMetaclass):
 
             return bool(subscription)
 
-    @staticmethod
-    def _order_anime_streams(
-        stream_links: list[StreamLink],
-    ) -> dict[int, list[StreamLink]]:
-        anime_stream_links: defaultdict[int, list[StreamLink]] = defaultdict(list)
-        for stream_link in stream_links:
-            anime_stream_links[stream_link.anime_id].append(stream_link)
-        return dict(anime_stream_links)
-
-    @staticmethod
-    def _order_anime_genres(
-        genres: Sequence[Row[tuple[int, Genre]]],
-    ) -> dict[int, list[Genre]]:
-        genres_by_anime: dict[int, list[Genre]] = defaultdict(list)
-        for anime_id, genre in genres:
-            genres_by_anime[anime_id].append(genre)
-        return dict(genres_by_anime)
-
-    async def get_animes_details(
-        self, anime_ids: Sequence[int]
-    ) -> tuple[dict[int, list[Genre]], dict[int, list[StreamLink]]]:
+    async def get_subscriptions(
+        self, anime_ids: Sequence[int], user_id: int
+    ) -> set[int]:
+        """
+        IDs of the given animes a user is subscribed to
+        """
         async with self.session_maker() as session:
-            genres_result: list[Row[tuple[int, Genre]]] = list(
-                (
-                    await session.execute(
-                        select(AnimeGenre.anime_id, Genre)
-                        .select_from(AnimeGenre)
-                        .join(Genre, AnimeGenre.genre_id == Genre.id_)
-                        .where(AnimeGenre.anime_id.in_(anime_ids))
-                    )
-                ).all()
-            )
-            anime_genres: dict[int, list[Genre]] = self._order_anime_genres(
-                genres_result
-            )
-
-            stream_links: list[StreamLink] = list(
+            return set(
                 (
                     await session.execute(
-                        select(StreamLink).where(StreamLink.anime_id.in_(anime_ids))
+                        select(AnimeSubscription.anime_id).where(
+                            (AnimeSubscription.user_id == user_id)
+                            & (
+                                AnimeSubscription.anime_id
+                                == any_(literal(anime_ids, ARRAY(INTEGER)))
+                            )
+                            & (AnimeSubscription.is_subscribed == True)
+                        )
                     )
                 )
                 .scalars()
                 .all()
             )
 
-            anime_stream_links: dict[int, list[StreamLink]] = self._order_anime_streams(
-                stream_links
-            )
-
-            return anime_genres, anime_stream_links
-
     async def get_animes(
         self,
+        limit: int,
         cursor: int = 0,
         search_param: str | None = None,
-        genres: list[Genre] | None = None,
+        genres: Sequence[Genre] | None = None,
     ) -> list[AnimeResult]:
+        """
+        Page through animes in ID order, optionally filtered by a title search and by
+        genres, in which case only animes having every given genre are returned.
+
+        Titles match when they contain the search term, or when it is similar to some
+        part of them. Ranked title search is served by the search repository instead
+        """
         where_clauses: list[ColumnElement] = [Anime.id_ > cursor]
         if search_param:
-            where_clauses.append(Anime.title.ilike(f"%{search_param}%"))
-
-        animes: list[Anime] = []
-        stream_links: list[StreamLink] = []
-        anime_genres: dict[int, list[Genre]] = {}
-        async with self.session_maker() as session:
-            if genres:
-                animes = list(
-                    (await session.execute(select(Anime).where(and_(*where_clauses))))
-                    .scalars()
-                    .all()
-                )
-                anime_ids: list[int] = [a.id_ for a in animes]
-            else:
-                animes = list(
-                    (await session.execute(select(Anime).where(and_(*where_clauses))))
-                    .scalars()
-                    .all()
-                )
-                anime_ids: list[int] = [a.id_ for a in animes]
-
-                genres_result: list[Row[tuple[int, Genre]]] = list(
-                    (
-                        await session.execute(
-                            select(AnimeGenre.anime_id, Genre)
-                            .select_from(AnimeGenre)
-                            .join(Genre, AnimeGenre.genre_id == Genre.id_)
-                            .where(AnimeGenre.anime_id.in_(anime_ids))
-                        )
-                    ).all()
+            where_clauses.append(matches_title(Anime.title, search_param))
+        if genres:
+            genre_ids: set[int] = {genre.id_ for genre in genres}
+            where_clauses.append(
+                Anime.id_.in_(
+                    select(AnimeGenre.anime_id)
+                    .where(AnimeGenre.genre_id.in_(genre_ids))
+                    .group_by(AnimeGenre.anime_id)
+                    .having(func.count() == len(genre_ids))
                 )
-                anime_genres = self._order_anime_genres(genres_result)
+            )
 
-            stream_links: list[StreamLink] = list(
+        async with self.session_maker() as session:
+            animes: list[Row[tuple[Any, ...]]] = list(
                 (
                     await session.execute(
-                        select(StreamLink).where(StreamLink.anime_id.in_(anime_ids))
+                        select(*AnimeResult.projected_columns())
+                        .where(and_(*where_clauses))
+                        .order_by(Anime.id_)
+                        .limit(limit)
                     )
-                )
-                .scalars()
-                .all()
-            )
-
-            anime_stream_links: dict[int, list[StreamLink]] = self._order_anime_streams(
-                stream_links
+                ).all()
             )
 
-            if genres:
-                return [
-                    AnimeResult.construct_from_orm(
-                        anime, genres, anime_stream_links[anime.id_]
-                    )
-                    for anime in animes
-                ]
-            else:
-                return [
-                    AnimeResult.construct_from_orm(
-                        anime, anime_genres[anime.id_], anime_stream_links[anime.id_]
-                    )
-                    for anime in animes
-                ]
+            return [AnimeResult.construct_from_row(anime) for anime in animes]
 
     async def get_user_animes(
         self,
         user_id: int,
         limit: int,
-        cursor: int = 0,
+        cursor: KeysetCursor | None = None,
         sort_option: SortOption = SortOption.DESCENDING,
-    ):
-        order_clause: Callable[[], UnaryExpression] = (
-            AnimeSubscription.time_subscribed.desc
+    ) -> tuple[list[AnimeResult], str | None]:
+        position: ColumnElement = tuple_(
+            AnimeSubscription.time_subscribed, AnimeSubscription.anime_id
+        )
+        statement = (
+            select(*AnimeResult.projected_columns(), AnimeSubscription.time_subscribed)
+            .select_from(AnimeSubscription)
+            .join(Anime, Anime.id_ == AnimeSubscription.anime_id)
+            .where(
+                (AnimeSubscription.user_id == user_id)
+                & (AnimeSubscription.is_subscribed == True)
+            )
+            .limit(limit)
         )
-        if sort_option == SortOption.ASCENDING:
-            order_clause = AnimeSubscription.time_subscribed.asc
+        match sort_option:
+            case SortOption.DESCENDING:
+                if cursor:
+                    statement = statement.where(position < tuple_(*cursor))
+                statement = statement.order_by(
+                    AnimeSubscription.time_subscribed.desc(),
+                    AnimeSubscription.anime_id.desc(),
+                )
+            case SortOption.ASCENDING:
+                if cursor:
+                    statement = statement.where(position > tuple_(*cursor))
+                statement = statement.order_by(
+                    AnimeSubscription.time_subscribed.asc(),
+                    AnimeSubscription.anime_id.asc(),
+                )
 
         async with self.session_maker() as session:
-            animes: list[Anime] = list(
-                (
-                    await session.execute(
-                        select(Anime)
-                        .select_from(AnimeSubscription)
-                        .join(Anime, Anime.id_ == AnimeSubscription.anime_id)
-                        .where(
-                            (AnimeSubscription.user_id == user_id)
-                            & (AnimeSubscription.anime_id > cursor)
-                        )
-                        .order_by(order_clause)
-                        .limit(limit)
-                    )
-                )
-                .scalars()
-                .all()
+            subscriptions: list[Row[tuple[Any, ...]]] = list(
+                (await session.execute(statement)).all()
             )
 
-            anime_ids: tuple[int, ...] = tuple(a.id_ for a in animes)
-
-            genres, stream_links = await self.get_animes_details(anime_ids)
-
-            return [
-                AnimeResult.construct_from_orm(
-                    anime, genres[anime.id_], stream_links[anime.id_]
-                )
-                for anime in animes
-            ]
+        results: list[AnimeResult] = [
+            AnimeResult.construct_from_row(subscription)
+            for subscription in subscriptions
+        ]
+        if len(results) < limit:
+            return results, None
+        # Subscription time trails the projected anime columns
+        last_subscription_time: datetime = subscriptions[-1][-1]
+        return results, KeysetCursor(last_subscription_time, results[-1].id_).encode()
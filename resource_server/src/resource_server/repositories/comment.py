@@ -1,16 +1,20 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import ClassVar, Self
+from typing import Any, ClassVar, Mapping, Self, Sequence
 
-from sqlalchemy import Row, select
+from sqlalchemy import Row, Select, any_, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.types import BIGINT
 
+from resource_server.datastructures.requests import KeysetCursor
 from resource_server.models.database import Comment, CommentReport, CommentVote, User
 from resource_server.models.database_enums import ReportTags
 from resource_server.repositories.result_protocol import AbstractResult
 from auxillary.singleton import SingletonMetaclass
 
-type t_comment_result = Row[tuple[Comment, int, str]]
+type t_comment_result = Row[tuple[Any, ...]]
 
 
 @dataclass(slots=True, init=False)
@@ -32,12 +36,23 @@ class CommentResult(AbstractResult):
         "score",
         "reports",
     )
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute]] = {
+        "id_": Comment.id_,
+        "author_id": Comment.author_id,
+        "author_username": User.username,
+        "parent_forum": Comment.parent_forum,
+        "parent_post": Comment.parent_post,
+        "time_created": Comment.time_created,
+        "body": Comment.body,
+        "score": Comment.score,
+        "reports": Comment.reports,
+    }
 
     @classmethod
     def construct_from_orm(
         cls, obj: Comment, author_id: int, author_username: str, *args, **kwargs
     ) -> Self:
-        instance = super().construct_from_orm(obj, *args, **kwargs)
+        instance = super(CommentResult, cls).construct_from_orm(obj, *args, **kwargs)
         instance.author_id = author_id
         instance.author_username = author_username
 
@@ -48,40 +63,56 @@ class CommentResult(AbstractResult):
 class CommentRepository(metaclass=SingletonMetaclass):
     session_maker: async_sessionmaker[AsyncSession]
 
+    @staticmethod
+    def _select_comments() -> Select[tuple[Any, ...]]:
+        return (
+            select(*CommentResult.projected_columns())
+            .select_from(Comment)
+            .join(User, User.id_ == Comment.author_id)
+        )
+
     async def get_comment(self, comment_id: int) -> CommentResult | None:
         async with self.session_maker() as session:
             result: t_comment_result | None = (
                 await session.execute(
-                    select(Comment, User.id_, User.username)
-                    .select_from(Comment)
-                    .join(User, User.id_ == Comment.author_id)
-                    .where(Comment.id_ == comment_id)
+                    self._select_comments().where(Comment.id_ == comment_id)
                 )
             ).first()
 
             if not result:
                 return None
 
-            return CommentResult.construct_from_orm(*result.tuple())
+            return CommentResult.construct_from_row(result)
 
     async def get_post_comments(
-        self, post_id: int, limit: int, cursor: int = 0
-    ) -> list[CommentResult]:
+        self, post_id: int, limit: int, cursor: KeysetCursor | None = None
+    ) -> tuple[list[CommentResult], str | None]:
+        # Comments read oldest first, paginated over (time_created, id)
+        statement = (
+            self._select_comments()
+            .where((Comment.parent_post == post_id) & (Comment.deleted == False))
+            .order_by(Comment.time_created.asc(), Comment.id_.asc())
+            .limit(limit)
+        )
+        if cursor:
+            statement = statement.where(
+                tuple_(Comment.time_created, Comment.id_) > tuple_(*cursor)
+            )
+
         async with self.session_maker() as session:
             results: list[t_comment_result] = list(
-                (
-                    await session.execute(
-                        select(Comment, User.id_, User.username)
-                        .select_from(Comment)
-                        .join(User, User.id_ == Comment.author_id)
-                        .where(
-                            (Comment.id_ > cursor) & (Comment.parent_post == post_id)
-                        )
-                    )
-                ).all()
+                (await session.execute(statement)).all()
             )
 
-            return [CommentResult.construct_from_orm(*r.tuple()) for r in results]
+        comments: list[CommentResult] = [
+            CommentResult.construct_from_row(r) for r in results
+        ]
+        if len(comments) < limit:
+            return comments, None
+        return (
+            comments,
+            KeysetCursor(comments[-1].time_created, comments[-1].id_).encode(),
+        )
 
     async def get_vote(self, comment_id: int, user_id: int) -> bool | None:
         async with self.session_maker() as session:
@@ -99,6 +130,29 @@ class CommentRepository(metaclass=SingletonMetaclass):
 
             return vote.vote_type
 
+    async def get_votes(
+        self, comment_ids: Sequence[int], user_id: int
+    ) -> dict[int, bool]:
+        """
+        Votes cast by a user on any of the given comments, by comment ID
+        """
+        async with self.session_maker() as session:
+            votes: list[Row[tuple[int, bool]]] = list(
+                (
+                    await session.execute(
+                        select(CommentVote.comment_id, CommentVote.vote_type).where(
+                            (CommentVote.voter_id == user_id)
+                            & (
+                                CommentVote.comment_id
+                                == any_(literal(comment_ids, ARRAY(BIGINT)))
+                            )
+                            & CommentVote.vote_type.is_not(None)
+                        )
+                    )
+                ).all()
+            )
+            return {comment_id: vote_type for comment_id, vote_type in votes}
+
     async def check_reported(
         self, comment_id: int, user_id, report_tag: ReportTags
     ) -> bool:
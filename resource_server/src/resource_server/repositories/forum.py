@@ -1,23 +1,29 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, ClassVar, Literal, Mapping, Self, overload
+from typing import Any, ClassVar, Literal, Mapping, Self, Sequence, overload
 
-from resource_server.datastructures.requests import SortOption
+from resource_server.datastructures.requests import KeysetCursor, SortOption
 from sqlalchemy import (
     ColumnElement,
     Row,
-    UnaryExpression,
     and_,
+    any_,
     delete,
     insert,
+    literal,
     select,
+    tuple_,
     update,
 )
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.types import INTEGER
 
 from resource_server.repositories.user import UserResult
 from auxillary.singleton import SingletonMetaclass
 from resource_server.repositories.result_protocol import AbstractResult
+from resource_server.utils.search import matches_title
 from resource_server.models.database import (
     Forum,
     ForumAdmin,
@@ -44,6 +50,16 @@ class ForumResult(AbstractResult):
 
     COUNTER_FIELDS: ClassVar[tuple[str, ...]] = ("subscribers", "posts")
     resource_name: ClassVar[str] = Forum.__tablename__
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute]] = {
+        "id_": Forum.id_,
+        "name_": Forum.name_,
+        "anime": Forum.anime,
+        "description": Forum.description,
+        "subscribers": Forum.subscribers,
+        "posts": Forum.posts,
+        "created_at": Forum.created_at,
+        "admin_count": Forum.admin_count,
+    }
 
 
 @dataclass(slots=True, init=False)
@@ -82,9 +98,14 @@ class ForumAdminResult(AbstractResult):
 class ForumAdminUserResult(UserResult):
     role: AdminRoles
 
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute]] = {
+        **UserResult.PROJECTION,
+        "role": ForumAdmin.role,
+    }
+
     @classmethod
     def construct_from_cache(cls, mapping: Mapping[str, Any]) -> Self:
-        instance = super().construct_from_cache(mapping)
+        instance = super(ForumAdminUserResult, cls).construct_from_cache(mapping)
         instance.role = AdminRoles(mapping["role"])
         return instance
 
@@ -92,12 +113,20 @@ class ForumAdminUserResult(UserResult):
     def construct_from_orm(
         cls, obj: User, role: str | AdminRoles, *args, **kwargs
     ) -> Self:
-        instance = super().construct_from_orm(obj, *args, **kwargs)
+        instance = super(ForumAdminUserResult, cls).construct_from_orm(
+            obj, *args, **kwargs
+        )
         if not isinstance(role, AdminRoles):
             role = AdminRoles(role)
         instance.role = role
         return instance
 
+    @classmethod
+    def construct_from_row(cls, row: Sequence[Any]) -> Self:
+        instance = super(ForumAdminUserResult, cls).construct_from_row(row)
+        instance.role = AdminRoles(instance.role)
+        return instance
+
 
 @dataclass(slots=True, weakref_slot=True)
 class ForumRepository(metaclass=SingletonMetaclass):
@@ -105,25 +134,31 @@ class ForumRepository(metaclass=SingletonMetaclass):
 
     async def get_forum(self, forum_id: int) -> ForumResult | None:
         async with self.session_maker() as session:
-            forum: Forum | None = (
-                await session.execute(select(Forum).where(Forum.id_ == forum_id))
-            ).scalar_one_or_none()
+            forum: Row[tuple[Any, ...]] | None = (
+                await session.execute(
+                    select(*ForumResult.projected_columns()).where(
+                        Forum.id_ == forum_id
+                    )
+                )
+            ).one_or_none()
 
             if not forum:
                 return None
 
-            return ForumResult.construct_from_orm(forum)
+            return ForumResult.construct_from_row(forum)
 
     async def get_forum_by_name(self, name: str) -> ForumResult | None:
         async with self.session_maker() as session:
-            forum: Forum | None = (
-                await session.execute(select(Forum).where(Forum.name_ == name))
-            ).scalar_one_or_none()
+            forum: Row[tuple[Any, ...]] | None = (
+                await session.execute(
+                    select(*ForumResult.projected_columns()).where(Forum.name_ == name)
+                )
+            ).one_or_none()
 
             if not forum:
                 return None
 
-            return ForumResult.construct_from_orm(forum)
+            return ForumResult.construct_from_row(forum)
 
     async def get_forums(
         self,
@@ -133,18 +168,22 @@ class ForumRepository(metaclass=SingletonMetaclass):
     ) -> list[ForumResult]:
         where_clauses: list[ColumnElement] = [Forum.id_ > cursor]
         if search_param:
-            where_clauses.append(Forum.name_.ilike(f"%{search_param}%"))
+            where_clauses.append(matches_title(Forum.name_, search_param))
         if parent_anime_id:
             where_clauses.append(Forum.anime == parent_anime_id)
 
         async with self.session_maker() as session:
-            forums: list[Forum] = list(
-                (await session.execute(select(Forum).where(and_(*where_clauses))))
-                .scalars()
-                .all()
+            forums: list[Row[tuple[Any, ...]]] = list(
+                (
+                    await session.execute(
+                        select(*ForumResult.projected_columns()).where(
+                            and_(*where_clauses)
+                        )
+                    )
+                ).all()
             )
 
-            return [ForumResult.construct_from_orm(f) for f in forums]
+            return [ForumResult.construct_from_row(f) for f in forums]
 
     async def create_forum(
         self,
@@ -155,18 +194,20 @@ class ForumRepository(metaclass=SingletonMetaclass):
         creation_time: datetime | None = None,
     ) -> ForumResult:
         async with self.session_maker() as session:
-            forum: Forum = (
-                await session.execute(
-                    insert(Forum)
-                    .values(
-                        name_=name,
-                        desscription=description,
-                        anime=parent_anime_id,
-                        created_at=creation_time,
+            forum: ForumResult = ForumResult.construct_from_row(
+                (
+                    await session.execute(
+                        insert(Forum)
+                        .values(
+                            name_=name,
+                            desscription=description,
+                            anime=parent_anime_id,
+                            created_at=creation_time,
+                        )
+                        .returning(*ForumResult.projected_columns())
                     )
-                    .returning(Forum)
-                )
-            ).scalar_one()
+                ).one()
+            )
 
             await session.flush()
             await session.execute(
@@ -175,13 +216,13 @@ class ForumRepository(metaclass=SingletonMetaclass):
                 )
             )
             await session.commit()
-            return ForumResult.construct_from_orm(forum)
+            return forum
 
     async def get_forum_owner(self, forum_id: int) -> UserResult:
         async with self.session_maker() as session:
-            user: User = (
+            user: Row[tuple[Any, ...]] = (
                 await session.execute(
-                    select(User)
+                    select(*UserResult.projected_columns())
                     .join(ForumAdmin, ForumAdmin.forum_id == Forum.id_)
                     .join(User, User.id_ == ForumAdmin.user_id)
                     .where(
@@ -189,9 +230,9 @@ class ForumRepository(metaclass=SingletonMetaclass):
                         & (ForumAdmin.role == AdminRoles.OWNER.value)
                     )
                 )
-            ).scalar_one()
+            ).one()
 
-            return UserResult.construct_from_orm(user)
+            return UserResult.construct_from_row(user)
 
     async def get_forum_admin(
         self, forum_id: int, user_id: int
@@ -256,19 +297,19 @@ class ForumRepository(metaclass=SingletonMetaclass):
             update_clauses["description"] = description
 
         async with self.session_maker() as session:
-            forum: Forum = (
+            forum: Row[tuple[Any, ...]] = (
                 await session.execute(
                     update(Forum)
                     .where(Forum.id_ == forum_id)
                     .values(**update_clauses)
-                    .returning(Forum)
+                    .returning(*ForumResult.projected_columns())
                 )
-            ).scalar_one()
+            ).one()
 
             await session.commit()
 
             if return_forum:
-                return ForumResult.construct_from_orm(forum)
+                return ForumResult.construct_from_row(forum)
 
     async def add_forum_admin(
         self,
@@ -297,10 +338,10 @@ class ForumRepository(metaclass=SingletonMetaclass):
         self, forum_id: int, cursor: int = 0, limit: int | None = None
     ) -> list[ForumAdminUserResult]:
         async with self.session_maker() as session:
-            forum_admin_users: list[Row[tuple[User, str]]] = list(
+            forum_admin_users: list[Row[tuple[Any, ...]]] = list(
                 (
                     await session.execute(
-                        select(User, ForumAdmin.role)
+                        select(*ForumAdminUserResult.projected_columns())
                         .join(ForumAdmin, ForumAdmin.user_id == User.id_)
                         .where((ForumAdmin.forum_id == forum_id) & (User.id_ > cursor))
                         .limit(limit)
@@ -309,7 +350,7 @@ class ForumRepository(metaclass=SingletonMetaclass):
             )
 
             return [
-                ForumAdminUserResult.construct_from_orm(*i) for i in forum_admin_users
+                ForumAdminUserResult.construct_from_row(i) for i in forum_admin_users
             ]
 
     async def update_admin_role(
@@ -338,36 +379,77 @@ class ForumRepository(metaclass=SingletonMetaclass):
 
             return bool(subscription)
 
-    async def get_user_forums(
-        self,
-        user_id: int,
-        limit: int,
-        cursor: int = 0,
-        sort_option: SortOption = SortOption.DESCENDING,
-    ) -> list[ForumResult]:
-        order_clause: Callable[[], UnaryExpression] = (
-            ForumSubscription.time_subscribed.desc
-        )
-        if sort_option == SortOption.ASCENDING:
-            order_clause = ForumSubscription.time_subscribed.asc
-
+    async def get_subscriptions(
+        self, forum_ids: Sequence[int], user_id: int
+    ) -> set[int]:
+        """
+        IDs of the given forums a user is subscribed to
+        """
         async with self.session_maker() as session:
-            forums: list[Forum] = list(
+            return set(
                 (
                     await session.execute(
-                        select(Forum)
-                        .select_from(ForumSubscription)
-                        .join(Forum, Forum.id_ == ForumSubscription.forum_id)
-                        .where(
+                        select(ForumSubscription.forum_id).where(
                             (ForumSubscription.user_id == user_id)
-                            & (ForumSubscription.forum_id > cursor)
+                            & (
+                                ForumSubscription.forum_id
+                                == any_(literal(forum_ids, ARRAY(INTEGER)))
+                            )
+                            & (ForumSubscription.is_subscribed == True)
                         )
-                        .order_by(order_clause)
-                        .limit(limit)
                     )
                 )
                 .scalars()
                 .all()
             )
 
-            return [ForumResult.construct_from_orm(forum) for forum in forums]
+    async def get_user_forums(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: KeysetCursor | None = None,
+        sort_option: SortOption = SortOption.DESCENDING,
+    ) -> tuple[list[ForumResult], str | None]:
+        position: ColumnElement = tuple_(
+            ForumSubscription.time_subscribed, ForumSubscription.forum_id
+        )
+        statement = (
+            select(*ForumResult.projected_columns(), ForumSubscription.time_subscribed)
+            .select_from(ForumSubscription)
+            .join(Forum, Forum.id_ == ForumSubscription.forum_id)
+            .where(
+                (ForumSubscription.user_id == user_id)
+                & (ForumSubscription.is_subscribed == True)
+            )
+            .limit(limit)
+        )
+        match sort_option:
+            case SortOption.DESCENDING:
+                if cursor:
+                    statement = statement.where(position < tuple_(*cursor))
+                statement = statement.order_by(
+                    ForumSubscription.time_subscribed.desc(),
+                    ForumSubscription.forum_id.desc(),
+                )
+            case SortOption.ASCENDING:
+                if cursor:
+                    statement = statement.where(position > tuple_(*cursor))
+                statement = statement.order_by(
+                    ForumSubscription.time_subscribed.asc(),
+                    ForumSubscription.forum_id.asc(),
+                )
+
+        async with self.session_maker() as session:
+            subscriptions: list[Row[tuple[Any, ...]]] = list(
+                (await session.execute(statement)).all()
+            )
+
+        forums: list[ForumResult] = [
+            ForumResult.construct_from_row(subscription)
+            for subscription in subscriptions
+        ]
+        if len(forums) < limit:
+            return forums, None
+        # Subscription time trails the projected forum columns
+        last_subscription_time: datetime = subscriptions[-1][-1]
+        return forums, KeysetCursor(last_subscription_time, forums[-1].id_).encode()
@@ -1,12 +1,23 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, ClassVar, Mapping, Self
+from typing import Any, ClassVar, Mapping, Self, Sequence
 
-from sqlalchemy import Row, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    any_,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, QueryableAttribute
+from sqlalchemy.types import BIGINT
 
-from resource_server.datastructures.requests import SortOption
+from resource_server.datastructures.requests import KeysetCursor, SortOption
 from auxillary.singleton import SingletonMetaclass
 from resource_server.repositories.result_protocol import AbstractResult
 from resource_server.models.database import Post, PostReport, PostSave, PostVote, User
@@ -38,10 +49,25 @@ class PostResult(AbstractResult):
 
     COUNTER_FIELDS: ClassVar[tuple[str, ...]] = ("saves", "reports", "total_comments")
     resource_name: ClassVar[str] = Post.__tablename__
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute]] = {
+        "id_": Post.id_,
+        "author_id": Post.author_id,
+        "forum_id": Post.forum_id,
+        "author_username": User.username,
+        "score": Post.score,
+        "total_comments": Post.total_comments,
+        "saves": Post.saves,
+        "reports": Post.reports,
+        "title": Post.title,
+        "body_text": Post.body_text,
+        "flair": Post.flair,
+        "closed": Post.closed,
+        "time_posted": Post.time_posted,
+    }
 
     @classmethod
     def construct_from_cache(cls, mapping: Mapping[str, Any]) -> Self:
-        instance = super().construct_from_cache(mapping)
+        instance = super(PostResult, cls).construct_from_cache(mapping)
         instance.author_username = mapping["author_username"]
         return instance
 
@@ -49,7 +75,7 @@ class PostResult(AbstractResult):
     def construct_from_orm(
         cls, obj: DeclarativeBase, author_username: str, *args, **kwargs
     ) -> Self:
-        instance = super().construct_from_orm(obj, *args, **kwargs)
+        instance = super(PostResult, cls).construct_from_orm(obj, *args, **kwargs)
         instance.author_username = author_username
         return instance
 
@@ -58,18 +84,40 @@ class PostResult(AbstractResult):
 class PostRepository(metaclass=SingletonMetaclass):
     session_maker: async_sessionmaker[AsyncSession]
 
+    @staticmethod
+    def _select_posts() -> Select[tuple[Any, ...]]:
+        return (
+            select(*PostResult.projected_columns())
+            .select_from(Post)
+            .join(User, User.id_ == Post.author_id)
+        )
+
     async def get_post(self, post_id: int) -> PostResult | None:
         async with self.session_maker() as session:
-            result: Row[tuple[Post, str]] | None = (
+            result: Row[tuple[Any, ...]] | None = (
                 await session.execute(
-                    select(Post, User.username)
-                    .join(User, User.id_ == Post.author_id)
-                    .where((Post.id_ == post_id) & (Post.deleted == False))
+                    self._select_posts().where(
+                        (Post.id_ == post_id) & (Post.deleted == False)
+                    )
                 )
             ).first()
             if not result:
                 return None
-            return PostResult.construct_from_orm(*result.tuple())
+            return PostResult.construct_from_row(result)
+
+    async def get_posts(self, post_ids: Sequence[int]) -> dict[int, PostResult]:
+        async with self.session_maker() as session:
+            results: list[Row[tuple[Any, ...]]] = list(
+                (
+                    await session.execute(
+                        self._select_posts().where(
+                            Post.id_.in_(post_ids) & (Post.deleted == False)
+                        )
+                    )
+                ).all()
+            )
+        posts: list[PostResult] = [PostResult.construct_from_row(r) for r in results]
+        return {post.id_: post for post in posts}
 
     async def update_post(
         self,
@@ -95,67 +143,81 @@ class PostRepository(metaclass=SingletonMetaclass):
             )
             await session.commit()
 
-    async def get_forum_posts(
-        self,
-        forum_id: int,
+    @staticmethod
+    def _paginate_posts(
+        statement: Select[tuple[Any, ...]],
         limit: int,
-        cursor: int = 0,
-        sort_option: SortOption = SortOption.DESCENDING,
-        datetime_bound: datetime | None = None,
-    ) -> list[PostResult]:
-        datetime_bound = datetime_bound or datetime.min
+        cursor: KeysetCursor | None,
+        sort_option: SortOption,
+    ) -> Select[tuple[Any, ...]]:
+        # Cursor and ordering share the (time_posted, id) key, so that pages are
+        # stable and served straight off the feed indexes
+        position: ColumnElement = tuple_(Post.time_posted, Post.id_)
         match sort_option:
             case SortOption.DESCENDING:
-                order_clause = Post.time_posted.desc
+                if cursor:
+                    statement = statement.where(position < tuple_(*cursor))
+                statement = statement.order_by(Post.time_posted.desc(), Post.id_.desc())
             case SortOption.ASCENDING:
-                order_clause = Post.time_posted.asc
+                if cursor:
+                    statement = statement.where(position > tuple_(*cursor))
+                statement = statement.order_by(Post.time_posted.asc(), Post.id_.asc())
+        return statement.limit(limit)
 
+    async def _get_post_page(
+        self, statement: Select[tuple[Any, ...]], limit: int
+    ) -> tuple[list[PostResult], str | None]:
         async with self.session_maker() as session:
-            posts: list[Row[tuple[Post, str]]] = list(
-                (
-                    await session.execute(
-                        select(Post, User.username)
-                        .join(User, Post.author_id == User.id_)
-                        .where(
-                            (Post.id_ > cursor)
-                            & (Post.forum_id == forum_id)
-                            & (Post.time_posted > datetime_bound)
-                        )
-                        .order_by(order_clause)
-                        .limit(limit)
-                    )
-                ).all()
+            posts: list[Row[tuple[Any, ...]]] = list(
+                (await session.execute(statement)).all()
             )
 
-            return [PostResult.construct_from_orm(*p.tuple()) for p in posts]
+        results: list[PostResult] = [PostResult.construct_from_row(p) for p in posts]
+        if len(results) < limit:
+            return results, None
+        return results, KeysetCursor(results[-1].time_posted, results[-1].id_).encode()
+
+    async def get_forum_posts(
+        self,
+        forum_id: int,
+        limit: int,
+        cursor: KeysetCursor | None = None,
+        sort_option: SortOption = SortOption.DESCENDING,
+        datetime_bound: datetime | None = None,
+    ) -> tuple[list[PostResult], str | None]:
+        datetime_bound = datetime_bound or datetime.min
+        return await self._get_post_page(
+            self._paginate_posts(
+                self._select_posts().where(
+                    (Post.forum_id == forum_id)
+                    & (Post.deleted == False)
+                    & (Post.time_posted > datetime_bound)
+                ),
+                limit,
+                cursor,
+                sort_option,
+            ),
+            limit,
+        )
 
     async def get_user_posts(
         self,
         user_id: int,
         limit: int,
-        cursor: int = 0,
+        cursor: KeysetCursor | None = None,
         sort_option: SortOption = SortOption.DESCENDING,
-    ) -> list[PostResult]:
-        match sort_option:
-            case SortOption.DESCENDING:
-                order_clause = Post.time_posted.desc
-            case SortOption.ASCENDING:
-                order_clause = Post.time_posted.asc
-
-        async with self.session_maker() as session:
-            posts: list[Row[tuple[Post, str]]] = list(
-                (
-                    await session.execute(
-                        select(Post, User.username)
-                        .join(User, Post.author_id == User.id_)
-                        .where((Post.id_ > cursor) & (Post.author_id == user_id))
-                        .order_by(order_clause)
-                        .limit(limit)
-                    )
-                ).all()
-            )
-
-            return [PostResult.construct_from_orm(*p.tuple()) for p in posts]
+    ) -> tuple[list[PostResult], str | None]:
+        return await self._get_post_page(
+            self._paginate_posts(
+                self._select_posts().where(
+                    (Post.author_id == user_id) & (Post.deleted == False)
+                ),
+                limit,
+                cursor,
+                sort_option,
+            ),
+            limit,
+        )
 
     async def check_saved(self, post_id: int, user_id) -> bool:
         async with self.session_maker() as session:
@@ -183,6 +245,49 @@ class PostRepository(metaclass=SingletonMetaclass):
 
             return vote.vote_type
 
+    async def get_votes(self, post_ids: Sequence[int], user_id: int) -> dict[int, bool]:
+        """
+        Votes cast by a user on any of the given posts, by post ID
+        """
+        async with self.session_maker() as session:
+            votes: list[Row[tuple[int, bool]]] = list(
+                (
+                    await session.execute(
+                        select(PostVote.post_id, PostVote.vote_type).where(
+                            (PostVote.voter_id == user_id)
+                            & (
+                                PostVote.post_id
+                                == any_(literal(post_ids, ARRAY(BIGINT)))
+                            )
+                            & PostVote.vote_type.is_not(None)
+                        )
+                    )
+                ).all()
+            )
+            return {post_id: vote_type for post_id, vote_type in votes}
+
+    async def get_saved(self, post_ids: Sequence[int], user_id: int) -> set[int]:
+        """
+        IDs of the given posts saved by a user
+        """
+        async with self.session_maker() as session:
+            return set(
+                (
+                    await session.execute(
+                        select(PostSave.post_id).where(
+                            (PostSave.user_id == user_id)
+                            & (
+                                PostSave.post_id
+                                == any_(literal(post_ids, ARRAY(BIGINT)))
+                            )
+                            & (PostSave.is_saved == True)
+                        )
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
     async def check_reported(
         self, post_id: int, user_id, report_tag: ReportTags
     ) -> bool:
@@ -1,9 +1,11 @@
 from dataclasses import dataclass, fields
-from typing import Any, ClassVar, Mapping, Self
+from functools import cache
+from typing import Any, Callable, ClassVar, Mapping, Self, Sequence
 
 from redis.typing import FieldT, EncodableT
 
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import DeclarativeBase, QueryableAttribute
 
 from resource_auxillary.cache import CACHE_TYPE_MAPPING, NAME_SEPERATOR
 
@@ -14,6 +16,8 @@ class AbstractResult:
     _fields: ClassVar[tuple[str, ...]] = tuple()
     _counter_fields: ClassVar[tuple[str, ...]] = tuple()
     counter_fields_map: ClassVar[Mapping[str, str]] = {}
+    # Columns selected for each field when reading rows instead of ORM entities
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute | ColumnElement]] = {}
 
     def __init_subclass__(cls):
         cls._fields = tuple(f.name for f in fields(cls))
@@ -32,6 +36,18 @@ class AbstractResult:
                 setattr(instance, k, v)
         return instance
 
+    @classmethod
+    def projected_columns(cls) -> tuple[QueryableAttribute | ColumnElement, ...]:
+        return tuple(cls.PROJECTION.values())
+
+    @classmethod
+    def construct_from_row(cls, row: Sequence[Any]) -> Self:
+        """
+        Construct from a row selected with `projected_columns`. Any columns after
+        the projection are left to the caller
+        """
+        return _compile_row_constructor(cls)(row)
+
     @classmethod
     def construct_from_orm(cls, obj: DeclarativeBase, *args, **kwargs) -> Self:
         instance = cls()
@@ -56,3 +72,34 @@ class AbstractResult:
             for field in fields(self)
             if not field.name.startswith("_")
         }
+
+
+@cache
+def _compile_row_constructor(
+    result_type: type[AbstractResult],
+) -> Callable[[Sequence[Any]], Any]:
+    """
+    Generate a constructor assigning each projected column straight to its slot,
+    so that rows are not walked column by column at runtime
+    """
+    if unknown_fields := set(result_type.PROJECTION) - set(result_type._fields):
+        raise ValueError(
+            f"Projection of {result_type.__name__} has unknown fields: {unknown_fields}"
+        )
+    assignments: str = "".join(
+        f"    instance.{field_name} = row[{idx}]\n"
+        for idx, field_name in enumerate(result_type.PROJECTION)
+    )
+    namespace: dict[str, Any] = {"new": object.__new__, "result_type": result_type}
+    exec(  # nosec: field names are dataclass fields, checked above
+        "".join(
+            (
+                "def construct_from_row(row):\n",
+                "    instance = new(result_type)\n",
+                assignments,
+                "    return instance\n",
+            )
+        ),
+        namespace,
+    )
+    return namespace["construct_from_row"]
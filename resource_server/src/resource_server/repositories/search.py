@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import ColumnElement, Row, Select, cast, func, select, tuple_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import QueryableAttribute
+
+from auxillary.singleton import SingletonMetaclass
+
+from resource_server.datastructures.requests import RankingCursor
+from resource_server.models.database import Anime, Forum, Post, User
+from resource_server.repositories.anime import AnimeResult
+from resource_server.repositories.forum import ForumResult
+from resource_server.repositories.posts import PostResult
+from resource_server.repositories.result_protocol import AbstractResult
+from resource_server.utils.search import (
+    matches_title,
+    text_search_query,
+    title_similarity,
+)
+
+SEARCH_RESULT_T = TypeVar("SEARCH_RESULT_T", bound=AbstractResult)
+
+
+@dataclass(slots=True, weakref_slot=True)
+class SearchRepository(metaclass=SingletonMetaclass):
+    """
+    Ranked search over animes, forums and posts. Results are ordered by (rank, id)
+    descending, and paginated over the same key through ranking cursors
+    """
+
+    session_maker: async_sessionmaker[AsyncSession]
+
+    async def _search(
+        self,
+        statement: Select[tuple[Any, ...]],
+        result_type: type[SEARCH_RESULT_T],
+        rank: ColumnElement[float],
+        identifier: QueryableAttribute[int],
+        limit: int,
+        cursor: RankingCursor | None,
+    ) -> tuple[list[SEARCH_RESULT_T], str | None]:
+        # Ranks are real, and cursor ranks are sent back as double precision. Ranks
+        # are widened to double precision on both sides, so that the cursor's rank
+        # compares equal to the row it was taken from and that row is not repeated
+        rank = cast(rank, DOUBLE_PRECISION)
+        # Ranks and IDs are selected after the projection, so that the cursor is
+        # built from the exact values Postgres compares against
+        statement = (
+            statement.add_columns(rank, identifier)
+            .order_by(rank.desc(), identifier.desc())
+            .limit(limit)
+        )
+        if cursor:
+            statement = statement.where(tuple_(rank, identifier) < tuple_(*cursor))
+
+        async with self.session_maker() as session:
+            rows: list[Row[tuple[Any, ...]]] = list(
+                (await session.execute(statement)).all()
+            )
+
+        results: list[SEARCH_RESULT_T] = [
+            result_type.construct_from_row(row) for row in rows
+        ]
+        if len(results) < limit:
+            return results, None
+        last_rank, last_identifier = rows[-1][-2:]
+        return results, RankingCursor(last_rank, last_identifier).encode()
+
+    async def search_animes(
+        self, query: str, limit: int, cursor: RankingCursor | None = None
+    ) -> tuple[list[AnimeResult], str | None]:
+        return await self._search(
+            select(*AnimeResult.projected_columns()).where(
+                matches_title(Anime.title, query)
+            ),
+            AnimeResult,
+            title_similarity(Anime.title, query),
+            Anime.id_,
+            limit,
+            cursor,
+        )
+
+    async def search_forums(
+        self, query: str, limit: int, cursor: RankingCursor | None = None
+    ) -> tuple[list[ForumResult], str | None]:
+        return await self._search(
+            select(*ForumResult.projected_columns()).where(
+                matches_title(Forum.name_, query), Forum.deleted == False
+            ),
+            ForumResult,
+            title_similarity(Forum.name_, query),
+            Forum.id_,
+            limit,
+            cursor,
+        )
+
+    async def search_posts(
+        self, query: str, limit: int, cursor: RankingCursor | None = None
+    ) -> tuple[list[PostResult], str | None]:
+        """
+        Posts matching the query as full-text, or by title similarity. Full-text
+        ranks favour matches in titles, and title similarity is added on top so
+        that misspelled titles still rank
+        """
+        text_query: ColumnElement = text_search_query(query)
+        return await self._search(
+            select(*PostResult.projected_columns())
+            .select_from(Post)
+            .join(User, User.id_ == Post.author_id)
+            .where(
+                Post.search_vector.op("@@")(text_query)
+                | matches_title(Post.title, query),
+                Post.deleted == False,
+            ),
+            PostResult,
+            func.ts_rank_cd(Post.search_vector, text_query)
+            + title_similarity(Post.title, query),
+            Post.id_,
+            limit,
+            cursor,
+        )
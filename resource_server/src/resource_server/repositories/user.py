@@ -4,6 +4,7 @@ from typing import Any, ClassVar, Mapping, Never, Self
 
 from sqlalchemy import ColumnElement, Row, and_, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import QueryableAttribute
 
 from resource_server.repositories.result_protocol import AbstractResult
 from resource_server.models.database import PasswordRecoveryToken, User
@@ -30,6 +31,15 @@ class UserResult(AbstractResult):
         "total_comments",
     )
     resource_name: ClassVar[str] = User.__tablename__
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute]] = {
+        "id_": User.id_,
+        "username": User.username,
+        "aura": User.aura,
+        "total_posts": User.total_posts,
+        "total_comments": User.total_comments,
+        "time_joined": User.time_joined,
+        "last_login": User.last_login,
+    }
 
 
 @dataclass(slots=True, init=False)
@@ -38,6 +48,13 @@ class PrivateUserResult(UserResult):
     deleted: bool
     time_deleted: datetime | None
 
+    PROJECTION: ClassVar[Mapping[str, QueryableAttribute]] = {
+        **UserResult.PROJECTION,
+        "pw_hash": User.pw_hash,
+        "deleted": User.deleted,
+        "time_deleted": User.time_deleted,
+    }
+
     @classmethod
     def construct_from_cache(cls, mapping: Mapping[str, Any], *args, **kwargs) -> Never:
         raise RuntimeError("Cache mapping of private user data violates policy")
@@ -47,7 +64,9 @@ class PrivateUserResult(UserResult):
 
     @classmethod
     def construct_from_orm(cls, obj: User, *args, **kwargs) -> Self:
-        instance = super().construct_from_orm(obj, *args, **kwargs)
+        instance = super(PrivateUserResult, cls).construct_from_orm(
+            obj, *args, **kwargs
+        )
         instance.pw_hash = obj.pw_hash
         instance.deleted = obj.deleted
         instance.time_deleted = obj.time_deleted
@@ -63,83 +82,81 @@ class UserRepository(metaclass=SingletonMetaclass):
         self, username: str, email: str, password: bytes | bytearray
     ) -> UserResult:
         async with self.session_maker() as session:
-            user: User = (
+            user: Row[tuple[Any, ...]] = (
                 await session.execute(
-                    insert(User).values(
-                        username=username, email=email, pw_hash=password
-                    )
+                    insert(User)
+                    .values(username=username, email=email, pw_hash=password)
+                    .returning(*UserResult.projected_columns())
                 )
-            ).scalar_one()
+            ).one()
             await session.commit()
 
-            return UserResult.construct_from_orm(user)
+            return UserResult.construct_from_row(user)
 
     async def get_user(self, user_id: int) -> UserResult | None:
         async with self.session_maker() as session:
-            user: User | None = (
+            user: Row[tuple[Any, ...]] | None = (
                 await session.execute(
-                    select(User).where(
+                    select(*UserResult.projected_columns()).where(
                         (User.id_ == user_id) & (User.deleted.is_(False))
                     )
                 )
-            ).scalar_one_or_none()
+            ).one_or_none()
 
             if not user:
                 return None
 
-            return UserResult.construct_from_orm(user)
+            return UserResult.construct_from_row(user)
 
     async def get_user_by_identity(self, username: str, email: str) -> list[UserResult]:
         async with self.session_maker() as session:
-            users: list[User] = list(
+            users: list[Row[tuple[Any, ...]]] = list(
                 (
                     await session.execute(
-                        select(User).where(
+                        select(*UserResult.projected_columns()).where(
                             (User.username == username) | (User.email == email)
                         )
                     )
-                )
-                .scalars()
-                .all()
+                ).all()
             )
 
-            return [UserResult.construct_from_orm(user) for user in users]
+            return [UserResult.construct_from_row(user) for user in users]
 
     async def get_user_by_username(
         self,
         username: str,
     ) -> UserResult | None:
         async with self.session_maker() as session:
-            user: User | None = (
+            user: Row[tuple[Any, ...]] | None = (
                 await session.execute(
-                    select(User).where(
+                    select(*UserResult.projected_columns()).where(
                         (User.username == username) & (User.deleted.is_(False))
                     )
                 )
-            ).scalar_one_or_none()
+            ).one_or_none()
 
             if not user:
                 return None
 
-            return UserResult.construct_from_orm(user)
+            return UserResult.construct_from_row(user)
 
     async def get_user_by_email(
         self,
         email: str,
     ) -> UserResult | None:
         async with self.session_maker() as session:
-            user: User | None = (
+            user: Row[tuple[Any, ...]] | None = (
                 await session.execute(
-                    select(User).where(
+                    select(*UserResult.projected_columns()).where(
                         (User.email == email) & (User.deleted.is_(False))
                     )
                 )
-            ).scalar_one_or_none()
+            ).one_or_none()
 
             if not user:
                 return None
 
-            return UserResult.construct_from_orm(user)
+            return UserResult.construct_from_row(user)
 
     async def set_password_recovery_token(
         self, user_id: int, url_hash: str, expiry: datetime
@@ -161,10 +178,10 @@ class UserRepository(metaclass=SingletonMetaclass):
         self, user_id: int
     ) -> tuple[UserResult | None, tuple[str, datetime] | tuple[None, None]]:
         async with self.session_maker() as session:
-            res: Row[tuple[User, str, datetime]] | None = (
+            res: Row[tuple[Any, ...]] | None = (
                 await session.execute(
                     select(
-                        User,
+                        *UserResult.projected_columns(),
                         PasswordRecoveryToken.url_hash,
                         PasswordRecoveryToken.expiry,
                     )
@@ -179,9 +196,9 @@ class UserRepository(metaclass=SingletonMetaclass):
             if not res:
                 return None, (None, None)
 
-            user, url_hash, expiry = res.tuple()
+            *_, url_hash, expiry = res.tuple()
 
-            return UserResult.construct_from_orm(user), (url_hash, expiry)
+            return UserResult.construct_from_row(res), (url_hash, expiry)
 
     async def update_password(
         self, user_id: int, password_hash: bytes | bytearray
@@ -224,14 +241,18 @@ class UserRepository(metaclass=SingletonMetaclass):
             where_clauses.append(User.deleted.is_(False))
 
         async with self.session_maker() as session:
-            user: User | None = (
-                await session.execute(select(User).where(and_(*where_clauses)))
-            ).scalar_one_or_none()
+            user: Row[tuple[Any, ...]] | None = (
+                await session.execute(
+                    select(*PrivateUserResult.projected_columns()).where(
+                        and_(*where_clauses)
+                    )
+                )
+            ).one_or_none()
 
             if not user:
                 return None
 
-            return PrivateUserResult.construct_from_orm(user)
+            return PrivateUserResult.construct_from_row(user)
 
     async def recover_user(self, user_id: int) -> None:
         async with self.session_maker() as session:
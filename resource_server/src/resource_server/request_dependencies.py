@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import struct
 from typing import Annotated, Final
 
 from fastapi import Depends, Query, Request
@@ -10,16 +11,23 @@ from jwt.exceptions import PyJWTError, ExpiredSignatureError
 from auxillary.utils import from_base64url
 
 from resource_server.config.app_config import AppConfig
+from resource_server.config.database_constants import SearchConstants
 from resource_server.dependencies import get_app_config, get_key_manager, get_genres
 from resource_server.key_manager import KeyManager
 from resource_server.models.database import Genre
+from resource_server.utils.search import normalize_search_query
 from resource_server.utils.typing import StandardAccessTokenClaims
 from resource_server.datastructures.requests import (
+    CHRONOLOGICAL_SORT_OPTIONS,
+    KeysetCursor,
+    RankingCursor,
     SortOption,
     TIMEFRAMES,
     TimeFrameOption,
 )
 
+MAX_BULK_IDENTIFIERS: Final[int] = 100
+
 
 async def validate_access_token(
     request: Request,
@@ -49,6 +57,7 @@ async def validate_access_token(
             decoded_token = jwt.decode(
                 jwt=encoded_access_token,
                 key=key,
+                algorithms=list(app_config.JWKS.ALLOWED_ALGORITHMS),
                 leeway=timedelta(minutes=app_config.JWKS.KEY_LEEWAY),
             )
 
@@ -61,6 +70,7 @@ async def validate_access_token(
                 decoded_token = jwt.decode(
                     jwt=encoded_access_token,
                     key=key,
+                    algorithms=list(app_config.JWKS.ALLOWED_ALGORITHMS),
                     leeway=timedelta(minutes=app_config.JWKS.KEY_LEEWAY),
                 )
 
@@ -85,6 +95,52 @@ def cursor_preprocessor(
     return from_base64url(raw_cursor)
 
 
+def keyset_cursor_preprocessor(
+    raw_cursor: str | None = Query(default=None, alias="cursor")
+) -> KeysetCursor | None:
+    if not raw_cursor:
+        return None
+
+    try:
+        return KeysetCursor.decode(raw_cursor)
+    except (ValueError, struct.error, OverflowError):
+        raise HTTPException(400, "Invalid cursor")
+
+
+def ranking_cursor_preprocessor(
+    raw_cursor: str | None = Query(default=None, alias="cursor")
+) -> RankingCursor | None:
+    if not raw_cursor:
+        return None
+
+    try:
+        return RankingCursor.decode(raw_cursor)
+    except (ValueError, struct.error):
+        raise HTTPException(400, "Invalid cursor")
+
+
+def search_query_preprocessor(
+    raw_query: str = Query(alias="q", max_length=SearchConstants.QUERY_MAX_LENGTH)
+) -> str:
+    query: str = normalize_search_query(raw_query)
+    minimum_length: Final[int] = SearchConstants.QUERY_MIN_LENGTH
+    if len(query) < minimum_length:
+        raise HTTPException(
+            400, f"Search queries need at least {minimum_length} characters"
+        )
+
+    return query
+
+
+def identifiers_preprocessor(
+    raw_identifiers: list[int] = Query(
+        alias="id", min_length=1, max_length=MAX_BULK_IDENTIFIERS
+    )
+) -> list[int]:
+    # Duplicates are dropped, keeping the requested order
+    return list(dict.fromkeys(raw_identifiers))
+
+
 def search_param_preprocessor(
     raw_search_param: str | None = Query(default=None, alias="search")
 ) -> str | None:
@@ -124,8 +180,8 @@ async def anime_genres_preprocessor(
     return genres
 
 
-def preprocess_sort_option(
-    raw_sort_option: str | None = Query(default=None, alias="cursor")
+def preprocess_ranked_sort_option(
+    raw_sort_option: str | None = Query(default=None, alias="sort")
 ) -> SortOption:
     if not raw_sort_option:
         return SortOption.DESCENDING
@@ -135,6 +191,30 @@ def preprocess_sort_option(
         return SortOption.DESCENDING
 
 
+def preprocess_sort_option(
+    sort_option: Annotated[SortOption, Depends(preprocess_ranked_sort_option)],
+) -> SortOption:
+    """
+    Sort option for feeds without rankings, where only chronological orders apply
+    """
+    if sort_option not in CHRONOLOGICAL_SORT_OPTIONS:
+        return SortOption.DESCENDING
+    return sort_option
+
+
+def feed_cursor_preprocessor(
+    sort_option: Annotated[SortOption, Depends(preprocess_ranked_sort_option)],
+    raw_cursor: str | None = Query(default=None, alias="cursor"),
+) -> KeysetCursor | RankingCursor | None:
+    """
+    Decode a cursor for a feed that can be served either chronologically or from
+    a ranking, depending on its sort option
+    """
+    if sort_option in CHRONOLOGICAL_SORT_OPTIONS:
+        return keyset_cursor_preprocessor(raw_cursor)
+    return ranking_cursor_preprocessor(raw_cursor)
+
+
 def preprocess_timeframe(
     raw_timeframe_option: str | None = Query(default=None, alias="timeframe")
 ) -> tuple[TimeFrameOption, datetime]:
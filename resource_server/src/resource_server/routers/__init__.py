@@ -11,6 +11,7 @@ from resource_server.routers.forums import FORUMS
 from resource_server.routers.posts import POSTS
 from resource_server.routers.comments import COMMENTS
 from resource_server.routers.misc import MISC
+from resource_server.routers.search import SEARCH
 
 type t_route_prefixes = tuple[tuple[APIRouter, tuple[URLPrefix, ...]], ...]
 
@@ -21,6 +22,7 @@ ROUTER_PREFIXES: Final[t_route_prefixes] = tuple(
         (FORUMS, (URLPrefix.FORUNS,)),
         (POSTS, (URLPrefix.POSTS,)),
         (COMMENTS, (URLPrefix.POSTS, URLPrefix.COMMENTS)),
+        (SEARCH, (URLPrefix.SEARCH,)),
         (MISC, ()),
     )
 )
@@ -22,14 +22,15 @@ from resource_server.dependencies import (
 )
 from resource_server.models.database import (
     Anime,
-    AnimeSubscription,
     Forum,
     Genre,
 )
 from resource_server.utils.typing import StandardAccessTokenClaims
+from resource_server.utils.user_state import is_present, load_presence_intents
 from resource_server.request_dependencies import (
     anime_genres_preprocessor,
     cursor_preprocessor,
+    identifiers_preprocessor,
     search_param_preprocessor,
     validate_access_token,
 )
@@ -56,6 +57,31 @@ from auxillary.utils import (
 ANIMES: Final[APIRouter] = APIRouter()
 
 
+@ANIMES.get("/subscriptions")
+async def get_anime_subscriptions(
+    anime_ids: Annotated[list[int], Depends(identifiers_preprocessor)],
+    access_token: Annotated[StandardAccessTokenClaims, Depends(validate_access_token)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    anime_repo: Annotated[AnimeRepository, Depends(get_anime_repository)],
+) -> JSONResponse:
+    user_id: Final[int] = access_token["sid"]
+    subscriptions: dict[int, IntentFlag] = await cache_manager.get_user_states(
+        user_id,
+        AnimeResult.resource_name,
+        Action.SUB,
+        anime_ids,
+        partial(load_presence_intents, anime_repo.get_subscriptions, user_id),
+    )
+
+    return JSONResponse(
+        {
+            "subscriptions": {
+                anime_id: is_present(subscriptions[anime_id]) for anime_id in anime_ids
+            }
+        }
+    )
+
+
 @ANIMES.get("/{anime_id}")
 async def get_anime(
     anime_id: int,
@@ -113,7 +139,7 @@ async def sub_anime(
                     intent_id,
                     str(access_token["sid"]),
                     str(anime_id),
-                    AnimeSubscription.__tablename__,
+                    AnimeResult.resource_name,
                     Action.SUB,
                     IntentFlag.RESOURCE_CREATION_PENDING_FLAG,
                 )
@@ -191,13 +217,13 @@ async def unsub_anime(
     ) as latest_intent:
         intent_id: Final[str] = uuid4().hex
         if not latest_intent:
-            if await anime_repo.check_subscription(anime_id, access_token["sid"]):
+            if not await anime_repo.check_subscription(anime_id, access_token["sid"]):
                 await cache_manager.set_intent(
                     intent_id,
                     str(access_token["sid"]),
                     str(anime_id),
-                    AnimeSubscription.__tablename__,
-                    Action.UNSUB,
+                    AnimeResult.resource_name,
+                    Action.SUB,
                     IntentFlag.RESOURCE_DELETION_PENDING_FLAG,
                 )
                 raise HTTPException(409, conflict_message)
@@ -246,7 +272,7 @@ async def unsub_anime(
 @ANIMES.get("/")
 async def get_animes(
     cursor: Annotated[int, Depends(cursor_preprocessor)],
-    genres: Annotated[list[Genre], Depends(anime_genres_preprocessor)],
+    genres: Annotated[list[Genre] | None, Depends(anime_genres_preprocessor)],
     search_param: Annotated[str | None, Depends(search_param_preprocessor)],
     app_config: Annotated[AppConfig, Depends(get_app_config)],
     cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
@@ -255,20 +281,30 @@ async def get_animes(
     pagination_cache_key: str = await cache_manager.derive_pagination_key(
         Anime.__tablename__,
         cursor,
-        CacheManager.PAGINATION_SUB_KEY_SEPERATOR.join([str(g.id_) for g in genres]),
+        CacheManager.PAGINATION_SUB_KEY_SEPERATOR.join(
+            sorted(str(g.id_) for g in genres or ())
+        ),
         search_param or "",
     )
 
     animes, next_cursor = await cache_manager.distributed_pagination_get_or_load(
         pagination_cache_key,
-        partial(anime_repo.get_animes, cursor, search_param, genres),
+        partial(
+            anime_repo.get_animes,
+            app_config.BUSINESS.PAGINATION_SIZE,
+            cursor,
+            search_param,
+            genres,
+        ),
         AnimeResult,
         fetch_dtype="string",
     )
 
     if next_cursor == CacheManager.CURSOR_UNDERIVABLE_SENTINEL:
-        next_cursor = to_base64url(
-            animes[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH
+        next_cursor = (
+            to_base64url(animes[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH)
+            if len(animes) == app_config.BUSINESS.PAGINATION_SIZE
+            else None
         )
 
     return JSONResponse(
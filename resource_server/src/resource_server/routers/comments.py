@@ -46,17 +46,46 @@ from resource_server.dependencies import (
 from resource_server.models.requests import CommentModel, ReportModel, VoteModel
 from resource_server.repositories.comment import CommentRepository, CommentResult
 from resource_server.repositories.posts import PostRepository, PostResult
-from resource_server.request_dependencies import validate_access_token
-from resource_server.models.database import CommentVote
+from resource_server.request_dependencies import (
+    identifiers_preprocessor,
+    validate_access_token,
+)
 from resource_server.repositories.user import UserResult
 from resource_server.repositories.forum import ForumAdminResult, ForumRepository
 from resource_server.models.admin_permissions import AdminPermissions, check_permission
 from resource_server.utils.typing import StandardAccessTokenClaims
+from resource_server.utils.user_state import VOTE_VALUES, load_vote_intents
 from resource_server.event_streamer import EventStreamer
 
 COMMENTS: Final[APIRouter] = APIRouter()
 
 
+@COMMENTS.get("/states")
+async def get_comment_states(
+    comment_ids: Annotated[list[int], Depends(identifiers_preprocessor)],
+    access_token: Annotated[StandardAccessTokenClaims, Depends(validate_access_token)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    comment_repo: Annotated[CommentRepository, Depends(get_comment_repository)],
+) -> JSONResponse:
+    user_id: Final[int] = access_token["sid"]
+    votes: dict[int, IntentFlag] = await cache_manager.get_user_states(
+        user_id,
+        CommentResult.resource_name,
+        Action.VOTE,
+        comment_ids,
+        partial(load_vote_intents, comment_repo.get_votes, user_id),
+    )
+
+    return JSONResponse(
+        {
+            "states": {
+                comment_id: {"vote": VOTE_VALUES[votes[comment_id]]}
+                for comment_id in comment_ids
+            }
+        }
+    )
+
+
 @COMMENTS.post("/")
 async def comment_on_post(
     post_id: int,
@@ -274,7 +303,7 @@ async def vote_comment(
                     intent_id,
                     str(access_token["sid"]),
                     str(comment_id),
-                    CommentVote.__tablename__,
+                    CommentResult.resource_name,
                     Action.VOTE,
                     intent,
                 )
@@ -368,7 +397,7 @@ async def unvote_comment(
                     intent_id,
                     str(access_token["sid"]),
                     str(comment_id),
-                    CommentVote.__tablename__,
+                    CommentResult.resource_name,
                     Action.VOTE,
                     IntentFlag.RESOURCE_DELETION_PENDING_FLAG,
                 )
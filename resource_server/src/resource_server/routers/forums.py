@@ -27,11 +27,18 @@ from resource_auxillary.events import (
     EventSideEffects,
     Event,
 )
+from resource_auxillary.rankings import RankingName, derive_ranking_key
 from resource_auxillary.strings import NAME_SEPERATOR, EventName, IntentFlag, StreamName
 
 from resource_server.cache_manager import CacheManager
 from resource_server.config.app_config import AppConfig
-from resource_server.datastructures.requests import SortOption, TimeFrameOption
+from resource_server.datastructures.requests import (
+    CHRONOLOGICAL_SORT_OPTIONS,
+    KeysetCursor,
+    RankingCursor,
+    SortOption,
+    TimeFrameOption,
+)
 from resource_server.dependencies import (
     get_anime_repository,
     get_app_config,
@@ -55,8 +62,9 @@ from resource_server.repositories.forum import (
 )
 from resource_server.repositories.user import UserRepository, UserResult
 from resource_server.request_dependencies import (
-    cursor_preprocessor,
-    preprocess_sort_option,
+    feed_cursor_preprocessor,
+    identifiers_preprocessor,
+    preprocess_ranked_sort_option,
     preprocess_timeframe,
     validate_access_token,
 )
@@ -66,10 +74,44 @@ from resource_server.event_streamer import EventStreamer
 from resource_server.models.database_enums import AdminRoles
 from resource_server.models.admin_permissions import AdminPermissions, check_permission
 from resource_server.utils.typing import StandardAccessTokenClaims
+from resource_server.utils.user_state import is_present, load_presence_intents
 
 FORUMS: Final[APIRouter] = APIRouter()
 
 
+def _posted_after(post: PostResult, datetime_bound: datetime) -> bool:
+    # Cached posts carry their timestamps in ISO format
+    time_posted: datetime | str = post.time_posted
+    if isinstance(time_posted, str):
+        time_posted = datetime.fromisoformat(time_posted)
+    return time_posted > datetime_bound
+
+
+@FORUMS.get("/subscriptions")
+async def get_forum_subscriptions(
+    forum_ids: Annotated[list[int], Depends(identifiers_preprocessor)],
+    access_token: Annotated[StandardAccessTokenClaims, Depends(validate_access_token)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    forum_repo: Annotated[ForumRepository, Depends(get_forum_repository)],
+) -> JSONResponse:
+    user_id: Final[int] = access_token["sid"]
+    subscriptions: dict[int, IntentFlag] = await cache_manager.get_user_states(
+        user_id,
+        ForumResult.resource_name,
+        Action.SUB,
+        forum_ids,
+        partial(load_presence_intents, forum_repo.get_subscriptions, user_id),
+    )
+
+    return JSONResponse(
+        {
+            "subscriptions": {
+                forum_id: is_present(subscriptions[forum_id]) for forum_id in forum_ids
+            }
+        }
+    )
+
+
 @FORUMS.get("/{forum_id}")
 async def get_forum(
     forum_id: int,
@@ -91,8 +133,10 @@ async def get_forum(
 @FORUMS.get("/{forum_id}/posts")
 async def get_forum_posts(
     forum_id: int,
-    cursor: Annotated[int, Depends(cursor_preprocessor)],
-    sort_option: Annotated[SortOption, Depends(preprocess_sort_option)],
+    cursor: Annotated[
+        KeysetCursor | RankingCursor | None, Depends(feed_cursor_preprocessor)
+    ],
+    sort_option: Annotated[SortOption, Depends(preprocess_ranked_sort_option)],
     timeframe_tuple: Annotated[
         tuple[TimeFrameOption, datetime], Depends(preprocess_timeframe)
     ],
@@ -110,10 +154,34 @@ async def get_forum_posts(
     if not forum:
         raise HTTPException(404, f"No forum with {forum_id} found")
 
-    posts, next_cursor = await cache_manager.distributed_pagination_get_or_load(
+    if sort_option not in CHRONOLOGICAL_SORT_OPTIONS:
+        # Ranked feeds are read off the forum's ranking, without sorting any posts
+        post_ids, next_cursor = await cache_manager.fetch_ranked_page(
+            derive_ranking_key(RankingName(sort_option), forum_id),
+            cursor,  # type: ignore[reportArgumentType]
+            app_config.BUSINESS.PAGINATION_SIZE,
+        )
+        ranked_posts: list[PostResult] = (
+            await cache_manager.distributed_get_many_or_load(
+                PostResult.resource_name, post_ids, post_repo.get_posts, PostResult
+            )
+        )
+        # Rankings span all time, so narrower timeframes are filtered per page
+        return JSONResponse(
+            {
+                "posts": [
+                    json_repr(p)
+                    for p in ranked_posts
+                    if _posted_after(p, timeframe_tuple[1])
+                ],
+                "cursor": next_cursor,
+            }
+        )
+
+    posts, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
         await cache_manager.derive_pagination_key(
             Post.__tablename__,
-            cursor,
+            str(cursor or ""),
             Forum.__tablename__,
             str(forum_id),
             str(sort_option),
@@ -123,18 +191,13 @@ async def get_forum_posts(
             post_repo.get_forum_posts,
             forum_id,
             app_config.BUSINESS.PAGINATION_SIZE,
-            cursor,
+            cursor,  # type: ignore[reportArgumentType]
             sort_option,
             timeframe_tuple[1],
         ),
         PostResult,
     )
 
-    if next_cursor == CacheManager.CURSOR_UNDERIVABLE_SENTINEL:
-        next_cursor = to_base64url(
-            posts[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH
-        )
-
     return JSONResponse({"posts": [json_repr(p) for p in posts], "cursor": next_cursor})
 
 
@@ -174,6 +237,9 @@ async def create_forum(
         forum_model.parent_anime_id,
         access_token["sid"],
     )
+    await cache_manager.pin_to_primary(
+        derive_cache_key(ForumResult.resource_name, created_forum.id_)
+    )
     await cache_manager.batch_hset_with_ttl(
         [
             derive_cache_key(Forum.__tablename__, created_forum.id_),
@@ -612,7 +678,7 @@ async def unsubscribe_forum(
                     str(access_token["sid"]),
                     str(forum_id),
                     ForumResult.resource_name,
-                    Action.UNSUB,
+                    Action.SUB,
                     IntentFlag.RESOURCE_DELETION_PENDING_FLAG,
                 )
                 raise HTTPException(409, conflicting_message)
@@ -649,7 +715,7 @@ async def unsubscribe_forum(
             IntentUpdate(
                 intent_name=create_intent_flag(
                     ForumResult.resource_name,
-                    Action.UNSUB,
+                    Action.SUB,
                     str(access_token["sid"]),
                     str(forum_id),
                 ),
@@ -709,6 +775,11 @@ async def edit_forum(
     updated_forum: ForumResult = await forum_repo.update_forum(
         forum_id, forum_model.title, forum_model.description, return_forum=True
     )
+    cache_key: Final[str] = derive_cache_key(ForumResult.resource_name, forum_id)
+    await cache_manager.pin_to_primary(cache_key)
+    await cache_manager.hset_with_ttl(
+        cache_key, cache_repr(updated_forum), cache_manager.cache_config.TTL_STRONG
+    )
 
     return JSONResponse(
         {"message": "Forum edited succesfully", "forum": json_repr(updated_forum)}
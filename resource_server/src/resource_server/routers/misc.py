@@ -2,10 +2,14 @@ from typing import Annotated, Final
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from redis.asyncio import Redis
 
+from resource_auxillary.event_processing.metrics import (
+    EXPOSITION_CONTENT_TYPE,
+    REGISTRY,
+)
 from resource_auxillary.strings import StreamName
 
 from resource_server.dependencies import get_genres, get_app_redis_client
@@ -22,6 +26,12 @@ async def get_anime_genres() -> JSONResponse:
     return JSONResponse({g.name_: g.id_ for g in genres})
 
 
+@MISC.get("/metrics")
+async def get_metrics() -> PlainTextResponse:
+    # Metrics are per worker process, as are the connection pools they describe
+    return PlainTextResponse(REGISTRY.render(), media_type=EXPOSITION_CONTENT_TYPE)
+
+
 @MISC.post("/tickets")
 async def issue_ticket(
     request_model: UserTicketModel,
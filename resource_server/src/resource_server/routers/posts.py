@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from functools import partial
 from typing import Annotated, Final
@@ -6,7 +7,7 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
-from auxillary.utils import cache_repr, json_repr, to_base64url
+from auxillary.utils import cache_repr, json_repr
 
 from resource_auxillary.cache import (
     NAME_SEPERATOR,
@@ -32,6 +33,7 @@ from resource_auxillary.strings import EventName, IntentFlag, StreamName
 
 from resource_server.cache_manager import CacheManager
 from resource_server.config.app_config import AppConfig
+from resource_server.datastructures.requests import KeysetCursor
 from resource_server.dependencies import (
     get_app_config,
     get_cache_manager,
@@ -55,13 +57,19 @@ from resource_server.repositories.forum import (
 from resource_server.repositories.posts import PostRepository, PostResult
 from resource_server.repositories.user import UserResult
 from resource_server.request_dependencies import (
-    cursor_preprocessor,
+    identifiers_preprocessor,
+    keyset_cursor_preprocessor,
     validate_access_token,
 )
 from resource_server.models.admin_permissions import AdminPermissions, check_permission
-from resource_server.models.database import PostVote
 from resource_server.repositories.comment import CommentRepository, CommentResult
 from resource_server.utils.typing import StandardAccessTokenClaims
+from resource_server.utils.user_state import (
+    VOTE_VALUES,
+    is_present,
+    load_presence_intents,
+    load_vote_intents,
+)
 from resource_server.utils.validation import validate_duplicate_amendment_contents
 
 POSTS: Final[APIRouter] = APIRouter()
@@ -128,6 +136,44 @@ async def create_post(
     return JSONResponse({"message": "post created"}, 202)
 
 
+@POSTS.get("/states")
+async def get_post_states(
+    post_ids: Annotated[list[int], Depends(identifiers_preprocessor)],
+    access_token: Annotated[StandardAccessTokenClaims, Depends(validate_access_token)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    post_repo: Annotated[PostRepository, Depends(get_post_repository)],
+) -> JSONResponse:
+    user_id: Final[int] = access_token["sid"]
+    votes, saves = await asyncio.gather(
+        cache_manager.get_user_states(
+            user_id,
+            PostResult.resource_name,
+            Action.VOTE,
+            post_ids,
+            partial(load_vote_intents, post_repo.get_votes, user_id),
+        ),
+        cache_manager.get_user_states(
+            user_id,
+            PostResult.resource_name,
+            Action.SAVE,
+            post_ids,
+            partial(load_presence_intents, post_repo.get_saved, user_id),
+        ),
+    )
+
+    return JSONResponse(
+        {
+            "states": {
+                post_id: {
+                    "vote": VOTE_VALUES[votes[post_id]],
+                    "saved": is_present(saves[post_id]),
+                }
+                for post_id in post_ids
+            }
+        }
+    )
+
+
 @POSTS.get("/{post_id}")
 async def get_post(
     post_id: int,
@@ -174,6 +220,7 @@ async def edit_post(
     await post_repo.update_post(
         post_id, post_model.title, post_model.body, bool(post_model.closed)
     )
+    await cache_manager.pin_to_primary(cache_key)
     post.body_text = post_model.body or post.body_text
     post.title = post_model.title or post.title
     if post_model.closed is not None:
@@ -314,7 +361,7 @@ async def vote_post(
                     intent_id,
                     str(access_token["sid"]),
                     str(post_id),
-                    PostVote.__tablename__,
+                    PostResult.resource_name,
                     Action.VOTE,
                     intent,
                 )
@@ -405,7 +452,7 @@ async def unvote_post(
                     intent_id,
                     str(access_token["sid"]),
                     str(post_id),
-                    PostVote.__tablename__,
+                    PostResult.resource_name,
                     Action.VOTE,
                     IntentFlag.RESOURCE_DELETION_PENDING_FLAG,
                 )
@@ -708,7 +755,7 @@ async def report_post(
 @POSTS.get("/{post_id}/comments")
 async def get_post_comments(
     post_id: int,
-    cursor: Annotated[int, Depends(cursor_preprocessor)],
+    cursor: Annotated[KeysetCursor | None, Depends(keyset_cursor_preprocessor)],
     app_config: Annotated[AppConfig, Depends(get_app_config)],
     cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
     post_repo: Annotated[PostRepository, Depends(get_post_repository)],
@@ -723,24 +770,23 @@ async def get_post_comments(
 
     pagination_cache_key: str = await cache_manager.derive_pagination_key(
         CommentResult.resource_name,
-        cursor,
-    )
-
-    comments, next_cursor = await cache_manager.distributed_pagination_get_or_load(
-        pagination_cache_key,
-        partial(
-            comment_repo.get_post_comments,
-            post_id,
-            app_config.BUSINESS.PAGINATION_SIZE,
-            cursor,
-        ),
-        CommentResult,
+        str(cursor or ""),
+        PostResult.resource_name,
+        str(post_id),
     )
 
-    if next_cursor == CacheManager.CURSOR_UNDERIVABLE_SENTINEL:
-        next_cursor = to_base64url(
-            comments[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH
+    comments, next_cursor = (
+        await cache_manager.distributed_keyset_pagination_get_or_load(
+            pagination_cache_key,
+            partial(
+                comment_repo.get_post_comments,
+                post_id,
+                app_config.BUSINESS.PAGINATION_SIZE,
+                cursor,
+            ),
+            CommentResult,
         )
+    )
 
     return JSONResponse(
         {"comments": [json_repr(i) for i in comments], "cursor": next_cursor}
@@ -0,0 +1,104 @@
+from functools import partial
+from typing import Annotated, Final
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from resource_server.cache_manager import CacheManager
+from resource_server.config.app_config import AppConfig
+from resource_server.datastructures.requests import RankingCursor
+from resource_server.dependencies import (
+    get_app_config,
+    get_cache_manager,
+    get_search_repository,
+)
+from resource_server.repositories.anime import AnimeResult
+from resource_server.repositories.forum import ForumResult
+from resource_server.repositories.posts import PostResult
+from resource_server.repositories.search import SearchRepository
+from resource_server.request_dependencies import (
+    ranking_cursor_preprocessor,
+    search_query_preprocessor,
+)
+
+from auxillary.utils import json_repr
+
+SEARCH: Final[APIRouter] = APIRouter()
+
+
+@SEARCH.get("/animes")
+async def search_animes(
+    query: Annotated[str, Depends(search_query_preprocessor)],
+    cursor: Annotated[RankingCursor | None, Depends(ranking_cursor_preprocessor)],
+    app_config: Annotated[AppConfig, Depends(get_app_config)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    search_repo: Annotated[SearchRepository, Depends(get_search_repository)],
+) -> JSONResponse:
+    animes, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
+        await cache_manager.derive_search_key(
+            AnimeResult.resource_name, query, str(cursor or "")
+        ),
+        partial(
+            search_repo.search_animes,
+            query,
+            app_config.BUSINESS.PAGINATION_SIZE,
+            cursor,
+        ),
+        AnimeResult,
+    )
+
+    return JSONResponse(
+        {"animes": [json_repr(anime) for anime in animes], "cursor": next_cursor}
+    )
+
+
+@SEARCH.get("/forums")
+async def search_forums(
+    query: Annotated[str, Depends(search_query_preprocessor)],
+    cursor: Annotated[RankingCursor | None, Depends(ranking_cursor_preprocessor)],
+    app_config: Annotated[AppConfig, Depends(get_app_config)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    search_repo: Annotated[SearchRepository, Depends(get_search_repository)],
+) -> JSONResponse:
+    forums, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
+        await cache_manager.derive_search_key(
+            ForumResult.resource_name, query, str(cursor or "")
+        ),
+        partial(
+            search_repo.search_forums,
+            query,
+            app_config.BUSINESS.PAGINATION_SIZE,
+            cursor,
+        ),
+        ForumResult,
+    )
+
+    return JSONResponse(
+        {"forums": [json_repr(forum) for forum in forums], "cursor": next_cursor}
+    )
+
+
+@SEARCH.get("/posts")
+async def search_posts(
+    query: Annotated[str, Depends(search_query_preprocessor)],
+    cursor: Annotated[RankingCursor | None, Depends(ranking_cursor_preprocessor)],
+    app_config: Annotated[AppConfig, Depends(get_app_config)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    search_repo: Annotated[SearchRepository, Depends(get_search_repository)],
+) -> JSONResponse:
+    posts, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
+        await cache_manager.derive_search_key(
+            PostResult.resource_name, query, str(cursor or "")
+        ),
+        partial(
+            search_repo.search_posts,
+            query,
+            app_config.BUSINESS.PAGINATION_SIZE,
+            cursor,
+        ),
+        PostResult,
+    )
+
+    return JSONResponse(
+        {"posts": [json_repr(post) for post in posts], "cursor": next_cursor}
+    )
@@ -10,3 +10,4 @@ class URLPrefix(str, Enum):
     MISC = ""
     USERS = "users"
     POSTS = "posts"
+    SEARCH = "search"
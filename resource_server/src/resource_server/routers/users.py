@@ -9,7 +9,6 @@ from auxillary.utils import (
     bcrypt_hash_password,
     bcrypt_check_password,
     json_repr,
-    to_base64url,
 )
 
 from resource_auxillary.cache import (
@@ -28,7 +27,7 @@ from resource_auxillary.strings import EventName, IntentFlag, Action, StreamName
 
 from resource_server.config.app_config import AppConfig
 from resource_server.cache_manager import CacheManager
-from resource_server.datastructures.requests import SortOption
+from resource_server.datastructures.requests import KeysetCursor, SortOption
 from resource_server.dependencies import (
     get_app_config,
     get_forum_repository,
@@ -47,7 +46,7 @@ from resource_server.models.requests import (
 from resource_server.repositories.anime import AnimeRepository, AnimeResult
 from resource_server.repositories.posts import PostRepository, PostResult
 from resource_server.request_dependencies import (
-    cursor_preprocessor,
+    keyset_cursor_preprocessor,
     preprocess_sort_option,
     validate_access_token,
 )
@@ -94,6 +93,9 @@ async def register(
     user: UserResult = await user_repo.add_user(
         user_model.username, user_model.email, pw_hash
     )
+    await cache_manager.pin_to_primary(
+        derive_cache_key(UserResult.resource_name, user.id_)
+    )
     await cache_manager.hset_with_ttl(
         derive_cache_key(UserResult.resource_name, user.id_),
         json_repr(user),
@@ -244,7 +246,7 @@ async def get_user(
 @USERS.get("/{username}/posts")
 async def get_user_posts(
     username: str,
-    cursor: Annotated[int, Depends(cursor_preprocessor)],
+    cursor: Annotated[KeysetCursor | None, Depends(keyset_cursor_preprocessor)],
     sort_option: Annotated[SortOption, Depends(preprocess_sort_option)],
     app_config: Annotated[AppConfig, Depends(get_app_config)],
     cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
@@ -260,10 +262,14 @@ async def get_user_posts(
         raise HTTPException(404, f"User {username} not found")
 
     pagination_cache_key: Final[str] = await cache_manager.derive_pagination_key(
-        PostResult.resource_name, cursor, sort_option.value
+        PostResult.resource_name,
+        str(cursor or ""),
+        UserResult.resource_name,
+        str(user.id_),
+        sort_option.value,
     )
 
-    posts, next_cursor = await cache_manager.distributed_pagination_get_or_load(
+    posts, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
         pagination_cache_key,
         partial(
             post_repo.get_user_posts,
@@ -275,11 +281,6 @@ async def get_user_posts(
         PostResult,
     )
 
-    if next_cursor == CacheManager.CURSOR_UNDERIVABLE_SENTINEL:
-        next_cursor = to_base64url(
-            posts[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH
-        )
-
     return JSONResponse(
         {"posts": [json_repr(post) for post in posts], "cursor": next_cursor}
     )
@@ -288,7 +289,7 @@ async def get_user_posts(
 @USERS.route("/{username}/forums")
 async def get_user_forums(
     username: str,
-    cursor: Annotated[int, Depends(cursor_preprocessor)],
+    cursor: Annotated[KeysetCursor | None, Depends(keyset_cursor_preprocessor)],
     sort_option: Annotated[SortOption, Depends(preprocess_sort_option)],
     app_config: Annotated[AppConfig, Depends(get_app_config)],
     cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
@@ -304,10 +305,14 @@ async def get_user_forums(
         raise HTTPException(404, f"User {username} not found")
 
     pagination_cache_key: Final[str] = await cache_manager.derive_pagination_key(
-        ForumResult.resource_name, cursor, sort_option.value
+        ForumResult.resource_name,
+        str(cursor or ""),
+        UserResult.resource_name,
+        str(user.id_),
+        sort_option.value,
     )
 
-    forums, next_cursor = await cache_manager.distributed_pagination_get_or_load(
+    forums, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
         pagination_cache_key,
         partial(
             forum_repo.get_user_forums,
@@ -316,14 +321,9 @@ async def get_user_forums(
             cursor,
             sort_option,
         ),
-        PostResult,
+        ForumResult,
     )
 
-    if next_cursor == CacheManager.CURSOR_UNDERIVABLE_SENTINEL:
-        next_cursor = to_base64url(
-            forums[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH
-        )
-
     return JSONResponse(
         {"forums": [json_repr(forum) for forum in forums], "cursor": next_cursor}
     )
@@ -332,7 +332,7 @@ async def get_user_forums(
 @USERS.route("/{username}/animes")
 async def get_user_animes(
     username: str,
-    cursor: Annotated[int, Depends(cursor_preprocessor)],
+    cursor: Annotated[KeysetCursor | None, Depends(keyset_cursor_preprocessor)],
     sort_option: Annotated[SortOption, Depends(preprocess_sort_option)],
     app_config: Annotated[AppConfig, Depends(get_app_config)],
     cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
@@ -348,10 +348,14 @@ async def get_user_animes(
         raise HTTPException(404, f"User {username} not found")
 
     pagination_cache_key: Final[str] = await cache_manager.derive_pagination_key(
-        AnimeResult.resource_name, cursor, sort_option.value
+        AnimeResult.resource_name,
+        str(cursor or ""),
+        UserResult.resource_name,
+        str(user.id_),
+        sort_option.value,
     )
 
-    animes, next_cursor = await cache_manager.distributed_pagination_get_or_load(
+    animes, next_cursor = await cache_manager.distributed_keyset_pagination_get_or_load(
         pagination_cache_key,
         partial(
             anime_repo.get_user_animes,
@@ -360,14 +364,9 @@ async def get_user_animes(
             cursor,
             sort_option,
         ),
-        PostResult,
+        AnimeResult,
     )
 
-    if next_cursor == CacheManager.CURSOR_UNDERIVABLE_SENTINEL:
-        next_cursor = to_base64url(
-            animes[-1].id_, app_config.BUSINESS.PAGINATION_CURSOR_LENGTH
-        )
-
     return JSONResponse(
         {"animes": [json_repr(anime) for anime in animes], "cursor": next_cursor}
     )
@@ -7,8 +7,13 @@ from auxillary.utils import generic_error_handler
 
 from resource_server.config.app_config import AppConfig
 from resource_server.routers import ROUTER_PREFIXES, t_route_prefixes
-from resource_server.dependencies import get_app_config, get_key_manager
+from resource_server.dependencies import (
+    get_app_config,
+    get_key_manager,
+    get_replica_router,
+)
 from resource_server.key_manager import KeyManager
+from resource_server.replica_router import ReplicaRouter
 
 
 def register_routers(
@@ -39,6 +44,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     key_manager.start_jwks_monitoring()
 
+    # Replicas only take reads once their lag has been measured
+    replica_router: Final[ReplicaRouter] = get_replica_router()
+    await replica_router.check_replicas()
+    replica_router.start_replica_monitoring()
+
     yield
 
+    await replica_router.stop_replica_monitoring()
     await key_manager.stop_jwks_monitoring()
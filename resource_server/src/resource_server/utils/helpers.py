@@ -1,8 +1,20 @@
 from datetime import datetime
 from hashlib import sha256
+from typing import Mapping
 from uuid import uuid4
 
 
 def generate_url_token() -> str:
     temp_url = uuid4().hex + datetime.now().strftime("%d%m%y%H%M%S")
     return sha256(temp_url.encode()).digest().decode("utf-8")
+
+
+def decode_reply(reply: bytes | str) -> str:
+    """
+    The app Redis client does not decode responses, so replies are bytes
+    """
+    return reply.decode() if isinstance(reply, bytes) else reply
+
+
+def decode_mapping_reply(reply: Mapping[bytes | str, bytes | str]) -> dict[str, str]:
+    return {decode_reply(key): decode_reply(value) for key, value in reply.items()}
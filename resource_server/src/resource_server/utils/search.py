@@ -0,0 +1,51 @@
+"""Search predicates and ranks, backed by pg_trgm and full-text search indexes"""
+
+from typing import Final
+
+from sqlalchemy import ColumnElement, cast, func, literal, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.types import VARCHAR
+
+from resource_server.config.database_constants import SearchConstants
+
+LIKE_ESCAPE_CHARACTER: Final[str] = "\\"
+
+
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def escape_like(pattern: str) -> str:
+    return (
+        pattern.replace(LIKE_ESCAPE_CHARACTER, LIKE_ESCAPE_CHARACTER * 2)
+        .replace("%", f"{LIKE_ESCAPE_CHARACTER}%")
+        .replace("_", f"{LIKE_ESCAPE_CHARACTER}_")
+    )
+
+
+def matches_title(column: QueryableAttribute[str], query: str) -> ColumnElement[bool]:
+    """
+    Titles containing the query, or having some part the query is similar to, e.g.
+    when misspelled. Both operators are served by a gin_trgm_ops index on the column
+    """
+    return or_(
+        column.ilike(f"%{escape_like(query)}%", escape=LIKE_ESCAPE_CHARACTER),
+        literal(query, VARCHAR).op("<%")(column),
+    )
+
+
+def title_similarity(
+    column: QueryableAttribute[str], query: str
+) -> ColumnElement[float]:
+    return func.word_similarity(literal(query, VARCHAR), column)
+
+
+def text_search_query(query: str) -> ColumnElement:
+    """
+    Full-text query parsed leniently, as typed into a search box: quoted phrases,
+    `or` and `-` exclusions are understood, and syntax errors are never raised
+    """
+    return func.websearch_to_tsquery(
+        cast(SearchConstants.TEXT_SEARCH_CONFIGURATION, REGCONFIG), query
+    )
@@ -0,0 +1,45 @@
+"""Translation between a user's state on resources and the intent flags caching it"""
+
+from typing import Any, Callable, Coroutine, Final, Iterable, Mapping, Sequence
+
+from resource_auxillary.strings import IntentFlag
+
+type t_vote_loader = Callable[
+    [Sequence[int], int], Coroutine[Any, Any, Mapping[int, bool]]
+]
+type t_presence_loader = Callable[
+    [Sequence[int], int], Coroutine[Any, Any, Iterable[int]]
+]
+
+# Upvotes and downvotes are intended through the creation flag and its alternate
+VOTE_INTENTS: Final[Mapping[bool, IntentFlag]] = {
+    True: IntentFlag.RESOURCE_CREATION_PENDING_FLAG,
+    False: IntentFlag.RESOURCE_CREATION_PENDING_ALT_FLAG,
+}
+VOTE_VALUES: Final[Mapping[IntentFlag, int]] = {
+    IntentFlag.RESOURCE_CREATION_PENDING_FLAG: 1,
+    IntentFlag.RESOURCE_CREATION_PENDING_ALT_FLAG: -1,
+    IntentFlag.RESOURCE_DELETION_PENDING_FLAG: 0,
+}
+
+
+async def load_vote_intents(
+    loader: t_vote_loader, user_id: int, identifiers: Sequence[int]
+) -> dict[int, IntentFlag]:
+    votes: Mapping[int, bool] = await loader(identifiers, user_id)
+    return {identifier: VOTE_INTENTS[vote] for identifier, vote in votes.items()}
+
+
+async def load_presence_intents(
+    loader: t_presence_loader, user_id: int, identifiers: Sequence[int]
+) -> dict[int, IntentFlag]:
+    """
+    Intents for saves and subscriptions, which either exist or do not
+    """
+    return dict.fromkeys(
+        await loader(identifiers, user_id), IntentFlag.RESOURCE_CREATION_PENDING_FLAG
+    )
+
+
+def is_present(intent: IntentFlag) -> bool:
+    return intent == IntentFlag.RESOURCE_CREATION_PENDING_FLAG
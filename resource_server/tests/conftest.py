@@ -0,0 +1,34 @@
+"""
+Fixtures for running the resource server's cache against a live Redis instance.
+
+Tests are skipped unless TENJIN_TEST_REDIS_URL points at a scratch Redis database,
+which is wiped by every test
+"""
+
+import os
+import tomllib
+from typing import Final
+
+import pytest
+from redis import Redis
+
+from resource_server.config.app_config import AppConfig
+from resource_server.config.sub_config import CacheConfig
+
+REDIS_URL_VARIABLE: Final[str] = "TENJIN_TEST_REDIS_URL"
+
+
+@pytest.fixture(scope="session")
+def cache_config() -> CacheConfig:
+    with open(AppConfig.config_filepath, "rb") as config_file:
+        return CacheConfig(**tomllib.load(config_file)["cache"])
+
+
+@pytest.fixture
+def redis_url() -> str:
+    url: str | None = os.environ.get(REDIS_URL_VARIABLE)
+    if not url:
+        pytest.skip(f"{REDIS_URL_VARIABLE} is not set")
+    with Redis.from_url(url) as redis:
+        redis.flushdb()
+    return url
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime
+from typing import Iterator, Mapping, Sequence
+
+import pytest
+from redis.asyncio import Redis
+
+from resource_auxillary.strings import Action, IntentFlag
+
+from resource_server.cache_manager import CacheManager
+from resource_server.config.sub_config import CacheConfig
+from resource_server.datastructures.requests import RankingCursor
+from resource_server.repositories.posts import PostResult
+
+RANKING_KEY: str = "test_ranking"
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache_manager() -> Iterator[None]:
+    # The cache manager is a singleton, bound to the event loop of its client
+    yield
+    CacheManager._instance = None  # type: ignore[reportAttributeAccessIssue]
+
+
+def _post(identifier: int) -> PostResult:
+    post: PostResult = PostResult()
+    for field, value in {
+        "id_": identifier,
+        "author_id": 1,
+        "forum_id": 1,
+        "author_username": "test_user",
+        "score": 0,
+        "total_comments": 0,
+        "saves": 0,
+        "reports": 0,
+        "title": f"test_post_{identifier}",
+        "body_text": "Test post",
+        "flair": "",
+        "closed": False,
+        "time_posted": datetime(2026, 1, 1),
+    }.items():
+        setattr(post, field, value)
+    return post
+
+
+async def _not_loaded(identifiers: Sequence[int]) -> Mapping[int, IntentFlag]:
+    raise AssertionError(f"Cached states were loaded again: {identifiers}")
+
+
+async def _read_user_states(
+    redis_url: str, cache_config: CacheConfig
+) -> tuple[dict[int, IntentFlag], dict[int, IntentFlag]]:
+    # Replies are left undecoded, as with the server's app client
+    async with Redis.from_url(redis_url) as redis:
+        cache_manager: CacheManager = CacheManager(redis, cache_config)
+        await cache_manager.set_intent(
+            "intent-1",
+            "1",
+            "1",
+            "posts",
+            Action.VOTE,
+            IntentFlag.RESOURCE_CREATION_PENDING_FLAG,
+        )
+
+        async def load_states(
+            identifiers: Sequence[int],
+        ) -> Mapping[int, IntentFlag]:
+            return {2: IntentFlag.RESOURCE_DELETION_PENDING_FLAG}
+
+        first_read: dict[int, IntentFlag] = await cache_manager.get_user_states(
+            1, "posts", Action.VOTE, [1, 2], load_states
+        )
+        second_read: dict[int, IntentFlag] = await cache_manager.get_user_states(
+            1, "posts", Action.VOTE, [1, 2], _not_loaded
+        )
+    return first_read, second_read
+
+
+async def _read_ranked_pages(redis_url: str, cache_config: CacheConfig) -> list[int]:
+    async with Redis.from_url(redis_url) as redis:
+        cache_manager: CacheManager = CacheManager(redis, cache_config)
+        # Ties span page boundaries
+        await redis.zadd(RANKING_KEY, {str(i): i // 3 for i in range(1, 11)})
+
+        identifiers: list[int] = []
+        cursor: RankingCursor | None = None
+        while True:
+            page, raw_cursor = await cache_manager.fetch_ranked_page(
+                RANKING_KEY, cursor, 2
+            )
+            identifiers.extend(page)
+            if not raw_cursor:
+                return identifiers
+            cursor = RankingCursor.decode(raw_cursor)
+
+
+async def _read_many_twice(
+    redis_url: str, cache_config: CacheConfig
+) -> tuple[list[PostResult], list[PostResult]]:
+    async with Redis.from_url(redis_url) as redis:
+        cache_manager: CacheManager = CacheManager(redis, cache_config)
+
+        async def load_posts(identifiers: Sequence[int]) -> Mapping[int, PostResult]:
+            return {i: _post(i) for i in identifiers if i != 3}
+
+        async def not_loaded(identifiers: Sequence[int]) -> Mapping[int, PostResult]:
+            raise AssertionError(f"Cached posts were loaded again: {identifiers}")
+
+        loaded: list[PostResult] = await cache_manager.distributed_get_many_or_load(
+            "posts", [1, 2, 3], load_posts, PostResult  # type: ignore[reportArgumentType]
+        )
+        cached: list[PostResult] = await cache_manager.distributed_get_many_or_load(
+            "posts", [1, 2, 3], not_loaded, PostResult  # type: ignore[reportArgumentType]
+        )
+    return loaded, cached
+
+
+def test_user_states_are_read_back(redis_url: str, cache_config: CacheConfig) -> None:
+    first_read, second_read = asyncio.run(_read_user_states(redis_url, cache_config))
+
+    expected: dict[int, IntentFlag] = {
+        1: IntentFlag.RESOURCE_CREATION_PENDING_FLAG,
+        2: IntentFlag.RESOURCE_DELETION_PENDING_FLAG,
+    }
+    assert first_read == expected
+    assert second_read == expected
+
+
+def test_ranked_pages_cover_every_member_once(
+    redis_url: str, cache_config: CacheConfig
+) -> None:
+    identifiers: list[int] = asyncio.run(_read_ranked_pages(redis_url, cache_config))
+
+    assert sorted(identifiers) == list(range(1, 11))
+    assert len(identifiers) == len(set(identifiers))
+
+
+def test_cached_resources_are_read_back(
+    redis_url: str, cache_config: CacheConfig
+) -> None:
+    loaded, cached = asyncio.run(_read_many_twice(redis_url, cache_config))
+
+    # Missing resources are cached as negative entries, and left out
+    assert [post.title for post in loaded] == ["test_post_1", "test_post_2"]
+    assert [post.title for post in cached] == ["test_post_1", "test_post_2"]